@@ -1,25 +1,38 @@
+from contextlib import asynccontextmanager
 from typing import Any, Union
+import json
 from unicodedata import name
 from pydantic import BaseModel, Field
 import uvicorn
 from fastapi import FastAPI, Depends, status, Form
 from datetime import date, datetime
 from fastapi.responses import JSONResponse
-from server.userManager import CareersUserManager, User
+from server.userManager import User
 from server.gameManager import CareersGameManager
+from careers.server.gameActor import GameBusyError     # the gameActor module as gameManager imports it
 from game.careersGameEngine import CareersGameEngine
 
 manager = CareersGameManager()    
-userManager = CareersUserManager()
-app = FastAPI()
+userManager = manager.userManager     # the same storage client as the game manager
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    manager.flush()     # write back the cached games
+
+app = FastAPI(lifespan=lifespan)
+
+@app.exception_handler(GameBusyError)
+def gameBusy(request, ex: GameBusyError):
+    return JSONResponse(status_code=status.HTTP_429_TOO_MANY_REQUESTS, content={"detail": str(ex)})
 
 @app.get("/", status_code=200)
 def get(game: CareersGameEngine=Depends(manager)):
     return {}
 
 @app.get('/user/{userId}')
-def getUserById(userId: str):
-    return userManager.getUserByUserId(userId)
+async def getUserById(userId: str):
+    return await userManager.getUserByUserIdAsync(userId)
 
 @app.put('/game/{gameId}/user/{userId}/formula/{hearts}/{stars}/{money}', status_code=200)
 def updatePlayerFormula(userId: str, gameId: str, hearts: int, stars: int, money: int, 
@@ -52,12 +65,12 @@ def start(gameId: str, gameInstance: CareersGameManager=Depends(manager)):
         return 409
 
 @app.get('/game/details/code/{joinCode}')
-def getGameDetails(joinCode: str):
+async def getGameDetails(joinCode: str):
     """
         Before joining a game, the player needs to know the details 
         so they can create the formula
     """
-    game = manager.getGameByJoinCode(joinCode)
+    game = await manager.getGameByJoinCodeAsync(joinCode)
 
     if(game is None):
         return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": "Not Found"})
@@ -65,12 +78,12 @@ def getGameDetails(joinCode: str):
     return game
 
 @app.get('/game/{gameId}')
-def getGame(gameId: str):
-    return manager.getGameById(gameId)
+async def getGame(gameId: str):
+    return await manager.getGameByIdAsync(gameId)
 
 @app.get('/game/restore/{gameId}')
 def restoreGame(gameId: str, gameInstance: CareersGameEngine=Depends(manager)):
-    return manager.getGameById(gameId)
+    return manager.getGameById(gameId, hasTurn=True)     # the request has the game's turn
 
 @app.get('/game/{gameId}/players')
 def getPlayers(gameId: str, gameInstance: CareersGameEngine=Depends(manager)):
@@ -81,12 +94,35 @@ def joinGame(gameId: str, userId: str = None, money: int = 0, hearts: int = 0, s
     user = manager.joinGame(gameId, userId, gameInstance)
     return user
 
+@app.get('/stats/cache', status_code=200)
+def getCacheStats():
+    """Game cache hits, misses, evictions and write-backs"""
+    return manager.games.stats()
+
+@app.get('/stats/queues', status_code=200)
+def getQueueStats():
+    """Per-game command queue depths and rejections"""
+    return manager.actors.stats()
+
+@app.get('/stats/policy', status_code=200)
+def getPolicyStats():
+    """Batched computer player decisions"""
+    return manager.policyBatcher.stats() if manager.policyBatcher is not None else {}
+
+@app.post('/game/{gameId}/computer', status_code=200)
+def takeComputerTurn(gameId: str):
+    """Plays a turn of the game's current player if it's a computer player"""
+    result = manager.takeComputerTurn(gameId)
+    if result is None:
+        return JSONResponse(status_code=status.HTTP_409_CONFLICT, content={"detail": "No computer player to play"})
+    return json.loads(result.json_message)
+
 @app.get('/games/{userId}', status_code=200)
-def getGames(userId: str):
+async def getGames(userId: str):
     """
         Gets all the games the user has created or participates in
     """
-    return manager.getGames(userId)
+    return await manager.getGamesAsync(userId)
 
 if __name__ == "__main__":
     uvicorn.run("app:app", port=9000, reload=True)
\ No newline at end of file
@@ -0,0 +1,79 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Time to build the BoardAnalytics Markov chain model of an edition and to query it, compared with estimating
+how often turns end on each border square by playing all-computer games.
+The total variation distance between the model and the game estimate is printed as a sanity check.
+They don't match exactly: the model doesn't play Opportunity or Experience cards and its policy isn't the computer player's.
+'''
+
+from game.boardAnalytics import BoardAnalytics
+from game.careersGameEngine import CareersGameEngine
+from game.commandResult import CommandResult
+from game.consoleOutput import ConsoleOutput
+from game.editionTemplate import EditionTemplate
+from game.gameConstants import GameParametersType
+import argparse, time
+import numpy as np
+
+def build(args) -> BoardAnalytics:
+    EditionTemplate.get_template(args.edition, GameParametersType.TEST)     # not part of the timing
+    start = time.perf_counter()
+    analytics = BoardAnalytics.get_analytics(args.edition, GameParametersType.TEST)
+    elapsed = time.perf_counter() - start
+    print(f'model build: {elapsed*1000:.1f} ms, {analytics.number_of_states} states')
+    return analytics
+
+def query(analytics:BoardAnalytics, n:int):
+    names = list(analytics._occupations.keys())
+    start = time.perf_counter()
+    for i in range(n):
+        analytics.square_frequency("Hospital")
+        analytics.expected_turns_to_occupation(names[i % len(names)], i % 42)
+        analytics.landing_distribution(i % 50)
+    elapsed = time.perf_counter() - start
+    print(f'queries: {elapsed / (3*n) * 1e6:.2f} us per query')
+    for name in names:
+        print(f'  {name:>30}: {analytics.occupation_frequency(name):.3f} of turns, {analytics.expected_turns_to_occupation(name):.1f} turns to reach from Payday')
+
+def estimate(args) -> np.ndarray:
+    counts = np.zeros(42)
+    start = time.perf_counter()
+    for game_number in range(args.games):
+        engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+        engine.create(args.edition, 'benchmark', 'points', 1000, 'test', seed=game_number)
+        for i in range(3):
+            engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 400 300 300 computer", None)
+        engine.execute_command("start", None)
+        engine.automatic_run = True
+        for _ in range(args.turns):
+            player = engine.game_state.current_player
+            engine.execute_command("take_turn", player)
+            if player.board_location.occupation_name is None:
+                counts[player.board_location.border_square_number] += 1
+            if engine.execute_command("next", player).return_code == CommandResult.TERMINATE:
+                break
+        engine.discard()
+    elapsed = time.perf_counter() - start
+    print(f'estimate from {args.games} games: {elapsed:.2f} sec')
+    return counts / counts.sum()
+
+def main():
+    parser = argparse.ArgumentParser(description="Board analytics benchmark")
+    parser.add_argument("--games", help="number of games to play for the estimate", type=int, default=20)
+    parser.add_argument("--turns", help="turns per game", type=int, default=300)
+    parser.add_argument("--n", help="number of queries of each kind", type=int, default=100000)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    estimated = estimate(args)      # the first engine configures logging
+    analytics = build(args)
+    query(analytics, args.n)
+    border = analytics.square_frequencies() / analytics.square_frequencies().sum()
+    print(f'total variation distance, border squares: {0.5 * np.abs(border - estimated).sum():.3f}')
+
+if __name__ == '__main__':
+    main()
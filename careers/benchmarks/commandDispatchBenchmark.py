@@ -0,0 +1,55 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Compares commands/sec for the original parse_command_string() + eval() command path
+against CommandRegistry dispatch.
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.gameEngineCommands import GameEngineCommands
+from game.commandResult import CommandResult
+import argparse, time
+
+#
+# cheap, repeatable commands so the measurement is dominated by command dispatch
+# rather than by game play
+#
+COMMANDS = ["location", "where am i", "where is CP_2", "need", "need CP_2", "perform roll 2", "help commands"]
+
+def eval_command(engine:CareersGameEngine, txt:str) -> CommandResult:
+    command_result = GameEngineCommands.parse_command_string(txt, [])
+    return eval("engine." + command_result.message)
+
+def run(label:str, fn, engine:CareersGameEngine, n:int) -> float:
+    ncommands = len(COMMANDS)
+    start = time.perf_counter()
+    for i in range(n):
+        fn(engine, COMMANDS[i % ncommands])
+    elapsed = time.perf_counter() - start
+    rate = n / elapsed
+    print(f'{label:>10}: {n} commands in {elapsed:.3f} sec, {rate:,.0f} commands/sec')
+    return rate
+
+def main():
+    parser = argparse.ArgumentParser(description="Command dispatch benchmark")
+    parser.add_argument("--n", help="number of commands to execute", type=int, default=20000)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    args = parser.parse_args()
+    
+    engine = CareersGameEngine(loglevel='warning', installationId='benchmark', edition=args.edition)
+    engine.create(args.edition, 'benchmark', 'points', 100, 'test')
+    engine.execute_command("add player ComputerPlayer_1 CP_1 cp1 cp1@example.com 40 30 30 computer", None)
+    engine.execute_command("add player ComputerPlayer_2 CP_2 cp2 cp2@example.com 30 30 40 computer", None)
+    engine.execute_command("start", None)
+    
+    for txt in COMMANDS:     # both paths must agree
+        assert eval_command(engine, txt).message == engine._evaluate(txt).message or txt.startswith("perform"), txt
+    
+    before = run("eval", eval_command, engine, args.n)
+    after = run("registry", lambda e, txt: e._evaluate(txt), engine, args.n)
+    print(f'speedup: {after/before:.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Mixed multi-game load through the server's per-game GameActors, compared with a single global lock
+and with no locking at all. Client threads send commands to games picked with a skew, so a few games are hot.
+Each command plays a turn of an all-computer game and then sleeps for --io milliseconds, standing in for
+the database write of a save. Overlaps count commands that ran while another command for the same game was running,
+which must be 0 with actors.
+'''
+
+from careers.server.gameActor import GameActors, GameBusyError
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+from threading import Lock, Thread
+import argparse, random, statistics, time
+
+def create_games(args) -> list:
+    engines = []
+    for game_number in range(args.games):
+        engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+        engine.create(args.edition, 'benchmark', 'points', 10000, 'test', seed=game_number)
+        for i in range(2):
+            engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 4000 3000 3000 computer", None)
+        engine.execute_command("start", None)
+        engine.automatic_run = True
+        engines.append(engine)
+    return engines
+
+def remove_games(engines:list):
+    for engine in engines:
+        engine.discard()
+
+def run(args, engines:list, mode:str) -> dict:
+    actors = GameActors(maxDepth=args.depth, timeout=None)
+    global_lock = Lock()
+    in_flight = [0] * len(engines)
+    counter_lock = Lock()
+    overlaps = [0]
+    latencies = []
+    rejected = [0]
+
+    def command(game_number:int):
+        with counter_lock:
+            in_flight[game_number] += 1
+            if in_flight[game_number] > 1:
+                overlaps[0] += 1
+        engine = engines[game_number]
+        player = engine.game_state.current_player
+        try:
+            engine.execute_command("take_turn", player)
+            engine.execute_command("next", player)
+        except Exception:
+            pass        # an unguarded engine can be left in an inconsistent state
+        time.sleep(args.io / 1000)
+        with counter_lock:
+            in_flight[game_number] -= 1
+
+    def client(seed:int):
+        rng = random.Random(seed)
+        weights = [1 / (n + 1) for n in range(len(engines))]      # game 0 is the hottest
+        for game_number in rng.choices(range(len(engines)), weights=weights, k=args.commands // args.threads):
+            start = time.perf_counter()
+            if mode == "actor":
+                try:
+                    actors.execute(str(game_number), command, game_number)
+                except GameBusyError:
+                    rejected[0] += 1
+                    time.sleep(args.io / 1000)       # back off and drop the command
+                    continue
+            elif mode == "global":
+                with global_lock:
+                    command(game_number)
+            else:
+                command(game_number)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    threads = [Thread(target=client, args=(seed,)) for seed in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {"mode":mode, "commands/sec":len(latencies) / elapsed, "p50 ms":1000 * statistics.median(latencies), \
+            "p99 ms":1000 * latencies[int(0.99 * (len(latencies)-1))], "overlaps":overlaps[0], "rejected":rejected[0], \
+            "max queued":actors.maxQueued}
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-game actor benchmark")
+    parser.add_argument("--games", help="number of games", type=int, default=20)
+    parser.add_argument("--threads", help="number of client threads", type=int, default=16)
+    parser.add_argument("--commands", help="total number of commands per run", type=int, default=4000)
+    parser.add_argument("--io", help="simulated database write per command, milliseconds", type=float, default=2.0)
+    parser.add_argument("--depth", help="maximum queue depth per game", type=int, default=8)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    for mode in ["none", "global", "actor"]:
+        engines = create_games(args)
+        try:
+            result = run(args, engines, mode)
+        finally:
+            remove_games(engines)
+        print("  ".join([f"{key}: {value:.1f}" if isinstance(value, float) else f"{key}: {value}" for key,value in result.items()]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Measures CareersGame instances created per second and resident memory per game.
+All games are kept alive so the memory figure reflects what a server holding N games pays.
+'''
+
+from game.careersGame import CareersGame
+import argparse, resource, time, gc, tracemalloc
+
+def rss_kb() -> int:
+    """Current resident set size in KB (Linux), else the peak RSS.
+    """
+    try:
+        with open("/proc/self/statm", "r") as fp:
+            pages = int(fp.read().split()[1])
+        return pages * resource.getpagesize() // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def main():
+    parser = argparse.ArgumentParser(description="CareersGame creation benchmark")
+    parser.add_argument("--n", help="number of games to create", type=int, default=200)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    parser.add_argument("--params", help="game parameters type", type=str, default="prod")
+    args = parser.parse_args()
+    
+    # the first game pays for imports, plugin discovery and anything loaded once per process
+    first_start = time.perf_counter()
+    games = [CareersGame(args.edition, "benchmark", 100, "benchmark_0", "points", args.params)]
+    first_elapsed = time.perf_counter() - first_start
+    
+    gc.collect()
+    rss_before = rss_kb()
+    start = time.perf_counter()
+    for i in range(1, args.n+1):
+        games.append(CareersGame(args.edition, "benchmark", 100, f"benchmark_{i}", "points", args.params))
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    rss_after = rss_kb()
+    
+    print(f'first game: {first_elapsed*1000:.1f} ms')
+    print(f'{args.n} games in {elapsed:.3f} sec, {args.n/elapsed:,.1f} games/sec, {elapsed*1000/args.n:.2f} ms/game')
+    print(f'resident memory: {(rss_after-rss_before)/args.n:,.1f} KB/game')
+    #
+    # allocated (rather than resident) memory per game, measured separately since tracing slows creation
+    #
+    tracemalloc.start()
+    traced = [CareersGame(args.edition, "benchmark", 100, f"traced_{i}", "points", args.params) for i in range(20)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'allocated memory: {current/1024/len(traced):,.1f} KB/game')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Time of the GameState reads made between commands: is_game_complete(), the win check at the end of every turn,
+and to_dict(), which every save and game lookup serializes. Each is called --reads times after every turn
+of an all-computer game of --players players, as a server serving several clients of a game would.
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+import argparse, statistics, time
+
+def main():
+    parser = argparse.ArgumentParser(description="GameState win check and to_dict benchmark")
+    parser.add_argument("--players", help="number of computer players", type=int, default=6)
+    parser.add_argument("--turns", help="number of turns", type=int, default=300)
+    parser.add_argument("--reads", help="reads after each turn", type=int, default=10)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    parser.add_argument("--seed", help="random seed", type=int, default=7)
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+    engine.create(args.edition, 'benchmark', 'points', 100000, 'test', seed=args.seed)
+    for i in range(args.players):
+        engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 40000 30000 30000 computer", None)
+    engine.execute_command("start", None)
+    engine.automatic_run = True
+    game_state = engine.game_state
+
+    complete_us = []
+    to_dict_us = []
+    for _ in range(args.turns):
+        player = game_state.current_player
+        engine.execute_command("take_turn", player)
+        engine.execute_command("next", player)
+        start = time.perf_counter()
+        for _ in range(args.reads):
+            game_state.is_game_complete()
+        complete_us.append(1e6 * (time.perf_counter() - start) / args.reads)
+        start = time.perf_counter()
+        for _ in range(args.reads):
+            game_state.to_dict()
+        to_dict_us.append(1e6 * (time.perf_counter() - start) / args.reads)
+
+    print(f'is_game_complete: p50 {statistics.median(complete_us):7.2f} us, mean {statistics.mean(complete_us):7.2f} us')
+    print(f'         to_dict: p50 {statistics.median(to_dict_us):7.2f} us, mean {statistics.mean(to_dict_us):7.2f} us')
+    print(f'{args.players} players, {args.turns} turns, {args.reads} reads per turn')
+    engine.discard()
+
+if __name__ == '__main__':
+    main()
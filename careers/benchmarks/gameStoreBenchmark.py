@@ -0,0 +1,88 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Save, load and saved-games listing times of each GameStore backend, for --games saved games of --users users.
+The listing is compared with the directory scan it replaces: reading every {game_id}_game.json in the folder
+and keeping the games of the user.
+The game state saved is a real one, from a short all-computer game.
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+from game.gameStore import GameStore, MemoryGameStore, FileGameStore, SQLiteGameStore
+import argparse, copy, json, os, shutil, statistics, tempfile, time
+
+def game_state(args) -> dict:
+    """The JSON game state of a game after a few turns"""
+    engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+    engine.create(args.edition, 'benchmark', 'points', 10000, 'test', seed=1)
+    for i in range(3):
+        engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 4000 3000 3000 computer", None)
+    engine.execute_command("start", None)
+    engine.automatic_run = True
+    for _ in range(30):
+        player = engine.game_state.current_player
+        engine.execute_command("take_turn", player)
+        engine.execute_command("next", player)
+    store = MemoryGameStore()
+    GameStore.set_store(store)
+    engine._gameEngineCommands.save_game(engine.game_filename_base, engine.game_id, how='json')
+    state = store.load_state(engine.game_id)
+    engine.discard()
+    return state
+
+def scan(folder:str, user_id:str) -> list:
+    """The directory scan that the indexed listing replaces"""
+    games = []
+    for filename in os.listdir(folder):
+        if filename.endswith('_game.json'):
+            with open(os.path.join(folder, filename), "r") as fp:
+                state = json.load(fp)
+            if user_id in GameStore.users(state):
+                games.append(state["game_id"])
+    return games
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return 1000 * (time.perf_counter() - start)
+
+def run(args, name:str, store:GameStore, state:dict, folder:str):
+    save_ms = []
+    for n in range(args.games):
+        game_state = copy.copy(state)
+        game_state["game_id"] = f'game{n}'
+        game_state["installationId"] = f'user{n % args.users}'
+        save_ms.append(timed(store.save_state, f'game{n}', game_state))
+    load_ms = [timed(store.load_state, f'game{n}') for n in range(0, args.games, max(1, args.games // 200))]
+    list_ms = [timed(store.list_games_for_user, f'user{n}') for n in range(args.users)]
+    assert len(store.list_games_for_user('user0')) == len(range(0, args.games, args.users))
+    print(f'{name:>7}: save {statistics.median(save_ms):7.3f} ms  load {statistics.median(load_ms):7.3f} ms  list {statistics.median(list_ms):7.3f} ms')
+    if isinstance(store, FileGameStore):
+        scan_ms = [timed(scan, folder, f'user{n}') for n in range(min(args.users, 5))]
+        print(f'{"scan":>7}: list {statistics.median(scan_ms):7.3f} ms (the directory scan of {args.games} games)')
+
+def main():
+    parser = argparse.ArgumentParser(description="GameStore backend benchmark")
+    parser.add_argument("--games", help="number of saved games", type=int, default=2000)
+    parser.add_argument("--users", help="number of users the games belong to", type=int, default=50)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    state = game_state(args)
+    print(f'{args.games} games of {args.users} users, {len(json.dumps(state))} bytes per game state')
+    folder = tempfile.mkdtemp()
+    try:
+        run(args, "memory", MemoryGameStore(), state, folder)
+        run(args, "file", FileGameStore(os.path.join(folder, 'files')), state, os.path.join(folder, 'files'))
+        store = SQLiteGameStore(os.path.join(folder, 'games.db'))
+        run(args, "sqlite", store, state, folder)
+        store.close()
+    finally:
+        shutil.rmtree(folder)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Simulated turns per second for an all-computer game, with and without a headless CareersGameEngine.
+Console output of the non-headless run is sent to os.devnull so that terminal speed doesn't count.
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+from game.commandResult import CommandResult
+import argparse, os, time
+
+def play(edition:str, turns:int, headless:bool, out) -> float:
+    engine = CareersGameEngine(loglevel='warning', installationId='benchmark', edition=edition, headless=headless)
+    if not headless:
+        engine.console = ConsoleOutput(out=out)
+    engine.create(edition, 'benchmark', 'points', 1000, 'test')
+    engine.execute_command("add player ComputerPlayer_1 CP_1 cp1 cp1@example.com 400 300 300 computer", None)
+    engine.execute_command("add player ComputerPlayer_2 CP_2 cp2 cp2@example.com 300 300 400 computer", None)
+    engine.execute_command("start", None)
+    engine.automatic_run = True
+    
+    start = time.perf_counter()
+    nturns = 0
+    for nturns in range(1, turns+1):
+        player = engine.game_state.current_player
+        engine.execute_command("take_turn", player)
+        result = engine.execute_command("next", player)
+        if not headless:
+            out.write(result.message)
+        if result.return_code == CommandResult.TERMINATE:
+            break
+    elapsed = time.perf_counter() - start
+    engine.end()
+    return nturns / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless simulation benchmark")
+    parser.add_argument("--turns", help="number of turns to play", type=int, default=300)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    args = parser.parse_args()
+    
+    with open(os.devnull, "w") as out:
+        rate = play(args.edition, args.turns, False, out)
+        print(f'console:  {rate:,.1f} turns/sec')
+        rate = play(args.edition, args.turns, True, out)
+        print(f'headless: {rate:,.1f} turns/sec')
+
+if __name__ == '__main__':
+    main()
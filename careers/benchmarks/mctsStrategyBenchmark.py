@@ -0,0 +1,93 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Strength and turn latency of the Careers_All_MCTS strategy plug-in. Each of --games games has --players computer players,
+one played by MCTS and the others by the BASIC Careers_All_Strategy. The MCTS player's seat rotates from game to game.
+Reports the MCTS player's win rate, with the win rate of a player as strong as the others (1 / players) to compare,
+the time of the MCTS player's take_turn and the number of playouts per decision.
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.commandResult import CommandResult
+from game.consoleOutput import ConsoleOutput
+from game.gameConstants import StrategyLevel
+from game.plugins.careers_All_MCTS import Careers_All_MCTS
+import argparse, math, statistics, time
+
+def play(args, game_number:int):
+    """Plays one game. Returns the winning player number (-1 if not won in --max_turns), the MCTS player's seat,
+        and the time and number of playouts of each of the MCTS player's turns
+    """
+    seat = game_number % args.players
+    engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+    engine.create(args.edition, 'benchmark', 'points', args.points, 'test', seed=args.seed + game_number)
+    careers_game = engine.careersGame
+    for plugin in careers_game.plugins["turn"]:
+        plugin.strategy_level = StrategyLevel.BASIC
+    mcts = Careers_All_MCTS(careers_game)
+    mcts.configure({"players":[seat], "time_budget":args.budget, "horizon":args.horizon, "workers":args.workers, "seed":args.seed + game_number})
+    careers_game.plugins["turn"].append(mcts)
+    goal = args.points // 3
+    for i in range(args.players):
+        engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com {goal} {goal} {args.points - 2*goal} computer", None)
+    engine.execute_command("start", None)
+    engine.automatic_run = True
+
+    game_state = engine.game_state
+    turn_ms = []
+    playouts = []
+    while game_state.turns < args.max_turns:
+        player = game_state.current_player
+        start = time.perf_counter()
+        cmd_result = engine.execute_command("take_turn", player)
+        if player.number == seat:
+            turn_ms.append(1000 * (time.perf_counter() - start))
+            playouts.append(mcts.iterations)
+        if cmd_result.return_code != CommandResult.TERMINATE:
+            cmd_result = engine.execute_command("next", player)
+        if cmd_result.return_code == CommandResult.TERMINATE:
+            break
+    winner = game_state.winning_player.number if game_state.game_complete else -1
+    mcts.close()
+    engine.discard()
+    return winner, seat, turn_ms, playouts
+
+def main():
+    parser = argparse.ArgumentParser(description="MCTS strategy win rate and turn latency benchmark")
+    parser.add_argument("--games", help="number of games", type=int, default=60)
+    parser.add_argument("--players", help="number of computer players", type=int, default=3)
+    parser.add_argument("--points", help="success formula total points", type=int, default=60)
+    parser.add_argument("--budget", help="MCTS seconds per decision", type=float, default=0.15)
+    parser.add_argument("--horizon", help="MCTS playout turns", type=int, default=3)
+    parser.add_argument("--workers", help="MCTS rollout processes, 0 searches in this process", type=int, default=0)
+    parser.add_argument("--max_turns", help="a game not won after this many turns is not counted", type=int, default=600)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    parser.add_argument("--seed", help="base random seed", type=int, default=100)
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    wins = 0
+    completed = 0
+    turn_ms = []
+    playouts = []
+    start = time.perf_counter()
+    for game_number in range(args.games):
+        winner, seat, game_turn_ms, game_playouts = play(args, game_number)
+        if winner >= 0:
+            completed += 1
+            wins += winner == seat
+        turn_ms += game_turn_ms
+        playouts += game_playouts
+
+    rate = wins / completed if completed > 0 else 0.0
+    error = math.sqrt(rate * (1 - rate) / completed) if completed > 0 else 0.0
+    print(f'MCTS win rate: {rate:.3f} +/- {1.96 * error:.3f} over {completed} completed games, {1 / args.players:.3f} for an even player')
+    print(f'MCTS turn: p50 {statistics.median(turn_ms):6.1f} ms, p90 {statistics.quantiles(turn_ms, n=10)[-1]:6.1f} ms, max {max(turn_ms):6.1f} ms')
+    print(f'playouts per decision: mean {statistics.mean(playouts):6.1f}')
+    print(f'{args.games} games of {args.players} players, budget {args.budget} sec, horizon {args.horizon}, {args.workers} workers, '
+          f'{time.perf_counter() - start:.1f} sec')
+
+if __name__ == '__main__':
+    main()
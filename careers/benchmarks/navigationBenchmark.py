@@ -0,0 +1,98 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Board navigation lookups with the GameBoard navigation tables compared to the linear scans they replace,
+and the latency of movement-heavy turns: each turn a player goes to a border square by name and advances.
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.gameBoard import GameBoard
+from game.gameConstants import BorderSquareType
+from game.consoleOutput import ConsoleOutput
+import argparse, random, statistics, time
+
+def scan_next_border_square(game_board:GameBoard, current_square_number:int, atype:BorderSquareType) -> int:
+    squares = game_board.travel_squares if atype is BorderSquareType.TRAVEL_SQUARE else game_board.opportunity_squares
+    for square in squares:
+        if square.square_type is atype and square.number > current_square_number:
+            return square.number
+    return squares[0].number
+
+def scan_border_square(game_board:GameBoard, name:str, starting_square_number:int) -> int:
+    size = game_board.game_board_size
+    for i in [(i+starting_square_number)%size for i in range(size)]:
+        if game_board.border_squares[i].name.lower() == name.lower():
+            return i
+    return None
+
+def lookups(game_board:GameBoard, n:int):
+    size = game_board.game_board_size
+    names = [square.name for square in game_board.border_squares]
+    types = [BorderSquareType.TRAVEL_SQUARE, BorderSquareType.OPPORTUNITY_SQUARE]
+    rng = random.Random(1)
+    queries = [(rng.randrange(size), types[i % 2], names[rng.randrange(size)]) for i in range(1000)]
+    for square_number, atype, name in queries:      # both must agree
+        assert scan_next_border_square(game_board, square_number, atype) == game_board.next_square_number(square_number, atype)
+        assert scan_border_square(game_board, name, square_number) == game_board.find_square_number(name, square_number)
+    
+    for label, next_square, find_square in [("linear scan", lambda sn, t: scan_next_border_square(game_board, sn, t), lambda name, sn: scan_border_square(game_board, name, sn)),
+                                            ("table", game_board.next_square_number, game_board.find_square_number)]:
+        start = time.perf_counter()
+        for i in range(n):
+            square_number, atype, name = queries[i % 1000]
+            next_square(square_number, atype)
+            find_square(name, square_number)
+        elapsed = time.perf_counter() - start
+        print(f'{label:>12}: {n} next square + find by name lookups in {elapsed:.3f} sec, {elapsed / n * 1e6:.2f} us per pair')
+
+def turns(args, scan:bool):
+    engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+    engine.create(args.edition, 'benchmark', 'points', 100000, 'test', seed=1)
+    for i in range(2):
+        engine.execute_command(f"add player Player_{i} P_{i} p{i} p{i}@example.com 40000 30000 30000", None)
+    engine.execute_command("start", None)
+    game_board = engine.careersGame.game_board
+    if scan:    # replace the table lookups with the linear scans for this run
+        game_board.next_square_number = lambda sn, atype, name=None: scan_next_border_square(game_board, sn, atype)
+        game_board.find_square_number = lambda name, sn=0: scan_border_square(game_board, name, sn)
+    names = [square.name for square in game_board.border_squares if square.square_type is not BorderSquareType.OCCUPATION_ENTRANCE_SQUARE]
+    rng = random.Random(1)
+    latencies = []
+    for _ in range(args.turns):
+        player = engine.game_state.current_player
+        player.clear_pending_actions()
+        start = time.perf_counter()
+        engine.execute_command(f"goto {rng.choice(names)}", player)
+        engine.execute_command(f"advance {rng.randint(2, 12)}", player)
+        engine.execute_command("done", player)
+        latencies.append(time.perf_counter() - start)
+    if scan:
+        del game_board.next_square_number
+        del game_board.find_square_number
+    cleanup(engine)
+    mean = statistics.fmean(latencies) * 1000
+    label = "linear scan" if scan else "table"
+    print(f'{label:>12}: {len(latencies)} movement turns, mean: {mean:.3f} ms')
+
+def cleanup(engine:CareersGameEngine):
+    engine.discard()
+
+def main():
+    parser = argparse.ArgumentParser(description="Board navigation benchmark")
+    parser.add_argument("--n", help="number of lookups", type=int, default=200000)
+    parser.add_argument("--turns", help="number of movement-heavy turns to play", type=int, default=2000)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+    
+    engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+    engine.create(args.edition, 'benchmark', 'points', 100, 'test')
+    lookups(engine.careersGame.game_board, args.n)
+    cleanup(engine)
+    turns(args, True)
+    turns(args, False)
+
+if __name__ == '__main__':
+    main()
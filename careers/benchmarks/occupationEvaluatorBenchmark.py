@@ -0,0 +1,57 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Time to build the OccupationEvaluator payoff distributions of an edition and to query them.
+The expected payoff of each occupation is printed next to its Occupation.points, the total over all its squares.
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+from game.editionTemplate import EditionTemplate
+from game.gameConstants import GameParametersType
+from game.occupationEvaluator import OccupationEvaluator
+from game.successFormula import SuccessFormula
+import argparse, time
+
+def main():
+    parser = argparse.ArgumentParser(description="Occupation evaluator benchmark")
+    parser.add_argument("--n", help="number of queries of each kind", type=int, default=100000)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)     # configures logging
+    template = EditionTemplate.get_template(args.edition, GameParametersType.TEST)     # not part of the timing
+    start = time.perf_counter()
+    evaluator = OccupationEvaluator.get_evaluator(args.edition, GameParametersType.TEST)
+    elapsed = time.perf_counter() - start
+    print(f'evaluator build: {elapsed*1000:.1f} ms, {len(evaluator.occupation_names)} occupations')
+
+    names = evaluator.occupation_names
+    success_formula = SuccessFormula(stars=40, hearts=30, money=30)
+    start = time.perf_counter()
+    for i in range(args.n):
+        payoff = evaluator.payoff(names[i % len(names)])
+        payoff.mean("cash")
+        payoff.risk
+    elapsed = time.perf_counter() - start
+    print(f'payoff queries: {elapsed / args.n * 1e6:.2f} us per query')
+    start = time.perf_counter()
+    for i in range(args.n // 10):
+        evaluator.recommend(success_formula, hearts=i % 30, stars=i % 40)
+    elapsed = time.perf_counter() - start
+    print(f'recommend: {elapsed / (args.n // 10) * 1e6:.2f} us per call')
+
+    print(f'{"occupation":>30}  {"hearts":>13}  {"stars":>13}  {"cash":>17}  {"salary":>17}  {"turns":>5}  {"risk":>5}')
+    for name in names:
+        payoff = evaluator.payoff(name)
+        points = template.occupations[name].points
+        print(f'{name:>30}  {payoff.mean("hearts"):6.2f} ({points["hearts"]:>4})  {payoff.mean("stars"):6.2f} ({points["stars"]:>4})  ' + \
+              f'{payoff.mean("cash"):8.0f} ({1000*points["cash"]:>6})  {payoff.mean("salary"):8.0f} ({1000*points["salary"]:>6})  ' + \
+              f'{payoff.mean("turns"):5.2f}  {payoff.risk:5.3f}')
+    print(f'recommended for {success_formula}: {evaluator.recommend(success_formula)[:3]}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Bytes written and save latency of the server's game saves: the whole game $set on every save,
+compared with only the changes, tracked by the engine's GameSaveTracker and written as targeted $set, $push and $unset.
+An all-computer game of --players players is saved after every turn, to the in-memory storage.
+Bytes are the BSON size of the update sent to the database. Save latency is the time to build and encode the update,
+the client side of the save; the database's time grows with the bytes it's sent.
+Both saved documents are checked to be the same when the game is done.
+'''
+
+from careers.server.storage import MemoryStorage
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+import argparse, bson, statistics, time
+
+def full_update(engine:CareersGameEngine) -> dict:
+    """The update CareersGameManager.writeGame made before partial saves"""
+    careers_game = engine.careersGame
+    return {"$set":{"gameState":careers_game.game_state.to_dict(),
+                    "opportunity_deck":{"next_index":careers_game.opportunities.next_index, "cards_index":careers_game.opportunities.cards_index},
+                    "experience_deck":{"next_index":careers_game.experience_cards.next_index, "cards_index":careers_game.experience_cards.cards_index},
+                    "random":careers_game.random_to_dict()}}
+
+def main():
+    parser = argparse.ArgumentParser(description="Partial save benchmark")
+    parser.add_argument("--players", help="number of computer players", type=int, default=6)
+    parser.add_argument("--turns", help="number of turns, a save after each", type=int, default=200)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    parser.add_argument("--seed", help="random seed", type=int, default=7)
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+    engine.create(args.edition, 'benchmark', 'points', 100000, 'test', seed=args.seed)
+    for i in range(args.players):
+        engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 40000 30000 30000 computer", None)
+    engine.execute_command("start", None)
+    engine.automatic_run = True
+
+    games = MemoryStorage().database["games"]
+    full = {"bytes":[], "ms":[]}
+    partial = {"bytes":[], "ms":[]}
+    games.insert_one({"_id":"full"})
+    games.insert_one({"_id":"partial"})
+    tracker = engine.save_tracker
+    for _ in range(args.turns):
+        player = engine.game_state.current_player
+        engine.execute_command("take_turn", player)
+        engine.execute_command("next", player)
+
+        start = time.perf_counter()
+        update = full_update(engine)
+        size = len(bson.encode(update))
+        full["ms"].append(1000 * (time.perf_counter() - start))
+        full["bytes"].append(size)
+        games.update_one({"_id":"full"}, update)
+
+        start = time.perf_counter()
+        update = tracker.update()
+        size = len(bson.encode(update))
+        tracker.saved()
+        partial["ms"].append(1000 * (time.perf_counter() - start))
+        partial["bytes"].append(size)
+        games.update_one({"_id":"partial"}, update)
+
+    full_game = games.find_one({"_id":"full"})
+    partial_game = games.find_one({"_id":"partial"})
+    for game in [full_game, partial_game]:
+        del game["_id"]
+        del game["gameState"]["elapsed_time"]
+    assert full_game == partial_game, "the saved games differ"
+    for name, result in [("full", full), ("partial", partial)]:
+        print(f'{name:>8}: {sum(result["bytes"]) / 1024:9.1f} KB written, {statistics.mean(result["bytes"]):8.0f} bytes/save, '
+              f'save p50 {statistics.median(result["ms"]):6.3f} ms, mean {statistics.mean(result["ms"]):6.3f} ms')
+    print(f'{args.players} players, {args.turns} turns, {engine.game_state.turns} game turns')
+
+    engine.discard()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Turn latency (take_turn + next) of an all-computer game with write-behind saves and with synchronous saves.
+The game is checkpointed on every change of turn, so the difference is the time a player waits on the disk.
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.commandResult import CommandResult
+from game.gameWriter import GameWriter
+import argparse, statistics, time
+
+def play(args, write_behind:bool):
+    engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+    engine.create(args.edition, 'benchmark', 'points', 1000, 'test', seed=args.seed)
+    for i in range(3):
+        engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 400 300 300 computer", None)
+    engine.execute_command("start", None)
+    engine.automatic_run = True
+    engine.write_behind = write_behind
+    engine.checkpoint_turns = 1
+    
+    latencies = []
+    for _ in range(args.turns):
+        player = engine.game_state.current_player
+        start = time.perf_counter()
+        engine.execute_command("take_turn", player)
+        result = engine.execute_command("next", player)
+        latencies.append(time.perf_counter() - start)
+        if result.return_code == CommandResult.TERMINATE:
+            break
+    engine.discard()
+    
+    latencies.sort()
+    mode = "write-behind" if write_behind else "synchronous "
+    mean = statistics.fmean(latencies) * 1000
+    p50 = latencies[len(latencies)//2] * 1000
+    p99 = latencies[int(0.99 * (len(latencies)-1))] * 1000
+    print(f'{mode}  turns: {len(latencies)}  mean: {mean:.2f} ms  p50: {p50:.2f} ms  p99: {p99:.2f} ms')
+
+def main():
+    parser = argparse.ArgumentParser(description="Game persistence turn latency benchmark")
+    parser.add_argument("--turns", help="number of turns to play", type=int, default=300)
+    parser.add_argument("--seed", help="random seed, both runs play the same game", type=int, default=1)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    args = parser.parse_args()
+    
+    play(args, False)
+    play(args, True)
+    writer = GameWriter.get_writer()
+    print(f'GameWriter  submitted: {writer.submitted}  written: {writer.written}  coalesced: {writer.coalesced}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Latency of done(), the end of a turn, which snapshots the player for the turn history,
+and the time of the snapshot itself, Player.player_info(outputFormat="dict") as update_turn_history calls it.
+An all-computer game of --players players is played for --turns turns with the turn history kept in memory.
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+import argparse, statistics, time
+
+def main():
+    parser = argparse.ArgumentParser(description="Player info and done() latency benchmark")
+    parser.add_argument("--players", help="number of computer players", type=int, default=6)
+    parser.add_argument("--turns", help="number of turns", type=int, default=600)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    parser.add_argument("--seed", help="random seed", type=int, default=7)
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+    engine.history_window = None
+    engine.create(args.edition, 'benchmark', 'points', 100000, 'test', seed=args.seed)
+    for i in range(args.players):
+        engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 40000 30000 30000 computer", None)
+    engine.execute_command("start", None)
+    engine.automatic_run = True
+
+    done_ms = []
+    info_us = []
+    for _ in range(args.turns):
+        player = engine.game_state.current_player
+        engine.execute_command("take_turn", player)
+        start = time.perf_counter()
+        for _ in range(10):
+            player.player_info(include_successFormula=True, outputFormat="dict", include_degrees=True, include_card_values=True)
+        info_us.append(1e6 * (time.perf_counter() - start) / 10)
+        start = time.perf_counter()
+        engine.execute_command("next", player)
+        done_ms.append(1000 * (time.perf_counter() - start))
+
+    print(f'done: p50 {statistics.median(done_ms):6.3f} ms, mean {statistics.mean(done_ms):6.3f} ms, p90 {statistics.quantiles(done_ms, n=10)[-1]:6.3f} ms')
+    print(f'player snapshot: p50 {statistics.median(info_us):6.1f} us, mean {statistics.mean(info_us):6.1f} us')
+    print(f'{args.players} players, {args.turns} turns')
+    engine.discard()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Decisions per second of the GENIUS strategy's PolicyModel, evaluated one game at a time and in micro-batches across games.
+First the model alone: the states of --games games, from --players computer players' point of view, scored one at a time
+and all at once. Then a CareersGameManager serving the games, a client thread per game taking --turns computer turns,
+with each engine's policy_scorer evaluating its own game and with the manager's PolicyBatcher, batching for --delay milliseconds.
+'''
+
+from careers.server.gameManager import CareersGameManager
+from careers.server.policyBatcher import PolicyBatcher
+from careers.server.storage import MemoryStorage
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+from game.gameConstants import GameParametersType, StrategyLevel
+from game.policyModel import PolicyModel
+from threading import Lock, Thread
+import argparse, statistics, time
+
+def create_games(args, manager:CareersGameManager) -> list:
+    engines = []
+    for game_number in range(args.games):
+        engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+        engine.create(args.edition, 'benchmark', 'points', 100, 'prod', seed=args.seed + game_number)
+        for plugin in engine.careersGame.plugins["turn"]:
+            plugin.strategy_level = StrategyLevel.GENIUS
+        for i in range(args.players):
+            engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 40 30 30 computer", None)
+        engine.execute_command("start", None)
+        engine.automatic_run = True
+        manager.serve(engine)
+        manager.games.put(engine.game_id, engine)
+        engines.append(engine)
+    return engines
+
+def model_alone(args, model:PolicyModel):
+    manager = CareersGameManager(storage=MemoryStorage())
+    manager.policyBatcher = None
+    engines = create_games(args, manager)
+    for game_number, engine in enumerate(engines):      # a few turns in, so the games differ
+        for _ in range(game_number % 7 + 1):
+            manager.playComputerTurn(engine)
+    game_states = [engine.game_state for engine in engines for _ in range(args.players)]
+    perspectives = [n for _ in engines for n in range(args.players)]
+    repeat = max(1, 20000 // len(game_states))
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for game_state, perspective in zip(game_states, perspectives):
+            model.evaluate([game_state], [perspective])
+    single = repeat * len(game_states) / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        model.evaluate(game_states, perspectives)
+    batched = repeat * len(game_states) / (time.perf_counter() - start)
+    print(f'model alone: one at a time {single:9.0f} decisions/sec, batches of {len(game_states)} {batched:9.0f} decisions/sec, ' \
+          f'{batched / single:.1f}x')
+    for engine in engines:
+        engine.discard()
+
+def served(args, batched:bool) -> dict:
+    manager = CareersGameManager(storage=MemoryStorage())
+    manager.policyBatcher = PolicyBatcher(maxDelay=args.delay / 1000, maxBatch=args.games) if batched else None
+    engines = create_games(args, manager)
+    lock = Lock()
+    latencies = []
+    for engine in engines:
+        scorer = manager.policyBatcher.scores if batched else lambda model, game_state, number: model.evaluate([game_state], [number])[0]
+        def timed(model, game_state, number, scorer=scorer):
+            start = time.perf_counter()
+            scores = scorer(model, game_state, number)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+            return scores
+        engine.policy_scorer = timed
+
+    def client(engine:CareersGameEngine):
+        for _ in range(args.turns):
+            if manager.takeComputerTurn(engine.game_id) is None:
+                break
+
+    start = time.perf_counter()
+    threads = [Thread(target=client, args=(engine,)) for engine in engines]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    turns = sum([engine.game_state.turns for engine in engines])
+    result = {"mode":"batched" if batched else "per-game", "turns/sec":turns / elapsed, "decisions/sec":len(latencies) / elapsed, \
+              "decisions":len(latencies), "p50 decision ms":1000 * statistics.median(latencies)}
+    if batched:
+        result["mean batch"] = manager.policyBatcher.stats()["meanBatch"]
+    for engine in engines:
+        engine.discard()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched policy inference benchmark")
+    parser.add_argument("--games", help="number of games", type=int, default=32)
+    parser.add_argument("--players", help="number of computer players in a game", type=int, default=3)
+    parser.add_argument("--turns", help="computer turns taken in each game", type=int, default=60)
+    parser.add_argument("--delay", help="the most milliseconds a batch waits for more decisions", type=float, default=2.0)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    parser.add_argument("--seed", help="base random seed", type=int, default=11)
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+    model = PolicyModel.get_model(args.edition, GameParametersType.PROD)
+    if model is None:
+        print(f'{args.edition} has no policy model, fit one with python -m game.policyModel {args.edition}')
+        return
+
+    model_alone(args, model)
+    for batched in [False, True]:
+        result = served(args, batched)
+        print("  ".join([f"{key}: {value:.1f}" if isinstance(value, float) else f"{key}: {value}" for key,value in result.items()]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Strength and decision time of the SMART Careers_All_Strategy, which follows the edition's PolicyTable.
+Each of --games games has --players computer players, one played by SMART and the others by the --opponents strategy level.
+The SMART player's seat rotates from game to game.
+Reports the SMART player's win rate, with the win rate of a player as strong as the others (1 / players) to compare,
+and the time of the SMART player's choice of commands.
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.commandResult import CommandResult
+from game.consoleOutput import ConsoleOutput
+from game.gameConstants import StrategyLevel
+from game.plugins.careers_All_Strategy import Careers_All_Strategy
+from game.policyTable import PolicyTable
+import argparse, math, statistics, time
+
+class TimedStrategy(Careers_All_Strategy):
+    """The SMART Careers_All_Strategy, keeping the time of each of its choices
+    """
+    def __init__(self, thegame, level:str="smart"):
+        super().__init__(thegame, level)
+        self.decision_us = []
+
+    def smart_strategy(self, player, can_enter) ->str:
+        start = time.perf_counter()
+        commands = super().smart_strategy(player, can_enter)
+        self.decision_us.append(1e6 * (time.perf_counter() - start))
+        return commands
+
+def play(args, game_number:int):
+    """Plays one game. Returns the winning player number (-1 if not won in --max_turns), the SMART player's seat
+        and the time of each of the SMART player's choices of a move
+    """
+    seat = game_number % args.players
+    engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+    engine.create(args.edition, 'benchmark', 'points', args.points, 'test', seed=args.seed + game_number)
+    careers_game = engine.careersGame
+    for plugin in careers_game.plugins["turn"]:
+        plugin.strategy_level = StrategyLevel[args.opponents.upper()]
+    smart = TimedStrategy(careers_game)
+    smart.configure({"players":[seat]})
+    careers_game.plugins["turn"].append(smart)
+    goal = args.points // 3
+    for i in range(args.players):
+        engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com {goal} {goal} {args.points - 2*goal} computer", None)
+    engine.execute_command("start", None)
+    engine.automatic_run = True
+
+    game_state = engine.game_state
+    while game_state.turns < args.max_turns:
+        player = game_state.current_player
+        cmd_result = engine.execute_command("take_turn", player)
+        if cmd_result.return_code != CommandResult.TERMINATE:
+            cmd_result = engine.execute_command("next", player)
+        if cmd_result.return_code == CommandResult.TERMINATE:
+            break
+    winner = game_state.winning_player.number if game_state.game_complete else -1
+    engine.discard()
+    return winner, seat, smart.decision_us
+
+def main():
+    parser = argparse.ArgumentParser(description="Policy table strategy win rate and decision time benchmark")
+    parser.add_argument("--games", help="number of games", type=int, default=200)
+    parser.add_argument("--players", help="number of computer players", type=int, default=3)
+    parser.add_argument("--points", help="success formula total points", type=int, default=60)
+    parser.add_argument("--opponents", help="the strategy level of the other players", type=str, default="dumb")
+    parser.add_argument("--max_turns", help="a game not won after this many turns is not counted", type=int, default=600)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    parser.add_argument("--seed", help="base random seed", type=int, default=100)
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    start = time.perf_counter()
+    if PolicyTable.get_policy(args.edition) is None:
+        print(f'{args.edition} has no policy table, solve it with python -m game.policyTable {args.edition}')
+        return
+    print(f'policy table loaded in {1000 * (time.perf_counter() - start):.1f} ms')
+    wins = 0
+    completed = 0
+    decision_us = []
+    start = time.perf_counter()
+    for game_number in range(args.games):
+        winner, seat, game_decision_us = play(args, game_number)
+        if winner >= 0:
+            completed += 1
+            wins += winner == seat
+        decision_us += game_decision_us
+
+    rate = wins / completed if completed > 0 else 0.0
+    error = math.sqrt(rate * (1 - rate) / completed) if completed > 0 else 0.0
+    print(f'SMART win rate: {rate:.3f} +/- {1.96 * error:.3f} over {completed} completed games, {1 / args.players:.3f} for an even player')
+    print(f'SMART decision: p50 {statistics.median(decision_us):6.1f} us, p90 {statistics.quantiles(decision_us, n=10)[-1]:6.1f} us, '
+          f'max {max(decision_us):6.1f} us')
+    print(f'{args.games} games of {args.players} players, {args.opponents} opponents, {time.perf_counter() - start:.1f} sec')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Turn latency and recovery time of an all-computer game for a range of checkpoint intervals.
+Every command is appended to the game's CommandLog and the game is checkpointed every checkpoint_turns turns.
+Checkpoints are written synchronously here, so the turn latency includes the disk.
+Recovery loads the latest checkpoint and replays the logged commands after it. For comparison,
+restore_game() loads the same game saved in JSON format.
+'''
+
+from game.careersGame import restore_game
+from game.careersGameEngine import CareersGameEngine
+from game.commandResult import CommandResult
+from game.consoleOutput import ConsoleOutput
+import argparse, pickle, statistics, time
+
+def play(args, checkpoint_turns:int) -> CareersGameEngine:
+    engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+    engine.create(args.edition, 'benchmark', 'points', 1000, 'test', seed=args.seed)
+    engine.write_behind = False
+    engine.checkpoint_turns = checkpoint_turns
+    for i in range(3):
+        engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 400 300 300 computer", None)
+    engine.execute_command("start", None)
+    engine.automatic_run = True
+    
+    latencies = []
+    for _ in range(args.turns):
+        player = engine.game_state.current_player
+        start = time.perf_counter()
+        engine.execute_command("take_turn", player)
+        result = engine.execute_command("next", player)
+        latencies.append(time.perf_counter() - start)
+        if result.return_code == CommandResult.TERMINATE:
+            break
+    engine.flush_saves()
+    mean = statistics.fmean(latencies) * 1000
+    print(f'checkpoint_turns: {checkpoint_turns:3d}  turns: {len(latencies)}  mean turn: {mean:.2f} ms', end='')
+    return engine
+
+def recover(args, engine:CareersGameEngine):
+    with open(f'{engine.game_filename_base}.pkl', "rb") as fp:
+        checkpoint_sequence = pickle.load(fp).command_sequence
+    start = time.perf_counter()
+    recovered = CareersGameEngine.recover(engine.game_id, 'error', 'benchmark', headless=True)
+    elapsed = time.perf_counter() - start
+    replayed = recovered.careersGame.command_sequence - checkpoint_sequence
+    print(f'  recover: {elapsed*1000:.1f} ms ({replayed} commands replayed)')
+    return recovered
+
+def restore_json(engine:CareersGameEngine):
+    engine.save('json')
+    start = time.perf_counter()
+    restore_game(engine.game_id)
+    elapsed = time.perf_counter() - start
+    print(f'restore_game from JSON: {elapsed*1000:.1f} ms')
+
+def cleanup(engine:CareersGameEngine):
+    engine.discard()
+
+def main():
+    parser = argparse.ArgumentParser(description="Command log and checkpoint benchmark")
+    parser.add_argument("--turns", help="number of turns to play", type=int, default=325)
+    parser.add_argument("--seed", help="random seed, every run plays the same game", type=int, default=1)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    parser.add_argument("--checkpoints", help="checkpoint intervals (turns) to compare", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+    
+    for checkpoint_turns in args.checkpoints:
+        engine = play(args, checkpoint_turns)
+        recovered = recover(args, engine)
+        if checkpoint_turns == args.checkpoints[-1]:
+            restore_json(engine)
+        cleanup(engine)
+
+if __name__ == '__main__':
+    main()
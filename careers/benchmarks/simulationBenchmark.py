@@ -0,0 +1,36 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Simulated games per second with one worker process and with --workers processes, and the resulting speedup.
+'''
+
+from game.gameSimulator import GameSimulator
+import argparse, os, time
+
+def rate(args, workers:int) -> float:
+    simulator = GameSimulator(args.edition, nplayers=args.players, total_points=args.points, max_turns=args.maxturns, workers=workers, seed=args.seed)
+    start = time.perf_counter()
+    summary = simulator.simulate(args.games)
+    elapsed = time.perf_counter() - start
+    print(f'workers: {workers}  games: {summary["games"]}  completed: {summary["completed"]}  {args.games/elapsed:,.2f} games/sec')
+    return args.games / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation benchmark")
+    parser.add_argument("--games", help="number of games to play", type=int, default=16)
+    parser.add_argument("--workers", help="number of worker processes", type=int, default=os.cpu_count())
+    parser.add_argument("--players", help="computer players per game", type=int, default=2)
+    parser.add_argument("--points", help="success formula total points", type=int, default=40)
+    parser.add_argument("--maxturns", help="maximum turns per game", type=int, default=200)
+    parser.add_argument("--seed", help="base random seed", type=int, default=1)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    args = parser.parse_args()
+    
+    single = rate(args, 1)
+    multi = rate(args, args.workers)
+    print(f'speedup: {multi/single:.2f}x with {args.workers} workers')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Time of CareersGame.snapshot() and restore(), which copy only a game's mutable state, compared with the copies
+of the whole game a lookahead had to make before: a pickle round trip and copy.deepcopy.
+An all-computer game of --players players is played for --turns turns and each copy is timed after every turn.
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+import argparse, copy, pickle, statistics, time
+
+def main():
+    parser = argparse.ArgumentParser(description="Game snapshot and restore benchmark")
+    parser.add_argument("--players", help="number of computer players", type=int, default=6)
+    parser.add_argument("--turns", help="number of turns", type=int, default=300)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    parser.add_argument("--seed", help="random seed", type=int, default=7)
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+    engine.scratch = True
+    engine.create(args.edition, 'benchmark', 'points', 100000, 'test', seed=args.seed)
+    for i in range(args.players):
+        engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 40000 30000 30000 computer", None)
+    engine.execute_command("start", None)
+    engine.automatic_run = True
+    careers_game = engine.careersGame
+
+    snapshot_us = []
+    restore_us = []
+    pickle_us = []
+    deepcopy_us = []
+    for _ in range(args.turns):
+        player = engine.game_state.current_player
+        engine.execute_command("take_turn", player)
+        engine.execute_command("next", player)
+        start = time.perf_counter()
+        token = careers_game.snapshot()
+        snapshot_us.append(1e6 * (time.perf_counter() - start))
+        start = time.perf_counter()
+        careers_game.restore(token)
+        restore_us.append(1e6 * (time.perf_counter() - start))
+        start = time.perf_counter()
+        pickle.loads(pickle.dumps(careers_game, protocol=pickle.HIGHEST_PROTOCOL))
+        pickle_us.append(1e6 * (time.perf_counter() - start))
+        start = time.perf_counter()
+        copy.deepcopy(careers_game)
+        deepcopy_us.append(1e6 * (time.perf_counter() - start))
+
+    total_us = [snapshot + restore for snapshot, restore in zip(snapshot_us, restore_us)]
+    for name, times in [("snapshot", snapshot_us), ("restore", restore_us), ("snapshot + restore", total_us), \
+                        ("pickle round trip", pickle_us), ("copy.deepcopy", deepcopy_us)]:
+        print(f'{name:>18}: p50 {statistics.median(times):9.1f} us, mean {statistics.mean(times):9.1f} us, max {max(times):9.1f} us')
+    print(f'{args.players} players, {args.turns} turns')
+    engine.discard()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Time of StateEncoder.encode_batch() for a batch of --batch games and for one game at a time,
+compared with reading the same players through Player.player_info(outputFormat="dict"), the per-field dict
+a feature vector had to be built from before. The games are --games all-computer games of --players players,
+each stopped after a different number of turns, repeated to fill the batch.
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+from game.stateEncoder import StateEncoder
+import argparse, time
+
+def main():
+    parser = argparse.ArgumentParser(description="Game state encoder benchmark")
+    parser.add_argument("--games", help="number of games", type=int, default=16)
+    parser.add_argument("--players", help="number of computer players", type=int, default=4)
+    parser.add_argument("--batch", help="number of games in a batch", type=int, default=4096)
+    parser.add_argument("--repeat", help="number of times each batch is timed", type=int, default=10)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    parser.add_argument("--seed", help="base random seed", type=int, default=7)
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    engines = []
+    for game_number in range(args.games):
+        engine = CareersGameEngine(loglevel='error', installationId='benchmark', edition=args.edition, headless=True)
+        engine.create(args.edition, 'benchmark', 'points', 100000, 'test', seed=args.seed + game_number)
+        for i in range(args.players):
+            engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 40000 30000 30000 computer", None)
+        engine.execute_command("start", None)
+        engine.automatic_run = True
+        for _ in range(10 * game_number):
+            player = engine.game_state.current_player
+            engine.execute_command("take_turn", player)
+            engine.execute_command("next", player)
+        engines.append(engine)
+    game_states = [engines[n % args.games].game_state for n in range(args.batch)]
+
+    encoder = StateEncoder(args.edition, max_players=6)
+    encoder.encode_batch(game_states)
+    sample = game_states[:1000]
+    batch_us = []
+    single_us = []
+    info_us = []
+    for _ in range(args.repeat):        # interleaved, the fastest of each is reported
+        start = time.perf_counter()
+        encoder.encode_batch(game_states)
+        batch_us.append(1e6 * (time.perf_counter() - start) / len(game_states))
+        start = time.perf_counter()
+        for game_state in sample:
+            encoder.encode(game_state)
+        single_us.append(1e6 * (time.perf_counter() - start) / len(sample))
+        start = time.perf_counter()
+        for game_state in sample:
+            for player in game_state.players:
+                player.player_info(include_successFormula=True, outputFormat="dict", include_degrees=True, include_card_values=True)
+        info_us.append(1e6 * (time.perf_counter() - start) / len(sample))
+
+    print(f'encode_batch: {min(batch_us):6.2f} us per game, in batches of {args.batch}')
+    print(f'      encode: {min(single_us):6.2f} us per game, one at a time, batching is {min(single_us) / min(batch_us):.1f}x faster')
+    print(f' player_info: {min(info_us):6.2f} us per game, the dicts alone')
+    print(f'{encoder.width} features, {args.games} games of {args.players} players')
+    for engine in engines:
+        engine.discard()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Requests per second of the server's game lookup on the sync path (a def endpoint on the threadpool,
+blocking storage calls) and on the async path (the async def endpoint, awaited storage calls),
+under a concurrent load generator.
+The app runs in uvicorn on the in-memory storage, with --latency milliseconds per storage call
+standing in for the database round trip.
+'''
+
+from datetime import datetime
+from threading import Thread
+import argparse, asyncio, os, socket, time
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+async def client(port:int, paths:list, deadline:float, counts:list, index:int):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    n = 0
+    while time.monotonic() < deadline:
+        path = paths[n % len(paths)]
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        headers = await reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in headers.decode().split("\r\n"):
+            if line.lower().startswith("content-length:"):
+                length = int(line.split(":")[1])
+        await reader.readexactly(length)
+        if not headers.startswith(b"HTTP/1.1 200"):
+            raise Exception(headers.decode())
+        n += 1
+    counts[index] = n
+    writer.close()
+
+async def load(port:int, paths:list, connections:int, seconds:float) -> float:
+    counts = [0] * connections
+    deadline = time.monotonic() + seconds
+    start = time.monotonic()
+    await asyncio.gather(*[client(port, paths, deadline, counts, i) for i in range(connections)])
+    return sum(counts) / (time.monotonic() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync and async storage path benchmark")
+    parser.add_argument("--connections", help="concurrent client connections", type=int, default=100)
+    parser.add_argument("--seconds", help="seconds per run", type=float, default=5)
+    parser.add_argument("--latency", help="storage latency, milliseconds", type=float, default=5)
+    parser.add_argument("--games", help="number of games", type=int, default=100)
+    args = parser.parse_args()
+
+    os.environ["DB_URL"] = "memory://"
+    os.environ["DB_MEMORY_LATENCY_MS"] = str(args.latency)
+    import uvicorn
+    import app      # the server app, on the in-memory storage
+
+    @app.app.get('/benchmark/sync/game/{gameId}')
+    def getGameSync(gameId: str):
+        return app.manager.getGameById(gameId)
+
+    games = app.manager.database["games"]
+    for n in range(args.games):
+        games.insert_one({"_id": f"game{n}", "players": [f"user{n}"], "joinCode": f"code{n}", "createdDate": str(datetime.now())})
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app.app, host="127.0.0.1", port=port, log_level="error"))
+    thread = Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    for name, prefix in [("sync", "/benchmark/sync/game/"), ("async", "/game/")]:
+        paths = [f"{prefix}game{n}" for n in range(args.games)]
+        rps = asyncio.run(load(port, paths, args.connections, args.seconds))
+        print(f"{name:>5} path: {rps:8.1f} requests/sec, {args.connections} connections, {args.latency} ms storage latency")
+    server.should_exit = True
+    thread.join()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+
+Memory and export cost of the columnar TurnHistory, compared with a List of Turn objects, the layout it replaced.
+The turns are the recorded turns of --games simulated games, written to a TurnDataset and read back memory-mapped,
+repeated to --turns turns. Reports the bytes per turn, the time to export every turn as NumPy arrays,
+and the time to recompute every outcome with other turn outcome parameters.
+'''
+
+from game.editionTemplate import EditionTemplate
+from game.gameConstants import GameParametersType
+from game.gameSimulator import GameSimulator
+from game.turnDataset import TurnDataset
+from game.turnHistory import Turn, TurnHistory
+import argparse, logging, shutil, tempfile, time, tracemalloc
+import numpy as np
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar TurnHistory benchmark")
+    parser.add_argument("--games", help="number of simulated games to record", type=int, default=8)
+    parser.add_argument("--turns", help="number of turns in the history", type=int, default=200000)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    parser.add_argument("--seed", help="base random seed", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.ERROR)
+
+    folder = tempfile.mkdtemp()
+    start = time.perf_counter()
+    simulator = GameSimulator(args.edition, nplayers=3, total_points=60, max_turns=300, workers=1, seed=args.seed, turns_folder=folder)
+    simulator.simulate(args.games)
+    dataset = TurnDataset(folder)
+    print(f'recorded {len(dataset)} turns of {args.games} games in {time.perf_counter() - start:.2f} sec')
+    recorded = dataset.arrays()
+    repeat = np.arange(args.turns) % len(dataset)
+    columns = {name:np.asarray(recorded[name])[repeat] for name in TurnHistory.COLUMNS}
+    parameters = EditionTemplate.get_template(args.edition, GameParametersType.TEST).turn_outcome_parameters
+
+    tracemalloc.start()
+    turns = [Turn(*[int(columns[name][i]) for name in TurnHistory.COLUMNS[:2]], [], *[int(columns[name][i]) for name in TurnHistory.COLUMNS[2:]]) \
+             for i in range(args.turns)]
+    list_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tracemalloc.start()
+    history = TurnHistory(0, parameters)
+    for turn in turns:
+        history.add_turn(turn)
+    columnar_bytes = tracemalloc.get_traced_memory()[0]      # the columns, and a list of the turns' commands lists
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    exported = {name:np.array([getattr(turn, name) for turn in turns], dtype=np.int32) for name in TurnHistory.COLUMNS}
+    list_export = time.perf_counter() - start
+    start = time.perf_counter()
+    arrays = history.to_numpy()
+    columnar_export = time.perf_counter() - start
+    assert all([(arrays[name] == exported[name]).all() for name in TurnHistory.COLUMNS])
+
+    weights = {key:2 * weight for key, weight in parameters.items()}
+    column_index = TurnHistory.column_index()
+    start = time.perf_counter()
+    list_outcomes = [sum([int(weight * getattr(turn, TurnHistory.COLUMNS[column_index[key]])) for key, weight in weights.items() if key in column_index]) \
+                     for turn in turns]
+    list_outcome = time.perf_counter() - start
+    start = time.perf_counter()
+    outcomes = history.outcomes(weights)
+    columnar_outcome = time.perf_counter() - start
+    assert (outcomes == np.array(list_outcomes)).all()
+
+    for name, nbytes, export, outcome in [("list", list_bytes, list_export, list_outcome), ("columnar", columnar_bytes, columnar_export, columnar_outcome)]:
+        print(f'{name:>9}: {nbytes / args.turns:7.1f} bytes/turn, export {1000 * export:9.3f} ms, outcomes {1000 * outcome:9.3f} ms')
+    print(f'{args.turns} turns')
+    shutil.rmtree(folder)
+
+if __name__ == '__main__':
+    main()
@@ -13,8 +13,13 @@ __all__ = [
     'careersGame',
     'careersGameEngine',
     'gameEngineCommands',
+    'boardAnalytics',
     'careersObject',
+    'commandLog',
+    'commandRegistry',
     'commandResult',
+    'consoleOutput',
+    'editionTemplate',
     'experienceCard',
     'experienceCardDeck',
     'experienceCardType',
@@ -22,19 +27,30 @@ __all__ = [
     'gameConstants',
     'gameParameters',
     'gamePlayer',
+    'gameSimulator',
     'gameSquare',
     'gameState',
+    'gameStore',
     'gameUtils',
+    'gameWriter',
     'logger',
     'occupation',
+    'occupationEvaluator',
     'occupationSquare',
     'opportunityCard',
     'opportunityCardDeck',
     'pendingAction',
     'pendingActions',
     'player',
+    'policyModel',
+    'policyTable',
+    'saveTracker',
     'specialProcessing',
-    'successFormula'
+    'stateEncoder',
+    'successFormula',
+    'tournament',
+    'turnDataset',
+    'turnHistory'
 ]
 
 from .actionType import ActionType
@@ -43,19 +59,32 @@ from .borderSquare import BorderSquare, BorderSquareType
 from .gameSquare import GameSquare, GameSquareClass
 from .gameState import GameState
 from .gameBoard import GameBoard
+from .boardAnalytics import BoardAnalytics
 from .occupation import Occupation
+from .occupationEvaluator import OccupationEvaluator, OccupationPayoff
+from .policyTable import PolicyTable
+from .policyModel import PolicyModel
 from .occupationSquare import OccupationSquare, OccupationSquareType
 from .careersObject import CareersObject
 from .cardDeck import CardDeck
+from .editionTemplate import EditionTemplate
 from .careersGame import CareersGame
 from .careersGameEngine import CareersGameEngine
 from .gameEngineCommands import GameEngineCommands
 from .gameParameters import GameParameters
+from .gameSimulator import GameSimulator, GameResult
+from .tournament import Tournament, Entrant, MatchResult
 from .gameRunner import GameRunner
 from .gameUtils import GameUtils
+from .gameWriter import GameWriter
+from .gameStore import GameStore, MemoryGameStore, FileGameStore, SQLiteGameStore
 from .logger import Logger
 from .player import Player
+from .saveTracker import SaveTracker, GameSaveTracker
 from .successFormula import SuccessFormula
+from .turnHistory import TurnHistory, Turn
+from .turnDataset import TurnDataset
+from .stateEncoder import StateEncoder
 from .opportunityCard import OpportunityCard, OpportunityType, OpportunityActionType
 from .opportunityCardDeck import OpportunityCardDeck
 from .experienceCard import ExperienceCard
@@ -66,4 +95,6 @@ from .pendingAction import PendingAction
 from .pendingActions import PendingActions
 from .gameConstants import  PendingActionType
 from .commandResult import CommandResult
+from .consoleOutput import ConsoleOutput
+from .commandLog import CommandLog
 
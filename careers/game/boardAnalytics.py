@@ -0,0 +1,301 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from game.editionTemplate import EditionTemplate
+from game.gameBoard import GameBoard
+from game.gameConstants import BorderSquareType, GameParametersType, OccupationSquareType, SpecialProcessingType
+from game.occupation import Occupation
+
+from threading import Lock
+from typing import Dict, List, Tuple
+import numpy as np
+
+class BoardAnalytics(object):
+    """A Markov chain model of a player's position at the end of each turn, for an edition's game board.
+        The states are the border squares and, for each occupation, the occupation's squares
+        plus its entrance (occupation square number -1, entered but not yet rolled in).
+        The transition matrix follows the movement rules of the game engine:
+            2 dice on the border and 1 die in an occupation
+            Hospital and Unemployment: a player who lands there stays until the roll is in must_roll (or doubles if required)
+            Holiday: a player whose roll is in must_roll stays with stay_probability
+            travel squares: a player who lands on one travels to one of its destinations with travel_probability
+            occupation entrance squares: a player who lands on one enters the occupation with enter_probability
+            occupation squares: goto, shortcut, travel_border (to Hospital or Unemployment for example),
+                cash_loss_and_unemployment and wormholes
+        Opportunity and Experience cards, extra turns and lost turns are not modelled.
+        A player with a cash_loss_or_unemployment choice is assumed to pay.
+
+        The stationary distribution, the landing distribution of the first few turns from Payday
+        and the expected number of turns to reach each occupation are solved with NumPy when the model is built.
+        Models are cached per edition and policy, use BoardAnalytics.get_analytics().
+        Arguments:
+            template - the EditionTemplate of the edition
+            enter_probability - the probability a player enters an occupation when landing on its entrance square
+            travel_probability - the probability a player travels when landing on a travel square
+            stay_probability - the probability a player stays on Holiday when the roll allows it
+            take_shortcuts - if True a player always takes an occupation shortcut
+            max_turns - the number of turns from Payday for which landing distributions are kept
+    """
+    _analytics:Dict[Tuple, 'BoardAnalytics'] = {}
+    _lock = Lock()
+
+    def __init__(self, template:EditionTemplate, enter_probability:float=0.5, travel_probability:float=0.5, \
+                 stay_probability:float=0.5, take_shortcuts:bool=True, max_turns:int=50):
+        self._edition_name = template.edition_name
+        self._game_board:GameBoard = template.game_board
+        #
+        # template occupations are also keyed by lower case and alternate names, and an occupation without a JSON file is None
+        #
+        self._occupation_aliases:Dict[str, str] = {alias : occupation.name for alias,occupation in template.occupations.items() if occupation is not None}
+        self._occupations:Dict[str, Occupation] = {occupation.name : occupation for occupation in template.occupations.values() if occupation is not None}
+        self._enter_probability = enter_probability
+        self._travel_probability = travel_probability
+        self._stay_probability = stay_probability
+        self._take_shortcuts = take_shortcuts
+        self._max_turns = max_turns
+        #
+        # state numbering: border squares 0..size-1, then each occupation's entrance (-1) and squares 0..size-1
+        #
+        self._board_size = self._game_board.game_board_size
+        self._occupation_offsets:Dict[str, int] = {}
+        nstates = self._board_size
+        for name,occupation in self._occupations.items():
+            self._occupation_offsets[name] = nstates + 1        # the state of occupation square 0
+            nstates += occupation.size + 1
+        self._nstates = nstates
+        self._wormholes = [(name, square.number) for name,occupation in self._occupations.items() \
+                           for square in occupation.occupationSquares if square.square_type is OccupationSquareType.DANGER_WORMHOLE_SQUARE]
+        self._unemployment_square_number = self._game_board.next_square_number(-1, BorderSquareType.UNEMPLOYMENT_SQUARE)
+
+        self._transitions = self._build_transitions()
+        self._stationary = self._solve_stationary()
+        self._name_frequencies:Dict[str, float] = {}     # lower case border square name -> total frequency of the squares with that name
+        for square in self._game_board.border_squares:
+            name = square.name.lower()
+            self._name_frequencies[name] = self._name_frequencies.get(name, 0.0) + float(self._stationary[square.number])
+        self._landing = self._solve_landing()
+        self._occupation_turns = self._solve_occupation_turns()
+        self._square_turns:Dict[int, np.ndarray] = {}      # expected turns to reach a border square, solved on demand
+
+    @staticmethod
+    def get_analytics(edition_name:str, game_parameters_type:GameParametersType=GameParametersType.PROD, **policy) -> 'BoardAnalytics':
+        """Gets the BoardAnalytics of an edition for a player policy, building it on first use.
+            Arguments:
+                edition_name - the edition name, for example "Professions-Hi-Tech_v3"
+                game_parameters_type - a GameParametersType
+                policy - keyword arguments for the BoardAnalytics constructor:
+                    enter_probability, travel_probability, stay_probability, take_shortcuts, max_turns
+        """
+        key = (edition_name, game_parameters_type, tuple(sorted(policy.items())))
+        analytics = BoardAnalytics._analytics.get(key)
+        if analytics is None:
+            with BoardAnalytics._lock:
+                analytics = BoardAnalytics._analytics.get(key)
+                if analytics is None:
+                    analytics = BoardAnalytics(EditionTemplate.get_template(edition_name, game_parameters_type), **policy)
+                    BoardAnalytics._analytics[key] = analytics
+        return analytics
+
+    @property
+    def edition_name(self) -> str:
+        return self._edition_name
+
+    @property
+    def number_of_states(self) -> int:
+        return self._nstates
+
+    @property
+    def transitions(self) -> np.ndarray:
+        """The (number_of_states, number_of_states) turn transition matrix. Rows sum to 1.
+        """
+        return self._transitions
+
+    @property
+    def stationary(self) -> np.ndarray:
+        """The long-run fraction of turns that end in each state
+        """
+        return self._stationary
+
+    def state(self, square_number:int, occupation_name:str=None) -> int:
+        """The state number of a border square, or of an occupation square if occupation_name is given.
+            Occupation square number -1 is the occupation's entrance.
+        """
+        if occupation_name is None:
+            return square_number
+        return self._occupation_offsets[self._occupation_aliases[occupation_name]] + square_number
+
+    def square_frequencies(self) -> np.ndarray:
+        """The long-run fraction of turns that end on each border square, indexed by square number
+        """
+        return self._stationary[:self._board_size]
+
+    def square_frequency(self, square_ref:int|str) -> float:
+        """The long-run fraction of turns that end on a border square, given by number or name (not case sensitive).
+            For a name shared by several squares, for example "Opportunity", this is the total over those squares.
+        """
+        if isinstance(square_ref, int):
+            return float(self._stationary[square_ref])
+        return self._name_frequencies.get(square_ref.lower(), 0.0)
+
+    def occupation_frequency(self, occupation_name:str) -> float:
+        """The long-run fraction of turns that end in an occupation, including its entrance
+        """
+        occupation = self._occupations[self._occupation_aliases[occupation_name]]
+        start = self.state(-1, occupation.name)
+        return float(self._stationary[start : start + occupation.size + 1].sum())
+
+    def landing_distribution(self, turns:int, square_number:int=0) -> np.ndarray:
+        """The distribution over states at the end of a given number of turns from a border square.
+            Distributions from Payday (square 0) for up to max_turns turns are precomputed.
+        """
+        if square_number == 0 and turns <= self._max_turns:
+            return self._landing[turns]
+        distribution = np.zeros(self._nstates)
+        distribution[square_number] = 1.0
+        for _ in range(turns):
+            distribution = distribution @ self._transitions
+        return distribution
+
+    def expected_turns_to_occupation(self, occupation_name:str, square_number:int=0) -> float:
+        """The expected number of turns from a border square until the player lands on the entrance square of an occupation
+            (or is in the occupation, having arrived there some other way)
+        """
+        return float(self._occupation_turns[self._occupation_aliases[occupation_name]][square_number])
+
+    def expected_turns_to_square(self, square_number:int, start:int=0) -> float:
+        """The expected number of turns from a border square until a turn ends on border square square_number
+        """
+        turns = self._square_turns.get(square_number)
+        if turns is None:
+            turns = self._first_passage([square_number])
+            self._square_turns[square_number] = turns
+        return float(turns[start])
+
+    #
+    # building the transition matrix
+    #
+    def _build_transitions(self) -> np.ndarray:
+        transitions = np.zeros((self._nstates, self._nstates))
+        two_dice = [(d1, d2) for d1 in range(1, 7) for d2 in range(1, 7)]
+        for square in self._game_board.border_squares:
+            row = transitions[square.number]
+            sp = square.special_processing
+            sp_type = None if sp is None else sp.processing_type
+            for d1,d2 in two_dice:
+                roll = d1 + d2
+                if sp_type in (SpecialProcessingType.HOSPITAL, SpecialProcessingType.UNEMPLOYMENT) \
+                  and not (roll in sp.must_roll or (sp.require_doubles and d1 == d2)):
+                    row[square.number] += 1/36      # laid up
+                elif sp_type is SpecialProcessingType.HOLIDAY and roll in sp.must_roll:
+                    row[square.number] += self._stay_probability / 36
+                    self._land_border((square.number + roll) % self._board_size, (1 - self._stay_probability) / 36, row)
+                else:
+                    self._land_border((square.number + roll) % self._board_size, 1/36, row)
+
+        for name,occupation in self._occupations.items():
+            for square_number in range(-1, occupation.size):
+                row = transitions[self.state(square_number, name)]
+                start = square_number
+                if square_number >= 0:
+                    sp = occupation.occupationSquares[square_number].special_processing
+                    if sp is not None and isinstance(sp.next_square, int):     # the engine moves from next_square - 1
+                        start = sp.next_square - 1
+                for die in range(1, 7):
+                    self._land_occupation(occupation, start + die, 1/6, row)
+        return transitions
+
+    def _land_border(self, square_number:int, probability:float, row:np.ndarray):
+        """Adds the probability of ending the turn in each state after landing on a border square to row
+        """
+        square = self._game_board.get_square(square_number)
+        sp = square.special_processing
+        if square.square_type is BorderSquareType.TRAVEL_SQUARE and sp is not None and self._travel_probability > 0:
+            if sp.processing_type is SpecialProcessingType.TRAVEL_BORDER:
+                destinations = [sp.next_square]
+            else:   # travel_choice, negative square numbers are backwards travel
+                destinations = [abs(d) for d in sp.destination_squares]
+            for destination in destinations:        # arriving by travel doesn't travel again
+                row[destination] += probability * self._travel_probability / len(destinations)
+            row[square_number] += probability * (1 - self._travel_probability)
+        elif square.square_type is BorderSquareType.OCCUPATION_ENTRANCE_SQUARE and square.name in self._occupation_offsets:
+            row[self.state(-1, square.name)] += probability * self._enter_probability
+            row[square_number] += probability * (1 - self._enter_probability)
+        else:
+            row[square_number] += probability
+
+    def _land_occupation(self, occupation:Occupation, square_number:int, probability:float, row:np.ndarray, depth:int=0):
+        """Adds the probability of ending the turn in each state after moving to an occupation square to row
+        """
+        if square_number >= occupation.size:    # exit the occupation
+            self._land_border((square_number - occupation.size + occupation.exit_square_number) % self._board_size, probability, row)
+            return
+        square = occupation.occupationSquares[square_number]
+        sp = square.special_processing
+        sp_type = None if sp is None else sp.processing_type
+        if depth > occupation.size:     # a loop of goto squares, stop here
+            sp_type = None
+        match(sp_type):
+            case SpecialProcessingType.GOTO:
+                self._land_occupation(occupation, sp.next_square, probability, row, depth+1)
+            case SpecialProcessingType.SHORTCUT if self._take_shortcuts:
+                self._land_occupation(occupation, sp.next_square, probability, row, depth+1)
+            case SpecialProcessingType.TRAVEL_BORDER:
+                destination = self._game_board.find_square_number(sp.next_square)
+                self._land_border(destination, probability, row)
+            case SpecialProcessingType.CASH_LOSS_AND_UNEMPLOYMENT if self._unemployment_square_number is not None:
+                row[self._unemployment_square_number] += probability
+            case SpecialProcessingType.WORMHOLE if len(self._wormholes) > 0:
+                for name,number in self._wormholes:     # arriving by wormhole doesn't travel again
+                    if name == occupation.name:         # picking this occupation's wormhole goes nowhere
+                        number = square_number
+                    row[self.state(number, name)] += probability / len(self._wormholes)
+            case _:
+                row[self.state(square_number, occupation.name)] += probability
+
+    #
+    # solving
+    #
+    def _solve_stationary(self) -> np.ndarray:
+        """Solves pi P = pi, sum(pi) = 1 as a least squares problem
+        """
+        a = np.vstack([self._transitions.T - np.eye(self._nstates), np.ones(self._nstates)])
+        b = np.zeros(self._nstates + 1)
+        b[-1] = 1.0
+        stationary = np.linalg.lstsq(a, b, rcond=None)[0]
+        stationary = np.clip(stationary, 0.0, None)
+        return stationary / stationary.sum()
+
+    def _solve_landing(self) -> np.ndarray:
+        landing = np.zeros((self._max_turns + 1, self._nstates))
+        landing[0, 0] = 1.0
+        for turn in range(1, self._max_turns + 1):
+            landing[turn] = landing[turn-1] @ self._transitions
+        return landing
+
+    def _first_passage(self, targets:List[int]) -> np.ndarray:
+        """The expected number of turns from each state to reach any of the target states, 0 for a target.
+            States that can't reach a target have an expected number of turns of inf.
+        """
+        others = np.setdiff1d(np.arange(self._nstates), targets)
+        q = self._transitions[np.ix_(others, others)]
+        turns = np.zeros(self._nstates)
+        try:
+            turns[others] = np.linalg.solve(np.eye(len(others)) - q, np.ones(len(others)))
+        except np.linalg.LinAlgError:
+            turns[others] = np.inf
+        turns[turns < 0] = np.inf   # numerically singular
+        return turns
+
+    def _solve_occupation_turns(self) -> Dict[str, np.ndarray]:
+        occupation_turns = {}
+        for name,occupation in self._occupations.items():
+            entrance = self._game_board.find_square_number(name)
+            start = self.state(-1, name)
+            targets = list(range(start, start + occupation.size + 1))
+            if entrance is not None:
+                targets.append(entrance)
+            occupation_turns[name] = self._first_passage(targets)
+        return occupation_turns
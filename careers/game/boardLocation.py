@@ -94,6 +94,13 @@ class BoardLocation(CareersObject):
     def prior_occupation_name(self):
         return self._prior_occupation_name
     
+    def copy(self) -> 'BoardLocation':
+        """A copy of this location, including where it came from
+        """
+        location = BoardLocation.__new__(BoardLocation)
+        location.__dict__.update(self.__dict__)
+        return location
+    
     def reset_prior(self):
         """After a player's turn is complete their prior location is no longer relevant. This sets all the prior_ values to None
         """
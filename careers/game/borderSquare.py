@@ -30,7 +30,7 @@ class BorderSquare(GameSquare):
         """Create a BorderSquare instance.
             Arguments:
                 border_square_dict - the dictionary defining this BorderSquare. This would be an element of the game layout.
-                game - a CareersGame instance
+                game - the EditionTemplate this square belongs to
 
         """
         super().__init__("Border", name=border_square_dict['name'], number= border_square_dict['number'], \
@@ -71,11 +71,11 @@ class BorderSquare(GameSquare):
                 player - current Player
             Returns: CommandResult
         """
-        careersGame = self._careersGame
+        careersGame = player.my_game
         if self.name == 'Opportunity':
             deck = careersGame.opportunities
             card = deck.draw()
-            player.my_opportunity_cards.append(card)
+            player.add_opportunity_card(card)
             return CommandResult(CommandResult.SUCCESS, f'Added Opportunity: {str(card)}', True)
         
         match(self.square_type):
@@ -91,7 +91,7 @@ class BorderSquare(GameSquare):
                     player.add_pending_action(pending_action_type, game_square_name=self.name)
                     result = CommandResult(CommandResult.NEED_PLAYER_CHOICE, message, False)   # player needs to pick the destination travel_square
                 else:
-                    next_square_number, game_square = self._careersGame.find_next_border_square(self.number, BorderSquareType.TRAVEL_SQUARE)
+                    next_square_number, game_square = careersGame.find_next_border_square(self.number, BorderSquareType.TRAVEL_SQUARE)
                     next_action = f'goto {next_square_number};roll'    # player.board_location set by 'goto' command
                     result = CommandResult(CommandResult.SUCCESS, f'Advance to square {next_square_number}, {game_square.name} and roll again', False)
                     result.next_action = next_action
@@ -3,7 +3,7 @@ Created on Aug 9, 2022
 
 @author: don_bacon
 '''
-import json
+import json, copy, random
 from pathlib import Path
 from game.gameUtils import GameUtils
 from typing import List, Dict
@@ -36,12 +36,28 @@ class CardDeck(object):
         self._deck = []
 
         self._cards_index = []
+        self._random = None     # random.Random used to shuffle, None for the random module
         self._size = self.create_card_deck()
         self._cards_index = GameUtils.shuffle(self._size)
         self._next_index = 0
         
     def shuffle(self):
-        self._cards_index = GameUtils.shuffle(self._size)
+        self._cards_index = GameUtils.shuffle(self._size, self._random)
+    
+    def new_deck(self, rng:random.Random=None, shuffle=True) -> 'CardDeck':
+        """Create a deck for a new game that shares the cards of this deck.
+            Cards are never modified during game play so only the deck order (cards_index, next_index)
+            belongs to the new deck, and it is freshly shuffled.
+            Arguments:
+                rng - the game's random.Random, used for this and every later shuffle of the new deck
+                shuffle - if False, the caller sets cards_index and next_index, for example when loading a saved game
+        """
+        deck = copy.copy(self)
+        deck._random = rng
+        if shuffle:
+            deck.shuffle()
+        deck._next_index = 0
+        return deck
         
     @property
     def size(self):
@@ -5,14 +5,13 @@ Created on Aug 6, 2022
 '''
 
 from game.environment import Environment
+from game.consoleOutput import ConsoleOutput
+from game.gameStore import GameStore
 from game.player import Player
-import json, logging, random, copy
+import json, logging, random
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Tuple, Union
+from typing import Dict, List, Tuple
 
-from game.opportunityCardDeck import OpportunityCardDeck
-from game.experienceCardDeck import ExperienceCardDeck
 from game.gameState import GameState
 from game.occupation import Occupation
 from game.gameBoard import GameBoard
@@ -23,6 +22,7 @@ from game.careersObject import CareersObject
 
 from game.boardLocation import BoardLocation
 from game.gameParameters import GameParameters
+from game.editionTemplate import EditionTemplate
 from game.gameConstants import GameConstants, GameParametersType, BorderSquareType, GameType
 from game.turnHistory import TurnHistory, Turn
 
@@ -34,7 +34,7 @@ class CareersGame(CareersObject):
         
     """
     
-    def __init__(self, edition_name:str,  installationId:str, total_points:int, game_id:str, game_type="points", game_parameters_type="prod"):
+    def __init__(self, edition_name:str,  installationId:str, total_points:int, game_id:str, game_type="points", game_parameters_type="prod", seed:int=None):
         """CareersGame Constructor
             Arguments:
                 edition_name - the name of the edition to create. This must be a key in editions.json file.
@@ -43,6 +43,7 @@ class CareersGame(CareersObject):
                 game_id - a Globally Unique Identifier for this game (guid).
                 game_type - "points" or "timed"
                 game_parameters_type - prod, custom, etc.
+                seed - seed for this game's random number generator. If None, a random seed is used.
             Raises:
                 ValueError if there is no such edition
             Saved games are indexed by installationId. This is the primary search key used to search for saved games.
@@ -51,37 +52,23 @@ class CareersGame(CareersObject):
         self._installationId = installationId
         self._edition_name = edition_name
         self._game_parameters_type = GameParametersType[game_parameters_type.upper()]      # can be "test" or "prod"
-        self._env = Environment.get_environment()
-        self._resource_folder = self._env.get_resource_folder()     # base resource folder
-        self._game_parameters_filename = None
-        self._occupations_filename = None
-        #
-        # validate the Edition
-        #
-        fp = open(self._resource_folder + "/editions.json", "r")
-        jtxt = fp.read()
-        editions_txt = json.loads(jtxt)
-        self._editions = editions_txt['editions']   # list of editions
-        if edition_name in self._editions:
-            self._edition = editions_txt[edition_name]
-        else: raise ValueError(f"No such edition {edition_name}")
-        fp.close()
-        self._edition_path = self._edition["edition_path"]
         #
-        # load game parameters, layout and occupations
+        # the edition resources are loaded once per process and shared by all games of this edition
+        # raises ValueError if there is no such edition
         #
-        self._load_game_configuration()
- 
+        self._template = EditionTemplate.get_template(edition_name, self._game_parameters_type)
+        self._attach_template(self._template)
         #
-        # create the Opportunity and Experience card decks
+        # all the dice, card shuffles and random choices of this game come from its own random number generator
+        # which is pickled with the game. Games never share or reseed the random module.
         #
-        self._create_opportunity_deck()
-        self._create_experience_deck()
-        self._college_degrees =  self._load_college_degrees()  # dict with keys: degreePrograms (list), maxDegrees (int), degreeNames (list)
+        self._seed = random.SystemRandom().getrandbits(63) if seed is None else seed
+        self._random = random.Random(self._seed)
         #
-        # load the game board
+        # this game's Opportunity and Experience card decks share the cards but not the order
         #
-        self._game_board = self._create_game_board()   # GameBoard instance
+        self._opportunities = self._template.opportunities.new_deck(self._random)
+        self._experience_cards = self._template.experience_cards.new_deck(self._random)
         self._game_type = GameType[game_type.upper()]  # 'points', 'timed' (which is not yet supported), or 'solo'
         self._gameId = game_id
                      
@@ -94,6 +81,7 @@ class CareersGame(CareersObject):
         self._solo = None     # True if number of players == 1, set when adding players
         self._start_datetime:datetime = None
         self._end_datetime:datetime = None
+        self._command_sequence = 0      # the number of engine commands applied to this game, see CommandLog
         
         self._plugins = {}
         #
@@ -101,61 +89,86 @@ class CareersGame(CareersObject):
         #
         self.load_plugins()
         
-    def _load_game_configuration(self):
-        """Loads the game parameters and occupations JSON files for this edition.
-        
+    #
+    # attributes that reference the shared EditionTemplate. These are not pickled with the game
+    # and are re-attached from the template when a pickled game is loaded
+    #
+    _TEMPLATE_ATTRIBUTES = ['_env', '_resource_folder', '_editions', '_edition', '_edition_path', '_game_parameters_filename',
+                            '_occupations_filename', '_game_parameters', '_occupations_dict', '_occupation_names', '_occupations',
+                            '_turn_outcome_parameters', '_point_icons', '_college_degrees', '_game_board']
+    
+    def _attach_template(self, template:EditionTemplate):
+        """Sets the references to the shared edition resources from an EditionTemplate
         """
-        game_params_type = self._game_parameters_type.value
-        self._game_parameters_filename = f'{self._resource_folder}/{self._edition_path}/gameParameters_{game_params_type}.json'
-            
-        with open(self._game_parameters_filename, "r") as fp:
-            jtxt = fp.read()
-            self._game_parameters = GameParameters(json.loads(jtxt))
-
-        self._occupations_filename = f'{self._resource_folder}/{self._edition_path}/occupations.json'
-        with open(self._occupations_filename, "r") as fp:
-            jtxt = fp.read()
-            occupations_dict = json.loads(jtxt)
-            self._occupations_dict = copy.deepcopy(occupations_dict)
-            self._occupation_names = occupations_dict['occupations']
-        fp.close()
-        
+        self._env = Environment.get_environment()
+        self._resource_folder = template.resource_folder     # base resource folder
+        self._editions = template.editions   # list of editions
+        self._edition = template.edition
+        self._edition_path = template.edition_path
+        self._game_parameters_filename = template.game_parameters_filename
+        self._occupations_filename = template.occupations_filename
+        self._game_parameters = template.game_parameters
+        self._occupations_dict = template.occupations_dict
+        self._occupation_names = template.occupation_names
+        self._occupations = template.occupations     # dictionary of Occupation instances keyed by name
+        self._turn_outcome_parameters = template.turn_outcome_parameters
+        self._college_degrees =  template.college_degrees  # dict with keys: degreePrograms (list), maxDegrees (int), degreeNames (list)
+        self._game_board = template.game_board   # GameBoard instance
         #
-        # load point icons
+        # point icons are global, another edition may have been loaded since this template
         #
-        self._point_icons =  self._edition["point_icons"] if "point_icons" in self._edition else None
+        self._point_icons = template.point_icons
         GameConstants.load_point_icons(self._point_icons)
-        
-        # load the individual occupation files
-        self._occupations = self.load_occupations()     # dictionary of Occupation instances keyed by name
-        
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in CareersGame._TEMPLATE_ATTRIBUTES:
+            state.pop(key, None)
         #
-        # add alternate names to occupation_names
+        # the cards are in the template, only the order of this game's decks is saved
         #
-        for key in self._occupations.keys():
-            if key not in self._occupation_names:
-                self._occupation_names.append(key)
-            else:
-                self._occupation_names.append(key.lower())
-                
-            
-        self._turn_outcome_parameters_filename = f'{self._resource_folder}/{self._edition_path}/turnOutcomeParameters.json'
-        with open(self._turn_outcome_parameters_filename, "r") as fp:
-            jtxt = fp.read()
-            turn_outcome_dict = json.loads(jtxt)
-            turn_outcome_parameters = turn_outcome_dict['turn_outcome_parameters']
-            self._turn_outcome_parameters = {}
-            for key in turn_outcome_parameters:
-                val = turn_outcome_parameters[key]
-                if "<STAR>" in key:
-                    key = key.replace("<STAR>", GameConstants.STAR)
-                    
-                elif "<HEART>" in key:
-                    key = key.replace("<HEART>", GameConstants.HEART)
-
-                self._turn_outcome_parameters.update({key:val})   
-        fp.close()
-            
+        for key in ['_opportunities', '_experience_cards']:
+            deck = state[key]
+            state[key] = {"next_index":deck.next_index, "cards_index":deck.cards_index}
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_command_sequence', 0)     # games pickled before there was a CommandLog
+        self._attach_template(self._template)
+        self._opportunities = self._load_deck(self._template.opportunities, state['_opportunities'])
+        self._experience_cards = self._load_deck(self._template.experience_cards, state['_experience_cards'])
+    
+    def _load_deck(self, template_deck, deck_dict:Dict):
+        deck = template_deck.new_deck(self._random, shuffle=False)
+        deck.cards_index = deck_dict["cards_index"]
+        deck.next_index = deck_dict["next_index"]
+        return deck
+    
+    def snapshot(self) -> Tuple:
+        """An opaque token of this game's state as it is now, for restore(). A lookahead, what-if or undo takes one
+            to play on and come back to, many times, instead of copying the game.
+            Only the mutable per-game state is in the token: the GameState and its players, the order of the decks
+            and the state of the random number generator. The edition's boards, occupations and cards are shared by every game
+            and aren't copied, and neither are the lists that are only appended to, like the players' command histories,
+            of which a token has the length. A token can be restored any number of times, in any order.
+            The engine's CommandLog and the saved game aren't part of the token: play on a scratch engine, see CareersGameEngine.scratch,
+            or save the game after restoring it.
+        """
+        return (self._game_state.snapshot(), self._random.getstate(), self._command_sequence, self._solo, \
+                self._opportunities.next_index, self._opportunities.cards_index, \
+                self._experience_cards.next_index, self._experience_cards.cards_index)
+    
+    def restore(self, token:Tuple):
+        """Restores this game to a snapshot(), in place: the game, its GameState, players and decks are the same instances,
+            so an engine playing the game, and the plug-ins, don't need to be told.
+        """
+        game_state_token, random_state, self._command_sequence, self._solo, \
+            self._opportunities.next_index, self._opportunities.cards_index, \
+            self._experience_cards.next_index, self._experience_cards.cards_index = token
+        self._random.setstate(random_state)
+        self._game_state.restore(game_state_token)
+    
     def load_plugins(self) -> bool:
         """Get active game plug-in instances for this game edition
             Returns:
@@ -169,7 +182,7 @@ class CareersGame(CareersObject):
         #
         # List[Dict], keys "name", "module"
         #
-        discovered_plugins = GameConstants.get_plugins(self.edition_name, apath=None)
+        discovered_plugins = self._template.discovered_plugins
         self._plugin_names = [d["module"].__name__.split(".")[-1] for d in discovered_plugins]
         logging.debug(f"plugin names: {self._plugin_names}")
         #
@@ -185,7 +198,8 @@ class CareersGame(CareersObject):
                 classname = plug_in["classname"]
                 context = plug_in["context"]
                 my_class = getattr(module, classname)
-                instance = my_class(self)      # TODO add strategy_level if key is present as an argument
+                instance = my_class(self)
+                instance.configure(plug_in)    # strategy_level, players etc.
                 logging.debug(f"{classname} instance created")
                 #
                 # save the instance using the context as a key
@@ -197,57 +211,43 @@ class CareersGame(CareersObject):
             module = None
         return True
     
-    def _create_opportunity_deck(self):
-        self._opportunities = OpportunityCardDeck(self._resource_folder, self._edition_path)
+    def pick_degree(self) ->str:
+        """Pick a degreeProgram at random
+        """
+        return self._random.sample(self.college_degrees['degreePrograms'], 1)[0]
     
-    def _create_experience_deck(self):
-        self._experience_cards = ExperienceCardDeck(self._resource_folder, self._edition_path)
-        
-    def _create_game_board(self) -> GameBoard:
-        game_layout_filename = f'{self._resource_folder}/{self._edition_path}/gameLayout.json'
-        game_board = GameBoard(game_layout_filename, game=self)
-        return game_board
-
-    def load_occupations(self) -> Dict[str, Occupation]:
-        """Loads individual occupation JSON files for this edition.
-             The occupation name is the same as the border square name.
-            Returns: a dict with the occupation name as the key and contents
-                of the corresponding occupation JSON file (as a dict) as the value.
-                If the occupation JSON file doesn't exist, the value is None.
-            Note: the filename is the occupation name + "_" + the edition_name + ".json"
-                The file path is the resource_folder set in the Environment
+    @property
+    def seed(self) -> int:
+        """The seed of this game's random number generator
         """
-        occupations:Dict[str, Occupation] = {}
-        for name in self._occupation_names:
-            filepath = f'{self._resource_folder}/{self._edition_path}/{name}.json'
-            p = Path(filepath)
-            if p.exists():
-                fp = open(filepath, "r")
-                logging.info(filepath)
-                occupation_dict = json.loads(fp.read())
-                # create an Occupation object for this occupation
-                occupation = Occupation(occupation_dict, game=self)
-                logging.info(f"{name} cards: {occupation.cards}\n points: {occupation.points}")
-                occupations[name] = occupation
-                occupations[name.lower()] = occupation
-                alternate_name = occupation.alternate_name
-                if alternate_name != name:
-                    occupations[alternate_name] = occupation
-                    occupations[alternate_name.lower()] = occupation
-            else:
-                occupations[name] = None
-        return occupations
-
+        return self._seed
     
-    def _load_college_degrees(self) -> Dict[str, Union[List[int] ,List[str], int]]:
-        fp = open(f'{self._resource_folder}/{self._edition_path}/collegeDegrees.json', "r")
-        degrees = json.loads(fp.read())
-        return degrees
+    @property
+    def random(self) -> random.Random:
+        """This game's random number generator. Use it for anything random in game play.
+        """
+        return self._random
     
-    def pick_degree(self) ->str:
-        """Pick a degreeProgram at random
+    @property
+    def command_sequence(self) -> int:
+        """The sequence number of the last CommandLog record applied to this game
+        """
+        return self._command_sequence
+    
+    @command_sequence.setter
+    def command_sequence(self, value:int):
+        self._command_sequence = value
+    
+    def random_to_dict(self) -> Dict:
+        """The seed and current state of this game's random number generator as a JSON-compatible dict
         """
-        return random.sample(self.college_degrees['degreePrograms'], 1)[0]
+        version, internal_state, gauss_next = self._random.getstate()
+        return {"seed":self._seed, "state":[version, list(internal_state), gauss_next]}
+    
+    def _load_random(self, random_dict:Dict):
+        self._seed = random_dict["seed"]
+        version, internal_state, gauss_next = random_dict["state"]
+        self._random.setstate((version, tuple(internal_state), gauss_next))
     
     @property
     def edition(self) -> Dict:
@@ -269,6 +269,12 @@ class CareersGame(CareersObject):
     def game_board(self) -> GameBoard:
         return self._game_board
     
+    @property
+    def template(self) -> EditionTemplate:
+        """The shared, read-only EditionTemplate this game was created from
+        """
+        return self._template
+    
     @property
     def plugins(self) -> Dict:
         return self._plugins
@@ -412,7 +418,7 @@ class CareersGame(CareersObject):
         turn_number = 0
         turn = Turn(aplayer.number, turn_number)
         turn_history.add_turn(turn)
-        player_info = aplayer.player_info(include_successFormula=True, outputFormat="dict", include_degrees=True, include_card_values=True)
+        player_info = aplayer.info_dict()
         turn_history.add_player_info(turn_number, TurnHistory.BEFORE_KEY, player_info)
         turn_history.turn_number = 1
         aplayer.turn_history = turn_history
@@ -463,32 +469,8 @@ class CareersGame(CareersObject):
                      and the game_square instance.
             BTW, the next_square_number could be < current_square_number if it's past Payday
         """
-        squares = []
-        next_square_num = None
-        game_square = None
-        if atype is BorderSquareType.TRAVEL_SQUARE:
-            squares = self.game_board.travel_squares
-            
-        elif atype is BorderSquareType.OPPORTUNITY_SQUARE:
-            squares=self.game_board.opportunity_squares
-            
-        elif atype is BorderSquareType.OCCUPATION_ENTRANCE_SQUARE:
-            squares = self.game_board.occupation_entrance_squares
-            
-        elif atype in GameConstants.CORNER_SQUARE_TYPES:
-            squares = self.game_board.corner_squares
-        
-        for square in squares:      # square is a BorderSquare instance, they are in square# order
-            if square.square_type is atype and (name is None or square.name==name):
-                if square.number > current_square_number:
-                    next_square_num = square.number
-                    game_square = square
-                    break
-        if next_square_num is None:     # wrap-around the board
-            square = squares[0]
-            next_square_num = square.number
-            game_square = square
-            
+        next_square_num = self.game_board.next_square_number(current_square_number, atype, name)
+        game_square = None if next_square_num is None else self.game_board.get_square(next_square_num)
         return next_square_num, game_square
     
     def find_border_square(self, name:str, starting_square_number:int=0) -> BorderSquare | None:
@@ -500,16 +482,8 @@ class CareersGame(CareersObject):
             Returns:
                 BorderSquare instance or None if not found.
         """
-        bs = None
-        indicies = [(i+starting_square_number)%42 for i in range(42)]
-        
-        for i in indicies:
-            square = self.game_board.border_squares[i]
-            if square.name.lower() == name.lower():
-                bs = square
-                break
-        
-        return bs
+        square_number = self.game_board.find_square_number(name, starting_square_number)
+        return None if square_number is None else self.game_board.get_square(square_number)
     
     def to_JSON(self) -> str:
         """Use jsonpickle to serialize the game to JSON as a JSON-compatible dict.
@@ -541,6 +515,9 @@ class CareersGame(CareersObject):
         self.opportunities.cards_index = opportunity_deck["cards_index"]
         self.experience_cards.next_index = experience_deck["next_index"]
         self.experience_cards.cards_index = experience_deck["cards_index"]
+        if "random" in game_dict:       # games saved before games had a random number generator don't have this
+            self._load_random(game_dict["random"])
+        self._command_sequence = game_dict.get("command_sequence", 0)
         
         # load player Opportunity and Experience cards
         players = game_state_dict["players"]
@@ -549,6 +526,7 @@ class CareersGame(CareersObject):
             player:Player = self.game_state.get_player_by_initials(initials)
             if player.number == self.game_state.current_player_number:
                 self.game_state.current_player = player
+            player.my_game = self
             opportunity_cards = player_dict["opportunity_cards"]    # List[str], format "<Opportunity card_number>:<card_text>"
             experience_cards = player_dict["experience_cards"]      # List[str], format "<Experience card_number>:card_type or text <n> spaces"
             
@@ -564,21 +542,19 @@ class CareersGame(CareersObject):
                 thecard = self.experience_cards.deck[card_number]
                 player.add_experience_card(thecard)
             
-            print(f'{player.player_initials} loaded')
+            ConsoleOutput.get_default().write(f'{player.player_initials} loaded')
         
 if __name__ == '__main__':
     print(CareersGame.__doc__)
     
 
 def restore_game(game_id:str, game_text:str=None) -> CareersGame|None:
-    print(f'restoring game "{game_id}"')
+    ConsoleOutput.get_default().write(f'restoring game "{game_id}"')
     game_dict = None
     if game_text is None:
-        env = Environment.get_environment()
-        games_folder = env.games_base
-        gamefile = f'{games_folder}/{game_id}_game.json'
-        with open(gamefile, "r") as fp:
-            game_dict = json.load(fp)
+        game_dict = GameStore.get_store().load_state(game_id)
+        if game_dict is None:
+            raise ValueError(f'No saved game "{game_id}"')
     else:
         game_dict = json.loads(game_text)
     game_state_dict = game_dict["gameState"]
@@ -21,6 +21,8 @@ from game.borderSquare import BorderSquare, BorderSquareType
 from game.occupationSquare import OccupationSquare
 from game.gameSquare import GameSquare, GameSquareClass
 from game.gameEngineCommands import GameEngineCommands
+from game.commandRegistry import CommandRegistry
+from game.consoleOutput import ConsoleOutput
 from game.environment import Environment
 from game.gameState import GameState
 from game.gameConstants import PendingActionType, SpecialProcessingType, GameType, GameParametersType, PlayerType, GameConstants
@@ -29,11 +31,16 @@ from game.todoList import TodoList
 from game.logger import Logger
 
 from datetime import datetime
-import random, json
-from typing import List
+import itertools, random, json
+from typing import Callable, Dict, List
 import os, logging, sys
 from threading import Lock
 from game.gameUtils import GameUtils
+from game.gameWriter import GameWriter
+from game.gameStore import GameStore
+from game.saveTracker import GameSaveTracker
+from game.commandLog import CommandLog
+import pickle
 
 class CareersGameEngine(object):
     """CareersGameEngine executes the action(s) associated with each player's turn.
@@ -92,10 +99,13 @@ class CareersGameEngine(object):
     """
     _lock = Lock()
         
-    def __init__(self, careers_game:CareersGame=None, game_id:str=None, loglevel='warning', installationId="", edition=""):
+    def __init__(self, careers_game:CareersGame=None, game_id:str=None, loglevel='warning', installationId="", edition="", headless=False):
         '''
         Constructor
+            headless - if True, console output is discarded. Use for batch simulation.
+                The console can also be set to any ConsoleOutput with the console property.
         '''
+        self._console = ConsoleOutput.headless() if headless else ConsoleOutput.get_default()
         self._careersGame = careers_game    # create a new CareersGame with create()
         self._debug = False                 # traces the action by describing each step and logs to a file
         self._start_date_time = datetime.now()
@@ -106,6 +116,20 @@ class CareersGameEngine(object):
         self.currency_symbol = None         # value set with create()
         self._game_state = None             # set with create()
         self._automatic_run = False         # set to True if running a script
+        self._write_behind = True           # checkpoints are written by the GameWriter thread
+        self._command_log:CommandLog = None # set with create() or resume()
+        self._checkpoint_turns = 10         # save a checkpoint every this many turns
+        self._checkpoint_turn = 0           # GameState.turns at the last checkpoint
+        self._command_depth = 0             # > 1 when a command executes other commands
+        self._log_flush_due = False         # set on change of turn
+        self._replaying = False
+        self._scratch = False               # True for an engine playing a throwaway copy of a game
+        self._chosen_commands:List[Dict] = []   # the commands chosen by plug-ins that aren't reproducible, logged with the command that ran them
+        self._replay_chosen:List[Dict] = []     # the chosen commands of the command being replayed, executed in place of the plug-ins
+        self._save_tracker:GameSaveTracker = None   # created on first use
+        self._history_window = TurnHistory.WINDOW   # turns of each player's history kept in memory, None to keep them all
+        self._policy_scorer:Callable|None = None    # evaluates the PolicyModel scores of computer players' turns, see policy_scorer
+        self._command_registry = CommandRegistry.get_registry(type(self))    # command name -> engine method
         self._game_id = self._create_game_id(installationId) if game_id is None else game_id
             
         self._init_logging(loglevel, self._game_id, edition)
@@ -163,6 +187,21 @@ class CareersGameEngine(object):
     def logfile_path(self):
         return self._logfile_path
     
+    @property
+    def game_filename_base(self) -> str:
+        """The saved game file path without the extension
+        """
+        return self._game_filename_base
+    
+    @property
+    def save_tracker(self) -> GameSaveTracker:
+        """Tracks the changes to the game since it was last saved, for a saver that writes only the changes.
+            A new tracker is created when the engine plays a different CareersGame.
+        """
+        if self._save_tracker is None or self._save_tracker.careers_game is not self._careersGame:
+            self._save_tracker = GameSaveTracker(self._careersGame)
+        return self._save_tracker
+    
     @property
     def game_id(self):
         return self._game_id
@@ -199,6 +238,46 @@ class CareersGameEngine(object):
     def careersGame(self, value:CareersGame):
         self._careersGame = value
     
+    @property
+    def console(self) -> ConsoleOutput:
+        return self._console
+    
+    @console.setter
+    def console(self, value:ConsoleOutput):
+        self._console = value
+        if self._gameEngineCommands is not None:
+            self._gameEngineCommands.console = value
+    
+    @property
+    def headless(self) -> bool:
+        return not self._console.enabled
+    
+    @property
+    def write_behind(self) -> bool:
+        """If True (the default), checkpoints are written to disk in the background.
+            Otherwise the engine waits for the file to be written.
+        """
+        return self._write_behind
+    
+    @write_behind.setter
+    def write_behind(self, value:bool):
+        self._write_behind = value
+    
+    @property
+    def command_log(self) -> CommandLog:
+        return self._command_log
+    
+    @property
+    def checkpoint_turns(self) -> int:
+        """The game is checkpointed (saved in pkl format) every checkpoint_turns turns (GameState.turns, a turn by every player).
+            Fewer turns between checkpoints means fewer commands to replay when the game is recovered.
+        """
+        return self._checkpoint_turns
+    
+    @checkpoint_turns.setter
+    def checkpoint_turns(self, value:int):
+        self._checkpoint_turns = max(1, value)
+    
     @property
     def automatic_run(self)->bool:
         return self._automatic_run
@@ -208,14 +287,62 @@ class CareersGameEngine(object):
         self._automatic_run = value
         self._game_state.automatic_run = value
     
+    @property
+    def gameEngineCommands(self) -> GameEngineCommands:
+        return self._gameEngineCommands
+    
+    @property
+    def policy_scorer(self) -> Callable|None:
+        """A callable(model, game_state, player_number) that returns a PolicyModel's scores of the game for a computer player,
+            for the strategy plug-ins that needs_scores() to choose a turn, for example the scores() of a server's PolicyBatcher
+            that evaluates the decisions of many games at once. If None, the default, a plug-in evaluates its model itself.
+        """
+        return self._policy_scorer
+    
+    @policy_scorer.setter
+    def policy_scorer(self, value:Callable|None):
+        self._policy_scorer = value
+    
+    @property
+    def scratch(self) -> bool:
+        """A scratch engine plays a copy of a game that's thrown away, for example a strategy plug-in's look-ahead.
+            Nothing it plays is logged, checkpointed, saved or stored, and the turn history is kept in memory.
+        """
+        return self._scratch
+    
+    @scratch.setter
+    def scratch(self, value:bool):
+        self._scratch = value
+        if value:
+            self._history_window = None
+    
+    @property
+    def history_window(self) -> int|None:
+        """The number of each player's most recent turns kept in memory. Older turns, and their commands, are appended
+            to the game's history in the GameStore and read back a page at a time by turn_history and list commands.
+            None keeps every turn in memory and stores nothing, for example for a simulated game.
+        """
+        return self._history_window
+    
+    @history_window.setter
+    def history_window(self, value:int|None):
+        self._history_window = None if value is None else max(1, value)
+    
     def log_info(self, *message):
         """Write info-level message to the log file and if debug is set, also to the console
-            
+            The message is only joined if it's going to be written somewhere.
         """
-        txt = " ".join(message)
-        if self.debug:
-            print(txt)
-        logging.info(txt)
+        if self.debug or logging.root.isEnabledFor(logging.INFO):
+            txt = " ".join(message)
+            if self.debug:
+                self._console.write(txt)
+            logging.info(txt)
+    
+    def is_logging(self, level=logging.INFO) -> bool:
+        """Returns True if messages at the given logging level are written. 
+            Use to avoid building log messages that would be discarded.
+        """
+        return self.debug or logging.root.isEnabledFor(level)
             
     def log_message(self, *message) -> CommandResult:
         """The command version of log.
@@ -225,7 +352,10 @@ class CareersGameEngine(object):
 
     def execute_command(self, command:str, aplayer:Player, args:list=[]) -> CommandResult:
         """Executes a command for a given Player.
-            This also updates Turn.commands.
+            This also updates Turn.commands, and appends the command to the game's CommandLog.
+            Commands executed by other commands (for example the take_turn of a computer player) are not logged,
+            replaying the outer command executes them again. The commands chosen by the plug-ins of each computer take_turn
+            it ran, if they aren't reproducible, are logged with it, so the replay executes them rather than running the plug-ins again.
             Arguments:
                 command - the command name, for example "roll".
                 args - a possibly empty list of additional string arguments
@@ -239,45 +369,135 @@ class CareersGameEngine(object):
         if aplayer is None:
             player = self._admin_player
         
+        self._command_depth += 1
+        try:
+            cmd_result = self._execute_commands(command, player, args)
+        finally:
+            self._command_depth -= 1
+        if self._command_depth == 0:
+            chosen = [dict(entry, commands=";".join(entry["commands"])) for entry in self._chosen_commands]
+            self._chosen_commands = []
+            self._log_command(command, player, args, chosen)
+        return cmd_result
+    
+    def _execute_commands(self, command:str, player:Player, args:list) -> CommandResult:
         commands = command.split(';')
-        messages = ""
+        results = []
+        log_debug = logging.root.isEnabledFor(logging.DEBUG)
         for command in commands:
-            logging.debug(f'{player.player_initials}: {command}')
+            if log_debug:
+                logging.debug(f'{player.player_initials}: {command}')
             if command is None or len(command) == 0:
                 return CommandResult(CommandResult.SUCCESS, "", False)
+            if self._game_state is not None:
+                self._game_state.changed()     # a command changes the game's state, a new version for GameState.to_dict()
             cmd_result = self._evaluate(command, args)
             player.add_command(command)    # adds to player's command history and current Turn
+            if self._game_state is not None:
+                self._game_state.changed()
             
             board_location = player.board_location    # current board location AFTER the command is executed
-            if command.lower() != "log_message":      # no need to log twice
+            if log_debug and command.lower() != "log_message":      # no need to log twice
                 logging.debug(f'  {player.player_initials} results: {cmd_result.return_code} {cmd_result.message}\n{board_location}')
             cmd_result.board_location = board_location
-            messages += cmd_result.message + "\n"
-        
-        cmd_result.message = messages
+            results.append(cmd_result)
+        #
+        # the combined message is rendered when (and if) it's read
+        #
+        cmd_result.combine_messages(results)
         return cmd_result
+    
+    def _log_command(self, command:str, player:Player, args:list, chosen:List[Dict]):
+        """Appends a command to the CommandLog, with the commands chosen by the plug-ins that aren't reproducible in the take_turns it ran.
+            On change of turn the log is written, and if checkpoint_turns have been played since the last checkpoint, the game is checkpointed.
+        """
+        if self._command_log is None or self._replaying or self._scratch:
+            return
+        careers_game = self._careersGame
+        careers_game.command_sequence += 1
+        self._command_log.append(careers_game.command_sequence, self._game_state.turns, player.number, command, args, \
+                                 self._game_state.automatic_run, careers_game.random, chosen)
+        if self._log_flush_due:
+            self._log_flush_due = False
+            self._command_log.flush()
+            if self._game_state.turns - self._checkpoint_turn >= self._checkpoint_turns:
+                self.checkpoint()
+    
+    def checkpoint(self) -> CommandResult:
+        """Saves the game in pkl format as the starting point for replaying the CommandLog.
+            The CommandLog is written first, so the log is never behind a checkpoint.
+        """
+        self._checkpoint_turn = self._game_state.turns
+        if self._scratch:
+            return CommandResult(CommandResult.SUCCESS, "scratch game not saved", False)
+        if self._command_log is not None:
+            self._command_log.flush()
+        return self._gameEngineCommands.save_game(self._game_filename_base, self.game_id, how='pkl', write_behind=self._write_behind)
+    
+    def replay(self) -> int:
+        """Replays the CommandLog records after the game's command_sequence, with console output discarded.
+            The replayed game is then checkpointed.
+            Returns: the number of commands replayed
+        """
+        careers_game = self._careersGame
+        console = self._console
+        self.console = ConsoleOutput.headless()
+        self._replaying = True
+        replayed = 0
+        try:
+            for record in CommandLog.read(self._command_log.filename, careers_game.command_sequence):
+                player = None if record["player"] < 0 else self._game_state.players[record["player"]]
+                self._game_state.automatic_run = record["auto"]
+                self._replay_chosen = list(record.get("chosen", []))
+                self.execute_command(record["command"], player, record["args"])
+                if len(self._replay_chosen) > 0:
+                    logging.warning(f'{self.game_id} replay of command {record["seq"]} "{record["command"]}" left chosen commands {self._replay_chosen}')
+                careers_game.command_sequence = record["seq"]
+                if CommandLog.fingerprint(careers_game.random) != record["rng"]:
+                    logging.warning(f'{self.game_id} replay of command {record["seq"]} "{record["command"]}" made different random draws')
+                replayed += 1
+        finally:
+            self._replaying = False
+            self._replay_chosen = []
+            self.console = console
+        self._log_flush_due = False
+        if replayed > 0:
+            self.checkpoint()
+        return replayed
+    
+    @staticmethod
+    def recover(game_id:str, loglevel='warning', installationId="", headless=False) -> 'CareersGameEngine':
+        """Restores a game from its latest checkpoint and replays the commands logged after it.
+            Arguments:
+                game_id - the game ID
+                loglevel, installationId, headless - as for the CareersGameEngine constructor
+            Returns: a CareersGameEngine ready to continue the game
+        """
+        gamefile = os.path.join(Environment.get_environment().games_base, f'{game_id}_game.pkl')
+        with open(gamefile, "rb") as fp:
+            careers_game:CareersGame = pickle.load(fp)
+        engine = CareersGameEngine(game_id=game_id, loglevel=loglevel, installationId=installationId, \
+                                   edition=careers_game.edition_name, headless=headless)
+        engine.resume(careers_game)
+        replayed = engine.replay()
+        engine.log_info(f'{game_id} recovered at turn {careers_game.game_state.turns}, {replayed} commands replayed')
+        return engine
         
     def _evaluate(self, commandTxt, args=[]) -> CommandResult:
-        """Evaulates a command string with eval()
+        """Evaluates a command string by dispatching it to the method registered for the command.
             Arguments:
                 commandTxt - the command name + any arguments to evaluate.
                 args - an optional list of additional arguments
             Returns - a CommandResult
         """
-        command_result = GameEngineCommands.parse_command_string(commandTxt, args)
-        if command_result.return_code != CommandResult.SUCCESS:     # must be an error
-            return command_result
-        
-        command = "self." + command_result.message
         command_result = None
-        logging.debug("_evaluate: " + command)
         try:
-            command_result = eval(command)
+            command_result = self._command_registry.dispatch(self, commandTxt, args)
         except Exception as ex:
-            message = f'"{command}" : Invalid command format or syntax\nexception: {str(ex)}'
+            message = f'"{commandTxt}" : Invalid command format or syntax\nexception: {str(ex)}'
             command_result = CommandResult(CommandResult.ERROR,  message,  False, exception=ex)
             logging.error(message)
-            print(message, file=sys.stderr)
+            self._console.write(message, error=True)
         return command_result
     
     def get_player_game_square(self, player:Player) -> GameSquare:
@@ -331,9 +551,9 @@ class CareersGameEngine(object):
         if self.is_in_occupation(game_square, player):
             ndice = 1
         
-        dice = random.choices(population=[i for i in range(1,7)], k=ndice)
+        dice = GameUtils.roll(ndice, self._careersGame.random)
         num_spaces = sum(dice)
-        logging.info(f' {player.player_initials}  rolled {num_spaces} {dice}')
+        logging.info(' %s  rolled %s %s', player.player_initials, num_spaces, dice)
         #
         # if the player has a stay_or_move pending action, then clear it
         #
@@ -342,10 +562,13 @@ class CareersGameEngine(object):
             
         return self._advance(num_spaces, dice)
     
-    def take_turn(self, command:str="roll") -> CommandResult:
+    def take_turn(self, command:str="roll", chosen:str|None=None) -> CommandResult:
         """take_turn is a cover function for the current player's next command.
             Arguments:
                 command - the command to execute, default is "roll"
+                chosen - for a COMPUTER player, the commands its plug-ins chose, as logged in the CommandLog
+                    by a plug-in that isn't reproducible. They're executed instead of running the plug-ins.
+                    When the CommandLog is replayed, the commands logged as chosen in this turn by this player are executed.
             For HUMAN players, the command string provided is executed.
             For COMPUTER players, the command(s) are determined by the active "turn" plug-in(s).
             
@@ -358,28 +581,65 @@ class CareersGameEngine(object):
         player = self.game_state.current_player
         if player.player_type is PlayerType.HUMAN:
             cmd_result = self.execute_command(command, player)
+        elif chosen is not None:
+            cmd_result = self.execute_command(chosen, player)
+        elif self._find_replay_chosen(player) is not None:
+            cmd_result = self.execute_command(self._find_replay_chosen(player, remove=True), player)
         else:
         #
         # Is the next player a Computer player?
         # If so, run the strategy plugin to get the player's command(s)
         # Also need to set the GameEngineCommands instance in the strategy plug-in
         #
-            plugins = self._plugins["turn"]      # a List of Plugin class instances to run
+            plugins = self.turn_plugins(player)      # a List of Plugin class instances to run
+            chosen = []
+            if not all([getattr(plugin_instance, "reproducible", True) for plugin_instance in plugins]):
+                #
+                # logged in the order the take_turns start, as the commands chosen can run another one, like an extra turn
+                #
+                self._chosen_commands.append({"turns":self.game_state.turns, "player":player.number, "commands":chosen})
             for plugin_instance in plugins:
                 plugin_instance.gameEngineCommands = self._gameEngineCommands
-                plugin_result = plugin_instance.run(player.number)
-                self.log_info(str(plugin_result))
+                if self._policy_scorer is not None and hasattr(plugin_instance, "needs_scores") and plugin_instance.needs_scores(player.number):
+                    scores = self._policy_scorer(plugin_instance.policy_model, self.game_state, player.number)
+                    plugin_result = plugin_instance.run(player.number, scores)
+                else:
+                    plugin_result = plugin_instance.run(player.number)
+                if self.is_logging():
+                    self.log_info(str(plugin_result))
                 commands = plugin_result["commands"]
+                chosen.append(commands)
                 cmd_result = self.execute_command(commands, player)
-                logging.debug(f"{player.player_initials} commands: '{commands}'  result: {cmd_result.message}")
-                print(cmd_result.message)
+                if self.is_logging(logging.DEBUG):
+                    logging.debug(f"{player.player_initials} commands: '{commands}'  result: {cmd_result.message}")
+                self._console.write(lambda: cmd_result.message)
         
         return cmd_result  
     
+    def _find_replay_chosen(self, player:Player, remove:bool=False) -> str|None:
+        """The first commands logged as chosen by the plug-ins in this turn for a player, in the command being replayed, or None
+        """
+        for index, chosen in enumerate(self._replay_chosen):
+            if chosen["turns"] == self.game_state.turns and chosen["player"] == player.number:
+                if remove:
+                    del self._replay_chosen[index]
+                return chosen["commands"]
+        return None
+    
+    def turn_plugins(self, player:Player) -> List:
+        """The "turn" plug-ins that choose a computer player's commands: the plug-ins whose players include the player,
+            or if there are none, the plug-ins that play for every computer player (players is None).
+        """
+        plugins = self._plugins["turn"]
+        assigned = [plugin for plugin in plugins if getattr(plugin, "players", None) is not None and player.number in plugin.players]
+        if len(assigned) > 0:
+            return assigned
+        return [plugin for plugin in plugins if getattr(plugin, "players", None) is None]
+    
     def advance(self, num_spaces, dice:List[int]|None=None) -> CommandResult:
         """Advance a given number of spaces
             Arguments:
-                number_of_spaces - must be >= 0 and < 42
+                number_of_spaces - must be >= 0 and < the board size (42 is typical)
                 dice - optional dice roll as List[int], default is None
         
         """
@@ -389,14 +649,14 @@ class CareersGameEngine(object):
             return self._advance(num_spaces, dice)
         
     def _advance(self, num_spaces, dice:List[int]|None=None) -> CommandResult:
-        assert(num_spaces >= 0 and num_spaces <42)
+        assert(num_spaces >= 0 and num_spaces < self._careersGame.game_board.game_board_size)
         player = self.game_state.current_player
 
         next_square_number = self._get_next_square_number(player, num_spaces)
         message = f' {player.player_initials}  rolled {num_spaces} {dice}, next_square number: {next_square_number}' if dice is not None \
             else f' {player.player_initials}  advances {num_spaces}, next_square number: {next_square_number}'
         self.log_info(message)
-        print(message)
+        self._console.write(message)
         #
         # check if player is on a holiday
         # 
@@ -416,7 +676,8 @@ class CareersGameEngine(object):
         # If dice is None, can_player_move will return True
         else:
             canmove, result = self._gameEngineCommands.can_player_move(player, dice)
-            logging.debug(result.message)
+            if self.is_logging(logging.DEBUG):
+                logging.debug(result.message)
             if canmove:
                 #
                 # clear any pending action - use it or lose it!
@@ -670,11 +931,23 @@ class CareersGameEngine(object):
         result = CommandResult(CommandResult.SUCCESS,  message, True)
         return result            
     
-    def turn_history(self, initials:str=None) ->CommandResult:
+    def turn_history(self, initials:str=None, page:int=None, page_size:int=TurnHistory.WINDOW) ->CommandResult:
         """turn_history command displays the current player's turn history as a JSON formated string
+            Arguments:
+                initials - the player's initials, default is the current player
+                page - a page of the complete history, oldest turns first, including the turns in the GameStore.
+                    The default is the turns in memory.
+                page_size - the number of turns per page
+            For example "turn_history CP 0" is the first page of CP's turns, "turn_history 2" the third page of the current player's.
         """
+        if isinstance(initials, int):     # turn_history <page> [page_size]
+            initials, page, page_size = None, initials, page if page is not None else page_size
         player:Player = self.game_state.current_player if initials is None else self.get_player(initials)
-        message = player.turn_history.to_JSON()
+        if page is None:
+            message = player.turn_history.to_JSON()
+        else:
+            stored = (row["record"] for row in GameStore.get_store().read_turns(self.game_id, player.number))
+            message = json.dumps(player.turn_history.page(stored, page, page_size), indent=1)
         result = CommandResult(CommandResult.SUCCESS,  message, True)
         return result       
     
@@ -704,14 +977,18 @@ class CareersGameEngine(object):
         # has this player won the game?
         #
         if self.game_state.is_game_complete():    # somebody won!
+            self._log_flush_due = True
             winning_player = self.game_state.winning_player
             save_result = self.save()
+            self.flush_saves()
             game_time = self.game_state.get_elapsed_time()
-            message = f'The game is over, the winner is {winning_player.player_initials} with {winning_player.total_points()} points. '
-            message = f'{message}\n Game time: {game_time} minutes \n Game saved as: {save_result.message}'
-            player_info = winning_player.player_info(include_successFormula=True, outputFormat='text')
-            message = f'{message}\n {player_info}'
-            result = CommandResult(CommandResult.TERMINATE, message, True)
+            total_points = winning_player.total_points()
+            def render_message() -> str:
+                message = f'The game is over, the winner is {winning_player.player_initials} with {total_points} points. '
+                message = f'{message}\n Game time: {game_time} minutes \n Game saved as: {save_result.message}'
+                player_info = winning_player.player_info(include_successFormula=True, outputFormat='text')
+                return f'{message}\n {player_info}'
+            result = CommandResult(CommandResult.TERMINATE, render_message, True)
             return result
     
         current_player.board_location.reset_prior()            # this player's prior board position no longer relevant
@@ -742,9 +1019,9 @@ class CareersGameEngine(object):
             self.lost_turn(lost_turn_player)
             
         #
-        # save the Game on change of turns
+        # the CommandLog is written on change of turns and the game checkpointed every checkpoint_turns turns
         #
-        self._gameEngineCommands.save_game(self._game_filename_base, self.game_id, how='pkl')
+        self._log_flush_due = True
         
         result = CommandResult(CommandResult.SUCCESS,  f"{current_player.player_initials} Turn is complete, {player.player_initials}'s ({npn}) turn " , True)
         #
@@ -753,7 +1030,7 @@ class CareersGameEngine(object):
         #
         if player.is_computer_player() and not self.game_state.automatic_run:
             cmd_result = self.execute_command("take_turn", player)
-            cmd_result.message = f"{result.message}\n{cmd_result.message}"
+            cmd_result.prepend_message(result.message)
             result = cmd_result
             
         return result
@@ -783,22 +1060,45 @@ class CareersGameEngine(object):
         #
         turn_history = player.turn_history
         next_turn_number = turn_history.next_turn_number()
-        player_info = player.player_info(include_successFormula=True, outputFormat="dict", include_degrees=True, include_card_values=True)
+        player_info = player.info_dict()
         turn_number = self.game_state.turn_number
         player.turn_history.add_player_info(turn_number, TurnHistory.AFTER_KEY, player_info)
         theTurn = player.turn_history.create_turn(turn_number)
-        self.log_info(f"turn: {turn_number} outcome: {theTurn.outcome}\n")
+        if self.is_logging():
+            self.log_info(f"turn: {turn_number} outcome: {theTurn.outcome}\n")
         
         # The AFTER of this turn is now the BEFORE of the player's next turn
         player.turn_history.turn_number = next_turn_number
         player.turn_history.add_player_info(next_turn_number, TurnHistory.BEFORE_KEY, player_info)
+        if self._history_window is not None:
+            self.store_history(player, self._history_window)
         return next_turn_number
+    
+    def store_history(self, player:Player, keep:int):
+        """Moves a player's turns, but the most recent keep turns, from the TurnHistory to the game's history in the GameStore.
+            The commands of those turns are dropped from the player's command history.
+            Turns evicted while replaying the CommandLog were stored before the game was recovered, so they're not stored again.
+        """
+        records = player.turn_history.evict(keep)
+        if len(records) == 0:
+            return
+        #
+        # the command history keeps the commands of the turns still in memory, its most recent,
+        # rather than counting the evicted turns' commands, which needn't be all the commands that came before them
+        #
+        player.drop_commands(max(len(player.command_history) - player.turn_history.command_count, 0))
+        if not self._replaying:
+            store = GameStore.get_store()
+            for record in records:
+                store.append_turn(self.game_id, record["turn"]["turn_number"], player.number, record)
         
     def end(self, save:str=None) -> CommandResult:
         """Ends the game, saves the current state if specified, and exits.
         """
         self.log_info("Ending game: " + self.game_id)
         self._careersGame.end_game()
+        self._log_flush_due = True
+        self.flush_saves()
         if save is not None and save.lower()=='save':    # save the game state first
             sg_result = self.save()
             result = CommandResult(CommandResult.TERMINATE, f'Game is complete and saved to file: {sg_result.message}', True)
@@ -807,7 +1107,9 @@ class CareersGameEngine(object):
             
         #
         # Update each player's turn history and add the final after_info
+        # A saved game also moves the rest of each player's turns to its GameStore history
         #
+        save_history = save is not None and save.lower()=='save'
         winning_points = 0
         winning_player = None
         for player in self.game_state.players:
@@ -815,7 +1117,7 @@ class CareersGameEngine(object):
             # Update the AFTER of this turn and calculate the final outcome
             #
             turn_history = player.turn_history
-            player_info = player.player_info(include_successFormula=True, outputFormat="dict", include_degrees=True)
+            player_info = player.info_dict()
             turn_number = self.game_state.turn_number
             turn_history.add_player_info(turn_number, TurnHistory.AFTER_KEY, player_info)
             turn_history.create_turn(turn_number)
@@ -823,6 +1125,8 @@ class CareersGameEngine(object):
             with open(self._turn_history_path, "w") as fp:
                 fp.write(player.turn_history.to_JSON())
                 fp.close()
+            if save_history:
+                self.store_history(player, 0)
             #
             # who has the most points - does not account for ties
             #
@@ -848,11 +1152,33 @@ class CareersGameEngine(object):
     def save(self, how="json") -> CommandResult:
         """Save the current game state.
             Arguments: how - save format: 'json' or 'pkl' (the default).
-            save('pkl') uses joblib.dump() to save the CareersGame instance to binary pickel format.
-            This can be reconstituted with joblib.load()
+            save('pkl') pickles the CareersGame instance to binary pickle format.
+            This can be reconstituted with joblib.load() or pickle.load()
         """
+        if self._scratch:
+            return CommandResult(CommandResult.SUCCESS, "scratch game not saved", False)
         return self._gameEngineCommands.save_game(self._game_filename_base, self.game_id, how=how)
     
+    def flush_saves(self, timeout:float=None) -> bool:
+        """Writes the CommandLog and waits until the write-behind saves of this game are written to disk.
+            Returns: True if written, False if the timeout (seconds) expired first.
+        """
+        if self._command_log is not None:
+            self._command_log.flush()
+        return GameWriter.get_writer().flush(f'{self._game_filename_base}.pkl', timeout=timeout)
+    
+    def discard(self):
+        """Removes everything saved for the game: its checkpoint, CommandLog, JSON save and stored history.
+            For a game that won't be resumed, for example a simulated or benchmark game.
+        """
+        self.flush_saves()
+        if self._command_log is not None:
+            self._command_log.remove()
+        filename = f'{self._game_filename_base}.pkl'
+        if os.path.exists(filename):
+            os.remove(filename)
+        GameStore.get_store().delete_game(self.game_id)
+    
     def location(self, who=None)->str:
         player = self.game_state.current_player if who is None else self.get_player(who)
         message =  player.get_location()
@@ -1005,18 +1331,36 @@ class CareersGameEngine(object):
         return result
         
     
-    def list(self, what='all', initials:str=None, how='condensed') ->CommandResult:
+    def list(self, what='all', initials:str=None, how='condensed', page:int=None) ->CommandResult:
         """List the Experience or Opportunity cards held by the current player
             Arguments: what - 'experience', 'opportunity', or 'all'
                 how - display control: 'full', 'condensed'  (the default), or 'count'
+                page - for 'commands', a page of the complete command history, oldest first, including the commands
+                    of the turns in the GameStore. The default is the most recent commands.
+            For example "list commands 0" is the first page of the current player's commands, "list commands CP 2" the third page of CP's.
             Returns: CommandResult.message is the stringified list of str(card).
                 For Opportunity cards this is the text property.
                 For Experience cards this is the number of spaces (if type is fixed), otherwise the type.
             
         """
+        if isinstance(initials, int):     # list commands <page>
+            initials, page = None, initials
+        elif isinstance(how, int):        # list commands <initials> <page>
+            how, page = 'condensed', how
         player = self.game_state.current_player if initials is None else self.get_player(initials)
+        if page is not None and what.lower().startswith('command'):
+            return self.list_commands(player, page)
         return GameEngineCommands.list(player, what, how)
     
+    def list_commands(self, player:Player, page:int, page_size:int=100) -> CommandResult:
+        """A page of a player's complete command history, oldest first: the commands of the stored turns, then the command history in memory.
+        """
+        stored = (command for record in GameStore.get_store().read_turns(self.game_id, player.number) for command in record["record"]["turn"]["commands"])
+        start = page * page_size
+        commands = list(itertools.islice(itertools.chain(stored, player.command_history), start, start + page_size))
+        message = json.dumps({"commands":commands, "page":page, "page_size":page_size}, indent=2)
+        return CommandResult(CommandResult.SUCCESS, message, False)
+    
     def help(self, what:str="None", name:str="None", format:str="json", how:str='full') ->CommandResult:
         """Get help on an occupation, degree program, or game square
             Arguments: 
@@ -1081,7 +1425,7 @@ Where <what> is 'occupation' or 'command'
     
     def perform(self, what:str, how:str) -> CommandResult:
         player = self.game_state.current_player
-        return GameEngineCommands.perform(player, what, how)
+        return self._gameEngineCommands.perform(player, what, how)
 
     def set(self, who:str, what:str, amount:int):
         """Sets number of hearts, stars or cash for a given player
@@ -1117,10 +1461,11 @@ Where <what> is 'occupation' or 'command'
         
     def saved(self) -> CommandResult:
         """List the games saved by this installationId, if any
-        
+            Returns: a CommandResult where message is a JSON list of the saved games, most recently saved first.
+                Each has the game_id, installationId, edition_name, turns, game_complete, updated date and the players' initials.
         """
-        result = CommandResult(CommandResult.SUCCESS, "'saved' command not yet implemented, but soon!", False)
-        return result    
+        saved_games = GameStore.get_store().list_games_for_user(self.installationId)
+        return CommandResult(CommandResult.SUCCESS, json.dumps(saved_games), False)
 
     def load(self, game_id:str) -> CommandResult:
         """Load a previously saved game, identified by the game Id
@@ -1197,7 +1542,7 @@ Where <what> is 'occupation' or 'command'
         
         return CommandResult(CommandResult.SUCCESS, message, True)
     
-    def create(self, edition, installationId, game_type, points, game_parameters_type="prod") -> CommandResult:
+    def create(self, edition, installationId, game_type, points, game_parameters_type="prod", seed:int=None) -> CommandResult:
         """Create a new CareersGame.
             Arguments:
                 edition - 'Hi-Tech' or 'UK' are the only editions currently supported
@@ -1205,6 +1550,8 @@ Where <what> is 'occupation' or 'command'
                 game_type - 'points', 'timed', or 'solo'
                 game_parameters_type - 'test', 'prod' or 'custom'. This maps to the appropriate (game_mode)
                     gameParameters JSON file: gameParameters_prod.json, gameParameters_test.json
+                seed - optional seed for the game's random number generator. Games created with the same seed
+                    and played with the same commands have the same dice rolls and card draws.
             Returns: 
                 CommandResult
                     message - JSON game_id, installationId if successful, else an error message: "error":<details>
@@ -1219,23 +1566,38 @@ Where <what> is 'occupation' or 'command'
         #
         # Create the CareersGame instance and the GameEngineCommands
         #
-        self._careersGame = CareersGame(self._edition, installationId, points, game_id, game_type=game_type, game_parameters_type=game_parameters_type)
-        
-        self._game_state = self._careersGame.game_state
-        self._game_state.game_id = game_id
-        self._gameEngineCommands = GameEngineCommands(self._careersGame)
-        self._gameEngineCommands.debug = self.debug
-        self.currency_symbol = self._careersGame.game_parameters.get_param("currency_symbol")
+        careers_game = CareersGame(self._edition, installationId, points, game_id, game_type=game_type, game_parameters_type=game_parameters_type, seed=seed)
+        careers_game.game_state.game_id = game_id
+        self.resume(careers_game)
         #
-        # make currency_symbol globally available
+        # the first checkpoint is the new game, the CommandLog has everything after it
         #
-        GameConstants.set_currency_symbol(self.currency_symbol)
+        self._command_log.remove()
+        self.checkpoint()
         
         message = f'{{"game_id":"{self.game_id}", "installationId":"{installationId}"}}'
         self.log_info(message)    # INFO
-        self._plugins = self._careersGame.plugins
         return CommandResult(CommandResult.SUCCESS, message, True)
     
+    def resume(self, careers_game:CareersGame):
+        """Sets the CareersGame this engine plays, for a new or restored game.
+            Commands are appended to the game's CommandLog.
+        """
+        self._careersGame = careers_game
+        self._edition = careers_game.edition_name
+        self._game_state = careers_game.game_state
+        self._gameEngineCommands = GameEngineCommands(careers_game)
+        self._gameEngineCommands.debug = self.debug
+        self._gameEngineCommands.console = self._console
+        self.currency_symbol = careers_game.game_parameters.get_param("currency_symbol")
+        #
+        # make currency_symbol globally available
+        #
+        GameConstants.set_currency_symbol(self.currency_symbol)
+        self._plugins = careers_game.plugins
+        self._command_log = CommandLog(f'{self._game_filename_base}_commands.jsonl')
+        self._checkpoint_turn = self._game_state.turns
+    
     def start(self) -> CommandResult:
         return self._start()
     
@@ -1335,7 +1697,7 @@ Where <what> is 'occupation' or 'command'
                 # roll the die to see if the player must move 
                 # i.e. the roll is not in the special_processing must_roll list
                 # typically 2 - 7
-                dice = GameUtils.roll(2)
+                dice = GameUtils.roll(2, self._careersGame.random)
                 num_spaces = sum(dice)
                 
                 if choice.lower().startswith("s") and num_spaces in special_processing.must_roll:
@@ -1450,8 +1812,9 @@ Where <what> is 'occupation' or 'command'
                     square_number = destination_squares[ind]
                     commands = f"goto {square_number};where am i;roll"
                     result = self.execute_command(commands, player)
-                    logging.debug(f"{player.player_initials} commands: '{commands}'  result: {result.message}")
-                    print(result.message)
+                    if self.is_logging(logging.DEBUG):
+                        logging.debug(f"{player.player_initials} commands: '{commands}'  result: {result.message}")
+                    self._console.write(lambda: result.message)
                 else:
                     result = CommandResult(CommandResult.ERROR, f"{choice} is not a valid destination. Please choose one of {destinations}", False)
                 
@@ -1761,7 +2124,7 @@ Where <what> is 'occupation' or 'command'
                 #
                 # go to next border square and update board_location after the occupation exit
                 #
-                board_location.border_square_number = square_number - occupation.size + occupation.exit_square_number
+                board_location.border_square_number = self._careersGame.game_board.wrap(square_number - occupation.size + occupation.exit_square_number)
                 board_location.occupation_name = None
                 game_square =  self._careersGame.get_border_square(board_location.border_square_number)
                 board_location.border_square_name = game_square.name                
@@ -1782,7 +2145,7 @@ Where <what> is 'occupation' or 'command'
                 and player.experience_card.card_type is ExperienceType.FIXED \
                 and player.experience_card.spaces < 0 else False
             current_square_number = board_location.border_square_number
-            board_size = self._careersGame.game_board.game_layout_dimensions['size']   # total number of squares, 42 is typical
+            board_size = self._careersGame.game_board.game_board_size   # total number of squares, 42 is typical
             if square_number < 0:
                 square_number = board_size + square_number
             if square_number >= 0 and \
@@ -1874,6 +2237,7 @@ Where <what> is 'occupation' or 'command'
             
         else:
             player.occupation_record[board_location.occupation_name] = trips
+        player.changed()
         if trips >= 3:
             #
             # player can retire
@@ -1982,6 +2346,7 @@ Where <what> is 'occupation' or 'command'
         
         else:
             ndegrees = 3  # already maxed out
+        thePlayer.changed()
         
         message = f'{thePlayer.player_initials} awarded {degree_names[ndegrees]} degree in {degreeProgram}'
         if salary_inc > 0:
@@ -0,0 +1,99 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from typing import Dict, Iterator, List
+import json, logging, os, random
+
+class CommandLog(object):
+    """The append-only log of the commands executed by a CareersGameEngine, one JSON record per line.
+        Together with a checkpoint (the pickled CareersGame saved every so many turns) the log is the game:
+        restoring loads the latest checkpoint and replays only the commands logged after it.
+        Each record has:
+            seq - the command sequence number, 1, 2, 3...
+            turns - GameState.turns when the command was executed
+            player - the number of the player executing the command, -1 for the Administrator
+            command - the command text as given to execute_command()
+            args - the additional command arguments, if any
+            auto - the value of GameState.automatic_run when the command was executed
+            rng - a fingerprint of the game's random number generator state after the command
+            chosen - the commands chosen by plug-ins that aren't reproducible, for each computer take_turn the command ran,
+                including those run by other commands, like the computer's turn after a human's "next". Only if there are any.
+                Each is a dict of the "turns" and "player" of the take_turn and the "commands" chosen.
+        The random draws themselves are not logged. The game's random number generator is checkpointed with the game,
+        so replaying the same commands makes the same draws. The fingerprint checks that they did.
+        Records are buffered and appended to the file by flush(), which the engine calls on every change of turn,
+        so a crash loses at most the commands of the turn in progress.
+        Arguments:
+            filename - the log file path. Records are appended to any existing file.
+    """
+
+    def __init__(self, filename:str):
+        self._filename = filename
+        self._buffer:List[str] = []
+        self._appended = 0
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def appended(self) -> int:
+        """The number of records appended by this CommandLog
+        """
+        return self._appended
+
+    def append(self, seq:int, turns:int, player_number:int, command:str, args:list, automatic_run:bool, rng:random.Random, \
+               chosen:List[Dict]=None):
+        """Buffer a command record. Call flush() to write it.
+        """
+        record = {"seq":seq, "turns":turns, "player":player_number, "command":command, "args":args, "auto":automatic_run, \
+                  "rng":CommandLog.fingerprint(rng)}
+        if chosen:
+            record["chosen"] = chosen
+        self._buffer.append(json.dumps(record, default=str))
+        self._appended += 1
+
+    def flush(self):
+        """Appends the buffered records to the log file
+        """
+        if len(self._buffer) == 0:
+            return
+        with open(self._filename, "a") as fp:
+            fp.write("\n".join(self._buffer) + "\n")
+        self._buffer.clear()
+
+    def remove(self):
+        """Discards any buffered records and removes the log file
+        """
+        self._buffer.clear()
+        if os.path.exists(self._filename):
+            os.remove(self._filename)
+
+    @staticmethod
+    def fingerprint(rng:random.Random) -> int:
+        """A cheap, process-independent digest of a random number generator's state
+        """
+        return hash(rng.getstate()[1])
+
+    @staticmethod
+    def read(filename:str, after_seq:int=0) -> Iterator[Dict]:
+        """Reads the records of a command log in sequence order.
+            Arguments:
+                filename - the log file path
+                after_seq - only records with a sequence number greater than this are returned
+            Returns: an Iterator of record dicts. An incomplete last line, left by a crash while appending, is skipped.
+        """
+        if not os.path.exists(filename):
+            return
+        with open(filename, "r") as fp:
+            for line in fp:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(f"{filename}: skipping incomplete command log record")
+                    continue
+                if record["seq"] > after_seq:
+                    yield record
@@ -0,0 +1,154 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from game.commandResult import CommandResult
+from game.gameConstants import GameConstants
+
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+from threading import Lock
+import inspect
+
+class CommandSpec(object):
+    """The dispatch entry for a single CareersGameEngine command.
+        Arguments:
+            name - the command name as it appears in GameConstants.COMMANDS, for example "roll"
+            function - the (unbound) engine method that implements the command, or None if the engine has no such method
+        The argument schema is taken from the method signature once, when the spec is created:
+            params - the names of the positional parameters, not including self
+            varargs - True if the method accepts *args
+            varkw - True if the method accepts **kwargs
+    """
+
+    def __init__(self, name:str, function:Callable|None):
+        self._name = name
+        self._function = function
+        self._params:Tuple[str] = ()
+        self._varargs = False
+        self._varkw = False
+        if function is not None:
+            signature = inspect.signature(function)
+            params = []
+            for p in list(signature.parameters.values())[1:]:     # skip self
+                if p.kind is inspect.Parameter.VAR_POSITIONAL:
+                    self._varargs = True
+                elif p.kind is inspect.Parameter.VAR_KEYWORD:
+                    self._varkw = True
+                else:
+                    params.append(p.name)
+            self._params = tuple(params)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def function(self) -> Callable|None:
+        return self._function
+
+    @property
+    def params(self) -> Tuple[str]:
+        return self._params
+
+    def accepts(self, nargs:int, kwargs:Dict) -> bool:
+        """Returns True if the method can be called with nargs positional arguments and the given kwargs.
+        """
+        if nargs > len(self._params) and not self._varargs:
+            return False
+        return len(kwargs) == 0 or self._varkw or all(k in self._params for k in kwargs)
+
+@lru_cache(maxsize=4096)
+def parse_command(txt:str) -> Tuple[str, Tuple, Tuple]:
+    """Parses a command string into a command name, positional arguments and keyword arguments.
+        The conversion rules are those of GameEngineCommands.parse_command_string:
+        digit arguments are passed as int, all others as str.
+        resolve is special-cased:
+            resolve <what> [choice ...]      -> resolve(<what>, "choice ...")
+            resolve backstab <initials ...>  -> resolve("backstab", "", player_initials="<initials ...>")
+        Arguments:
+            txt - the command string, for example "use opportunity 3"
+        Returns: a 3-tuple (command name, args tuple, kwargs as a tuple of (key, value) pairs)
+        Results are cached since simulated games issue the same few command strings over and over.
+    """
+    command_args = txt.split()
+    command = command_args[0]
+    if len(command_args) == 1:
+        return command, (), ()
+    if command == "resolve":
+        what = command_args[1].lower()
+        rest = " ".join(command_args[2:])
+        if what == "backstab":
+            return command, (what, ""), (("player_initials", rest),)
+        return command, (what, rest), ()
+
+    args = tuple(int(arg) if arg.isdigit() else arg for arg in command_args[1:])
+    return command, args, ()
+
+class CommandRegistry(object):
+    """Maps each command in GameConstants.COMMANDS to the CareersGameEngine method that implements it.
+        This replaces building a Python source string with parse_command_string() and running it through eval().
+        The table is built once per engine class and shared by all engine instances.
+        Commands with no arguments (roll, next, done etc.) go straight from a dictionary lookup to the method call.
+    """
+    _registries:Dict[type, 'CommandRegistry'] = {}
+    _lock = Lock()
+
+    def __init__(self, engine_class:type):
+        self._engine_class = engine_class
+        self._commands:Dict[str, CommandSpec] = {}
+        for name in GameConstants.COMMANDS:
+            self._commands[name] = CommandSpec(name, getattr(engine_class, name, None))
+
+    @staticmethod
+    def get_registry(engine_class:type) -> 'CommandRegistry':
+        """Gets the shared CommandRegistry for an engine class, creating it on first use.
+        """
+        registry = CommandRegistry._registries.get(engine_class)
+        if registry is None:
+            with CommandRegistry._lock:
+                registry = CommandRegistry._registries.get(engine_class)
+                if registry is None:
+                    registry = CommandRegistry(engine_class)
+                    CommandRegistry._registries[engine_class] = registry
+        return registry
+
+    @property
+    def commands(self) -> Dict[str, CommandSpec]:
+        return self._commands
+
+    def get_command(self, name:str) -> CommandSpec|None:
+        return self._commands.get(name)
+
+    def dispatch(self, engine, txt:str, addl_args:List[str]=[]) -> CommandResult:
+        """Parse and execute a command string against an engine instance.
+            Arguments:
+                engine - a CareersGameEngine instance
+                txt - the command name + any arguments, for example "resolve buy_hearts 2"
+                addl_args - an optional list of additional string arguments, appended after the parsed arguments
+            Returns: the CommandResult of the command, or an ERROR CommandResult if the command is invalid
+            Exceptions raised by the command itself are passed on to the caller.
+        """
+        spec = self._commands.get(txt)
+        if spec is not None and spec.function is not None and not addl_args:
+            return spec.function(engine)      # fast path: no-argument command
+
+        if len(txt) == 0 or txt.isspace():
+            return CommandResult(CommandResult.ERROR,  'Missing command',  False)
+        command, args, kwargs = parse_command(txt)
+        spec = self._commands.get(command)
+        if spec is None:
+            return CommandResult(CommandResult.ERROR,  f'Invalid command: "{command}"',  False)
+        if spec.function is None:
+            return CommandResult(CommandResult.ERROR,  f'Command "{command}" is not implemented',  False)
+
+        if addl_args and command != "resolve":
+            args = args + tuple(addl_args)
+        kwargs = dict(kwargs)
+        if not spec.accepts(len(args), kwargs):
+            message = f'"{txt}" : Invalid command format, {command} takes arguments ({", ".join(spec.params)})'
+            return CommandResult(CommandResult.ERROR,  message,  False)
+        return spec.function(engine, *args, **kwargs)
+
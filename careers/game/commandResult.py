@@ -5,7 +5,7 @@ Created on Aug 21, 2022
 '''
 from game.careersObject import CareersObject
 from game.boardLocation import BoardLocation
-from typing import List
+from typing import List, Callable
 import json
 
 class CommandResult(CareersObject):
@@ -19,7 +19,7 @@ class CommandResult(CareersObject):
     NEED_PLAYER_CHOICE = 4  # successful, but need player choice as to what to do next
     
 
-    def __init__(self, return_code:int, message:str, done_flag:bool, next_action:str=None, board_location:BoardLocation=None, exception:Exception=None, choices:List[str]=None):
+    def __init__(self, return_code:int, message:str|Callable[[], str], done_flag:bool, next_action:str=None, board_location:BoardLocation=None, exception:Exception=None, choices:List[str]=None):
         """Constructor, baby.
             Arguments:
                 return_code - integer return code:
@@ -28,6 +28,8 @@ class CommandResult(CareersObject):
                     TERMINATE = 2  terminate the game
                     EXECUTE_NEXT = 3  success, and execute the next_action for the current player
                 message - a message string to be displayed to the player. Can be blank but not None.
+                    This can also be a zero-argument callable that returns the message string. It's called the first time
+                    the message is read, so text that nobody reads (in a headless simulation for example) is never rendered.
                 jsonMessage - a JSON formatted message for the server
                 done_flag - if  True, this player's turn is completed, False otherwise.
                 next_action - next action to perform for this player, default is None. 
@@ -41,7 +43,8 @@ class CommandResult(CareersObject):
         """
         self._return_code = return_code
         self._message = message
-        self._json_message = f'{{"userMessage":{message}}}'
+        self._json_message = None           # rendered from the original message when first read
+        self._json_source = message
         self._done_flag = done_flag
         self._exception = exception
         self._next_action = next_action
@@ -58,12 +61,38 @@ class CommandResult(CareersObject):
     
     @property
     def message(self):
+        if callable(self._message):
+            rendered = self._message()
+            if self._json_source is self._message:
+                self._json_source = rendered
+            self._message = rendered
         return self._message
     
     @message.setter
     def message(self, amessage):
         self._message = amessage
     
+    def prepend_message(self, text:str):
+        """Prepends text and a newline to this message without rendering the message
+        """
+        message = self._message
+        self._message = lambda: f"{text}\n{message() if callable(message) else message}"
+    
+    def combine_messages(self, results:List['CommandResult']):
+        """Sets this message to the messages of results, each followed by a newline, without rendering them.
+            This CommandResult may itself be one of the results.
+        """
+        sources = [self._message if r is self else r for r in results]
+        def render() -> str:
+            messages = []
+            for source in sources:
+                if isinstance(source, CommandResult):
+                    messages.append(source.message)
+                else:
+                    messages.append(source() if callable(source) else source)
+            return "".join([m + "\n" for m in messages])
+        self._message = render
+    
     @property
     def done_flag(self):
         return self._done_flag
@@ -98,6 +127,13 @@ class CommandResult(CareersObject):
         
     @property
     def json_message(self):
+        if self._json_message is None:
+            if self._json_source is self._message:
+                self._json_source = self.message
+            elif callable(self._json_source):
+                self._json_source = self._json_source()
+            self._json_message = f'{{"userMessage":{self._json_source}}}'
+            self._json_source = None
         return self._json_message
     
     @json_message.setter
@@ -120,6 +156,13 @@ class CommandResult(CareersObject):
     def choices(self, value:List[str]):
         self._choices = value
         
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_message"] = self.message      # a message callable can't be pickled
+        state["_json_message"] = self.json_message
+        state["_json_source"] = None
+        return state
+    
     def is_successful(self):
         return True if self.return_code == CommandResult.SUCCESS else False
     
@@ -0,0 +1,75 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from typing import TextIO
+import sys
+
+class ConsoleOutput(object):
+    """Destination for the console (print) output of the game engine and game components.
+        By default output goes to sys.stdout and error output to sys.stderr.
+        A headless ConsoleOutput discards everything, which is what batch simulations want.
+        A value to write can be a zero-argument callable, for example lambda: result.message,
+        which is only called if this output is enabled. That way nothing is rendered for a headless console.
+    """
+    _default:'ConsoleOutput' = None
+
+    def __init__(self, enabled:bool=True, out:TextIO=None, err:TextIO=None):
+        """Create a ConsoleOutput
+            Arguments:
+                enabled - if False, all output is discarded
+                out - the output stream, default is sys.stdout at the time of writing
+                err - the error output stream, default is sys.stderr at the time of writing
+        """
+        self._enabled = enabled
+        self._out = out
+        self._err = err
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value:bool):
+        self._enabled = value
+
+    def __reduce__(self):
+        """Output streams belong to the process, so a ConsoleOutput is pickled (with a saved game for example)
+            as the default console, or as a headless console if it's disabled.
+        """
+        return (ConsoleOutput.get_default, ()) if self._enabled else (ConsoleOutput.headless, ())
+
+    def write(self, *values, error:bool=False):
+        """Writes values separated by a space, like print()
+            Arguments:
+                values - the values to write. Callables are called to get the value.
+                error - if True write to the error stream
+        """
+        if not self._enabled:
+            return
+        text = " ".join([str(v() if callable(v) else v) for v in values])
+        if error:
+            print(text, file=self._err if self._err is not None else sys.stderr)
+        else:
+            print(text, file=self._out if self._out is not None else sys.stdout)
+
+    @staticmethod
+    def headless() -> 'ConsoleOutput':
+        """Returns a ConsoleOutput that discards all output
+        """
+        return ConsoleOutput(enabled=False)
+
+    @staticmethod
+    def get_default() -> 'ConsoleOutput':
+        """The process-wide ConsoleOutput used by components that don't belong to a CareersGameEngine,
+            for example restore_game() and Player._load()
+        """
+        if ConsoleOutput._default is None:
+            ConsoleOutput._default = ConsoleOutput()
+        return ConsoleOutput._default
+
+    @staticmethod
+    def set_default(console:'ConsoleOutput'):
+        ConsoleOutput._default = console
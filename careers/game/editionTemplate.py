@@ -0,0 +1,265 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from game.environment import Environment
+from game.opportunityCardDeck import OpportunityCardDeck
+from game.experienceCardDeck import ExperienceCardDeck
+from game.occupation import Occupation
+from game.gameBoard import GameBoard
+from game.gameParameters import GameParameters
+from game.gameConstants import GameConstants, GameParametersType
+
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Tuple, Union
+import json, logging, copy
+
+class EditionTemplate(object):
+    """The read-only resources of a game edition for a given GameParametersType.
+        This includes the edition configuration, game parameters, occupations (and their occupation squares),
+        the game board, card decks, college degrees and turn outcome parameters.
+        A template is loaded once per process for each (edition_name, game_parameters_type)
+        and shared by every CareersGame of that edition, so nothing here may be changed during game play.
+        Per-game state (players, the GameState and the order of the card decks) is held by CareersGame.
+        Use EditionTemplate.get_template() rather than the constructor.
+    """
+    _templates:Dict[Tuple[str, GameParametersType], 'EditionTemplate'] = {}
+    _lock = Lock()
+
+    def __init__(self, edition_name:str, game_parameters_type:GameParametersType):
+        """Load an EditionTemplate.
+            Arguments:
+                edition_name - the name of the edition to load. This must be a key in editions.json file.
+                game_parameters_type - a GameParametersType
+            Raises:
+                ValueError if there is no such edition
+        """
+        self._edition_name = edition_name
+        self._game_parameters_type = game_parameters_type
+        self._env = Environment.get_environment()
+        self._resource_folder = self._env.get_resource_folder()     # base resource folder
+        #
+        # validate the Edition
+        #
+        with open(self._resource_folder + "/editions.json", "r") as fp:
+            editions_txt = json.loads(fp.read())
+        self._editions = editions_txt['editions']   # list of editions
+        if edition_name in self._editions:
+            self._edition = editions_txt[edition_name]
+        else: raise ValueError(f"No such edition {edition_name}")
+        self._edition_path = self._edition["edition_path"]
+        #
+        # load game parameters, layout and occupations
+        #
+        self._load_game_configuration()
+        #
+        # the Opportunity and Experience card decks. A CareersGame gets its own copy of each with deck.new_deck()
+        #
+        self._opportunities = OpportunityCardDeck(self._resource_folder, self._edition_path)
+        self._experience_cards = ExperienceCardDeck(self._resource_folder, self._edition_path)
+        self._college_degrees =  self._load_college_degrees()  # dict with keys: degreePrograms (list), maxDegrees (int), degreeNames (list)
+        #
+        # load the game board
+        #
+        self._game_board = GameBoard(f'{self._resource_folder}/{self._edition_path}/gameLayout.json', game=self)
+        #
+        # plug-in modules for this edition, List[Dict] with keys "name", "module"
+        #
+        self._discovered_plugins = GameConstants.get_plugins(edition_name, apath=None)
+
+    @staticmethod
+    def get_template(edition_name:str, game_parameters_type:GameParametersType) -> 'EditionTemplate':
+        """Gets the EditionTemplate for an edition and game parameters type, loading it on first use.
+            Raises:
+                ValueError if there is no such edition
+        """
+        key = (edition_name, game_parameters_type)
+        template = EditionTemplate._templates.get(key)
+        if template is None:
+            with EditionTemplate._lock:
+                template = EditionTemplate._templates.get(key)
+                if template is None:
+                    template = EditionTemplate(edition_name, game_parameters_type)
+                    EditionTemplate._templates[key] = template
+                    logging.debug(f"EditionTemplate loaded for {edition_name} {game_parameters_type.value}")
+        return template
+
+    def __reduce__(self):
+        """A template is pickled by reference: unpickling gets (or loads) the template for the same edition in this process.
+        """
+        return (EditionTemplate.get_template, (self._edition_name, self._game_parameters_type))
+
+    @staticmethod
+    def clear_templates():
+        """Discards all loaded templates, for example after edition resource files have been changed.
+            Existing games keep the template they were created with.
+        """
+        with EditionTemplate._lock:
+            EditionTemplate._templates = {}
+
+    def _load_game_configuration(self):
+        """Loads the game parameters and occupations JSON files for this edition.
+
+        """
+        game_params_type = self._game_parameters_type.value
+        self._game_parameters_filename = f'{self._resource_folder}/{self._edition_path}/gameParameters_{game_params_type}.json'
+
+        with open(self._game_parameters_filename, "r") as fp:
+            jtxt = fp.read()
+            self._game_parameters = GameParameters(json.loads(jtxt))
+
+        self._occupations_filename = f'{self._resource_folder}/{self._edition_path}/occupations.json'
+        with open(self._occupations_filename, "r") as fp:
+            jtxt = fp.read()
+            occupations_dict = json.loads(jtxt)
+            self._occupations_dict = copy.deepcopy(occupations_dict)
+            self._occupation_names = occupations_dict['occupations']
+
+        #
+        # load point icons
+        #
+        self._point_icons =  self._edition["point_icons"] if "point_icons" in self._edition else None
+        GameConstants.load_point_icons(self._point_icons)
+
+        # load the individual occupation files
+        self._occupations = self.load_occupations()     # dictionary of Occupation instances keyed by name
+
+        #
+        # add alternate names to occupation_names
+        #
+        for key in self._occupations.keys():
+            if key not in self._occupation_names:
+                self._occupation_names.append(key)
+            else:
+                self._occupation_names.append(key.lower())
+
+
+        self._turn_outcome_parameters_filename = f'{self._resource_folder}/{self._edition_path}/turnOutcomeParameters.json'
+        with open(self._turn_outcome_parameters_filename, "r") as fp:
+            jtxt = fp.read()
+            turn_outcome_dict = json.loads(jtxt)
+            turn_outcome_parameters = turn_outcome_dict['turn_outcome_parameters']
+            self._turn_outcome_parameters = {}
+            for key in turn_outcome_parameters:
+                val = turn_outcome_parameters[key]
+                if "<STAR>" in key:
+                    key = key.replace("<STAR>", GameConstants.STAR)
+
+                elif "<HEART>" in key:
+                    key = key.replace("<HEART>", GameConstants.HEART)
+
+                self._turn_outcome_parameters.update({key:val})
+
+    def load_occupations(self) -> Dict[str, Occupation]:
+        """Loads individual occupation JSON files for this edition.
+             The occupation name is the same as the border square name.
+            Returns: a dict with the occupation name as the key and contents
+                of the corresponding occupation JSON file (as a dict) as the value.
+                If the occupation JSON file doesn't exist, the value is None.
+            Note: the filename is the occupation name + "_" + the edition_name + ".json"
+                The file path is the resource_folder set in the Environment
+        """
+        occupations:Dict[str, Occupation] = {}
+        for name in self._occupation_names:
+            filepath = f'{self._resource_folder}/{self._edition_path}/{name}.json'
+            p = Path(filepath)
+            if p.exists():
+                with open(filepath, "r") as fp:
+                    logging.info(filepath)
+                    occupation_dict = json.loads(fp.read())
+                # create an Occupation object for this occupation
+                occupation = Occupation(occupation_dict, game=self)
+                logging.info(f"{name} cards: {occupation.cards}\n points: {occupation.points}")
+                occupations[name] = occupation
+                occupations[name.lower()] = occupation
+                alternate_name = occupation.alternate_name
+                if alternate_name != name:
+                    occupations[alternate_name] = occupation
+                    occupations[alternate_name.lower()] = occupation
+            else:
+                occupations[name] = None
+        return occupations
+
+    def _load_college_degrees(self) -> Dict[str, Union[List[int] ,List[str], int]]:
+        with open(f'{self._resource_folder}/{self._edition_path}/collegeDegrees.json', "r") as fp:
+            degrees = json.loads(fp.read())
+        return degrees
+
+    @property
+    def edition(self) -> Dict:
+        return self._edition
+
+    @property
+    def edition_name(self) -> str:
+        return self._edition_name
+
+    @property
+    def edition_path(self) -> str:
+        return self._edition_path
+
+    @property
+    def editions(self) -> List[str]:
+        return self._editions
+
+    @property
+    def game_parameters_type(self) -> GameParametersType:
+        return self._game_parameters_type
+
+    @property
+    def resource_folder(self) -> str:
+        return self._resource_folder
+
+    @property
+    def game_parameters_filename(self) -> str:
+        return self._game_parameters_filename
+
+    @property
+    def occupations_filename(self) -> str:
+        return self._occupations_filename
+
+    @property
+    def game_parameters(self) -> GameParameters:
+        return self._game_parameters
+
+    @property
+    def point_icons(self) -> Dict | None:
+        return self._point_icons
+
+    @property
+    def occupation_names(self) -> List[str]:
+        return self._occupation_names
+
+    @property
+    def occupations(self) -> Dict[str, Occupation]:
+        return self._occupations
+
+    @property
+    def occupations_dict(self) -> Dict:
+        return self._occupations_dict
+
+    @property
+    def turn_outcome_parameters(self) -> Dict:
+        return self._turn_outcome_parameters
+
+    @property
+    def opportunities(self) -> OpportunityCardDeck:
+        return self._opportunities
+
+    @property
+    def experience_cards(self) -> ExperienceCardDeck:
+        return self._experience_cards
+
+    @property
+    def college_degrees(self) -> Dict:
+        return self._college_degrees
+
+    @property
+    def game_board(self) -> GameBoard:
+        return self._game_board
+
+    @property
+    def discovered_plugins(self) -> List[Dict]:
+        return self._discovered_plugins
@@ -5,6 +5,7 @@ Created on Aug 26, 2022
 '''
 
 import json
+from typing import Dict, List, Tuple
 from game.borderSquare import BorderSquare, BorderSquareType
 from game.gameConstants import GameConstants
 
@@ -13,13 +14,15 @@ class GameBoard(object):
     """Encapsulates a Careers game board border squares.
         This structure does not include the Occupation path squares.
         They are accessed from CareersGame from occupations dictionary.
+        Navigation tables are built when the board is loaded, so finding the next square of a given type
+        or the square with a given name is a table lookup.
     """
 
     def __init__(self, game_layout_filename, game=None):
         """Create a new GameBoard
             Arguments:
                 game_layout_filename - the full path to the gameLayout JSON file, for example: "/Compile/careers/resources/gameLayout_Hi-Tech.json"
-                game - a CareersGame instance
+                game - the EditionTemplate this board belongs to
         """
         self._game_layout_filename = game_layout_filename
         self._occupation_entrance_squares = {}         # dictionary of BorderSquare that are type "occupation_entrance_square" indexed by name
@@ -65,6 +68,62 @@ class GameBoard(object):
                 
             if 'special_processing' in border_square_dict:
                 ...    # SpecialProcessing added as part of BorderSquare constructor
+        
+        self._build_navigation_tables()
+    
+    def _build_navigation_tables(self):
+        """For each square type, the type and name of each square, and each (lower case) square name,
+            a list indexed by square number of the square number to go to from that square.
+        """
+        numbers_of_type:Dict[BorderSquareType, List[int]] = {}
+        numbers_of_type_named:Dict[Tuple[BorderSquareType, str], List[int]] = {}
+        numbers_named:Dict[str, List[int]] = {}
+        for square in self._border_squares:     # in square number order
+            numbers_of_type.setdefault(square.square_type, []).append(square.number)
+            numbers_of_type_named.setdefault((square.square_type, square.name), []).append(square.number)
+            numbers_named.setdefault(square.name.lower(), []).append(square.number)
+        #
+        # next square of a type is strictly after the current square, a name includes the starting square
+        #
+        self._next_of_type = {atype : self._next_table(numbers, inclusive=False) for atype,numbers in numbers_of_type.items()}
+        self._next_of_type_named = {key : self._next_table(numbers, inclusive=False) for key,numbers in numbers_of_type_named.items()}
+        self._next_named = {name : self._next_table(numbers, inclusive=True) for name,numbers in numbers_named.items()}
+    
+    def _next_table(self, numbers:List[int], inclusive:bool) -> List[int]:
+        """Arguments:
+                numbers - square numbers in ascending order
+                inclusive - if True a square number in numbers maps to itself
+            Returns: a List of the first of numbers after (or at) each square number, wrapping around the board
+        """
+        table = [0] * self._game_board_size
+        candidates = set(numbers)
+        following = numbers[0]      # past the last of numbers is the first of numbers
+        for square_number in range(self._game_board_size-1, -1, -1):
+            if inclusive and square_number in candidates:
+                following = square_number
+            table[square_number] = following
+            if not inclusive and square_number in candidates:
+                following = square_number
+        return table
+    
+    def wrap(self, square_number:int) -> int:
+        """The square number on the board of a square number past Payday (>= board size) or before square 0 (<0)
+        """
+        return square_number % self._game_board_size
+    
+    def next_square_number(self, square_number:int, atype:BorderSquareType, name:str=None) -> int|None:
+        """The number of the next square after square_number of a given type and optional (exact) name,
+            wrapping around the board. Returns None if there is no such square.
+        """
+        table = self._next_of_type.get(atype) if name is None else self._next_of_type_named.get((atype, name))
+        return None if table is None else table[self.wrap(square_number)]
+    
+    def find_square_number(self, name:str, starting_square_number:int=0) -> int|None:
+        """The number of the first square named name (NOT case sensitive) at or after starting_square_number,
+            wrapping around the board. Returns None if there is no such square.
+        """
+        table = self._next_named.get(name.lower())
+        return None if table is None else table[self.wrap(starting_square_number)]
     
     @property
     def border_squares(self) ->list:    # list of BorderSquare
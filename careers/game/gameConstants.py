@@ -190,12 +190,15 @@ class GameConstants(object):
         GameConstants.wormholes.append(wormhole)
     
     @staticmethod
-    def pick_random_wormhole() -> Dict:
+    def pick_random_wormhole(rng:random.Random=None) -> Dict:
         """Pick and return a wormhole at random from GameConstants.wormholes.
             If there are no wormholes, return an empty Dict {}
+            Arguments:
+                rng - the game's random.Random. If None the random module is used.
         """
+        rng = random if rng is None else rng
         wn = len(GameConstants.wormholes)
-        return GameConstants.wormholes[random.randrange(len(GameConstants.wormholes))] if wn > 0 else {}
+        return GameConstants.wormholes[rng.randrange(len(GameConstants.wormholes))] if wn > 0 else {}
         
     @staticmethod
     def get_plugins(edition_name="All", apath=None) ->List[Dict]:
@@ -10,10 +10,13 @@ from game.player import Player
 from game.opportunityCard import OpportunityCard, OpportunityType, OpportunityActionType
 from game.occupation import Occupation
 from game.gameConstants import GameConstants, PendingActionType, SpecialProcessingType
+from game.consoleOutput import ConsoleOutput
+from game.gameUtils import GameUtils
+from game.gameWriter import GameWriter
+from game.gameStore import GameStore
 
 from typing import Tuple, List
-import joblib
-import random, json, sys
+import json, pickle, sys
 import logging
 from game.borderSquare import BorderSquareType
 
@@ -26,6 +29,7 @@ class GameEngineCommands(object):
         self._careersGame = thegame
         self._game_state = self._careersGame.game_state
         self._debug = False          # traces the action by describing each step and logs to a file
+        self._console = ConsoleOutput.get_default()     # set by the CareersGameEngine
         self.currency_symbol = self._careersGame.game_parameters.get_param("currency_symbol")
     
     @property 
@@ -36,6 +40,14 @@ class GameEngineCommands(object):
     def careersGame(self, thegame:CareersGame):
         self._careersGame = thegame
         
+    @property
+    def console(self) -> ConsoleOutput:
+        return self._console
+    
+    @console.setter
+    def console(self, value:ConsoleOutput):
+        self._console = value
+    
     @property
     def debug(self):
         return self._debug
@@ -75,7 +87,7 @@ class GameEngineCommands(object):
                 result = CommandResult(CommandResult.SUCCESS, f'Player may move {dice} spaces', True)
         
         if result is None:
-            print("ERROR result is None", file=sys.stderr)
+            self._console.write("ERROR result is None", error=True)
         can_move = result.is_successful()
         return can_move, result
 
@@ -171,6 +183,8 @@ class GameEngineCommands(object):
         """Parses a command string into an executable string, i.e. that can be evaluated with eval()
             Returns: if return_code == 0, a CommandResult with commandResult.message as the string to eval()
                 else if return_code == 1, commandResult.message has the error message
+            NOTE - CareersGameEngine no longer uses this, commands are dispatched by game.commandRegistry.
+            It is retained for tools that want the eval() form of a command.
         """
         command_args = txt.split()
             
@@ -239,8 +253,7 @@ class GameEngineCommands(object):
         result = CommandResult(CommandResult.SUCCESS, message, False)
         return result   
 
-    @staticmethod
-    def perform(player:Player, what:str, how:str) -> CommandResult:
+    def perform(self, player:Player, what:str, how:str) -> CommandResult:
         """Perform some pre-defined action.
             Arguments:
                 player - Player instance, typically the current player
@@ -258,7 +271,7 @@ class GameEngineCommands(object):
         if what.startswith("roll"):
             # the how has the number of dice (as a string), Player is not used
             ndice = int(how)
-            dice = random.choices(population=[1,2,3,4,5,6], k=ndice)
+            dice = GameUtils.roll(ndice, self._careersGame.random)
             num_spaces = sum(dice)
             result_dict = {"player" : player.player_initials,  "roll" : num_spaces, "dice" : dice }
             message = json.dumps(result_dict)
@@ -349,7 +362,7 @@ class GameEngineCommands(object):
                 for aplayer in self.careersGame.game_state.players:
                     ncards = len(aplayer.my_experience_cards)
                     if player.number != aplayer.number and ncards > 0:
-                        ind = random.randint(0, ncards-1)    # the index of the card to move to this player
+                        ind = self._careersGame.random.randint(0, ncards-1)    # the index of the card to move to this player
                         thecard = aplayer.my_experience_cards[ind]
                         aplayer.remove_experience_card(thecard)
                         player.add_experience_card(thecard)
@@ -393,11 +406,15 @@ class GameEngineCommands(object):
         
         return result
     
-    def save_game(self, gamefile_base_name:str, game_id:str, how='json') -> CommandResult:
+    def save_game(self, gamefile_base_name:str, game_id:str, how='json', write_behind=False) -> CommandResult:
         """Save the complete serialized game state so it can be restarted at a later time.
             Arguments:
                 how - serialization format to use: 'json', 'jsonpickle' or 'pkl' (pickle)
-            NOTE that the game state is automatically saved in pkl format after each player's turn.
+                    'json' saves to the GameStore, GameStore.get_store(), which by default is the {game_id}_game.json file in the games folder
+                write_behind - applies to 'pkl'. If True the game is pickled now and written to disk by the GameWriter thread.
+                    Use GameWriter.get_writer().flush(filename) to wait for the file.
+                    If False (the default) the file is written before save_game returns.
+            NOTE that the game state is automatically checkpointed in pkl format (write-behind) every few turns, see CareersGameEngine.checkpoint()
             NOTE saving in JSON format saves only the GameState; pkl and jsonpickle persist CareersGame
         """
         extension = 'pkl' if how=='pkl' else 'json'
@@ -410,9 +427,12 @@ class GameEngineCommands(object):
             experience_deck = {"next_index":self.careersGame.experience_cards.next_index, "cards_index":self.careersGame.experience_cards.cards_index}
             game_dict["opportunity_deck"] = opportunity_deck
             game_dict["experience_deck"] = experience_deck
+            game_dict["random"] = self._careersGame.random_to_dict()
+            game_dict["command_sequence"] = self._careersGame.command_sequence
             
-            with open(filename, "w") as fp:
-                json.dump(game_dict, fp, indent=2)
+            store = GameStore.get_store()
+            store.save_state(game_id, game_dict)
+            filename = store.location(game_id)
 
         elif how == 'jsonpickle':
             jstr = self._careersGame.json_pickle()
@@ -421,15 +441,25 @@ class GameEngineCommands(object):
             fp.close()
             
         else:
+            #
+            # the pickle only has the game's own state, the shared EditionTemplate is pickled by reference.
+            # The file can be loaded with pickle.load() or joblib.load()
+            #
             try:
-                result = joblib.dump(self._careersGame, filename)   # returns a list, as in  ['/data/games/ZenAlien2013_20220909-124721-555368-33134.pkl']
-                filename = f'{result}'
+                data = pickle.dumps(self._careersGame, protocol=pickle.HIGHEST_PROTOCOL)
             except Exception as ex:
-                message = f"joblib.dump exception: {str(ex)}"
+                message = f"pickle exception: {str(ex)}"
                 logging.warn(message)
-                print(message, file=sys.stderr  )
+                self._console.write(message, error=True)
 
                 return CommandResult(CommandResult.ERROR, message, True)
+            #
+            # an immediate save also waits for any earlier write-behind saves of this game, so they can't overwrite it
+            #
+            writer = GameWriter.get_writer()
+            writer.submit(filename, data)
+            if not write_behind:
+                writer.flush(filename)
         
         self.log(f'game saved to {filename}')
         return CommandResult(CommandResult.SUCCESS, filename, True)
@@ -440,5 +470,5 @@ class GameEngineCommands(object):
         """
         logging.info(message)
         if self.debug:
-            print(message)
+            self._console.write(message)
     
\ No newline at end of file
@@ -12,7 +12,10 @@ from game.careersGame import CareersGame, restore_game
 from game.gameState import GameState
 from game.gameUtils import GameUtils
 from game.successFormula import SuccessFormula
-import argparse, time
+from game.gameSimulator import GameSimulator
+from game.environment import Environment
+from typing import Dict, List
+import argparse, time, json, os
 import logging
 
 class GameRunner(object):
@@ -30,11 +33,13 @@ class GameRunner(object):
             script - a script file to execute
             careers_game - a CareersGame instance. If not None, all previous parameters except debug_flag
               are set from careers_game
+            headless - if True, discard all console output. Use for batch simulation.
+            seed - optional seed for a new game's random number generator, to replay a game
             
     """
 
     def __init__(self, edition:str, installationId:str, game_type:str, total_points:int, game_duration:int, loglevel:str,\
-                  game_mode:str, careers_game:CareersGame|None=None, game_id:str|None=None):
+                  game_mode:str, careers_game:CareersGame|None=None, game_id:str|None=None, headless=False, seed:int|None=None):
         """
         Constructor
         """
@@ -49,9 +54,9 @@ class GameRunner(object):
             total_points = self.total_points if game_type is GameType.POINTS else self.game_duration
             
             self.game_engine = \
-                CareersGameEngine(careers_game=None, game_id=None, loglevel=loglevel, edition=edition, installationId=installationId)
+                CareersGameEngine(careers_game=None, game_id=None, loglevel=loglevel, edition=edition, installationId=installationId, headless=headless)
 
-            result = self.game_engine.create(self._edition, self._installationId, self._game_type.value, total_points, game_mode)
+            result = self.game_engine.create(self._edition, self._installationId, self._game_type.value, total_points, game_mode, seed=seed)
             if result.return_code != CommandResult.SUCCESS:
                 logging.error("Could not create a CareersGame")
             
@@ -59,16 +64,16 @@ class GameRunner(object):
             self._game_id = self._careersGame.gameId
             
         else:    # restore an existing game
-            self._game_id = self._careersGame.gameId
-            self.game_engine = CareersGameEngine(careers_game=careers_game, game_id=self.game_id, loglevel='warning', installationId=installationId)
+            self._careersGame = careers_game
+            self._game_id = careers_game.gameId
+            self._edition = careers_game.edition_name
+            self.game_engine = CareersGameEngine(careers_game=careers_game, game_id=self.game_id, loglevel=loglevel, installationId=installationId, \
+                                                 edition=self._edition, headless=headless)
             self.total_points = careers_game.game_state.total_points             # applies to GameType.POINTS
             self.game_duration = careers_game.game_state.get_time_remaining()    # applies to GameType.TIMED
-            self._edition = careers_game.edition_name
             self._game_type = careers_game.game_state.game_type
             # initialize CareersGameEngine with restored values
-            self.game_engine.game_state = careers_game.game_state
-            self.game_engine.careersGame = careers_game
-            self.game_engine.gameId = game_id
+            self.game_engine.resume(careers_game)
         
         debug_flag = loglevel == 'debug'
         self._debug = debug_flag          # traces the action by describing each step
@@ -267,7 +272,7 @@ class GameRunner(object):
                     turn_number += 1
                 
                 if result is not None:
-                    print(f'"{cmd}": {result.message}')
+                    self.game_engine.console.write(lambda: f'"{cmd}": {result.message}')
                     if result.return_code == CommandResult.TERMINATE:
                         break
                     
@@ -276,10 +281,42 @@ class GameRunner(object):
                 
         self.game_engine.end()
 
+    @staticmethod
+    def simulate(edition:str, ngames:int, nplayers:int=2, total_points:int=100, success_formulas:List[SuccessFormula]|None=None, \
+                 strategy_level:str|None=None, game_mode:str="test", max_turns:int=1000, workers:int|None=None, seed:int|None=None, \
+                 csv_path:str|None=None, npz_path:str|None=None, turns_folder:str|None=None) -> Dict:
+        """Runs ngames all-computer games across a pool of worker processes and returns the summary.
+            Arguments:
+                edition - the game edition
+                ngames - the number of games to play
+                nplayers - the number of computer players in each game
+                total_points - success formula total points
+                success_formulas - an optional List of SuccessFormula, one per player. If None, formulas are random.
+                strategy_level - Careers_All_Strategy level: 'dumb', 'basic', 'smart', or None for the configured level
+                game_mode - game parameters type: 'test', 'prod' or 'custom'
+                max_turns - games not won in this many turns are counted as incomplete
+                workers - the number of worker processes, default is the number of cores
+                seed - the base random seed. Game n uses seed + n
+                csv_path - if not None, write per-game results to this CSV file
+                npz_path - if not None, write per-game results to this NumPy .npz file
+                turns_folder - if not None, append every turn of every game to the TurnDataset in this folder
+            Returns: the GameSimulator summary dict. See GameSimulator.summarize()
+        """
+        simulator = GameSimulator(edition, nplayers=nplayers, total_points=total_points, success_formulas=success_formulas, \
+                                  strategy_level=strategy_level, game_parameters_type=game_mode, max_turns=max_turns, workers=workers, seed=seed, \
+                                  turns_folder=turns_folder)
+        summary = simulator.simulate(ngames)
+        summary["seed"] = simulator.seed
+        if csv_path is not None:
+            simulator.write_csv(csv_path)
+        if npz_path is not None:
+            simulator.write_npz(npz_path)
+        return summary
+
 
 def main():
     parser = argparse.ArgumentParser(description="Run a command-driven Careers Game for 1 to 6 players, 0 to 2 computer players")
-    parser.add_argument("--players", "-p", help="The number of human players", type=int, choices=range(1,6), default=1)
+    parser.add_argument("--players", "-p", help="The number of human players, or the number of computer players with --simulate", type=int, choices=range(1,6), default=1)
     parser.add_argument("--cp", help="The number of computer players", type=int, choices=range(0,3), default=0)
     parser.add_argument("--points", help="Total game points", type=int, choices=range(30, 10000), default=100)
     parser.add_argument("--time", help="For a timed game, the game duration in minutes", type=int, choices=range(5, 24*60), default=30)
@@ -295,8 +332,24 @@ def main():
     parser.add_argument("--loglevel", help="Set Python logging level", type=str, choices=["debug","info","warning","error","critical"], default="warning")
     parser.add_argument("--type","-t", help="Game type: points, timed", type=str, choices=["points", "timed"], default="points")
     parser.add_argument("--restore", "-r", help="Restore game by gameid", action="store_true", default=False)
+    parser.add_argument("--headless", help="Discard console output when running a script", action="store_true", default=False)
+    parser.add_argument("--simulate", help="Simulate a number of all-computer games and print a summary", type=int, default=0)
+    parser.add_argument("--workers", help="The number of worker processes for --simulate, default is the number of cores", type=int, default=None)
+    parser.add_argument("--strategy", help="Computer player strategy level for --simulate", type=str, choices=["dumb","basic","smart"], default=None)
+    parser.add_argument("--maxturns", help="Maximum turns per game for --simulate", type=int, default=1000)
+    parser.add_argument("--seed", help="Random seed for a new game, or the base random seed for --simulate", type=int, default=None)
+    parser.add_argument("--csv", help="CSV file for --simulate results", type=str, default=None)
+    parser.add_argument("--npz", help="NumPy .npz file for --simulate results", type=str, default=None)
+    parser.add_argument("--turns", help="TurnDataset folder to record every turn of --simulate games", type=str, default=None)
     args = parser.parse_args()
     
+    if args.simulate > 0:
+        summary = GameRunner.simulate(args.edition, args.simulate, nplayers=args.players, total_points=args.points, strategy_level=args.strategy, \
+                                      game_mode=args.params, max_turns=args.maxturns, workers=args.workers, seed=args.seed, csv_path=args.csv, npz_path=args.npz, \
+                                      turns_folder=args.turns)
+        print(json.dumps(summary, indent=2))
+        return
+    
     total_points = args.points
     game_duration = args.time
     edition = args.edition
@@ -308,7 +361,13 @@ def main():
     gameId = args.gameid
     current_player = None
     if args.restore:
-        careers_game = restore_game(gameId)
+        #
+        # recover from the latest checkpoint and command log if there is one, otherwise from the game saved in JSON format
+        #
+        if os.path.exists(os.path.join(Environment.get_environment().games_base, f'{gameId}_game.pkl')):
+            careers_game = CareersGameEngine.recover(gameId, args.loglevel, installationId).careersGame
+        else:
+            careers_game = restore_game(gameId)
         nplayers = careers_game.game_state.number_of_players
         game_runner = GameRunner(edition, installationId, game_type, total_points, game_duration, \
                                  args.loglevel, args.params, careers_game=careers_game, game_id=gameId)
@@ -318,7 +377,8 @@ def main():
         # test_prod allows goto and advance in production mode
         #
         game_mode = "prod" if args.params=="test_prod" else args.params    # not used if restoring a previously saved CareersGame
-        game_runner = GameRunner(edition, installationId, game_type, total_points, game_duration, args.loglevel, game_mode)
+        game_runner = GameRunner(edition, installationId, game_type, total_points, game_duration, args.loglevel, game_mode, \
+                                 headless=args.headless and filePath is not None, seed=args.seed)
         
         # creates a CareersGame for points
         # game_runner.create_game(gameId, game_parameters_type)
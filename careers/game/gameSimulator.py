@@ -0,0 +1,293 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.commandResult import CommandResult
+from game.consoleOutput import ConsoleOutput
+from game.editionTemplate import EditionTemplate
+from game.gameConstants import GameParametersType, StrategyLevel
+from game.gameUtils import GameUtils
+from game.successFormula import SuccessFormula
+from game.turnDataset import TurnDataset
+
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Tuple
+import csv, logging, os, statistics, time
+import numpy as np
+
+@dataclass
+class GameResult():
+    """
+        The outcome of one simulated game.
+
+    """
+    game_number:int
+    seed:int
+    winner:int=-1           # the winning player number, -1 if the game was not completed within max_turns
+    completed:bool=False
+    turns:int=0             # the number of completed turns by all players
+    elapsed:float=0.0       # seconds
+    player_info:List[Dict]=field(default_factory=list)    # final player_info(outputFormat='dict') for each player in player number order
+    player_values:List[List[int]]=field(default_factory=list)  # final values of _PLAYER_COLUMNS for each player in player number order
+    error:str|None=None     # the exception message if the game raised an exception
+    turn_arrays:Dict|None=None  # every player's turns as arrays by TurnHistory column, until they're appended to the TurnDataset
+
+class GameSimulator(object):
+    """Runs batches of all-computer games for Monte Carlo studies of an edition.
+        Games are spread across a pool of worker processes. Each game gets a headless CareersGameEngine,
+        and each worker process loads the EditionTemplate once and reuses it for every game it plays.
+        Results are streamed back as they complete and can be aggregated with summarize(),
+        and written with write_csv() and write_npz(). Every turn of every game can be recorded in a TurnDataset.
+        Arguments:
+            edition - the game edition name, for example "Professions-Hi-Tech_v3"
+            nplayers - the number of computer players in each game, 1 to 6
+            total_points - the total points of a success formula
+            success_formulas - an optional List of SuccessFormula, one per player. If None, each player
+                gets a random formula for total_points at the start of each game.
+            strategy_level - the Careers_All_Strategy level name: 'dumb', 'basic', 'smart' or 'genius'.
+                If None, the level configured in editions.json is used.
+            game_parameters_type - 'test', 'prod' or 'custom'
+            max_turns - a game not won after this many turns (by all players) is recorded as incomplete
+            workers - the number of worker processes, default is os.cpu_count().
+                If 1, games are run in this process, which is handy for debugging.
+            seed - the base random seed. Game number n is seeded with seed + n, so any game can be replayed.
+            turns_folder - if not None, the folder of a TurnDataset the turns of each game are appended to as it completes
+    """
+
+    def __init__(self, edition:str, nplayers:int=2, total_points:int=100, success_formulas:List[SuccessFormula]|None=None, \
+                 strategy_level:str|None=None, game_parameters_type:str="test", max_turns:int=1000, workers:int|None=None, seed:int|None=None, \
+                 turns_folder:str|None=None):
+        assert nplayers >= 1 and nplayers <= 6
+        if success_formulas is not None:
+            assert len(success_formulas) == nplayers
+        if strategy_level is not None:
+            StrategyLevel[strategy_level.upper()]      # raises KeyError if not a valid level
+        self._edition = edition
+        self._nplayers = nplayers
+        self._total_points = total_points
+        self._success_formulas = success_formulas
+        self._strategy_level = strategy_level
+        self._game_parameters_type = game_parameters_type
+        self._max_turns = max_turns
+        self._workers = os.cpu_count() if workers is None else workers
+        self._seed = GameUtils.time_since() if seed is None else seed
+        self._results:List[GameResult] = []
+        self._turn_dataset = None if turns_folder is None else TurnDataset(turns_folder)
+
+    @property
+    def edition(self) -> str:
+        return self._edition
+
+    @property
+    def nplayers(self) -> int:
+        return self._nplayers
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    @property
+    def results(self) -> List[GameResult]:
+        return self._results
+
+    @property
+    def turn_dataset(self) -> TurnDataset|None:
+        return self._turn_dataset
+
+    def _settings(self) -> Dict:
+        formulas = None if self._success_formulas is None else [(sf.money, sf.stars, sf.hearts) for sf in self._success_formulas]
+        return {"edition":self._edition, "nplayers":self._nplayers, "total_points":self._total_points, "success_formulas":formulas, \
+                "strategy_level":self._strategy_level, "game_parameters_type":self._game_parameters_type, "max_turns":self._max_turns, \
+                "record_turns":self._turn_dataset is not None}
+
+    def run(self, ngames:int, chunksize:int|None=None) -> Iterator[GameResult]:
+        """Play ngames games, yielding each GameResult as it completes (not necessarily in game_number order).
+            Results are also accumulated in self.results.
+            Arguments:
+                ngames - the number of games to play
+                chunksize - the number of games sent to a worker at a time. Default is a few chunks per worker.
+        """
+        settings = self._settings()
+        jobs = [(settings, n, self._seed + n) for n in range(ngames)]
+        if self._workers <= 1:
+            _init_worker(self._edition, self._game_parameters_type)
+            for job in jobs:
+                result = _play_game(job)
+                self._add_result(result)
+                yield result
+        else:
+            if chunksize is None:
+                chunksize = max(1, ngames // (self._workers * 4))
+            with Pool(processes=self._workers, initializer=_init_worker, initargs=(self._edition, self._game_parameters_type)) as pool:
+                for result in pool.imap_unordered(_play_game, jobs, chunksize=chunksize):
+                    self._add_result(result)
+                    yield result
+
+    def _add_result(self, result:GameResult):
+        if result.turn_arrays is not None:
+            self._turn_dataset.append(result.turn_arrays, result.game_number)
+            result.turn_arrays = None
+        self._results.append(result)
+
+    def simulate(self, ngames:int, chunksize:int|None=None) -> Dict:
+        """Play ngames games and return the summary.
+        """
+        for _ in self.run(ngames, chunksize):
+            pass
+        return self.summarize()
+
+    def summarize(self, results:List[GameResult]|None=None) -> Dict:
+        """Aggregates game results into win rates and turn-length statistics.
+            Arguments:
+                results - a List of GameResult, default is self.results
+            Returns: a dict with keys:
+                games, completed, errors - counts
+                win_rate - List[float] the fraction of completed games won by each player number
+                turns - dict of mean, stdev, min, median, p90, max over completed games
+                turns_histogram - Dict[int, int] the number of completed games by turns, in bins of 10 turns
+                elapsed - the total and mean game time in seconds
+        """
+        results = self._results if results is None else results
+        completed = [r for r in results if r.completed]
+        wins = [0] * self._nplayers
+        for r in completed:
+            wins[r.winner] += 1
+        ncompleted = len(completed)
+        summary = {"games":len(results), "completed":ncompleted, "errors":len([r for r in results if r.error is not None])}
+        summary["win_rate"] = [w / ncompleted if ncompleted > 0 else 0.0 for w in wins]
+
+        turns = sorted([r.turns for r in completed])
+        if len(turns) > 0:
+            summary["turns"] = {"mean":statistics.fmean(turns), "stdev":statistics.pstdev(turns), "min":turns[0], \
+                                "median":statistics.median(turns), "p90":turns[int(0.9 * (len(turns)-1))], "max":turns[-1]}
+        else:
+            summary["turns"] = {}
+        histogram:Dict[int, int] = {}
+        for t in turns:
+            bin_start = 10 * (t // 10)
+            histogram[bin_start] = histogram.get(bin_start, 0) + 1
+        summary["turns_histogram"] = histogram
+
+        elapsed = sum([r.elapsed for r in results])
+        summary["elapsed"] = {"total":elapsed, "mean":elapsed / len(results) if len(results) > 0 else 0.0}
+        return summary
+
+    def write_csv(self, filepath:str, results:List[GameResult]|None=None):
+        """Writes one row per game: game_number, seed, completed, winner, turns, elapsed, error
+            followed by cash, stars, hearts, points, net_worth and salary for each player.
+        """
+        results = self._results if results is None else results
+        columns = ["game_number", "seed", "completed", "winner", "turns", "elapsed", "error"]
+        for pn in range(self._nplayers):
+            columns += [f"p{pn}_{name}" for name in _PLAYER_COLUMNS]
+        with open(filepath, "w", newline="") as fp:
+            writer = csv.writer(fp)
+            writer.writerow(columns)
+            for r in sorted(results, key=lambda r: r.game_number):
+                row = [r.game_number, r.seed, r.completed, r.winner, r.turns, f"{r.elapsed:.4f}", r.error or ""]
+                for pn in range(self._nplayers):
+                    row += _player_values(r, pn)
+                writer.writerow(row)
+
+    def write_npz(self, filepath:str, results:List[GameResult]|None=None):
+        """Writes the results as NumPy arrays in a compressed .npz file.
+            Arrays are in game_number order:
+                game_number, seed, turns, winner (int), completed (bool), elapsed (float)
+                and a (ngames, nplayers) int array for each of: cash, stars, hearts, points, net_worth, salary
+        """
+        results = sorted(self._results if results is None else results, key=lambda r: r.game_number)
+        arrays = {
+            "game_number" : np.array([r.game_number for r in results], dtype=np.int64),
+            "seed" : np.array([r.seed for r in results], dtype=np.int64),
+            "turns" : np.array([r.turns for r in results], dtype=np.int32),
+            "winner" : np.array([r.winner for r in results], dtype=np.int8),
+            "completed" : np.array([r.completed for r in results], dtype=bool),
+            "elapsed" : np.array([r.elapsed for r in results], dtype=np.float64)
+        }
+        values = np.array([[_player_values(r, pn) for pn in range(self._nplayers)] for r in results], dtype=np.int64)\
+            .reshape(len(results), self._nplayers, len(_PLAYER_COLUMNS))
+        for i,name in enumerate(_PLAYER_COLUMNS):
+            arrays[name] = values[:, :, i]
+        np.savez_compressed(filepath, **arrays)
+
+_PLAYER_COLUMNS = ["cash", "stars", "hearts", "points", "net_worth", "salary"]    # the player_values of a GameResult
+
+def _player_values(result:GameResult, player_number:int) -> List[int]:
+    if player_number >= len(result.player_values):
+        return [0] * len(_PLAYER_COLUMNS)
+    return result.player_values[player_number]
+
+def _init_worker(edition:str, game_parameters_type:str):
+    """Worker process initializer: load the edition once and silence console output.
+    """
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+    EditionTemplate.get_template(edition, GameParametersType[game_parameters_type.upper()])
+
+def _play_game(job:Tuple[Dict, int, int]) -> GameResult:
+    """Plays a single all-computer game to completion or settings["max_turns"]
+        Arguments:
+            job - a 3-tuple of (settings dict, game number, random seed)
+        Returns: the GameResult
+    """
+    settings, game_number, seed = job
+    result = GameResult(game_number=game_number, seed=seed)
+    edition = settings["edition"]
+    start = time.perf_counter()
+    engine = CareersGameEngine(loglevel='error', installationId='simulator', edition=edition, headless=True)
+    engine.history_window = None        # a simulated game is short lived, its turn history stays in memory
+    try:
+        engine.create(edition, 'simulator', 'points', settings["total_points"], settings["game_parameters_type"], seed=seed)
+        if settings["strategy_level"] is not None:
+            for plugin in engine.careersGame.plugins.get("turn", []):
+                if hasattr(plugin, "strategy_level"):
+                    plugin.strategy_level = StrategyLevel[settings["strategy_level"].upper()]
+
+        formulas = settings["success_formulas"]
+        for pn in range(settings["nplayers"]):
+            if formulas is None:
+                sf = GameUtils.get_random_formula(settings["total_points"], engine.careersGame.random)
+                cash, stars, hearts = sf.money, sf.stars, sf.hearts
+            else:
+                cash, stars, hearts = formulas[pn]
+            name = f"CP_{pn+1}"
+            engine.execute_command(f"add player {name} {name} {name}_{game_number} {name}@simulator {cash} {stars} {hearts} computer", None)
+        engine.execute_command("start", None)
+        engine.automatic_run = True
+
+        game_state = engine.game_state
+        max_turns = settings["max_turns"]
+        while game_state.turns < max_turns:
+            player = game_state.current_player
+            cmd_result = engine.execute_command("take_turn", player)
+            if cmd_result.return_code != CommandResult.TERMINATE:
+                cmd_result = engine.execute_command("next", player)
+            if cmd_result.return_code == CommandResult.TERMINATE:
+                break
+
+        result.completed = game_state.game_complete
+        if result.completed:
+            result.winner = game_state.winning_player.number
+        result.turns = game_state.turns
+        result.player_info = [p.player_info(include_successFormula=True, outputFormat='dict') for p in game_state.players]
+        result.player_values = [[p.cash, p.fame, p.happiness, p.total_points(), p.net_worth(), p.salary] for p in game_state.players]
+        if settings.get("record_turns", False):
+            histories = [p.turn_history.to_numpy() for p in game_state.players]
+            result.turn_arrays = {column:np.concatenate([history[column] for history in histories]) for column in histories[0]}
+    except Exception as ex:
+        result.error = str(ex)
+        logging.error(f"simulated game {game_number} seed {seed}: {str(ex)}")
+    finally:
+        #
+        # a simulated game is not resumed, so remove its saved game files and command log
+        #
+        engine.discard()
+    result.elapsed = time.perf_counter() - start
+    return result
@@ -38,17 +38,14 @@ class GameSquare(CareersObject):
         self._game_square_dict = None       # populated by concrete class
         self._square_type = None            # populated by concrete class
         self._special_processing = SpecialProcessing(special_processing_dict, square_class) if special_processing_dict is not None and len(special_processing_dict) > 0 else None
-        self._careersGame = None
         self._game_parameters = None
         self._help_text = None    # optional "help_text" content
         #
-        # avoids circular import
+        # game is the EditionTemplate this square belongs to. Game squares are shared by every CareersGame
+        # of the edition, so the CareersGame a player is in is player.my_game
         #
         assert(game is not None)
         if game is not None:
-            from game.careersGame import CareersGame
-            assert isinstance(game,CareersGame)
-            self._careersGame = game
             self._game_parameters = game.game_parameters    # GameParameters instance
             if self._special_processing is not None:        # not all game squares have SpecialProcessing
                 self._special_processing.game_parameters = self._game_parameters
@@ -109,10 +106,6 @@ class GameSquare(CareersObject):
     def special_processing(self) ->SpecialProcessing:
         return self._special_processing
     
-    @property
-    def careersGame(self):
-        return self._careersGame
-    
     @property
     def game_parameters(self) -> GameParameters:
         return self._game_parameters
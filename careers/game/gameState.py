@@ -8,11 +8,14 @@ import json
 from game.player import Player
 from game.careersObject import CareersObject
 from game.gameConstants import GameType, GameParametersType
-from typing import List
+from typing import Dict, List, Tuple
 
 class GameState(CareersObject):
     """Maintains the global state of a Careers game instance.
-    
+        Each player reports changes to its cash, stars, hearts or success formula, so the GameState always knows
+        which players have met their success formula and finding a winner doesn't look at every player.
+        The version is incremented on every change, by the engine after each command and by the GameState's own setters,
+        and to_dict() is memoized per version.
     """
 
 
@@ -48,7 +51,65 @@ class GameState(CareersObject):
         self._restored = False    # True if this is a restored game
         self._started = False
         self._automatic_run = False         # set to True if running a script
-        self._ = game_id
+        self._game_id = game_id
+        self._goals_met:Dict[int, Player] = {}     # the players who have met their success formula, by player number
+        self._version = 0
+        self._dict_cache:Dict[bool, tuple] = {}     # include_players -> (version, the to_dict() parts that don't depend on the time)
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_dict_cache'] = {}
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if '_goals_met' not in state:       # game states pickled before completion was tracked
+            self._goals_met = {}
+            self._version = 0
+            self._dict_cache = {}
+        for player in self._players:
+            player.progress_listener = self._progress_changed
+            self._progress_changed(player)
+    
+    def snapshot(self) -> Tuple:
+        """An opaque token of the game state and its players as they are now, for restore(). See CareersGame.snapshot()
+        """
+        state = self.__dict__.copy()
+        del state['_version'], state['_dict_cache']
+        state['_players'] = list(self._players)
+        state['_goals_met'] = dict(self._goals_met)
+        return state, [player.snapshot() for player in self._players]
+    
+    def restore(self, token:Tuple):
+        """Restores the game state and its players to a snapshot(), in place. It's a new version of the game state.
+        """
+        state, player_tokens = token
+        self.__dict__.update(state)
+        self._players = list(self._players)
+        self._goals_met = dict(self._goals_met)
+        for player, player_token in zip(self._players, player_tokens):
+            player.restore(player_token)
+        self._version += 1
+    
+    @property
+    def version(self) -> int:
+        """Incremented on every change to the game's state
+        """
+        return self._version
+    
+    def changed(self):
+        """Records a change to the game's state, for example by a command
+        """
+        self._version += 1
+    
+    def _progress_changed(self, player:Player):
+        """Called by a player when its cash, stars, hearts or success formula change
+        """
+        if player.goals_met():
+            self._goals_met[player.number] = player
+        else:
+            self._goals_met.pop(player.number, None)
+        self._version += 1
     
     @property
     def game_id(self):
@@ -65,6 +126,7 @@ class GameState(CareersObject):
     @number_of_players.setter
     def number_of_players(self, value):
         self._number_of_players = value
+        self._version += 1
 
     @property
     def players(self) -> List[Player]:
@@ -77,6 +139,7 @@ class GameState(CareersObject):
     @winning_player.setter
     def winning_player(self, player:Player):
         self._winning_player = player
+        self._version += 1
     
     @property
     def current_player(self) -> Player:
@@ -93,6 +156,7 @@ class GameState(CareersObject):
     @current_player_number.setter
     def current_player_number(self, value):
         self._current_player_number = value
+        self._version += 1
         
     @property
     def game_type(self) -> GameType:
@@ -115,7 +179,9 @@ class GameState(CareersObject):
         self._automatic_run = value
     
     def is_game_complete(self) -> bool:
-        """Iterates over the players to see who, if anyone, has won.
+        """Determines who, if anyone, has won.
+            In a points game only the players who have met their success formula are checked,
+            for the TODOs, if any, so it doesn't depend on the number of players.
             Returns: True if there's are winner(s), else False.
                     sets self.winning_player to the Player who won.
                     sets game_complete to True if there is a winner
@@ -125,9 +191,10 @@ class GameState(CareersObject):
         completed = False
         if self.started:
             if self.game_type is GameType.POINTS:
-                for p in self.players:
+                for number in sorted(self._goals_met):
+                    p = self._goals_met[number]
                     if p.is_complete():    # has the player achieved their success formula?
-                        self._winning_player = p
+                        self.winning_player = p
                         completed = True
                         break
             elif self.game_type is GameType.TIMED:
@@ -143,9 +210,10 @@ class GameState(CareersObject):
                             winner = p
                             winning_points = p.total_points()
                     
-                    self._winning_player = winner
+                    self.winning_player = winner
         
-        self.game_complete = completed
+        if completed != self._game_complete:
+            self.game_complete = completed
         return completed
     
     @property
@@ -155,6 +223,7 @@ class GameState(CareersObject):
     @game_complete.setter
     def game_complete(self, value:bool):
         self._game_complete = value
+        self._version += 1
         
     @property
     def started(self) -> bool:
@@ -163,6 +232,7 @@ class GameState(CareersObject):
     @started.setter
     def started(self, value:bool):
         self._started = value
+        self._version += 1
     
     @property
     def total_points(self) ->int :
@@ -183,6 +253,7 @@ class GameState(CareersObject):
     @turns.setter
     def turns(self, value):
         self._turns = value
+        self._version += 1
     
     @property
     def turn_number(self):
@@ -191,6 +262,7 @@ class GameState(CareersObject):
     @turn_number.setter
     def turn_number(self, value):
         self._turn_number = value
+        self._version += 1
     
     @property
     def restored(self)->bool:
@@ -282,6 +354,8 @@ class GameState(CareersObject):
         aplayer.number = self.number_of_players     # starts at 0
         self._players.append(aplayer)
         self._number_of_players += 1
+        aplayer.progress_listener = self._progress_changed
+        self._progress_changed(aplayer)
     
     def get_player_by_initials(self, initials):
         player = None
@@ -306,27 +380,33 @@ class GameState(CareersObject):
         gs = self.to_dict()
         return json.dumps(gs, indent=2)
     
-    def to_dict(self) -> dict:
-        gs = {"game_id" : self._game_id, "game_type" : self.game_type.value, "game_parameters_type" : self.game_parameters_type.value, \
-              "number_of_players" : self.number_of_players, "current_player_number" : self.current_player_number }
-        gs["turns"] = self.turns
-        gs["turn_number"] = self.turn_number
+    def to_dict(self, include_players=True) -> dict:
+        """The GameState as a JSON-compatible dict. It has no side effects: game_complete is as of the last is_game_complete().
+            The dict is memoized per version, except the elapsed_time and time_remaining which are computed on each call.
+            Treat it as read-only, the players' dicts are shared by the calls for the same version.
+            Arguments:
+                include_players - if False the dict has no "players", for saving the players separately
+        """
+        cached = self._dict_cache.get(include_players)
+        if cached is None or cached[0] != self._version:
+            head = {"game_id" : self._game_id, "game_type" : self.game_type.value, "game_parameters_type" : self.game_parameters_type.value, \
+                    "number_of_players" : self.number_of_players, "current_player_number" : self.current_player_number, \
+                    "turns" : self.turns, "turn_number" : self.turn_number}
+            tail = {}
+            if self.winning_player is not None:
+                tail["winning_player"] = self.winning_player.player_initials
+            tail["game_complete"] = self._game_complete
+            if include_players:
+                tail["players"] = [player.to_dict() for player in self.players]
+            cached = (self._version, head, tail)
+            self._dict_cache[include_players] = cached
+        _, head, tail = cached
 
+        gs = dict(head)
         if self.game_type is GameType.TIMED:
             gs["time_remaining"] = self.get_time_remaining()
         elif self.game_type is GameType.POINTS:
             gs["total_points"] = self.total_points
-
         gs["elapsed_time"] = self.get_elapsed_time()
-        if self.winning_player is not None:
-            gs["winning_player"] = self.winning_player.player_initials
-        gs["game_complete"] = self.is_game_complete()
-
-        players = []
-        for player in self.players:
-            players.append(player.to_dict())
-        gs["players"] = players
+        gs.update(tail)
         return gs
-    
-        
-        
\ No newline at end of file
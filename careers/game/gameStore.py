@@ -0,0 +1,482 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from game.environment import Environment
+from game.gameWriter import GameWriter
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Iterator, List, Set
+import json, logging, os, sqlite3
+
+class GameStore(object):
+    """Where saved games live. A saved game is its state, the dict that GameEngineCommands.save_game() saves in JSON format
+        and restore_game() loads, plus an append-only list of turn records.
+        Each saved game is indexed by its users: the installationId that created it and the _id of each player,
+        so the games of a user are a lookup and not a scan of every saved game.
+        There are three backends:
+            MemoryGameStore - a dict, for tests and benchmarks
+            FileGameStore - the {game_id}_game.json files in the games folder, with an index journal
+            SQLiteGameStore - a SQLite database in WAL mode, for a single-node server without Mongo
+        Use GameStore.get_store() for the process-wide store. It's set by the CAREERS_GAME_STORE environment variable:
+            memory:// | file://<folder> | sqlite://<database file>
+        The default is a FileGameStore in the games folder.
+    """
+    _store:'GameStore' = None
+    _lock = Lock()
+
+    SUMMARY_KEYS = ["game_id", "installationId", "edition_name", "turns", "game_complete", "updated"]
+
+    def save_state(self, game_id:str, state:Dict):
+        """Saves a game's state, replacing any earlier state of the game.
+            Arguments:
+                game_id - the game ID
+                state - the game dict, with "installationId", "edition_name" and "gameState" keys
+        """
+        #
+        # override in concrete class
+        #
+        pass
+
+    def load_state(self, game_id:str) -> Dict|None:
+        """Returns: the saved state of a game, or None if there's no such game
+        """
+        #
+        # override in concrete class
+        #
+        return None
+
+    def list_games_for_user(self, user_id:str) -> List[Dict]:
+        """Lists the saved games of a user, most recently saved first.
+            Arguments:
+                user_id - an installationId or a player's _id
+            Returns: a summary dict of each game, with the SUMMARY_KEYS and a "players" list of player initials
+        """
+        #
+        # override in concrete class
+        #
+        return []
+
+    def append_turn(self, game_id:str, turn_number:int, player_number:int, record:Dict):
+        """Appends a turn record to a game's history. Records are never updated.
+        """
+        #
+        # override in concrete class
+        #
+        pass
+
+    def read_turns(self, game_id:str, player_number:int=None, after_turn:int=-1) -> Iterator[Dict]:
+        """Reads the turn records of a game in the order they were appended.
+            Arguments:
+                player_number - only the turns of this player, default is all players
+                after_turn - only turns with a turn number greater than this
+        """
+        #
+        # override in concrete class
+        #
+        return iter([])
+
+    def delete_game(self, game_id:str) -> bool:
+        """Deletes a game's state and turn history.
+            Returns: True if there was such a game
+        """
+        #
+        # override in concrete class
+        #
+        return False
+
+    def location(self, game_id:str) -> str:
+        """Where a game's state is saved, for messages
+        """
+        return f'{self.name}:{game_id}'
+
+    def close(self):
+        pass
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    @staticmethod
+    def summary(game_id:str, state:Dict) -> Dict:
+        """The summary of a saved game that list_games_for_user() returns
+        """
+        game_state = state.get("gameState", {})
+        players = game_state.get("players", [])
+        return {"game_id":game_id, "installationId":state.get("installationId", ""), "edition_name":state.get("edition_name", ""), \
+                "turns":game_state.get("turns", 0), "game_complete":game_state.get("game_complete", False), \
+                "updated":datetime.now().isoformat(), "players":[player.get("initials") for player in players]}
+
+    @staticmethod
+    def users(state:Dict) -> Set[str]:
+        """The users a saved game is indexed by: the installationId and the player _ids
+        """
+        users = set([player.get("_id") for player in state.get("gameState", {}).get("players", [])])
+        users.add(state.get("installationId"))
+        return set([user for user in users if user])
+
+    @staticmethod
+    def create(url:str) -> 'GameStore':
+        """Creates a GameStore from a URL: memory://, file://<folder> or sqlite://<database file>
+            An empty folder or database file is the games folder or games/games.db
+        """
+        games_base = Environment.get_environment().games_base
+        if url.startswith("memory://"):
+            return MemoryGameStore()
+        elif url.startswith("file://"):
+            return FileGameStore(url[len("file://"):] or games_base)
+        elif url.startswith("sqlite://"):
+            return SQLiteGameStore(url[len("sqlite://"):] or os.path.join(games_base, 'games.db'))
+        raise ValueError(f'Unknown GameStore URL: {url}')
+
+    @staticmethod
+    def get_store() -> 'GameStore':
+        """Gets the process-wide GameStore, creating it on first use
+        """
+        if GameStore._store is None:
+            with GameStore._lock:
+                if GameStore._store is None:
+                    GameStore._store = GameStore.create(os.environ.get("CAREERS_GAME_STORE", "file://"))
+        return GameStore._store
+
+    @staticmethod
+    def set_store(store:'GameStore'):
+        """Replaces the process-wide GameStore, for example with a MemoryGameStore in a benchmark
+        """
+        with GameStore._lock:
+            GameStore._store = store
+
+
+class MemoryGameStore(GameStore):
+    """A GameStore in memory. States are copied in and out as JSON, as they would be by a persistent store.
+    """
+
+    def __init__(self):
+        self._states:Dict[str, str] = {}
+        self._summaries:Dict[str, Dict] = {}
+        self._users:Dict[str, Set[str]] = {}        # user -> game_ids
+        self._turns:Dict[str, List[Dict]] = {}
+        self._lock = Lock()
+
+    def save_state(self, game_id:str, state:Dict):
+        text = json.dumps(state)
+        with self._lock:
+            self._unindex(game_id)
+            self._states[game_id] = text
+            self._summaries[game_id] = GameStore.summary(game_id, state)
+            for user in GameStore.users(state):
+                self._users.setdefault(user, set()).add(game_id)
+
+    def load_state(self, game_id:str) -> Dict|None:
+        with self._lock:
+            text = self._states.get(game_id)
+        return None if text is None else json.loads(text)
+
+    def list_games_for_user(self, user_id:str) -> List[Dict]:
+        with self._lock:
+            summaries = [dict(self._summaries[game_id]) for game_id in self._users.get(user_id, [])]
+        return sorted(summaries, key=lambda summary: summary["updated"], reverse=True)
+
+    def append_turn(self, game_id:str, turn_number:int, player_number:int, record:Dict):
+        row = {"game_id":game_id, "turn_number":turn_number, "player_number":player_number, "record":json.loads(json.dumps(record))}
+        with self._lock:
+            self._turns.setdefault(game_id, []).append(row)
+
+    def read_turns(self, game_id:str, player_number:int=None, after_turn:int=-1) -> Iterator[Dict]:
+        with self._lock:
+            rows = list(self._turns.get(game_id, []))
+        for row in rows:
+            if row["turn_number"] > after_turn and (player_number is None or row["player_number"] == player_number):
+                yield row
+
+    def delete_game(self, game_id:str) -> bool:
+        with self._lock:
+            self._unindex(game_id)
+            self._turns.pop(game_id, None)
+            return self._states.pop(game_id, None) is not None
+
+    def _unindex(self, game_id:str):
+        """Removes a game from the user index. The caller holds the lock.
+        """
+        if game_id in self._states:
+            for user in GameStore.users(json.loads(self._states[game_id])):
+                self._users.get(user, set()).discard(game_id)
+        self._summaries.pop(game_id, None)
+
+
+class FileGameStore(GameStore):
+    """A GameStore of files in a folder, by default the games folder:
+            {game_id}_game.json - the game state, as save_game() has always saved it, written by way of a temporary file
+            {game_id}_turns.jsonl - the turn records, one JSON record per line
+            game_index.jsonl - the index: a line with the summary and users of a game each time it's saved, and a line when it's deleted
+        The index is read once and kept in memory. It's an append-only journal, so a save appends one line;
+        the journal is compacted to a line per game when it's opened, or saved to, with more than COMPACT_LINES lines
+        and more superseded lines than games. The rewrite is paid for by the saves since the last one.
+        A folder of games saved before there was an index is indexed the first time it's opened.
+        The index is for one process: games saved to the same folder by another process are seen when the folder is next opened.
+        Arguments:
+            folder - the folder, created if it doesn't exist
+    """
+    INDEX_FILENAME = 'game_index.jsonl'
+    COMPACT_LINES = 100
+
+    def __init__(self, folder:str):
+        self._folder = folder
+        self._lock = Lock()
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        self._index_filename = os.path.join(folder, FileGameStore.INDEX_FILENAME)
+        self._index:Dict[str, Dict] = {}        # game_id -> {"game_id":..., "summary":..., "users":[...]}
+        self._users:Dict[str, Set[str]] = {}
+        self._index_lines = 0       # lines in the index journal
+        self._turns_files:Set[str] = set()      # the turn files appended to, that end with a complete line
+        self._read_index()
+
+    @property
+    def folder(self) -> str:
+        return self._folder
+
+    def location(self, game_id:str) -> str:
+        return self._state_filename(game_id)
+
+    def save_state(self, game_id:str, state:Dict):
+        GameWriter.write_file(self._state_filename(game_id), json.dumps(state, indent=2).encode())
+        with self._lock:
+            entry = self._add(game_id, GameStore.summary(game_id, state), GameStore.users(state))
+            self._append_index([entry])
+            self._compact_index()
+
+    def load_state(self, game_id:str) -> Dict|None:
+        filename = self._state_filename(game_id)
+        if not os.path.exists(filename):
+            return None
+        with open(filename, "r") as fp:
+            return json.load(fp)
+
+    def list_games_for_user(self, user_id:str) -> List[Dict]:
+        with self._lock:
+            summaries = [dict(self._index[game_id]["summary"]) for game_id in self._users.get(user_id, [])]
+        return sorted(summaries, key=lambda summary: summary["updated"], reverse=True)
+
+    def append_turn(self, game_id:str, turn_number:int, player_number:int, record:Dict):
+        row = {"game_id":game_id, "turn_number":turn_number, "player_number":player_number, "record":record}
+        filename = self._turns_filename(game_id)
+        if filename not in self._turns_files:
+            FileGameStore._end_line(filename)
+            self._turns_files.add(filename)
+        with open(filename, "a") as fp:
+            fp.write(json.dumps(row, default=str) + "\n")
+
+    def read_turns(self, game_id:str, player_number:int=None, after_turn:int=-1) -> Iterator[Dict]:
+        for row in FileGameStore._read_lines(self._turns_filename(game_id)):
+            if row["turn_number"] > after_turn and (player_number is None or row["player_number"] == player_number):
+                yield row
+
+    def delete_game(self, game_id:str) -> bool:
+        found = False
+        self._turns_files.discard(self._turns_filename(game_id))
+        for filename in [self._state_filename(game_id), self._turns_filename(game_id)]:
+            if os.path.exists(filename):
+                os.remove(filename)
+                found = True
+        with self._lock:
+            if self._remove(game_id):
+                self._append_index([{"game_id":game_id, "deleted":True}])
+                self._compact_index()
+                found = True
+        return found
+
+    def _state_filename(self, game_id:str) -> str:
+        return os.path.join(self._folder, f'{game_id}_game.json')
+
+    def _turns_filename(self, game_id:str) -> str:
+        return os.path.join(self._folder, f'{game_id}_turns.jsonl')
+
+    def _add(self, game_id:str, summary:Dict, users:Set[str]) -> Dict:
+        self._remove(game_id)
+        entry = {"game_id":game_id, "summary":summary, "users":sorted(users)}
+        self._index[game_id] = entry
+        for user in users:
+            self._users.setdefault(user, set()).add(game_id)
+        return entry
+
+    def _remove(self, game_id:str) -> bool:
+        entry = self._index.pop(game_id, None)
+        if entry is None:
+            return False
+        for user in entry["users"]:
+            self._users.get(user, set()).discard(game_id)
+        return True
+
+    def _read_index(self):
+        if os.path.exists(self._index_filename):
+            FileGameStore._end_line(self._index_filename)
+            for entry in FileGameStore._read_lines(self._index_filename):
+                self._index_lines += 1
+                if entry.get("deleted", False):
+                    self._remove(entry["game_id"])
+                else:
+                    self._add(entry["game_id"], entry["summary"], set(entry["users"]))
+            self._compact_index()
+            return
+        #
+        # no index yet: index the games already saved in the folder, once
+        #
+        suffix = '_game.json'
+        for filename in os.listdir(self._folder):
+            if filename.endswith(suffix):
+                game_id = filename[:-len(suffix)]
+                try:
+                    state = self.load_state(game_id)
+                except (OSError, json.JSONDecodeError) as ex:
+                    logging.warning(f'FileGameStore could not index {filename}: {str(ex)}')
+                    continue
+                self._add(game_id, GameStore.summary(game_id, state), GameStore.users(state))
+        if len(self._index) > 0:
+            self._write_index()
+
+    def _append_index(self, entries:List[Dict]):
+        """Appends entries to the index journal. The caller holds the lock.
+        """
+        with open(self._index_filename, "a") as fp:
+            fp.write("".join([json.dumps(entry) + "\n" for entry in entries]))
+        self._index_lines += len(entries)
+
+    def _compact_index(self):
+        """Rewrites the index journal if more than half of its lines are superseded. The caller holds the lock.
+        """
+        if self._index_lines > FileGameStore.COMPACT_LINES and self._index_lines > 2 * len(self._index):
+            self._write_index()
+
+    def _write_index(self):
+        """Rewrites the index journal with a line per game, by way of a temporary file
+        """
+        data = "".join([json.dumps(entry) + "\n" for entry in self._index.values()])
+        GameWriter.write_file(self._index_filename, data.encode())
+        self._index_lines = len(self._index)
+
+    @staticmethod
+    def _end_line(filename:str):
+        """Ends an incomplete last line, left by a crash while appending, so that the next line appended isn't joined to it
+        """
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            with open(filename, "rb+") as fp:
+                fp.seek(-1, os.SEEK_END)
+                if fp.read(1) != b"\n":
+                    fp.write(b"\n")
+
+    @staticmethod
+    def _read_lines(filename:str) -> Iterator[Dict]:
+        """Reads a JSON record per line. An incomplete last line, left by a crash while appending, is skipped.
+        """
+        if not os.path.exists(filename):
+            return
+        with open(filename, "r") as fp:
+            for line in fp:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(f"{filename}: skipping incomplete record")
+
+
+class SQLiteGameStore(GameStore):
+    """A GameStore in a SQLite database, in WAL mode so readers don't wait on a writer.
+            games - a row per game: the summary columns and the state as JSON text
+            game_users - a row per (user, game), the index of each user's games
+            turns - the turn records, keyed by (game_id, turn_number, player_number, seq)
+        One connection is shared by the threads of a process and used under a lock.
+        Arguments:
+            filename - the database file, created if it doesn't exist. ":memory:" for a database in memory
+    """
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS games (game_id TEXT PRIMARY KEY, installation_id TEXT, edition_name TEXT,
+            turns INTEGER, game_complete INTEGER, players TEXT, updated TEXT, state TEXT NOT NULL)""",
+        """CREATE TABLE IF NOT EXISTS game_users (user_id TEXT NOT NULL, game_id TEXT NOT NULL, PRIMARY KEY (user_id, game_id))
+            WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS game_users_game_id ON game_users (game_id)",
+        """CREATE TABLE IF NOT EXISTS turns (seq INTEGER PRIMARY KEY AUTOINCREMENT, game_id TEXT NOT NULL,
+            turn_number INTEGER NOT NULL, player_number INTEGER NOT NULL, record TEXT NOT NULL)""",
+        "CREATE INDEX IF NOT EXISTS turns_game_turn ON turns (game_id, turn_number, player_number)"
+    ]
+
+    def __init__(self, filename:str):
+        self._filename = filename
+        folder = os.path.dirname(filename)
+        if filename != ':memory:' and folder != '' and not os.path.exists(folder):
+            os.makedirs(folder)
+        self._lock = Lock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")      # durable at each checkpoint of the WAL, not each commit
+        for statement in SQLiteGameStore.SCHEMA:
+            self._connection.execute(statement)
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    def location(self, game_id:str) -> str:
+        return f'{self._filename}:{game_id}'
+
+    def save_state(self, game_id:str, state:Dict):
+        summary = GameStore.summary(game_id, state)
+        row = (game_id, summary["installationId"], summary["edition_name"], summary["turns"], int(summary["game_complete"]), \
+               json.dumps(summary["players"]), summary["updated"], json.dumps(state))
+        with self._lock, self._transaction() as connection:
+            connection.execute("INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+            connection.execute("DELETE FROM game_users WHERE game_id = ?", (game_id,))
+            connection.executemany("INSERT INTO game_users VALUES (?, ?)", [(user, game_id) for user in GameStore.users(state)])
+
+    def load_state(self, game_id:str) -> Dict|None:
+        with self._lock:
+            row = self._connection.execute("SELECT state FROM games WHERE game_id = ?", (game_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def list_games_for_user(self, user_id:str) -> List[Dict]:
+        with self._lock:
+            rows = self._connection.execute("""SELECT g.game_id, g.installation_id, g.edition_name, g.turns, g.game_complete, g.updated, g.players
+                FROM game_users u JOIN games g ON g.game_id = u.game_id WHERE u.user_id = ? ORDER BY g.updated DESC""", (user_id,)).fetchall()
+        summaries = []
+        for row in rows:
+            summary = dict(zip(GameStore.SUMMARY_KEYS, row[:-1]))
+            summary["game_complete"] = bool(summary["game_complete"])
+            summary["players"] = json.loads(row[-1])
+            summaries.append(summary)
+        return summaries
+
+    def append_turn(self, game_id:str, turn_number:int, player_number:int, record:Dict):
+        with self._lock:
+            self._connection.execute("INSERT INTO turns (game_id, turn_number, player_number, record) VALUES (?, ?, ?, ?)", \
+                                     (game_id, turn_number, player_number, json.dumps(record, default=str)))
+
+    def read_turns(self, game_id:str, player_number:int=None, after_turn:int=-1) -> Iterator[Dict]:
+        query = "SELECT turn_number, player_number, record FROM turns WHERE game_id = ? AND turn_number > ?"
+        parameters = [game_id, after_turn]
+        if player_number is not None:
+            query += " AND player_number = ?"
+            parameters.append(player_number)
+        with self._lock:
+            rows = self._connection.execute(query + " ORDER BY seq", parameters).fetchall()
+        for turn_number, number, record in rows:
+            yield {"game_id":game_id, "turn_number":turn_number, "player_number":number, "record":json.loads(record)}
+
+    def delete_game(self, game_id:str) -> bool:
+        with self._lock, self._transaction() as connection:
+            deleted = connection.execute("DELETE FROM games WHERE game_id = ?", (game_id,)).rowcount
+            connection.execute("DELETE FROM game_users WHERE game_id = ?", (game_id,))
+            connection.execute("DELETE FROM turns WHERE game_id = ?", (game_id,))
+        return deleted > 0
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _transaction(self) -> sqlite3.Connection:
+        """A connection context manager that commits the statements in it as one transaction, or rolls them back.
+            The caller holds the lock.
+        """
+        self._connection.execute("BEGIN")
+        return self._connection
@@ -18,33 +18,43 @@ class GameUtils(object):
         self.params = params
     
     @staticmethod
-    def shuffle(size:int) -> list:
-        return random.sample(list(range(0, size)), size)
+    def shuffle(size:int, rng:random.Random=None) -> list:
+        """Returns a random permutation of 0 to size-1.
+            Arguments:
+                size - the number of items
+                rng - a random.Random instance, for example CareersGame.random. If None the random module is used.
+        """
+        rng = random if rng is None else rng
+        return rng.sample(list(range(0, size)), size)
     
     
     @staticmethod
-    def get_random_formula(total_points) -> SuccessFormula:
+    def get_random_formula(total_points, rng:random.Random=None) -> SuccessFormula:
         """Create a new SuccessFormula for a given number of points.
             Random values assigned in order: money, hearts, stars
+            If rng (a random.Random) is None the random module is used.
         """
-        money = random.randint(1, total_points)
-        hearts = random.randint(1, total_points-money)
+        rng = random if rng is None else rng
+        money = rng.randint(1, total_points-1)
+        hearts = rng.randint(1, total_points-money)
         stars = total_points-(money+hearts)
         return SuccessFormula(stars, hearts, money)
     
     @staticmethod
-    def update_random_formula(success_formula:SuccessFormula) -> SuccessFormula:
+    def update_random_formula(success_formula:SuccessFormula, rng:random.Random=None) -> SuccessFormula:
         """Update a given SuccessFormula with new random money, stars, hearts
         """
+        rng = random if rng is None else rng
         total_points = success_formula.total_points
-        success_formula.money = random.randint(1, total_points)
-        success_formula.hearts = random.randint(1, total_points-success_formula.money)
+        success_formula.money = rng.randint(1, total_points-1)
+        success_formula.hearts = rng.randint(1, total_points-success_formula.money)
         success_formula.stars = total_points-(success_formula.money+success_formula.hearts)
         return success_formula
     
     @staticmethod
-    def roll(number_of_dice)->List[int]:
-        return random.choices(population=[1,2,3,4,5,6],k=number_of_dice)
+    def roll(number_of_dice, rng:random.Random=None)->List[int]:
+        rng = random if rng is None else rng
+        return rng.choices(population=[1,2,3,4,5,6],k=number_of_dice)
     
     @staticmethod
     def get_datetime() -> str:
@@ -0,0 +1,117 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from threading import Condition, Lock, Thread
+from typing import Dict
+import atexit, logging, os, time
+
+class GameWriter(object):
+    """Writes saved game files from a background thread (write-behind).
+        A save is submitted as the bytes to write, so the game's state is captured when the save is submitted
+        and the caller doesn't wait on the disk.
+        Back-to-back saves of the same file are coalesced: only the most recent bytes not yet written are kept,
+        so a busy game writes at most one file at a time, however many turns are played meanwhile.
+        Files are written to a temporary file that is then renamed, so a reader never sees a partially written game.
+        Use flush() to wait until a game's saves are on disk, for example when the game ends.
+        Pending saves are also flushed when the process exits normally.
+        There is one GameWriter per process, use GameWriter.get_writer()
+    """
+    _writer:'GameWriter' = None
+    _lock = Lock()
+
+    def __init__(self):
+        self._condition = Condition()
+        self._pending:Dict[str, bytes] = {}     # filename -> the latest bytes to write, in submission order
+        self._writing:str = None                # the filename being written
+        self._submitted = 0
+        self._written = 0
+        self._coalesced = 0
+        self._pid = os.getpid()
+        self._thread = Thread(target=self._run, name="GameWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)     # the thread is a daemon, so write anything still pending before the process exits
+
+    @staticmethod
+    def get_writer() -> 'GameWriter':
+        """Gets the process-wide GameWriter, starting it on first use.
+            A forked process (a simulation worker for example) doesn't inherit the writer thread, so it gets its own GameWriter.
+        """
+        if GameWriter._writer is None or GameWriter._writer._pid != os.getpid():
+            with GameWriter._lock:
+                if GameWriter._writer is None or GameWriter._writer._pid != os.getpid():
+                    GameWriter._writer = GameWriter()
+        return GameWriter._writer
+
+    @property
+    def submitted(self) -> int:
+        return self._submitted
+
+    @property
+    def written(self) -> int:
+        return self._written
+
+    @property
+    def coalesced(self) -> int:
+        """The number of submitted saves replaced by a later save of the same file before being written
+        """
+        return self._coalesced
+
+    def submit(self, filename:str, data:bytes):
+        """Queue bytes to be written to filename, replacing any unwritten bytes for the same file.
+        """
+        with self._condition:
+            self._submitted += 1
+            if filename in self._pending:
+                self._coalesced += 1
+            self._pending[filename] = data
+            self._condition.notify_all()
+
+    def flush(self, filename:str=None, timeout:float=None) -> bool:
+        """Wait until saves have been written.
+            Arguments:
+                filename - wait for this file only, default is to wait for all files
+                timeout - maximum seconds to wait, default is no limit
+            Returns: True if everything asked for has been written, False if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._is_pending(filename):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def _is_pending(self, filename:str|None) -> bool:
+        if filename is None:
+            return len(self._pending) > 0 or self._writing is not None
+        return filename in self._pending or self._writing == filename
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while len(self._pending) == 0:
+                    self._condition.wait()
+                filename = next(iter(self._pending))
+                data = self._pending.pop(filename)
+                self._writing = filename
+            try:
+                GameWriter.write_file(filename, data)
+            except Exception as ex:
+                logging.error(f"GameWriter could not write {filename}: {str(ex)}")
+            with self._condition:
+                self._writing = None
+                self._written += 1
+                self._condition.notify_all()
+
+    @staticmethod
+    def write_file(filename:str, data:bytes):
+        """Writes data to filename by way of a temporary file in the same folder
+        """
+        temp_filename = f'{filename}.tmp'
+        with open(temp_filename, "wb") as fp:
+            fp.write(data)
+        os.replace(temp_filename, filename)
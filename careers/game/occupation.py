@@ -53,15 +53,10 @@ class Occupation(object):
         self._points =  {"cash" : 0,"stars" : 0,"hearts" : 0,"salary" : 0,"total_points" : 0} 
         
         self._double_happiness = False      # this is temporarily set by a "double_happiness" Opportunity card
-        self._careersGame = None
         #
-        # avoids circular import
+        # game is the EditionTemplate this Occupation belongs to
         #
-        if game is not None:
-            from game.careersGame import CareersGame
-            assert isinstance(game,CareersGame)
-            self._careersGame = game
-        self._occupationSquares = self._create_occupation_squares(occupation_dict["occupationSquares"], self._careersGame)
+        self._occupationSquares = self._create_occupation_squares(occupation_dict["occupationSquares"], game)
 
     def _create_occupation_squares(self, occupationSquares:list, game) -> list:
         """For this Occupation create a list of OccupationSquare corresponding to the "occupationSquares".
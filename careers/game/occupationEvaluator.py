@@ -0,0 +1,381 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from game.editionTemplate import EditionTemplate
+from game.gameConstants import GameParametersType, SpecialProcessingType
+from game.occupation import Occupation
+from game.player import Player
+from game.successFormula import SuccessFormula
+
+from threading import Lock
+from typing import Dict, List, Set, Tuple
+import numpy as np
+
+class OccupationPayoff(object):
+    """The exact distributions of the outcome of one trip through an occupation, from entering it until leaving it.
+        The outcome is the change in each of the QUANTITIES and the way the player left, one of the EXITS:
+            completed - moved past the last square to the occupation's exit square
+            hospital, unemployment - sent to the Hospital or Unemployment
+            wormhole - transported to another occupation
+            incomplete - still in the occupation after max_turns turns (a loop of goto squares for example)
+        For each quantity the joint distribution of (exit, value) is kept as NumPy arrays, one row per distinct pair.
+        Salary and cash are in currency units.
+        Arguments:
+            occupation_name - the occupation name
+            outcomes - a Dict of quantity : Dict of (exit, value) : probability
+    """
+    QUANTITIES = ["hearts", "stars", "salary", "cash", "cards", "turns"]
+    EXITS = ["completed", "hospital", "unemployment", "wormhole", "incomplete"]
+
+    def __init__(self, occupation_name:str, outcomes:Dict[str, Dict[Tuple[str, int], float]]):
+        self._occupation_name = occupation_name
+        self._outcomes:Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._distributions:Dict[str, Dict[int, float]] = {}
+        self._means:Dict[str, float] = {}
+        for quantity in OccupationPayoff.QUANTITIES:
+            keys = sorted(outcomes[quantity].keys(), key=lambda key: key[1])
+            exits = np.array([OccupationPayoff.EXITS.index(key[0]) for key in keys], dtype=np.int8)
+            values = np.array([key[1] for key in keys], dtype=np.int64)
+            probabilities = np.array([outcomes[quantity][key] for key in keys])
+            self._outcomes[quantity] = (values, exits, probabilities)
+            self._distributions[quantity] = self._marginal(values, probabilities)
+            self._means[quantity] = float(probabilities @ values)
+        #
+        # every quantity's distribution has the same exit probabilities
+        #
+        values, exits, probabilities = self._outcomes["turns"]
+        self._exit_probabilities = np.bincount(exits, weights=probabilities, minlength=len(OccupationPayoff.EXITS))
+
+    @staticmethod
+    def _marginal(values:np.ndarray, probabilities:np.ndarray) -> Dict[int, float]:
+        unique_values, inverse = np.unique(values, return_inverse=True)
+        return {int(v) : float(p) for v,p in zip(unique_values, np.bincount(inverse, weights=probabilities))}
+
+    @property
+    def occupation_name(self) -> str:
+        return self._occupation_name
+
+    def outcomes(self, quantity:str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The joint distribution of a quantity and the exit as a 3-tuple of arrays in value order:
+            values, exits (the index in EXITS) and probabilities, which sum to 1
+        """
+        return self._outcomes[quantity]
+
+    def distribution(self, quantity:str, exit_name:str=None) -> Dict[int, float]:
+        """The distribution of one of the QUANTITIES as a Dict of value : probability, in value order.
+            If exit_name is given, the distribution is conditional on leaving the occupation that way.
+        """
+        if exit_name is None:
+            return self._distributions[quantity]
+        values, exits, probabilities = self._outcomes[quantity]
+        selected = exits == OccupationPayoff.EXITS.index(exit_name)
+        total = probabilities[selected].sum()
+        return self._marginal(values[selected], probabilities[selected] / total) if total > 0 else {}
+
+    def mean(self, quantity:str) -> float:
+        return self._means[quantity]
+
+    def stdev(self, quantity:str) -> float:
+        values, exits, probabilities = self._outcomes[quantity]
+        return float(np.sqrt(probabilities @ (values - self._means[quantity])**2))
+
+    def exit_probability(self, exit_name:str) -> float:
+        """The probability of leaving the occupation one of the EXITS
+        """
+        return float(self._exit_probabilities[OccupationPayoff.EXITS.index(exit_name)])
+
+    @property
+    def completion_probability(self) -> float:
+        return self.exit_probability("completed")
+
+    @property
+    def risk(self) -> float:
+        """The probability of being sent to the Hospital or Unemployment
+        """
+        return self.exit_probability("hospital") + self.exit_probability("unemployment")
+
+    def to_dict(self) -> Dict:
+        """A summary of the means, standard deviations and exit probabilities
+        """
+        return {"occupation_name" : self._occupation_name, \
+                "mean" : {quantity : round(self.mean(quantity), 3) for quantity in OccupationPayoff.QUANTITIES}, \
+                "stdev" : {quantity : round(self.stdev(quantity), 3) for quantity in OccupationPayoff.QUANTITIES}, \
+                "exits" : {exit_name : round(self.exit_probability(exit_name), 4) for exit_name in OccupationPayoff.EXITS}}
+
+class OccupationEvaluator(object):
+    """Evaluates the payoff of each occupation of an edition by dynamic programming over the occupation's squares.
+        A trip through an occupation starts at its entrance (square -1) and each turn the player rolls 1 die.
+        The state is the player's square together with the running total of a quantity, so the result is the exact
+        distribution of each of hearts, stars, salary change, cash change, cards drawn and turns spent, jointly with
+        the way the player left, not just the means that Occupation.points estimates.
+        Identical states are merged after every roll, and quantities are solved one at a time
+        so the number of states stays small.
+        Square actions follow OccupationSquare.execute_special_processing:
+            bonus, bonus_all and salary_increase amounts, multiplied by the dice when the square has dice
+            cash_loss, salary_cut, fame_loss and happiness_loss, fixed or as a percent of the player's running totals
+                (a loss of net worth is taken as a loss of cash)
+            goto and shortcut squares, travel_border (Hospital or Unemployment), cash_loss_and_unemployment and wormholes
+            lose_next_turn adds a turn, and the roll after an extra_turn square costs no turn
+        A player with a cash_loss_or_unemployment choice pays if they have the cash. Insurance and favors are not modelled,
+        and backstab squares don't cost hearts: backstabbing is the player's choice.
+        Percent losses depend on the player's totals on entering, given by the reference values.
+        The default reference is a new player: the starting salary and cash of the edition's game parameters.
+
+        Payoffs are computed for every occupation when the evaluator is built,
+        so payoff() and recommend() are lookups. Evaluators are cached, use OccupationEvaluator.get_evaluator().
+        Arguments:
+            template - the EditionTemplate of the edition
+            salary, cash, stars, hearts - the reference totals of a player entering an occupation
+            take_shortcuts - if True a player always takes an occupation shortcut
+            max_turns - a trip that hasn't left the occupation after this many turns is counted as incomplete
+    """
+    _evaluators:Dict[Tuple, 'OccupationEvaluator'] = {}
+    _lock = Lock()
+
+    def __init__(self, template:EditionTemplate, salary:int=None, cash:int=None, stars:int=0, hearts:int=0, \
+                 take_shortcuts:bool=True, max_turns:int=50):
+        game_parameters = template.game_parameters
+        self._edition_name = template.edition_name
+        if salary is None:
+            salary = game_parameters.get_param("starting_salary") or 2000
+        if cash is None:
+            cash = game_parameters.get_param("starting_cash") or 2000
+        self._salary = salary
+        self._cash = cash
+        self._stars = stars
+        self._hearts = hearts
+        self._take_shortcuts = take_shortcuts
+        self._max_turns = max_turns
+        #
+        # template occupations are also keyed by lower case and alternate names, and an occupation without a JSON file is None
+        #
+        self._occupation_aliases:Dict[str, str] = {alias : occupation.name for alias,occupation in template.occupations.items() if occupation is not None}
+        self._occupations:Dict[str, Occupation] = {occupation.name : occupation for occupation in template.occupations.values() if occupation is not None}
+        self._payoffs:Dict[str, OccupationPayoff] = {name : self._evaluate(occupation) for name,occupation in self._occupations.items()}
+        #
+        # expected hearts, stars, money points (cash and salary in 1000s) and turns of each occupation, for recommend()
+        #
+        self._names = list(self._payoffs.keys())
+        self._expected = np.array([[payoff.mean("hearts"), payoff.mean("stars"), payoff.mean("cash") / 1000, payoff.mean("salary") / 1000, \
+                                    max(payoff.mean("turns"), 1.0)] for payoff in self._payoffs.values()]).reshape(len(self._names), 5)
+
+    @staticmethod
+    def get_evaluator(edition_name:str, game_parameters_type:GameParametersType=GameParametersType.PROD, **reference) -> 'OccupationEvaluator':
+        """Gets the OccupationEvaluator of an edition, building it on first use.
+            Arguments:
+                edition_name - the edition name, for example "Professions-Hi-Tech_v3"
+                game_parameters_type - a GameParametersType
+                reference - keyword arguments for the OccupationEvaluator constructor:
+                    salary, cash, stars, hearts, take_shortcuts, max_turns
+        """
+        key = (edition_name, game_parameters_type, tuple(sorted(reference.items())))
+        evaluator = OccupationEvaluator._evaluators.get(key)
+        if evaluator is None:
+            with OccupationEvaluator._lock:
+                evaluator = OccupationEvaluator._evaluators.get(key)
+                if evaluator is None:
+                    evaluator = OccupationEvaluator(EditionTemplate.get_template(edition_name, game_parameters_type), **reference)
+                    OccupationEvaluator._evaluators[key] = evaluator
+        return evaluator
+
+    @property
+    def edition_name(self) -> str:
+        return self._edition_name
+
+    @property
+    def occupation_names(self) -> List[str]:
+        return self._names
+
+    @property
+    def payoffs(self) -> Dict[str, OccupationPayoff]:
+        return self._payoffs
+
+    def payoff(self, occupation_name:str) -> OccupationPayoff:
+        """The OccupationPayoff of an occupation, by name or alternate name
+        """
+        return self._payoffs[self._occupation_aliases[occupation_name]]
+
+    def recommend(self, success_formula:SuccessFormula, hearts:int=0, stars:int=0, money:int=0, \
+                  salary_paydays:float=1.0, occupation_names:List[str]=None) -> List[Tuple[str, float]]:
+        """Ranks occupations by the expected progress per turn towards a success formula.
+            Progress counts only the hearts, stars and money points still needed, each weighted by its share of the points still needed.
+            Arguments:
+                success_formula - the player's SuccessFormula
+                hearts, stars, money - the player's current hearts, stars and money points (cash in 1000s)
+                salary_paydays - the number of paydays a salary increase is expected to be collected
+                occupation_names - the occupations to rank, default is all of them
+            Returns: a List of (occupation name, score) best first
+        """
+        needed = np.array([max(success_formula.hearts - hearts, 0), max(success_formula.stars - stars, 0), max(success_formula.money - money, 0)], dtype=float)
+        if needed.sum() > 0:
+            needed = needed / needed.sum()
+        expected = self._expected
+        gains = np.column_stack([expected[:, 0], expected[:, 1], expected[:, 2] + salary_paydays * expected[:, 3]])
+        scores = (gains @ needed) / expected[:, 4]
+        names = self._names if occupation_names is None else [self._occupation_aliases[name] for name in occupation_names]
+        ranked = [(name, float(scores[self._names.index(name)])) for name in names]
+        ranked.sort(key=lambda ranking: ranking[1], reverse=True)
+        return ranked
+
+    def recommend_for(self, player:Player, occupation_names:List[str]=None, salary_paydays:float=1.0) -> List[Tuple[str, float]]:
+        """Ranks occupations for a Player, see recommend()
+        """
+        return self.recommend(player.success_formula, player.happiness, player.fame, (player.cash + player.savings) // 1000, \
+                              salary_paydays, occupation_names)
+
+    #
+    # dynamic programming
+    #
+    def _evaluate(self, occupation:Occupation) -> OccupationPayoff:
+        """The outcome distributions of a trip through an occupation, solved one quantity at a time
+        """
+        #
+        # cash and salary decide whether a cash_loss_or_unemployment square sends the player to Unemployment,
+        # so where there is one they are always part of the state
+        #
+        types = [square.special_processing.processing_type for square in occupation.occupationSquares if square.special_processing is not None]
+        salary_losses = [square for square in occupation.occupationSquares if square.special_processing is not None and \
+                         square.special_processing.processing_type is SpecialProcessingType.CASH_LOSS and \
+                         square.special_processing.amount == 0 and square.special_processing.of == 'salary']
+        cash_columns = {2, 3} if len(salary_losses) > 0 else {3}     # a cash loss can be a percent of salary
+        path_columns = cash_columns if SpecialProcessingType.CASH_LOSS_OR_UNEMPLOYMENT in types else set()
+        outcomes = {}
+        for column,quantity in enumerate(OccupationPayoff.QUANTITIES):
+            columns = path_columns | {column}
+            if quantity == "cash":
+                columns |= cash_columns
+            outcomes[quantity] = self._evaluate_quantity(occupation, columns, column)
+        return OccupationPayoff(occupation.name, outcomes)
+
+    def _evaluate_quantity(self, occupation:Occupation, columns:Set[int], column:int) -> Dict[Tuple[str, int], float]:
+        """The joint distribution of the exit and the change in one quantity.
+            A state is (square number, extra turn, hearts, stars, salary, cash, cards, turns) with running totals.
+            Totals in columns are kept, the others are reset to their reference value after every roll,
+            so states that differ only in totals that don't matter are merged.
+            Returns: a Dict of (exit, change in the quantity in column) : probability
+        """
+        reference = (self._hearts, self._stars, self._salary, self._cash, 0, 0)
+        kept = [i in columns for i in range(len(reference))]
+        #
+        # the square a roll moves from, indexed by square number + 1
+        #
+        starts = [-1]
+        for square in occupation.occupationSquares:
+            sp = square.special_processing
+            starts.append(sp.next_square - 1 if sp is not None and isinstance(sp.next_square, int) else square.number)   # the engine moves from next_square - 1
+        outcomes:Dict[Tuple[str, int], float] = {}
+        states = {(-1, False) + reference : 1.0}
+        for _ in range(self._max_turns):
+            next_states:Dict[Tuple, float] = {}
+            for state,probability in states.items():
+                start = starts[state[0] + 1]
+                totals = state[2:7] + (state[7] if state[1] else state[7] + 1, )
+                for die in range(1, 7):
+                    for exit_name,new_state,p in self._land(occupation, start + die, totals, probability / 6):
+                        if exit_name is None:
+                            new_state = new_state[:2] + tuple(value if keep else ref for value,keep,ref in zip(new_state[2:], kept, reference))
+                            next_states[new_state] = next_states.get(new_state, 0.0) + p
+                        else:
+                            key = (exit_name, new_state[column] - reference[column])
+                            outcomes[key] = outcomes.get(key, 0.0) + p
+            states = next_states
+            if len(states) == 0:
+                break
+        for state,probability in states.items():
+            key = ("incomplete", state[column+2] - reference[column])
+            outcomes[key] = outcomes.get(key, 0.0) + probability
+        return outcomes
+
+    def _land(self, occupation:Occupation, square_number:int, totals:Tuple, probability:float, depth:int=0) -> List[Tuple]:
+        """The results of moving to an occupation square.
+            Returns: a List of (exit name, state, probability). The exit name is None if the player is still in the occupation,
+            in which case state is the next DP state, otherwise it's the final totals.
+        """
+        if square_number >= occupation.size:
+            return [("completed", totals, probability)]
+        hearts, stars, salary, cash, cards, turns = totals
+        square = occupation.occupationSquares[square_number]
+        stars += max(square.stars, 0)          # like OccupationSquare.execute, only positive stars and hearts are added
+        hearts += max(square.hearts, 0)
+        cards += square.opportunities + square.experience
+        sp = square.special_processing
+        sp_type = None if sp is None else sp.processing_type
+        if depth > occupation.size:     # a loop of goto squares, stop here
+            sp_type = None
+        extra_turn = False
+        results = []
+        match(sp_type):
+            case SpecialProcessingType.BONUS | SpecialProcessingType.BONUS_ALL | SpecialProcessingType.SALARY_INCREASE:
+                if sp.dice > 0:
+                    amounts = self._dice_amounts(sp.dice, sp.amount)
+                elif sp_type is SpecialProcessingType.BONUS_ALL:    # the engine pays a bonus_all without dice to no one
+                    amounts = [(0, 1.0)]
+                else:
+                    amounts = [(sp.amount, 1.0)]
+                for amount,p in amounts:
+                    if sp_type is SpecialProcessingType.SALARY_INCREASE:
+                        results.append((None, (square_number, False, hearts, stars, salary + amount, cash, cards, turns), probability * p))
+                    else:
+                        results.append((None, (square_number, False, hearts, stars, salary, cash + amount, cards, turns), probability * p))
+                return results
+            case SpecialProcessingType.CASH_LOSS:
+                for amount,p in self._loss_amounts(sp, cash, salary):
+                    results.append((None, (square_number, False, hearts, stars, salary, cash - amount, cards, turns), probability * p))
+                return results
+            case SpecialProcessingType.CASH_LOSS_OR_UNEMPLOYMENT:
+                if cash < sp.amount:
+                    return [("unemployment", (hearts, stars, salary, cash, cards, turns), probability)]
+                cash -= sp.amount
+            case SpecialProcessingType.CASH_LOSS_AND_UNEMPLOYMENT:    # SpecialProcessing.compute_cash_loss has no loss for this type
+                return [("unemployment", (hearts, stars, salary, cash, cards, turns), probability)]
+            case SpecialProcessingType.SALARY_CUT:
+                salary -= sp.amount if sp.amount > 0 else 1000 * int(salary * sp.percent / 1000)
+            case SpecialProcessingType.FAME_LOSS:
+                stars -= int(stars * sp.percent) if sp.percent > 0 else sp.amount
+            case SpecialProcessingType.HAPPINESS_LOSS:
+                hearts -= int(hearts * sp.percent) if sp.percent > 0 else sp.amount
+            case SpecialProcessingType.LOSE_NEXT_TURN:
+                turns += 1
+            case SpecialProcessingType.EXTRA_TURN:
+                extra_turn = True
+            case SpecialProcessingType.TRAVEL_BORDER:
+                exit_name = str(sp.next_square).lower()
+                exit_name = exit_name if exit_name in OccupationPayoff.EXITS else "completed"
+                return [(exit_name, (hearts, stars, salary, cash, cards, turns), probability)]
+            case SpecialProcessingType.WORMHOLE:
+                return [("wormhole", (hearts, stars, salary, cash, cards, turns), probability)]
+            case SpecialProcessingType.GOTO:
+                return self._land(occupation, sp.next_square, (hearts, stars, salary, cash, cards, turns), probability, depth+1)
+            case SpecialProcessingType.SHORTCUT if self._take_shortcuts:
+                return self._land(occupation, sp.next_square, (hearts, stars, salary, cash, cards, turns), probability, depth+1)
+        return [(None, (square_number, extra_turn, hearts, stars, salary, cash, cards, turns), probability)]
+
+    def _dice_amounts(self, dice:int, amount:int) -> List[Tuple[int, float]]:
+        """The distribution of amount * the sum of a roll of dice, as a List of (amount, probability)
+        """
+        sums = {0 : 1.0}
+        for _ in range(dice):
+            rolled:Dict[int, float] = {}
+            for total,p in sums.items():
+                for die in range(1, 7):
+                    rolled[total + die] = rolled.get(total + die, 0.0) + p / 6
+            sums = rolled
+        return [(total * amount, p) for total,p in sums.items()]
+
+    def _loss_amounts(self, sp, cash:int, salary:int) -> List[Tuple[int, float]]:
+        """The distribution of a cash loss, following SpecialProcessing._compute_amount
+        """
+        if sp.amount != 0:
+            return self._dice_amounts(sp.dice, sp.amount) if sp.dice > 0 else [(sp.amount, 1.0)]
+        base = salary if sp.of == 'salary' else cash
+        multipliers = self._dice_amounts(sp.dice, 1) if sp.dice > 0 else [(1, 1.0)]
+        amounts = []
+        for multiplier,p in multipliers:
+            amount = int(multiplier * sp.percent * base)
+            if sp.of == 'salary':
+                amount = 1000 * int(amount / 1000)
+            amounts.append((amount, p))
+        return amounts
@@ -8,7 +8,7 @@ from game.player import Player
 from game.commandResult import CommandResult
 from game.gameUtils import GameUtils
 from game.gameConstants import SpecialProcessingType, OccupationSquareType, PendingActionType, GameConstants
-import json, random
+import json
 from typing import Any, List, Dict
 
 
@@ -25,7 +25,7 @@ class OccupationSquare(GameSquare):
         """Create a OccupationSquare instance.
             Arguments:
                 occupation_square_dict - the dictionary defining this OccupationSquare. This would be an element of occupationSquares.
-                game - a CareersGame instance
+                game - the EditionTemplate this square belongs to
 
         """
         super().__init__("Occupation", name=name, number= occupation_square_dict['number'], \
@@ -95,10 +95,10 @@ class OccupationSquare(GameSquare):
             message += f'\n {happiness_str}: {str(self.hearts)}'
             player.add_hearts(self.hearts)
         if self.opportunities > 0:
-            card_list = self.careersGame.opportunities.draw_cards(self.opportunities)
+            card_list = player.my_game.opportunities.draw_cards(self.opportunities)
             player.add_opportunity_card(card_list)
         if self.experience > 0:
-            card_list = self.careersGame.experience_cards.draw_cards(self.experience)
+            card_list = player.my_game.experience_cards.draw_cards(self.experience)
             player.add_experience_card(card_list)
         if self.special_processing is not None:
             return self.execute_special_processing(message, player)
@@ -118,14 +118,14 @@ class OccupationSquare(GameSquare):
         match sptype:
             case SpecialProcessingType.BONUS:
                 if dice > 0:
-                    n = GameUtils.roll(dice)
+                    n = GameUtils.roll(dice, player.my_game.random)
                     amount = amount * sum(n)
                     message += f'\n You rolled {dice} die and got a {n} to collect {amount}'
                 player.add_cash(amount)
             
             case SpecialProcessingType.BONUS_ALL:
                 if dice > 0:
-                    n = GameUtils.roll(dice)
+                    n = GameUtils.roll(dice, player.my_game.random)
                     amount = amount * sum(n)
                     #
                     # who else has COMPLETED this occupation? They also get the bonus amount
@@ -144,7 +144,7 @@ class OccupationSquare(GameSquare):
                     
             case SpecialProcessingType.SALARY_INCREASE:
                 if dice > 0:
-                    n = GameUtils.roll(dice)
+                    n = GameUtils.roll(dice, player.my_game.random)
                     amount = amount * sum(n)
                     message = f'{message}\n You rolled a {n}, salary increase {amount}'
                 player.add_to_salary(amount)
@@ -163,10 +163,10 @@ class OccupationSquare(GameSquare):
                 # collect a randomly selected Opportunity card from the other players
                 #
                 message = ""
-                for aplayer in self.careersGame.game_state.players:
+                for aplayer in player.my_game.game_state.players:
                     ncards = len(aplayer.my_opportunity_cards)
                     if player.number != aplayer.number and ncards > 0:
-                        ind = random.randint(0, ncards-1)    # the index of the card to move to this player
+                        ind = player.my_game.random.randint(0, ncards-1)    # the index of the card to move to this player
                         thecard = aplayer.my_opportunity_cards[ind]
                         aplayer.remove_opportunity_card(thecard)
                         player.add_opportunity_card(thecard)
@@ -285,7 +285,7 @@ class OccupationSquare(GameSquare):
                     # pick a profession/wormhole square at random.
                     # It could be the same square the player now occupies.
                     # 
-                    next_dest = GameConstants.pick_random_wormhole()
+                    next_dest = GameConstants.pick_random_wormhole(player.my_game.random)
                     occupation_name = next_dest["occupation_name"]
                     if self.name == occupation_name:      # if the destination is the current square
                         message = f'{self.action_text} nowhere'   # stay where we are
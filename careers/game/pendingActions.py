@@ -7,7 +7,7 @@ from game.careersObject import CareersObject
 from game.pendingAction import PendingAction
 from game.gameConstants import PendingActionType
 from typing import List
-import json
+import copy, json
 
 class PendingActions(CareersObject):
     '''
@@ -146,6 +146,13 @@ class PendingActions(CareersObject):
     def get_all(self)->List[PendingAction]:
         return self._pending_actions
     
+    def copy(self) -> 'PendingActions':
+        """A copy with copies of the PendingAction, as a PendingAction can be changed (its pending_dice for example)
+        """
+        pending_actions = PendingActions()
+        pending_actions._pending_actions = [copy.copy(pa) for pa in self._pending_actions]
+        return pending_actions
+    
     def to_dict(self):
         pl = []
         for pa in self._pending_actions:
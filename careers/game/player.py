@@ -7,7 +7,7 @@ from game.successFormula import SuccessFormula
 from game.careersObject import CareersObject
 from game.boardLocation import BoardLocation
 from game.opportunityCard import OpportunityCard, OpportunityType, OpportunityActionType
-from game.experienceCard import ExperienceCard
+from game.experienceCard import ExperienceCard, ExperienceType
 from game.gameConstants import PendingActionType
 from game.pendingAction import PendingAction
 from game.pendingActions import PendingActions
@@ -16,6 +16,7 @@ from game.turnHistory import TurnHistory
 from game.todoList import TodoList
 from game.gameConstants import GameConstants
 from game.gameUtils import GameUtils
+from game.consoleOutput import ConsoleOutput
 from datetime import datetime
 from typing import Dict, List, Union
 import json
@@ -23,8 +24,21 @@ import json
 class Player(CareersObject):
     
     SPECIAL_PROCESSING = Dict[str, Union[str, List[int], int, float, Dict[str, int]]]
+    #
+    # the lists that are only appended to or replaced, never changed in place, which a snapshot shares with the player,
+    # and the lists and dicts that are changed in place, which a snapshot copies
+    #
+    _APPENDED = ['_salary_history', '_happiness', '_fame', '_command_history']
+    _COPIED = ['_my_degrees', '_occupation_record', '_loans', '_point_losses', '_can_bump', '_my_experience_cards', '_my_opportunity_cards', \
+               '_experience_type_counts', '_opportunity_type_counts']
+    #
+    # the index of each card type in the type counts
+    #
+    _OPPORTUNITY_TYPE_INDEX = {opportunity_type : i for i,opportunity_type in enumerate(OpportunityType)}
+    _EXPERIENCE_TYPE_INDEX = {experience_type : i for i,experience_type in enumerate(ExperienceType)}
     
     def __init__(self, number=0, name="Player", player_id="", email="", salary=2000, cash=2000, initials="XXX", playerType:PlayerType=PlayerType.HUMAN):
+        self._progress_listener = None      # called with the player when its cash, stars, hearts or success formula change, see GameState.add_player
         self._player_name = name
         self._player_initials = initials            # unique initials - no player can have the same initials
         self._salary_history = [salary]             # List[int] of salaries the player has attained
@@ -51,8 +65,10 @@ class Player(CareersObject):
         
         # player loan obligations are indexed by player_number: loans[player_number] = <loan amount>
         self._loans = {}    # Dict[int, int]:
+        self._total_loans = 0       # the sum of the loans, kept by add_loan()
         
-        self._command_history:List[str] = []    # a list of commands executed by a player
+        self._command_history:List[str] = []    # a list of commands executed by a player, the most recent if some are stored
+        self._commands_stored = 0               # the number of the oldest commands dropped from command_history, see drop_commands()
         self._turn_history:TurnHistory = None   # turn command(s) and outcomes
         
         # minutes remaining in a timed game
@@ -95,17 +111,56 @@ class Player(CareersObject):
         self._pending_actions = PendingActions()
         self._my_experience_cards = []       # list of ExperienceCards this player holds
         self._my_opportunity_cards = []      # list of OpportunityCards this player holds
+        self._experience_card_value = 0      # the sum of the values of the cards held, kept as cards are added and removed
+        self._opportunity_card_value = 0
+        self._experience_type_counts = [0] * len(ExperienceType)        # the number of cards held of each type, in Enum order
+        self._opportunity_type_counts = [0] * len(OpportunityType)
         self._happiness = [0]                # record of happiness (hearts) earned. Cumulative amounts, total is happiness[-1]
         self._fame = [0]                     # record of fame (stars) earned. Cumulative amounts, total is fame[-1]
         self._savings = 0                    # savings account - populated with "pay", draw funds with "withdraw"
         self._point_losses = {"cash":5000,"hearts":10,"stars":10, "salary":2000}    # most recent point losses if any. Used by "use_insurance" command
         self._game_type = GameType.POINTS    # defaults to POINTS, can set to TIMED
     
+    def __setattr__(self, name:str, value):
+        """Every assignment to the player is a change, see version
+        """
+        object.__setattr__(self, name, value)
+        self.__dict__['_version'] = self.__dict__.get('_version', 0) + 1
+    
+    @property
+    def version(self) -> int:
+        """Incremented on every change to the player, so the player's saved document is only rebuilt when it changed.
+            Assignments count themselves, the lists and dicts changed in place call changed().
+            Changes in place to the BoardLocation and PendingActions aren't counted, see GameSaveTracker.
+        """
+        return self.__dict__.get('_version', 0)
+    
+    def changed(self):
+        """Records a change in place to the player, for example to its occupation record
+        """
+        self.__dict__['_version'] = self.version + 1
+    
     def set_starting_parameters(self, cash=2000, salary=2000):
         self._starting_cash = cash
         self._starting_salary = salary
         self._cash = cash
         self._salary = salary     
+        self._progress_changed()
+    
+    @property
+    def progress_listener(self):
+        return self._progress_listener
+    
+    @progress_listener.setter
+    def progress_listener(self, listener):
+        """Sets the function called with this player when its cash, stars, hearts or success formula change
+        """
+        self._progress_listener = listener
+    
+    def _progress_changed(self):
+        self.changed()
+        if self._progress_listener is not None:
+            self._progress_listener(self)
     
     def has_success(self) -> bool:
         return self.happiness >= self.success_formula.hearts and \
@@ -169,6 +224,7 @@ class Player(CareersObject):
         self._cash = value
         if value < 0:
             self.add_pending_action(PendingActionType.BANKRUPT)
+        self._progress_changed()
     
     @property
     def success_formula(self) -> SuccessFormula:
@@ -177,6 +233,7 @@ class Player(CareersObject):
     @success_formula.setter
     def success_formula(self, value:SuccessFormula):
         self._success_formula = value
+        self._progress_changed()
         
     @property
     def number(self):
@@ -242,6 +299,7 @@ class Player(CareersObject):
     @happiness.setter
     def happiness(self, qty):
         self._happiness = [qty]
+        self._progress_changed()
     
     @property   
     def fame(self):
@@ -250,6 +308,7 @@ class Player(CareersObject):
     @fame.setter
     def fame(self, qty):
         self._fame = [qty]
+        self._progress_changed()
         
     @property
     def time_remaining(self)->int:
@@ -324,10 +383,23 @@ class Player(CareersObject):
     def add_opportunity_card(self, thecard:OpportunityCard|List[OpportunityCard]):
         """Add a single OpportunityCard OR a List[OpportunityCard] to my deck
         """
-        if isinstance(thecard, OpportunityCard):
-            self._my_opportunity_cards.append(thecard)
-        else:
-            self._my_opportunity_cards += thecard
+        cards = [thecard] if isinstance(thecard, OpportunityCard) else thecard
+        self._my_opportunity_cards += cards
+        for card in cards:
+            self._opportunity_card_value += card.value
+            self._opportunity_type_counts[Player._OPPORTUNITY_TYPE_INDEX[card.opportunity_type]] += 1
+    
+    @property
+    def opportunity_card_value(self) -> int:
+        """The sum of the values of the Opportunity cards held
+        """
+        return self._opportunity_card_value
+    
+    @property
+    def opportunity_type_counts(self) -> List[int]:
+        """The number of Opportunity cards held of each OpportunityType, in Enum order. Read only.
+        """
+        return self._opportunity_type_counts
     
     @property
     def my_experience_cards(self) -> List[ExperienceCard]:
@@ -348,10 +420,23 @@ class Player(CareersObject):
     def add_experience_card(self, thecard:ExperienceCard|List[ExperienceCard]):
         """Add a single ExperienceCard OR a List[ExperienceCard] to my deck
         """
-        if isinstance(thecard, ExperienceCard):
-            self._my_experience_cards.append(thecard)
-        else:
-            self._my_experience_cards += thecard
+        cards = [thecard] if isinstance(thecard, ExperienceCard) else thecard
+        self._my_experience_cards += cards
+        for card in cards:
+            self._experience_card_value += card.value
+            self._experience_type_counts[Player._EXPERIENCE_TYPE_INDEX[card.card_type]] += 1
+    
+    @property
+    def experience_card_value(self) -> int:
+        """The sum of the values of the Experience cards held
+        """
+        return self._experience_card_value
+    
+    @property
+    def experience_type_counts(self) -> List[int]:
+        """The number of Experience cards held of each ExperienceType, in Enum order. Read only.
+        """
+        return self._experience_type_counts
     
     @property
     def is_unemployed(self):
@@ -450,12 +535,14 @@ class Player(CareersObject):
     
     def add_point_loss(self, key:str, value:int):
         self._point_losses[key] = value
+        self.changed()
     
     def clear_point_losses(self):
         self.point_losses["cash"] = 0
         self.point_losses["hearts"] = 0
         self.point_losses["stars"] = 0
         self.point_losses["salary"] = 0
+        self.changed()
         
     @property
     def game_type(self)->GameType:
@@ -499,13 +586,30 @@ class Player(CareersObject):
         """Adds a command to the player's command_history and current Turn
         """
         self._command_history.append(command)
+        self.changed()
         
         if self.turn_history is not None:
-            turn = self.turn_history.get_turn()
-            turn.commands.append(command)
+            self.turn_history.add_command(command)
     
     def get_command(self, index:int=-1) ->str:
         return self._command_history[index]
+    
+    @property
+    def command_history(self) -> List[str]:
+        return self._command_history
+    
+    @property
+    def commands_stored(self) -> int:
+        """The number of commands dropped from the command history, stored with the turns of the TurnHistory they belong to
+        """
+        return self._commands_stored
+    
+    def drop_commands(self, count:int):
+        """Drops the oldest commands from the command history, for example when the turns they belong to are evicted from the TurnHistory.
+        """
+        count = min(count, len(self._command_history))
+        self._command_history = self._command_history[count:]      # a new list, a snapshot may share this one
+        self._commands_stored += count
         
     def add_pending_action(self, action:PendingActionType, game_square_name:str=None, amount:SPECIAL_PROCESSING=None, dice:int | List[int]=0):
         self._pending_actions.add(PendingAction(action, game_square_name, amount, dice))
@@ -561,16 +665,15 @@ class Player(CareersObject):
         return self._pending_actions.to_dict()
     
     def get_total_loans(self):
-        total = 0
-        for v in self._loans.values():
-            total += v
-        return total
+        return self._total_loans
     
     def add_loan(self, amt:int, player_number:int):
         if player_number in self._loans:
             self._loans[player_number] = self._loans[player_number] + amt
         else:
             self._loans[player_number] = amt
+        self._total_loans += amt
+        self.changed()
     
     def get_opportunity_cards(self) -> List[OpportunityCard]:
         """Returns a of dict of Opportunity cards indexed by number
@@ -616,6 +719,8 @@ class Player(CareersObject):
     
     def remove_opportunity_card(self, card:OpportunityCard):
         self.my_opportunity_cards.remove(card)
+        self._opportunity_card_value -= card.value
+        self._opportunity_type_counts[Player._OPPORTUNITY_TYPE_INDEX[card.opportunity_type]] -= 1
     
     def used_experience(self):
         """The player has used the saved Experience card. Set it to None and remove from their deck
@@ -626,6 +731,8 @@ class Player(CareersObject):
     
     def remove_experience_card(self, card:ExperienceCard):
             self.my_experience_cards.remove(card)
+            self._experience_card_value -= card.value
+            self._experience_type_counts[Player._EXPERIENCE_TYPE_INDEX[card.card_type]] -= 1
                 
     def add_degree(self, degree_program:str):
         if degree_program in self.my_degrees:
@@ -638,6 +745,7 @@ class Player(CareersObject):
                 self.can_retire = True
         else:
             self._my_degrees[degree_program] = 1
+        self.changed()
     
     def add_occupation(self, occupation_name:str):
         if occupation_name in self.occupation_record:
@@ -647,6 +755,7 @@ class Player(CareersObject):
                 self.can_retire = True
         else:
             self._occupation_record[occupation_name] = 1
+        self.changed()
             
         
     def add_hearts(self, nhearts:int):
@@ -657,12 +766,14 @@ class Player(CareersObject):
             if self.happiness + nhearts < 0:
                 nhearts = -self.happiness
         self._happiness.append(self.happiness + nhearts)
+        self._progress_changed()
     
     def add_stars(self, nstars:int):
         if nstars < 0:    # subract this amount but don't go below 0
             if self.fame + nstars < 0:
                 nstars = -self.fame
         self._fame.append(self.fame + nstars)
+        self._progress_changed()
         
     def add_points(self, what:str, qty:int):
         '''Add hearts, stars or cash
@@ -705,6 +816,13 @@ class Player(CareersObject):
         '''
         return self.savings + self.cash - self.get_total_loans()
     
+    def goals_met(self) -> bool:
+        """Returns True if this player has met or surpassed each success formula item: happiness (hearts), fame (stars) and money.
+            The TODOs, if any, are not included, see is_complete()
+        """
+        sf = self._success_formula
+        return sf is not None and self._happiness[-1] >= sf.hearts and self._fame[-1] >= sf.stars and self._cash // 1000 >= sf.money
+    
     def is_complete(self):
         """Returns True if this players has met or surpassed each success formula item:
             happiness (hearts), fame (stars), money, False otherwise
@@ -714,10 +832,7 @@ class Player(CareersObject):
         """
         
         if self.game_type is GameType.POINTS:
-            cash = self.cash_points()
-            complete = self.happiness >= self.success_formula.hearts and \
-                       self.fame >= self.success_formula.stars and \
-                       cash >= self.success_formula.money
+            complete = self.goals_met()
         else:
             complete = self.time_remaining <= 0
         if self._my_todos is not None:
@@ -787,6 +902,86 @@ class Player(CareersObject):
         self.salary = self._starting_salary
         self._salary_history = [self.salary]
         self._initialize()
+        self._progress_changed()
+    
+    def snapshot(self) -> Dict:
+        """An opaque token of the player's state as it is now, for restore(). The cards, success formula and game are shared,
+            as are the lists that are only appended to, like the command history, of which the token has the length.
+            The other lists and dicts, the BoardLocation, PendingActions and TodoList are copied.
+        """
+        state = self.__dict__.copy()
+        for key in Player._APPENDED:
+            state[key] = (state[key], len(state[key]))
+        self._copy_state(state)
+        if self._turn_history is not None:
+            state['_turn_history'] = (self._turn_history, self._turn_history.snapshot())
+        return state
+    
+    def restore(self, token:Dict):
+        """Restores the player to a snapshot(), in place: the Player and its TurnHistory are the same instances.
+            The progress listener isn't called, see GameState.restore()
+        """
+        version = self.version
+        state = token.copy()
+        for key in Player._APPENDED:
+            value, length = state[key]
+            state[key] = value if len(value) == length else value[:length]
+        self._copy_state(state)
+        if state['_turn_history'] is not None:
+            turn_history, turn_history_token = state['_turn_history']
+            turn_history.restore(turn_history_token)
+            state['_turn_history'] = turn_history
+        self.__dict__.update(state)
+        self.__dict__['_version'] = version + 1     # a change, though it's the state of the token
+    
+    @staticmethod
+    def _copy_state(state:Dict):
+        for key in Player._COPIED:
+            state[key] = state[key].copy()
+        state['_board_location'] = state['_board_location'].copy()
+        state['_pending_actions'] = state['_pending_actions'].copy()
+        if state['_my_todos'] is not None:
+            state['_my_todos'] = state['_my_todos'].copy()
+    
+    def info_dict(self, include_successFormula:bool=True, include_degrees=True, include_board_location=True, \
+                  include_card_values=True, include_todos=True) -> Dict:
+        """The player's information as a dict, the player_info(outputFormat='dict') the turn history records at the start
+            and end of each turn. It's built from the running totals of cards, loans and points, without rendering any text.
+            The degrees are a copy, so the dict doesn't change with the player.
+            Arguments: see player_info()
+        """
+        total_loans = self._total_loans
+        net_worth = self._savings + self._cash - total_loans
+        happiness = self._happiness[-1]
+        fame = self._fame[-1]
+        points = happiness + fame + self._cash // 1000 - total_loans // 1000
+        progress =  {"cash":self._cash, f"{GameConstants.STAR}s":fame, f"{GameConstants.HEART}s":happiness, "points":points}
+        
+        info_dict = {"player":self._player_initials,  "salary":self._salary, 'progress' : progress, \
+                     "insured":self._is_insured, "unemployed":self._is_unemployed, "sick":self._is_sick, \
+                     "extra_turn":self._extra_turn, "can_retire":self._can_retire, "net_worth":net_worth}
+        info_dict.update( self._get_pending() )
+        if self._cash < 0:
+            info_dict["is_bankrupt"] = True
+        if include_successFormula and self.game_type is GameType.POINTS:
+            info_dict['success_formula'] = self.success_formula.to_dict()
+        if include_degrees:
+            ndegrees = len(self._my_degrees)
+            info_dict['degrees'] = {'number_of_degrees':ndegrees, 'degrees':dict(self._my_degrees)} if ndegrees > 0 else {'number_of_degrees':0}
+        if include_board_location:
+            info_dict["board_location"] = self.board_location.to_dict()
+        if include_card_values:
+            info_dict["opportunity"] = {"count": len(self._my_opportunity_cards), "value" : self._opportunity_card_value}
+            info_dict["experience"] = {"count": len(self._my_experience_cards), "value" : self._experience_card_value}
+        if include_todos and self._my_todos is not None:
+            info_dict.update(self._my_todos.todos)
+        if self.game_type is GameType.TIMED:
+            info_dict["time_remaining"] = self.time_remaining
+        if total_loans > 0:
+            info_dict["loans"] = self.loans
+        info_dict["opportunities"] = len(self._my_opportunity_cards)
+        info_dict["experiences"] = len(self._my_experience_cards)
+        return info_dict
     
     def player_info(self, include_successFormula:bool=False, outputFormat:str='text', include_degrees=True, \
                     include_board_location=True, include_card_values=True, include_todos= True) ->str:
@@ -800,16 +995,13 @@ class Player(CareersObject):
                 include_todos - include the player's TodoList if there is one
             
             Card values are assigned by card_type and are in the cards JSON files under "types".
+            The 'dict' and 'json' formats are the info_dict(), only 'text' is rendered.
         '''
-        v = self.get_total_loans()
-        net_worth = self.net_worth()
-        progress =  {"cash":self.cash, f"{GameConstants.STAR}s":self.fame, f"{GameConstants.HEART}s":self.happiness, "points":self.total_points()}
-        
-        info_dict = {"player":self.player_initials,  "salary":self.salary, 'progress' : progress }
-        
-        info_dict.update( {"insured":self.is_insured, "unemployed":self.is_unemployed, "sick":self.is_sick, \
-                           "extra_turn":self.extra_turn, "can_retire":self.can_retire, "net_worth":net_worth} )
-        info_dict.update( self._get_pending() )
+        info_dict = self.info_dict(include_successFormula, include_degrees, include_board_location, include_card_values, include_todos)
+        if outputFormat=='json':
+            return json.dumps(info_dict)
+        elif outputFormat=='dict':
+            return info_dict
         
         if self.pending_actions.size() == 0:
             pending_string = "Pending actions: None"  
@@ -821,81 +1013,34 @@ class Player(CareersObject):
         
         salary_str = GameUtils.format_money(self.salary)
         cash_str = GameUtils.format_money(self.cash)
-        net_worth_str = GameUtils.format_money(net_worth)
+        net_worth_str = GameUtils.format_money(info_dict["net_worth"])
         fame_str = GameConstants.FAME.title()
         happiness_str = GameConstants.HAPPINESS.title()
+        points = info_dict["progress"]["points"]
         fstring = \
-f'''Initials: {self.player_initials}: Salary:{salary_str}, Cash: {cash_str},  {fame_str}: {self.fame}, {happiness_str}: {self.happiness}, Points: {self.total_points()}
+f'''Initials: {self.player_initials}: Salary:{salary_str}, Cash: {cash_str},  {fame_str}: {self.fame}, {happiness_str}: {self.happiness}, Points: {points}
 Insured: {self.is_insured}, Unemployed: {self.is_unemployed}, Sick: {self.is_sick}, Can Retire: {self.can_retire}, Net worth: {net_worth_str}
 {pending_string}, Extra turn: {self.extra_turn} '''
 
         if self.cash < 0:
             fstring = f'{fstring}\nALERT: You have negative cash amount and must declare bankruptcy OR borrow the needed funds from another player!!'
-            info_dict.update( {"is_bankrupt":True})
-            
-        if include_successFormula and self.game_type is GameType.POINTS:
+        if "success_formula" in info_dict:
             fstring = f'{fstring}\nSuccess Formula: {self.success_formula}'
-            sf = {'success_formula' : self.success_formula.to_dict()}
-            info_dict.update( sf)
-            
         if include_degrees:
-            list_dict = self.list("degrees", "condensed")
-            degrees = json.dumps(list_dict)
-            fstring = f'{fstring}\nDegrees: {degrees}'
-            info_dict.update({'degrees' : list_dict})
-            
+            fstring = f'{fstring}\nDegrees: {json.dumps(info_dict["degrees"])}'
         if include_board_location:
-            board_locn = str(self.board_location)
-            fstring = f'{fstring}\nBoardLocation: {board_locn}'
-            info_dict.update( {"board_location" : self.board_location.to_dict()} )
-            
+            fstring = f'{fstring}\nBoardLocation: {str(self.board_location)}'
         if include_card_values:
-            #
-            # sum the values of the player's Experience and Opportunity cards
-            # return as a Dict having the count and the total value  {"count" : 2, "value" : 8} 
-            # 
-            opportunity_card_value = 0
-            opportunity_card_count = 0
-            experience_card_value = 0
-            experience_card_count = 0
-            for card in self.my_opportunity_cards:
-                opportunity_card_count += 1
-                opportunity_card_value += card.value
-            for card in self.my_experience_cards:
-                experience_card_count += 1
-                experience_card_value += card.value
-            
-            cdict = {"opportunity" : {"count": opportunity_card_count, "value" : opportunity_card_value}}
-            cdict.update({"experience" : {"count": experience_card_count, "value" : experience_card_value}})
+            cdict = {"opportunity" : info_dict["opportunity"], "experience" : info_dict["experience"]}
             fstring = f'{fstring}\n{cdict}'
-            info_dict.update(cdict)
-        
         if include_todos and self._my_todos is not None:
-            todos = self._my_todos.todos
-            fstring = f'{fstring}\n{todos}'
-            info_dict.update(todos)
-            
+            fstring = f'{fstring}\n{self._my_todos.todos}'
         if self.game_type is GameType.TIMED:
             fstring = f'{fstring}\nGame Time Remaining: {self.time_remaining} minutes'
-            info_dict.update({"time_remaining": self.time_remaining})
-            
-        if v > 0:
-            fstring = f'{fstring}\nloans: {v}'
-            info_dict.update( {"loans":self.loans})
-        
-        # add number of opportunity and experience cards
-        nOpportunities = len(self._my_opportunity_cards)
-        nExperiences = len(self._my_experience_cards)
-        fstring = f'{fstring},\nOpportunity Cards:{nOpportunities}, Experience Cards:{nExperiences}'
-        info_dict.update( {"opportunities":nOpportunities, "experiences":nExperiences})
-            
-        outval = fstring
-        if outputFormat=='json':
-            outval = json.dumps(info_dict)
-        elif outputFormat=='dict':
-            outval = info_dict 
-            
-        return outval
+        if self._total_loans > 0:
+            fstring = f'{fstring}\nloans: {self._total_loans}'
+        fstring = f'{fstring},\nOpportunity Cards:{info_dict["opportunities"]}, Experience Cards:{info_dict["experiences"]}'
+        return fstring
     
     def get_current_location(self) -> BoardLocation:
         """Gets the location of this player on the board.
@@ -978,8 +1123,9 @@ Insured: {self.is_insured}, Unemployed: {self.is_unemployed}, Sick: {self.is_sic
                 list_dict["occupations"] = []
                 list_dict["occupations_completed"] = []
 
-        if what.lower().startswith('command') or listall: # command history
+        if what.lower().startswith('command') or listall: # command history, the most recent if some are stored
             list_dict["commands"] = self._command_history
+            list_dict["commands_stored"] = self._commands_stored
         
         if what.lower().startswith('can_bump') or listall:  # list the players this player can bump, by initials
             list_dict["can_bump"] = self.can_bump
@@ -1027,6 +1173,29 @@ Insured: {self.is_insured}, Unemployed: {self.is_unemployed}, Sick: {self.is_sic
     def to_JSON(self):
         return json.dumps(self.to_dict(), indent=2)
 
+    def __getstate__(self):
+        """The progress listener is a method of the GameState, which pickles the player, so it isn't pickled.
+            GameState.__setstate__ sets it again.
+        """
+        state = self.__dict__.copy()
+        state['_progress_listener'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_progress_listener', None)
+        if '_total_loans' not in state:      # players pickled before the running totals
+            self._total_loans = sum(self._loans.values())
+            self._opportunity_card_value = sum([card.value for card in self._my_opportunity_cards])
+            self._experience_card_value = sum([card.value for card in self._my_experience_cards])
+        if '_opportunity_type_counts' not in state:      # players pickled before the card type counts
+            self._opportunity_type_counts = [0] * len(OpportunityType)
+            for card in self._my_opportunity_cards:
+                self._opportunity_type_counts[Player._OPPORTUNITY_TYPE_INDEX[card.opportunity_type]] += 1
+            self._experience_type_counts = [0] * len(ExperienceType)
+            for card in self._my_experience_cards:
+                self._experience_type_counts[Player._EXPERIENCE_TYPE_INDEX[card.card_type]] += 1
+    
     def _load(self, player_dict:dict):
         """Loads game state player info from a previously saved CareersGame
             TODO
@@ -1057,11 +1226,12 @@ Insured: {self.is_insured}, Unemployed: {self.is_unemployed}, Sick: {self.is_sic
             
         command_history = player_dict["commands"]               # List[str]
         for command in command_history: self.add_command(command)
+        self._commands_stored = player_dict.get("commands_stored", 0)
         
         score = player_dict["score"]                            # {"cash":self.cash, "fame":self.fame, "happiness":self.happiness, "total_points":points}
         self.cash = score["cash"]
-        self.fame = score["fame"]
-        self.happiness = score["happiness"]
+        self.fame = score[GameConstants.FAME] if GameConstants.FAME in score else score["fame"]    # the keys are the edition's point icons
+        self.happiness = score[GameConstants.HAPPINESS] if GameConstants.HAPPINESS in score else score["happiness"]
         self.points = score["total_points"]
         
         salary_history = player_dict["salary_history"]          # List[int]
@@ -1070,9 +1240,9 @@ Insured: {self.is_insured}, Unemployed: {self.is_unemployed}, Sick: {self.is_sic
         pending_actions = player_dict["pending_actions"]        # List[PendingAction]  TODO
         for pa in pending_actions:
             pending_action_type = PendingActionType[pa["pending_action_type"].upper()]
-            self.add_pending_action(pending_action_type, pa["pending_game_square_name"], pa["pending_amount"], pa["pending_dice"])
+            self.add_pending_action(pending_action_type, pa.get("pending_game_square_name"), pa["pending_amount"], pa["pending_dice"])
 
-        print(f'player {self.player_initials} loaded')
+        ConsoleOutput.get_default().write(f'player {self.player_initials} loaded')
     
 if __name__ == '__main__':
     print(Player.__doc__)
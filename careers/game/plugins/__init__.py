@@ -28,6 +28,7 @@ __all__ = [
     "careers_All_Randomizer",
     "careers_HiTech_Rules",
     "careers_All_Strategy",
+    "careers_All_MCTS",
     "plugin"
 ]
 
@@ -35,3 +36,4 @@ from game.plugins.plugin import Plugin
 from game.plugins.careers_All_Randomizer import Careers_All_Randomizer
 from game.plugins.careers_HiTech_Rules import Careers_HiTech_Rules
 from game.plugins.careers_All_Strategy import Careers_All_Strategy
+from game.plugins.careers_All_MCTS import Careers_All_MCTS
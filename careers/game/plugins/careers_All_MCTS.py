@@ -0,0 +1,410 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+from game.careersGame import CareersGame
+from game.careersGameEngine import CareersGameEngine
+from game.commandResult import CommandResult
+from game.consoleOutput import ConsoleOutput
+from game.experienceCard import ExperienceType
+from game.gameConstants import BorderSquareType, PendingActionType
+from game.gameEngineCommands import GameEngineCommands
+from game.opportunityCard import OpportunityType
+from game.player import Player
+from game.plugins.careers_All_Strategy import Careers_All_Strategy
+
+from multiprocessing import Pool
+from typing import Dict, List, Tuple
+import logging, math, pickle, random, time
+
+class Careers_All_MCTS(Careers_All_Strategy):
+    """A computer player strategy that picks each turn's commands with a Monte Carlo tree search.
+        The choices searched are the player's real choices at the start of a turn: how to resolve each pending action
+        (select_degree, take_shortcut, buy_insurance, buy_hearts, buy_stars, travel_choice, cash_loss_or_unemployment),
+        and then roll, enter the occupation the player is on, use one of their Opportunity cards or use one of their
+        Experience cards (with each roll a wild card allows).
+
+        The search plays a copy of the game, unpickled from the game pickled once per decision, in a scratch CareersGameEngine.
+        Each iteration restores the copy to a snapshot of the decision, see CareersGame.snapshot(), and
+        the copy gets its own dice and the undrawn cards are reshuffled, so the search
+        doesn't know the real game's next rolls and draws. The tree is open-loop: its nodes are the player's choices
+        over their next horizon turns, selected with UCB1, and every other turn (the opponents', and the player's once
+        the tree is left) is played by the DUMB Careers_All_Strategy. A playout ends after horizon turns of the player
+        or when the game is won, and is scored by the player's success formula progress less the best opponent's.
+
+        The search stops at a wall-clock time_budget per decision. With workers > 0, that many processes each search
+        for the time budget and their root statistics are added together. The choices depend on the time taken,
+        so the plug-in is not reproducible: the engine logs the commands it chose in place of "take_turn".
+
+        Settings, from the plugin's "plugins" entry in editions.json:
+            players - the numbers of the computer players this strategy plays for, None for every computer player
+            time_budget - seconds of search per decision, default 0.15
+            horizon - the number of the player's own turns a playout looks ahead, default 3
+            exploration - the UCB1 exploration constant, default 0.7
+            workers - the number of processes of parallel rollouts, default 0 searches in this process
+            seed - the seed of the search's random number generator. The game's own is never used.
+    """
+
+    def __init__(self, thegame:CareersGame, level:str="smart"):
+        super().__init__(thegame, level)
+        self.reproducible = False
+        self._time_budget = 0.15
+        self._horizon = 3
+        self._exploration = 0.7
+        self._workers = 0
+        self._search_random = random.Random()
+        self._pool = None
+        self._iterations = 0            # the number of playouts of the last turn searched, 0 if it wasn't
+
+    def configure(self, settings:Dict):
+        super().configure(settings)
+        self._time_budget = settings.get("time_budget", self._time_budget)
+        self._horizon = settings.get("horizon", self._horizon)
+        self._exploration = settings.get("exploration", self._exploration)
+        self._workers = settings.get("workers", self._workers)
+        if settings.get("seed", None) is not None:
+            self._search_random.seed(settings["seed"])
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None       # a process pool belongs to the process
+        return state
+
+    @property
+    def time_budget(self) -> float:
+        return self._time_budget
+
+    @time_budget.setter
+    def time_budget(self, value:float):
+        self._time_budget = value
+
+    @property
+    def horizon(self) -> int:
+        return self._horizon
+
+    @horizon.setter
+    def horizon(self, value:int):
+        self._horizon = max(1, value)
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @workers.setter
+    def workers(self, value:int):
+        if value != self._workers:
+            self.close()
+        self._workers = value
+
+    @property
+    def iterations(self) -> int:
+        return self._iterations
+
+    def close(self):
+        """Shuts down the process pool, if there is one
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+
+    def run(self, player_number:int) ->Dict:
+        result = {}
+        if player_number >= 0:
+            result = {"player_number":player_number, "commands":self._search_turn(player_number)}
+        return result
+
+    def test(self)->str:
+        return "Careers_All_MCTS"
+
+    def _search_turn(self, player_number:int) -> str:
+        """Returns the commands of the player's turn, delimited by semi-colon. As for Careers_All_Strategy,
+            a player with no cash declares bankruptcy, and a player who can bump another player does.
+        """
+        start = time.perf_counter()
+        self._iterations = 0
+        player = self._game_state.players[player_number]
+        commands = []
+        if player.cash <= 0:
+            commands.append("bankrupt")
+        else:
+            if len(player.can_bump) > 0:
+                commands.append(f"bump {player.can_bump[0]}")
+            steps = _turn_choices(self._careersGame, self._gameEngineCommands, player)
+            if sum([len(choices) for choices in steps]) > len(steps):     # more than one way to play the turn
+                commands += self._search(player_number, len(commands) > 0, self._time_budget - (time.perf_counter() - start))
+            else:
+                commands += [choices[0] for choices in steps]
+        if not self._game_state.automatic_run:
+            commands.append("next")
+        return ";".join([command for command in commands if len(command) > 0])
+
+    def _search(self, player_number:int, bumped:bool, time_budget:float) -> List[str]:
+        """Searches the player's choices for this turn and returns the most visited choice of each step of the turn
+        """
+        start = time.perf_counter()
+        data = pickle.dumps(self._careersGame, protocol=pickle.HIGHEST_PROTOCOL)
+        settings = {"time_budget":time_budget - (time.perf_counter() - start), "horizon":self._horizon, "exploration":self._exploration, "bumped":bumped}
+        if self._workers > 0:
+            if self._pool is None:
+                self._pool = Pool(processes=self._workers, initializer=_init_worker)
+            jobs = [(data, player_number, self._search_random.getrandbits(63), settings) for _ in range(self._workers)]
+            roots = self._pool.map(_search, jobs)
+        else:
+            roots = [_search((data, player_number, self._search_random.getrandbits(63), settings))]
+        self._iterations = sum([root.visits for root in roots])
+        #
+        # follow the most visited choices, added up over the searches, through the steps of this turn
+        #
+        commands = []
+        nodes = roots
+        for step in range(_MAX_STEPS):
+            visits:Dict[str, int] = {}
+            for node in nodes:
+                for command, child in node.children.items():
+                    if child.step == step:
+                        visits[command] = visits.get(command, 0) + child.visits
+            if len(visits) == 0:
+                break
+            command = max(visits, key=lambda command: (visits[command], command == "roll"))
+            commands.append(command)
+            nodes = [node.children[command] for node in nodes if command in node.children]
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug(f"MCTS player {player_number}: {self._iterations} playouts, commands {commands}")
+        return commands
+
+class _Node(object):
+    """A node of the search tree: the statistics of a choice, and the choices that follow it.
+        step is the number of the choice in the turn, 0 for the first choice of a turn
+    """
+    __slots__ = ["visits", "value", "step", "children", "illegal"]
+
+    def __init__(self, step:int=0):
+        self.visits = 0
+        self.value = 0.0
+        self.step = step
+        self.children:Dict[str, _Node] = {}
+        self.illegal:List[str] = []
+
+    def select(self, choices:List[str], exploration:float) -> str:
+        """The choice with the highest UCB1 value
+        """
+        log_visits = math.log(max(1, self.visits))
+        def ucb(choice:str) -> float:
+            child = self.children[choice]
+            return child.value / child.visits + exploration * math.sqrt(log_visits / child.visits)
+        return max(choices, key=ucb)
+
+_MAX_STEPS = 8      # the most pending actions + 1 searched in one turn
+
+def _can_enter(careers_game:CareersGame, gameEngineCommands:GameEngineCommands, player:Player) -> Tuple:
+    """The can_enter 4-tuple of the occupation whose entrance square the player is on, (False, 0, "", "") if none
+    """
+    location = player.board_location
+    border_square = careers_game.game_board.get_square(location.border_square_number)
+    if border_square.square_type is BorderSquareType.OCCUPATION_ENTRANCE_SQUARE and location.occupation_name is None:
+        return gameEngineCommands.can_enter(careers_game.occupations[border_square.name], player)
+    return (False, 0, "", "")
+
+def _pending_choices(careers_game:CareersGame, player:Player, pending_action) -> List[str]:
+    """The commands that resolve a pending action. "" leaves it unresolved.
+    """
+    action_type = pending_action.pending_action_type
+    value = action_type.value
+    amount = pending_action.pending_amount
+    if action_type is PendingActionType.SELECT_DEGREE:
+        return [f"resolve {value} {degree}" for degree in careers_game.college_degrees['degreePrograms']]
+    elif action_type is PendingActionType.TAKE_SHORTCUT:
+        return [f"resolve {value} yes", f"resolve {value} no"]
+    elif action_type is PendingActionType.BUY_INSURANCE:
+        return ["", f"resolve {value} 1"] if not player.is_insured and player.cash > amount else [""]
+    elif action_type is PendingActionType.BUY_HEARTS or action_type is PendingActionType.BUY_STARS:
+        if isinstance(amount, dict):
+            return [""] + [f"resolve {value} {qty}" for qty, cost in amount.items() if player.cash > cost]
+        return ["", f"resolve {value} 1"] if isinstance(amount, int) and player.cash > amount else [""]
+    elif action_type is PendingActionType.TRAVEL_CHOICE or action_type is PendingActionType.BIDIRECTIONAL_TRAVEL_CHOICE:
+        game_square = careers_game.game_board.border_squares[player.board_location.border_square_number]
+        return [f"resolve {value} {destination}" for destination in game_square.special_processing.destination_names]
+    elif action_type is PendingActionType.CASH_LOSS_OR_UNEMPLOYMENT:
+        game_square = careers_game.game_board.border_squares[player.board_location.border_square_number]
+        if player.cash > game_square.special_processing.amount:
+            return [f"resolve {value} pay", f"resolve {value} unemployment"]
+        return [f"resolve {value} unemployment"]
+    return [""]
+
+def _advance_choices(careers_game:CareersGame, gameEngineCommands:GameEngineCommands, player:Player) -> List[str]:
+    """The ways a player can move this turn: roll, enter the occupation they're on and roll,
+        use an Opportunity card or use an Experience card
+    """
+    choices = ["roll"]
+    can_enter = _can_enter(careers_game, gameEngineCommands, player)
+    if can_enter[0]:
+        choices.append(f"enter {can_enter[3]};roll")
+    in_occupation = player.board_location.occupation_name is not None
+    if player.can_use_opportunity and not in_occupation:     # Opportunities are used on the border
+        entrance_squares = careers_game.get_occupation_entrance_squares()
+        for number, card in player.get_opportunity_cards().items():
+            card_type = card["card"].opportunity_type
+            if card_type is OpportunityType.OCCUPATION_CHOICE:
+                choices += [f"use opportunity {number} {name}" for name in entrance_squares]
+            elif card_type is OpportunityType.BORDER_SQUARE_CHOICE:
+                choices += [f"use opportunity {number} {square.name}" for square in entrance_squares.values()]
+            else:
+                choices.append(f"use opportunity {number}")
+    if player.can_roll:
+        for number, card in player.get_experience_cards().items():
+            card_type = card["card"].card_type
+            if card_type is ExperienceType.FIXED:
+                choices.append(f"use experience {number}")
+            elif in_occupation and card_type is not ExperienceType.TWO_DIE_WILD:
+                choices += [f"use experience {number} {spaces}" for spaces in range(1, 7)]
+            elif not in_occupation and card_type is not ExperienceType.ONE_DIE_WILD:
+                choices += [f"use experience {number} {min(6, spaces-1)},{spaces - min(6, spaces-1)}" for spaces in range(2, 13)]
+    return choices
+
+def _turn_choices(careers_game:CareersGame, gameEngineCommands:GameEngineCommands, player:Player) -> List[List[str]]:
+    """The choices of each step of a player's turn: one step for each pending action and a last step to move
+    """
+    pending_actions = player.pending_actions.pending_actions[:_MAX_STEPS - 1]
+    steps = [_pending_choices(careers_game, player, pending_action) for pending_action in pending_actions]
+    return steps + [_advance_choices(careers_game, gameEngineCommands, player)]
+
+def _progress(player:Player) -> float:
+    """The fraction of a player's success formula that's been met, with each item counted up to its goal
+    """
+    sf = player.success_formula
+    money = (player.cash - player.get_total_loans()) // 1000
+    met = min(money, sf.money) + min(player.fame, sf.stars) + min(player.happiness, sf.hearts)
+    return max(0, met) / max(1, sf.money + sf.stars + sf.hearts)
+
+def _score(careers_game:CareersGame, player_number:int) -> float:
+    """The value of a game position for a player, from 0 (lost) to 1 (won)
+    """
+    game_state = careers_game.game_state
+    if game_state.game_complete:
+        return 1.0 if game_state.winning_player.number == player_number else 0.0
+    mine = _progress(game_state.players[player_number])
+    others = [_progress(player) for player in game_state.players if player.number != player_number]
+    if len(others) == 0:
+        return mine
+    return 0.5 + 0.5 * (mine - max(others))
+
+def _clone(data:bytes) -> CareersGame:
+    """A copy of a pickled game, every player of which is played by the DUMB strategy, but for the searched choices
+    """
+    careers_game:CareersGame = pickle.loads(data)
+    careers_game.plugins["turn"] = [Careers_All_Strategy(careers_game, "dumb")]
+    return careers_game
+
+def _redeal(careers_game:CareersGame, rng:random.Random):
+    """Reseeds the game's random number generator and reshuffles the undrawn cards
+    """
+    careers_game.random.seed(rng.getrandbits(63))     # the decks share the game's random number generator
+    for deck in [careers_game.opportunities, careers_game.experience_cards]:
+        undrawn = deck.cards_index[deck.next_index:]
+        careers_game.random.shuffle(undrawn)
+        deck.cards_index = deck.cards_index[:deck.next_index] + undrawn
+
+_scratch_engine:CareersGameEngine = None     # the engine that plays the copies of games in this process
+
+def _get_scratch_engine() -> CareersGameEngine:
+    global _scratch_engine
+    if _scratch_engine is None:
+        _scratch_engine = CareersGameEngine(loglevel='error', installationId='search', headless=True)
+        _scratch_engine.scratch = True
+    return _scratch_engine
+
+def _init_worker():
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+def _play_turn(engine:CareersGameEngine, player:Player) -> bool:
+    """Plays a turn with the player's plug-in. Returns False if the game is over
+    """
+    result = engine.execute_command("take_turn", player)
+    if result is not None and result.return_code == CommandResult.TERMINATE:
+        return False
+    return _next(engine, player)
+
+def _next(engine:CareersGameEngine, player:Player) -> bool:
+    """Ends the player's turn. Returns False if the game is over, or if the turn couldn't be ended
+    """
+    return engine.execute_command("next", player).return_code not in [CommandResult.TERMINATE, CommandResult.ERROR]
+
+def _search(job:Tuple[bytes, int, int, Dict]) -> _Node:
+    """Monte Carlo tree search of a player's choices in a pickled game, for the time budget.
+        Arguments:
+            job - a 4-tuple of (the pickled CareersGame, player number, seed, settings)
+        Returns: the root _Node
+    """
+    data, player_number, seed, settings = job
+    deadline = time.perf_counter() + settings["time_budget"]
+    rng = random.Random(seed)
+    engine = _get_scratch_engine()
+    exploration = settings["exploration"]
+    root = _Node()
+    careers_game = _clone(data)
+    engine.resume(careers_game)
+    engine.automatic_run = True
+    game_state = careers_game.game_state
+    token = careers_game.snapshot()
+    while root.visits == 0 or time.perf_counter() < deadline:
+        careers_game.restore(token)
+        _redeal(careers_game, rng)
+        node = root
+        path = [root]
+        turns = 0
+        in_tree = True
+        playing = True
+        while playing and turns < settings["horizon"]:
+            if root.visits > 0 and time.perf_counter() > deadline:
+                break       # out of time, this playout isn't counted
+            player = game_state.current_player
+            if player.number != player_number or not in_tree:
+                playing = _play_turn(engine, player)
+                turns += player.number == player_number
+                continue
+            if turns == 0 and settings["bumped"] and len(player.can_bump) > 0:
+                engine.execute_command(f"bump {player.can_bump[0]}", player)
+            if player.cash <= 0:
+                engine.execute_command("bankrupt", player)
+                in_tree = False
+            else:
+                for step, choices in enumerate(_turn_choices(careers_game, engine.gameEngineCommands, player)):
+                    child = None
+                    if in_tree:
+                        choices = [choice for choice in choices if choice not in node.illegal]
+                        if len(choices) == 0:
+                            continue
+                        untried = [choice for choice in choices if choice not in node.children]
+                        if len(untried) > 0:
+                            choice = rng.choice(untried)
+                            node.children[choice] = _Node(step)
+                            in_tree = False     # expanded, the rest of the playout is random
+                        else:
+                            choice = node.select(choices, exploration)
+                        child = node.children[choice]
+                        path.append(child)
+                    else:
+                        choice = rng.choice(choices)
+                    if len(choice) > 0:
+                        result = engine.execute_command(choice, player)
+                        if child is not None and turns == 0 and result.return_code == CommandResult.ERROR:
+                            #
+                            # the first turn is played from the real position, a choice that's an error there is never valid
+                            #
+                            node.illegal.append(choice)
+                            del node.children[choice]
+                            path.pop()
+                            in_tree = False
+                            continue
+                    if child is not None:
+                        node = child
+            playing = _next(engine, player)
+            turns += 1
+        if root.visits > 0 and time.perf_counter() > deadline:
+            break
+        score = _score(careers_game, player_number)
+        for node in path:
+            node.visits += 1
+            node.value += score
+    return root
@@ -9,7 +9,6 @@ from game.plugins.plugin import Plugin
 from game.todoList import TodoList
 
 from typing import Dict
-import random
 
 class Careers_All_Randomizer(Plugin):
     '''
@@ -54,8 +53,8 @@ class Careers_All_Randomizer(Plugin):
         """
         occupation_names = self._careersGame.occupations_dict["occupations"]
         degree_names = self._careersGame.college_degrees["degreePrograms"]
-        degrees = random.sample(degree_names, ndegrees)
-        occupations = random.sample(occupation_names, noccupations)
+        degrees = self._careersGame.random.sample(degree_names, ndegrees)
+        occupations = self._careersGame.random.sample(occupation_names, noccupations)
         #
         todo_list = TodoList(occupation_names=occupations, degree_names=degrees)
         result =   todo_list.todos 
@@ -6,14 +6,15 @@ Created on Jun 4, 2023
 '''
 from game.careersGame import CareersGame
 from game.gameState import GameState
-from game.gameUtils import GameUtils
 from game.plugins import Plugin
 from game.opportunityCard import OpportunityCard, OpportunityType, OpportunityActionType
 from game.experienceCard import ExperienceCard, ExperienceType
-from game.gameConstants import StrategyLevel, BorderSquareType, PendingActionType
+from game.gameConstants import GameConstants, StrategyLevel, BorderSquareType, PendingActionType
 from game.gameEngineCommands import GameEngineCommands
+from game.policyModel import PolicyModel
+from game.policyTable import PolicyTable
 from typing import Dict, List
-import random
+import numpy as np
 
 class Careers_All_Strategy(Plugin):
     """Implements various strategies for a computer player.
@@ -34,8 +35,7 @@ class Careers_All_Strategy(Plugin):
         super().__init__(thegame.edition_name)
         self._careersGame:CareersGame = thegame
         self._game_state:GameState = self._careersGame.game_state
-        seconds = GameUtils.time_since()
-        random.seed(seconds)
+        self._random = thegame.random     # the game's random number generator
         self._strategy_level:StrategyLevel = StrategyLevel[level.upper()]
         self._gameEngineCommands = None
         self._possible_actions = ["roll", "use opportunity", "use experience"]
@@ -60,12 +60,27 @@ class Careers_All_Strategy(Plugin):
     def gameEngineCommands(self, value):
         self._gameEngineCommands = value
         
-    def run(self, player_number:int) ->Dict:
+    @property
+    def policy_model(self) -> PolicyModel|None:
+        """The edition's PolicyModel for the GENIUS level, None if it has none
+        """
+        return PolicyModel.get_model(self.careers_game.edition_name, self.careers_game.game_parameters_type)
+        
+    def configure(self, settings:Dict):
+        super().configure(settings)
+        if "strategy_level" in settings:
+            self._strategy_level = StrategyLevel[settings["strategy_level"].upper()]
+        
+    def run(self, player_number:int, scores:np.ndarray|None=None) ->Dict:
         """Implement the plugin interface for this class
+            Arguments:
+                player_number - the number of the player to choose commands for
+                scores - for the GENIUS level, the PolicyModel's scores of the game for the player if they've already been evaluated,
+                         for example by the engine's policy_scorer. See needs_scores()
         """
         result = {}
         if player_number >=0:
-            cmds = self._get_turn_commands(player_number)
+            cmds = self._get_turn_commands(player_number, scores)
             result = {"player_number":player_number, "commands":cmds }
             
         return result
@@ -73,7 +88,14 @@ class Careers_All_Strategy(Plugin):
     def test(self)->str:
         return "Careers_All_Strategy"
     
-    def _get_turn_commands(self, player_number:int) ->str:
+    def needs_scores(self, player_number:int) ->bool:
+        """True if the player's next turn is chosen by the PolicyModel: the GENIUS level, an edition with a model,
+            and a player on the border
+        """
+        return self._strategy_level is StrategyLevel.GENIUS and \
+               self._game_state.players[player_number].board_location.occupation_name is None and self.policy_model is not None
+
+    def _get_turn_commands(self, player_number:int, scores:np.ndarray|None=None) ->str:
         """Returns a List of commands for a player's turn.
             Commands delimited by semi-colon, for example: "roll;next"
             The last command is always "next" to advance to the next player.
@@ -99,7 +121,7 @@ class Careers_All_Strategy(Plugin):
                     commands.append(f"resolve {pending_action_value} {degree}")
                     
                 elif pending_action.pending_action_type is PendingActionType.TAKE_SHORTCUT:   # random yes or not
-                    selection = random.sample(['yes','no'], 1)[0]
+                    selection = self._random.sample(['yes','no'], 1)[0]
                     commands.append(f"resolve {pending_action_value} {selection}")
                     
                 elif pending_action.pending_action_type is PendingActionType.BUY_INSURANCE:   # int dollar amount
@@ -114,9 +136,9 @@ class Careers_All_Strategy(Plugin):
                     # or a Dict[str, int] for quantity, amount
                     #
                     if isinstance(amount, dict):
-                        qty = random.sample(list(amount), 1)[0]
+                        qty = self._random.sample(list(amount), 1)[0]
                         cost = amount[qty]
-                        hearts_needed = player.need()["hearts_needed"]
+                        hearts_needed = player.need()[f"{GameConstants.HEART}s_needed"]
                         if player.cash > cost and hearts_needed >= int(qty):    # this could be smarter
                             commands.append(f"resolve {pending_action_value} {qty}" )
                     else:   # an integer amount for 1 heart
@@ -129,10 +151,10 @@ class Careers_All_Strategy(Plugin):
                     # amount is a Dict[str, int] for quantity, amount
                     #
                     if isinstance(amount, dict):
-                        qty = random.sample(list(amount), 1)[0]
+                        qty = self._random.sample(list(amount), 1)[0]
                         cost = amount[qty]
-                        hearts_needed = player.need()["stars_needed"]
-                        if player.cash > cost and hearts_needed >= int(qty):    # this could be smarter
+                        stars_needed = player.need()[f"{GameConstants.STAR}s_needed"]
+                        if player.cash > cost and stars_needed >= int(qty):    # this could be smarter
                             commands.append(f"resolve {pending_action_value} {qty}" )
                             
                 elif pending_action.pending_action_type is PendingActionType.TRAVEL_CHOICE or\
@@ -142,7 +164,7 @@ class Careers_All_Strategy(Plugin):
                     #
                     game_square = self._careersGame.game_board.border_squares[player.board_location.border_square_number]
                     destinations = game_square.special_processing.destination_names
-                    my_dest = random.sample(destinations, 1)[0]
+                    my_dest = self._random.sample(destinations, 1)[0]
                     commands.append(f"resolve {pending_action_value} {my_dest}")
                 
                 elif pending_action.pending_action_type is PendingActionType.CASH_LOSS_OR_UNEMPLOYMENT:
@@ -180,17 +202,17 @@ class Careers_All_Strategy(Plugin):
                     
 
         if len(player.can_bump) > 0:
-            num = random.randint(0, len(player.can_bump)-1)
+            num = self._random.randint(0, len(player.can_bump)-1)
             commands.append(f"bump {player.can_bump[num]}")
 
-        advance_cmds = self._pick_advance_commands(player)
+        advance_cmds = self._pick_advance_commands(player, scores)
         commands.append(advance_cmds)    # pick opportunity, experience, or roll
         if not self._game_state.automatic_run:
             commands.append("next")
             
         return ";".join(commands)
         
-    def _pick_advance_commands(self, player) ->str:
+    def _pick_advance_commands(self, player, scores:np.ndarray|None=None) ->str:
         """Pick an advancement command based the StrategyLevel.
             DUMB - If occupying an occupation entrance square, and can afford it (or has been there before or has a degree)
                    then enter and roll, otherwise returns only "roll"
@@ -198,8 +220,8 @@ class Careers_All_Strategy(Plugin):
             BASIC - randomly pick roll, use experience, use opportunity
                     Player must be able to afford the opportunity cost, for example
                     when entering an occupation or buying insurance, hearts, or stars
-            SMART - BASIC + consider what helps fulfill the success formula
-            GENIUS - use trained neural network model
+            SMART - follow the edition's PolicyTable to the occupation that best helps fulfill the success formula
+            GENIUS - follow the edition's PolicyModel, a model trained on encoded game states
             
             The strategy level is configured in the plugins section of editions.json
             
@@ -222,9 +244,11 @@ class Careers_All_Strategy(Plugin):
             case StrategyLevel.DUMB:
                 commands.append(self.dumb_strategy(player, can_enter))
             case StrategyLevel.BASIC:
-                commands.append(self.basic_strategy(player), can_enter)
+                commands.append(self.basic_strategy(player, can_enter))
             case StrategyLevel.SMART:
-                commands.append(self.smart_strategy(player), can_enter)
+                commands.append(self.smart_strategy(player, can_enter))
+            case StrategyLevel.GENIUS:
+                commands.append(self.genius_strategy(player, can_enter, scores))
             case _:
                 commands.append("roll")
         
@@ -255,7 +279,7 @@ class Careers_All_Strategy(Plugin):
         if can_enter[0]:
             commands = f"enter {can_enter[3]};roll"
         else:
-            actions = random.sample(["roll", "use opportunity", "use experience"], 3)    # returns the list in random order
+            actions = self._random.sample(["roll", "use opportunity", "use experience"], 3)    # returns the list in random order
             for action in actions:
                 if action.endswith("opportunity"):
                     commands = self.get_opportunity_command(player)
@@ -266,9 +290,11 @@ class Careers_All_Strategy(Plugin):
                     
                 elif action.endswith("experience"):
                     commands = self.get_experience_command(player)
+                    if commands is not None:
+                        return commands
                     
                 else:
-                    commands = "roll"
+                    return "roll"
         return commands
     
     def get_opportunity_command(self, player) ->str|None:
@@ -293,7 +319,7 @@ class Careers_All_Strategy(Plugin):
         """
         commands = None
         if len(player.my_experience_cards) > 0:
-            experience_card = player.my_experience_cards[random.randint(len(player.my_experience_cards))]
+            experience_card = player.my_experience_cards[self._random.randint(0, len(player.my_experience_cards)-1)]
             if player.is_unemployed:   # if it's fixed with 7 spaces or TWO_DIE_WILD or TRIPPLE_DIE_WILD, then use it
                 if experience_card.card_type is ExperienceType.FIXED and experience_card.spaces == 7:
                     commands = f"use experience {experience_card.number}"
@@ -307,11 +333,85 @@ class Careers_All_Strategy(Plugin):
         return commands
     
     def smart_strategy(self, player, can_enter) ->str:
-        """Applies additional smarts to the basic strategy.
-            This will attempt to pick the best Opportunity card
-            or Experience card for the player's circumstances -
-            including board position, success formula fulfillment.
+        """Follows the edition's PolicyTable, solved offline by value iteration, which picks the occupation to head for
+            (or going round to Payday) from the player's square, salary and what's still needed to fulfill the success formula.
+            If the player can't enter that occupation, the table's second choice is tried, and failing that the DUMB strategy is used.
+            The player enters only the chosen occupation, and uses an Opportunity card that enters it
+            or an Experience card that lands exactly on its entrance square.
+            If the edition has no PolicyTable the BASIC strategy is used.
+            Arguments:
+                player - Player reference
+                can_enter - a 4-tupple result from gameEngineCommands.can_enter()
+            Returns:
+                str of commands
+        """
+        if player.board_location.occupation_name is not None:
+            return "roll"
+        policy = PolicyTable.get_policy(self.careers_game.edition_name, self.careers_game.game_parameters_type)
+        if policy is None:
+            return self.basic_strategy(player, can_enter)
+        for target in policy.choices_for(player):
+            if target is None:      # round to Payday
+                return "roll"
+            occupation = self.careers_game.occupations[target]
+            if self._gameEngineCommands.can_enter(occupation, player)[0]:
+                return self.get_advance_command(player, target, can_enter)
+        return self.dumb_strategy(player, can_enter)
+    
+    def genius_strategy(self, player, can_enter, scores:np.ndarray|None=None) ->str:
+        """Heads for the occupation the edition's PolicyModel scores highest for the player, or rolls to go round to Payday.
+            Occupations the player can't enter are passed over for the next best. If the edition has no PolicyModel,
+            or the model's best action isn't the PolicyTable's, the SMART strategy is used.
+            Arguments:
+                player - Player reference
+                can_enter - a 4-tupple result from gameEngineCommands.can_enter()
+                scores - the model's scores of the game for the player, evaluated here if None
+            Returns:
+                str of commands
+        """
+        if player.board_location.occupation_name is not None:
+            return "roll"
+        model = self.policy_model
+        if model is None:
+            return self.smart_strategy(player, can_enter)
+        if scores is None:
+            scores = model.evaluate([self._game_state], [player.number])[0]
+        ranked = model.ranked(scores)
+        policy = PolicyTable.get_policy(self.careers_game.edition_name, self.careers_game.game_parameters_type)
+        if policy is None or ranked[0] != policy.choices_for(player)[0]:
+            return self.smart_strategy(player, can_enter)
+        for target in ranked:
+            if target is None:      # round to Payday
+                return "roll"
+            occupation = self.careers_game.occupations[target]
+            if self._gameEngineCommands.can_enter(occupation, player)[0]:
+                return self.get_advance_command(player, target, can_enter)
+        return self.dumb_strategy(player, can_enter)
+    
+    def get_advance_command(self, player, occupation_name:str, can_enter) ->str:
+        """The command that moves a player on the border closest to entering an occupation:
+            enter it if they're on its entrance square, use an Opportunity card for it, use an Experience card
+            that lands on its entrance square, or else roll.
         """
+        if can_enter[0] and can_enter[3] == occupation_name:
+            return f"enter {occupation_name};roll"
+        if player.can_use_opportunity:
+            for number, card in player.get_opportunity_cards().items():
+                opportunity_card = card["card"]
+                if opportunity_card.opportunity_type is OpportunityType.OCCUPATION_CHOICE:
+                    return f"use opportunity {number} {occupation_name}"
+                elif opportunity_card.opportunity_type is OpportunityType.OCCUPATION and opportunity_card.destination == occupation_name:
+                    return f"use opportunity {number}"
+        if player.can_roll:
+            game_board = self.careers_game.game_board
+            spaces = (game_board.find_square_number(occupation_name) - player.board_location.border_square_number) % game_board.game_board_size
+            for number, card in player.get_experience_cards().items():
+                experience_card = card["card"]
+                if experience_card.card_type is ExperienceType.FIXED and experience_card.spaces == spaces:
+                    return f"use experience {number}"
+                elif (experience_card.card_type is ExperienceType.TWO_DIE_WILD or experience_card.card_type is ExperienceType.TRIPLE_WILD) \
+                     and 2 <= spaces <= 12:
+                    return f"use experience {number} {min(6, spaces-1)},{spaces - min(6, spaces-1)}"
         return "roll"
     
 if __name__ == '__main__':
@@ -4,7 +4,7 @@ Created on May 23, 2023
 @author: don_bacon
 '''
 
-from typing import Dict
+from typing import Dict, List
 
 class Plugin(object):
     '''
@@ -25,6 +25,22 @@ class Plugin(object):
         '''
         self.name_template = "careers_{_edition_name}_{plugin_name}"
         self.edition = edition_name    # the edition that created this plug-in instance
+        #
+        # the numbers of the computer players a "turn" plug-in plays for.
+        # None plays for every computer player that has no plug-in of its own.
+        #
+        self.players:List[int]|None = None
+        #
+        # True if the plug-in makes the same choices every time it's run on the same game,
+        # so the CommandLog can record a computer player's "take_turn" and replay it by running the plug-in again
+        #
+        self.reproducible = True
+    
+    def configure(self, settings:Dict):
+        """Applies the plug-in's settings from the "plugins" section of editions.json. Called by CareersGame when it's loaded.
+            Override in a concrete class that has settings of its own, and call this one.
+        """
+        self.players = settings.get("players", None)
     
     def run(self, obj:object=None)->Dict:
         #
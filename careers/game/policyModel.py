@@ -0,0 +1,296 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from game.editionTemplate import EditionTemplate
+from game.gameConstants import GameParametersType
+from game.gameState import GameState
+from game.policyTable import PolicyTable
+from game.stateEncoder import StateEncoder
+
+from threading import Lock
+from typing import Dict, List, Tuple
+import argparse, logging, os, random
+import numpy as np
+
+class PolicyModel(object):
+    """A learned policy for a computer player of an edition, for the GENIUS level of the Careers_All_Strategy plug-in.
+        The model is linear in the features of a game seen by the player: the StateEncoder features, followed by
+        the deciding player's border square crossed with what they still need of their success formula and their salary,
+        and crossed with each need binned by NEED_BINS, so that where to head from a square can depend on the formula.
+        The scores of a batch of games are
+            scores = features @ weights + bias
+        one matrix multiply of the StateEncoder features plus a lookup of the weights of the crossed features,
+        with a score for each action: heading for each of occupation_names, and the last action (len(occupation_names))
+        going round to Payday, as in the PolicyTable. The highest scoring action is tried first.
+        Weights are stored in the edition's resource folder and loaded on first use, use PolicyModel.get_model().
+        main() fits them to the edition's PolicyTable by ridge regression over the states of games played by SMART players
+        with random success formulas and numbers of players, and measures their agreement on the states of other games.
+        A model is read only, and evaluate() can be called from many threads at once.
+        Arguments:
+            edition_name - the edition name, for example "Professions-Hi-Tech_v3"
+            occupation_names - the occupation of each action
+            weights - (width, actions) float32 weights
+            bias - (actions,) float32 bias
+            game_parameters_type - a GameParametersType, for the StateEncoder
+    """
+    NEEDS = ["hearts_needed", "stars_needed", "money_needed"]
+    CROSSED = NEEDS + ["salary"]
+    #
+    # bin edges of the fraction of a need still to get, 0 and between every other PolicyTable.DEFICIT_LEVELS of a 100 point formula
+    #
+    NEED_BINS = np.array([0, 1.5, 3.5, 7, 11.5, 18, 28.5, 45], dtype=np.float32) / 100
+    _models:Dict[Tuple, 'PolicyModel|None'] = {}
+    _lock = Lock()
+
+    def __init__(self, edition_name:str, occupation_names:List[str], weights:np.ndarray, bias:np.ndarray, \
+                 game_parameters_type:GameParametersType=GameParametersType.PROD):
+        self._edition_name = edition_name
+        self._occupation_names = list(occupation_names)
+        self._weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self._bias = np.ascontiguousarray(bias, dtype=np.float32)
+        assert self._weights.shape[1] == len(self._occupation_names) + 1 and self._bias.shape == (self._weights.shape[1],)
+        encoder = StateEncoder(edition_name, game_parameters_type, max_players=1)
+        player_width = encoder.player_width
+        self._board_size = encoder.board_size
+        self._square_offset = encoder.offsets["square"]
+        self._crossed_index = [encoder.offsets["scalars"] + StateEncoder.SCALARS.index(name) for name in PolicyModel.CROSSED]
+        encoded_width = self._weights.shape[0] - PolicyModel.crossed_width(self._board_size)
+        assert encoded_width > 0 and encoded_width % player_width == 0
+        self._encoder = StateEncoder(edition_name, game_parameters_type, max_players=encoded_width // player_width)
+        #
+        # views of the weights of the crossed features, in the order features() lays them out
+        #
+        nactions = self._weights.shape[1]
+        nbins = len(PolicyModel.NEED_BINS) + 1
+        offset = encoded_width + self._board_size * len(PolicyModel.CROSSED)
+        self._square_weights = self._weights[encoded_width:offset].reshape(self._board_size, len(PolicyModel.CROSSED), nactions)
+        self._bin_weights = []
+        self._square_bin_weights = []
+        for _ in PolicyModel.NEEDS:
+            self._bin_weights.append(self._weights[offset:offset + nbins])
+            offset += nbins
+            self._square_bin_weights.append(self._weights[offset:offset + self._board_size * nbins].reshape(self._board_size, nbins, nactions))
+            offset += self._board_size * nbins
+
+    @staticmethod
+    def get_model(edition_name:str, game_parameters_type:GameParametersType=GameParametersType.PROD) -> 'PolicyModel|None':
+        """Gets the PolicyModel of an edition, loading it from the edition's resource folder on first use.
+            Returns None if the edition has no model, or it is out of date with the edition's occupations or the StateEncoder.
+            Arguments:
+                edition_name - the edition name, for example "Professions-Hi-Tech_v3"
+                game_parameters_type - a GameParametersType
+        """
+        key = (edition_name, game_parameters_type)
+        if key not in PolicyModel._models:
+            with PolicyModel._lock:
+                if key not in PolicyModel._models:
+                    template = EditionTemplate.get_template(edition_name, game_parameters_type)
+                    filename = PolicyModel.filename(template)
+                    model = None
+                    if os.path.exists(filename):
+                        try:
+                            model = PolicyModel.load(filename, game_parameters_type)
+                        except AssertionError:
+                            logging.warning(f"policy model {filename} doesn't fit the StateEncoder")
+                        policy = PolicyTable.get_policy(edition_name, game_parameters_type)
+                        if model is not None and (policy is None or model.occupation_names != policy.occupation_names):
+                            logging.warning(f"policy model {filename} is out of date with the edition's policy table")
+                            model = None
+                    PolicyModel._models[key] = model
+        return PolicyModel._models[key]
+
+    @staticmethod
+    def crossed_width(board_size:int) -> int:
+        """The number of crossed features of an edition's board, that follow the StateEncoder features
+        """
+        return board_size * len(PolicyModel.CROSSED) + len(PolicyModel.NEEDS) * (len(PolicyModel.NEED_BINS) + 1) * (board_size + 1)
+
+    @staticmethod
+    def filename(template:EditionTemplate) -> str:
+        """The policy model file of an edition: policyModel_<edition name>.npz in the edition's resource folder
+        """
+        return f'{template.resource_folder}/{template.edition_path}/policyModel_{template.edition_name}.npz'
+
+    @staticmethod
+    def load(filename:str, game_parameters_type:GameParametersType=GameParametersType.PROD) -> 'PolicyModel':
+        with np.load(filename) as arrays:
+            return PolicyModel(str(arrays["edition_name"]), [str(name) for name in arrays["occupation_names"]], \
+                               arrays["weights"], arrays["bias"], game_parameters_type)
+
+    def save(self, filename:str):
+        np.savez_compressed(filename, edition_name=np.array(self._edition_name), occupation_names=np.array(self._occupation_names), \
+                            weights=self._weights, bias=self._bias)
+
+    @property
+    def edition_name(self) -> str:
+        return self._edition_name
+
+    @property
+    def occupation_names(self) -> List[str]:
+        return self._occupation_names
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self._weights
+
+    @property
+    def bias(self) -> np.ndarray:
+        return self._bias
+
+    @property
+    def encoder(self) -> StateEncoder:
+        return self._encoder
+
+    @property
+    def width(self) -> int:
+        """The number of features of a game, the StateEncoder's and the crossed features
+        """
+        return self._weights.shape[0]
+
+    def features(self, encoded:np.ndarray) -> np.ndarray:
+        """The (n, width) features of (n, StateEncoder width) encoded games: the encoded features followed by the crossed features.
+        """
+        n = len(encoded)
+        squares = encoded[:, self._square_offset:self._square_offset + self._board_size]
+        crossed = encoded[:, self._crossed_index]
+        parts = [encoded, (squares[:, :, None] * crossed[:, None, :]).reshape(n, -1)]
+        nbins = len(PolicyModel.NEED_BINS) + 1
+        for need in range(len(PolicyModel.NEEDS)):
+            binned = np.zeros((n, nbins), dtype=encoded.dtype)
+            binned[np.arange(n), np.digitize(crossed[:, need], PolicyModel.NEED_BINS)] = 1.0
+            parts += [binned, (squares[:, :, None] * binned[:, None, :]).reshape(n, -1)]
+        return np.hstack(parts)
+
+    def scores(self, encoded:np.ndarray) -> np.ndarray:
+        """The (n, actions) scores of (n, StateEncoder width) encoded games, features(encoded) @ weights + bias.
+            The crossed features are all 0 but those of the player's square and bins, so rather than multiplying them
+            their weights are looked up and added to the scores of the encoded features.
+        """
+        n = len(encoded)
+        squares = encoded[:, self._square_offset:self._square_offset + self._board_size]
+        square = np.argmax(squares, axis=1)
+        on_square = squares[np.arange(n), square][:, None]      # 0 if the player has no square
+        crossed = encoded[:, self._crossed_index]
+        scores = encoded @ self._weights[:encoded.shape[1]] + self._bias
+        scores += np.einsum("nk,nka->na", crossed * on_square, self._square_weights[square])
+        for need in range(len(PolicyModel.NEEDS)):
+            binned = np.digitize(crossed[:, need], PolicyModel.NEED_BINS)
+            scores += self._bin_weights[need][binned] + on_square * self._square_bin_weights[need][square, binned]
+        return scores
+
+    def evaluate(self, game_states:List[GameState], perspectives:List[int]) -> np.ndarray:
+        """The (len(game_states), actions) scores of a batch of games, each seen by a player.
+            Features are encoded into an array of their own, so that evaluate() is thread safe.
+            Arguments:
+                game_states - the GameStates to score
+                perspectives - the number of the player deciding in each game
+        """
+        encoded = np.empty((len(game_states), self._encoder.width), dtype=np.float32)
+        self._encoder.encode_batch(game_states, perspectives, out=encoded)
+        return self.scores(encoded)
+
+    def ranked(self, scores:np.ndarray) -> List[str|None]:
+        """The occupations of a game's scores, best first, None for going round to Payday
+        """
+        return [self._occupation_names[action] if action < len(self._occupation_names) else None for action in np.argsort(-scores, kind="stable")]
+
+    @staticmethod
+    def fit(edition_name:str, encoded:np.ndarray, actions:np.ndarray, game_parameters_type:GameParametersType=GameParametersType.PROD, \
+            regularization:float=1.0) -> 'PolicyModel':
+        """Fits a model by ridge regression of the one-hot actions of the edition's PolicyTable on the features of the same states.
+            The normal equations are summed a chunk of states at a time, rather than crossing the features of them all at once.
+            Arguments:
+                encoded - (n, StateEncoder width) encoded games
+                actions - (n,) the PolicyTable's best action of each state
+        """
+        occupation_names = PolicyTable.get_policy(edition_name, game_parameters_type).occupation_names
+        nactions = len(occupation_names) + 1
+        board_size = StateEncoder(edition_name, game_parameters_type, max_players=1).board_size
+        width = encoded.shape[1] + PolicyModel.crossed_width(board_size)
+        unfitted = PolicyModel(edition_name, occupation_names, np.zeros((width, nactions)), np.zeros(nactions), game_parameters_type)
+        xtx = regularization * np.eye(width + 1)
+        xty = np.zeros((width + 1, nactions))
+        for start in range(0, len(encoded), 4096):
+            chunk = unfitted.features(encoded[start:start + 4096].astype(np.float32))
+            x = np.hstack([chunk.astype(np.float64), np.ones((len(chunk), 1))])
+            y = np.zeros((len(chunk), nactions))
+            y[np.arange(len(chunk)), actions[start:start + 4096]] = 1.0
+            xtx += x.T @ x
+            xty += x.T @ y
+        solution = np.linalg.solve(xtx, xty)
+        return PolicyModel(edition_name, occupation_names, solution[:-1], solution[-1], game_parameters_type)
+
+def collect_states(edition_name:str, game_parameters_type:GameParametersType, seeds:List[int], max_players:int, turns:int) -> Tuple[np.ndarray, np.ndarray]:
+    """The encoded state of every player on the border at every turn of games played by SMART players,
+        and the PolicyTable's best action for each. The game of each seed has 2 to max_players players,
+        each with a random success formula.
+    """
+    from game.careersGameEngine import CareersGameEngine
+    from game.gameConstants import StrategyLevel
+    from game.gameUtils import GameUtils
+
+    policy = PolicyTable.get_policy(edition_name, game_parameters_type)
+    encoder = StateEncoder(edition_name, game_parameters_type)
+    encoded = []
+    actions = []
+    for seed in seeds:
+        rng = random.Random(seed)
+        engine = CareersGameEngine(loglevel='error', installationId='policyModel', edition=edition_name, headless=True)
+        engine.create(edition_name, 'policyModel', 'points', 100, game_parameters_type.value, seed=seed)
+        for plugin in engine.careersGame.plugins["turn"]:
+            plugin.strategy_level = StrategyLevel.SMART
+        for i in range(rng.randint(2, max_players)):
+            sf = GameUtils.get_random_formula(100, rng)
+            engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com {sf.money} {sf.stars} {sf.hearts} computer", None)
+        engine.execute_command("start", None)
+        engine.automatic_run = True
+        game_state = engine.game_state
+        for _ in range(turns):
+            if game_state.game_complete:
+                break
+            players = [player for player in game_state.players if player.board_location.occupation_name is None]
+            encoded.append(encoder.encode_batch([game_state] * len(players), [player.number for player in players]).copy())
+            for player in players:
+                best = policy.choices_for(player)[0]
+                actions.append(len(policy.occupation_names) if best is None else policy.occupation_names.index(best))
+            player = game_state.current_player
+            engine.execute_command("take_turn", player)
+            engine.execute_command("next", player)
+        engine.discard()
+    return np.vstack(encoded), np.array(actions)
+
+def main():
+    from game.consoleOutput import ConsoleOutput
+
+    parser = argparse.ArgumentParser(description="Fit and save the policy model of a game edition to its policy table")
+    parser.add_argument("edition", help="edition name", type=str, default="Professions-Hi-Tech_v3", nargs="?")
+    parser.add_argument("--params", help="game parameters type", type=str, default="prod")
+    parser.add_argument("--games", help="number of games played for training states", type=int, default=400)
+    parser.add_argument("--holdout", help="number of games played for held-out states, that agreement is measured on", type=int, default=50)
+    parser.add_argument("--players", help="the most players in a game, each game has 2 to players", type=int, default=6)
+    parser.add_argument("--turns", help="number of turns played in a game", type=int, default=200)
+    parser.add_argument("--regularization", help="ridge regression regularization", type=float, default=1.0)
+    parser.add_argument("--seed", help="base random seed", type=int, default=1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+    game_parameters_type = GameParametersType[args.params.upper()]
+    if PolicyTable.get_policy(args.edition, game_parameters_type) is None:
+        print(f'{args.edition} has no policy table, solve it with python -m game.policyTable {args.edition}')
+        return
+    training = collect_states(args.edition, game_parameters_type, range(args.seed, args.seed + args.games), args.players, args.turns)
+    model = PolicyModel.fit(args.edition, training[0], training[1], game_parameters_type, args.regularization)
+    filename = PolicyModel.filename(EditionTemplate.get_template(args.edition, game_parameters_type))
+    model.save(filename)
+    print(f'{filename}: {len(training[1])} training states, {100 * np.mean(np.argmax(model.scores(training[0]), axis=1) == training[1]):.1f}% agree with the policy table')
+    if args.holdout > 0:
+        seed = args.seed + args.games
+        holdout = collect_states(args.edition, game_parameters_type, range(seed, seed + args.holdout), args.players, args.turns)
+        agreement = np.mean(np.argmax(model.scores(holdout[0]), axis=1) == holdout[1])
+        print(f'{len(holdout[1])} held-out states of {args.holdout} other games, {100 * agreement:.1f}% agree with the policy table')
+
+if __name__ == '__main__':
+    main()
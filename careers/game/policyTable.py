@@ -0,0 +1,318 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from game.boardAnalytics import BoardAnalytics
+from game.editionTemplate import EditionTemplate
+from game.gameBoard import GameBoard
+from game.gameConstants import BorderSquareType, GameParametersType, SpecialProcessingType
+from game.occupationEvaluator import OccupationEvaluator, OccupationPayoff
+from game.player import Player
+
+from threading import Lock
+from typing import Dict, List, Tuple
+import argparse, logging, os
+import numpy as np
+
+class PolicyTable(object):
+    """A policy for a computer player of an edition, solved offline by value iteration and stored as compact arrays
+        next to the edition's resources, for the SMART level of the Careers_All_Strategy plug-in.
+        The game is abstracted to a Markov decision process:
+            state - the border square, the salary and the hearts, stars and money (cash in 1000s) still needed
+                    to fulfill the success formula. Salary and the amounts needed are interpolated between LEVELS.
+            action - the occupation to head for next, or None to go round the board to Payday
+        Heading for an occupation takes the expected number of turns to land on its entrance (BoardAnalytics),
+        collecting the salary at each Payday passed, then pays the entry fee and makes one trip through the occupation.
+        The trip's outcome is the OccupationPayoff of the occupation, hearts, stars, cash and salary taken to be independent
+        given the way the player left it, and the player's next decision is at the square the trip ends on.
+        The policy minimizes the expected number of turns until the success formula is fulfilled.
+        Opportunity and Experience cards, other players and the degrees won in college are not modelled.
+
+        The best and second best action of every state are kept as uint8 arrays.
+        Tables are cached per edition, use PolicyTable.get_policy(). Solve and save them with main().
+        Arguments:
+            edition_name - the edition name, for example "Professions-Hi-Tech_v3"
+            occupation_names - the occupation of each action, the last action (len(occupation_names)) is going round to Payday
+            best - (board size, SALARY_LEVELS, DEFICIT_LEVELS, DEFICIT_LEVELS, DEFICIT_LEVELS) best actions,
+                   indexed by square, salary, hearts needed, stars needed and money needed
+            alternative - the second best actions, same shape as best
+    """
+    DEFICIT_LEVELS = np.array([0, 1, 2, 3, 4, 6, 8, 10, 13, 16, 20, 25, 32, 40, 50, 65], dtype=float)
+    SALARY_LEVELS = np.array([2000, 3000, 4000, 6000, 9000, 13000, 20000, 30000], dtype=float)
+    _policies:Dict[Tuple, 'PolicyTable|None'] = {}
+    _lock = Lock()
+
+    def __init__(self, edition_name:str, occupation_names:List[str], best:np.ndarray, alternative:np.ndarray):
+        self._edition_name = edition_name
+        self._occupation_names = list(occupation_names)
+        self._best = best
+        self._alternative = alternative
+        #
+        # the midpoints between levels, to find the nearest level of an amount with searchsorted
+        #
+        self._salary_bounds = (PolicyTable.SALARY_LEVELS[1:] + PolicyTable.SALARY_LEVELS[:-1]) / 2
+        self._deficit_bounds = (PolicyTable.DEFICIT_LEVELS[1:] + PolicyTable.DEFICIT_LEVELS[:-1]) / 2
+
+    @staticmethod
+    def get_policy(edition_name:str, game_parameters_type:GameParametersType=GameParametersType.PROD) -> 'PolicyTable|None':
+        """Gets the PolicyTable of an edition, loading it from the edition's resource folder on first use.
+            Returns None if the edition has no table, or it is out of date with the edition's occupations.
+            Tables aren't solved here, in a player's turn, but by main(), which saves them.
+            Arguments:
+                edition_name - the edition name, for example "Professions-Hi-Tech_v3"
+                game_parameters_type - a GameParametersType
+        """
+        key = (edition_name, game_parameters_type)
+        if key not in PolicyTable._policies:
+            with PolicyTable._lock:
+                if key not in PolicyTable._policies:
+                    template = EditionTemplate.get_template(edition_name, game_parameters_type)
+                    filename = PolicyTable.filename(template)
+                    occupation_names = PolicyTable._occupations(template)
+                    policy = None
+                    if len(occupation_names) == 0:
+                        logging.info(f"{edition_name} has no occupations on the board, and no policy table")
+                    elif not os.path.exists(filename):
+                        logging.warning(f"no policy table {filename}, solve it with python -m game.policyTable {edition_name}")
+                    else:
+                        policy = PolicyTable.load(filename)
+                        if policy.occupation_names != occupation_names:
+                            logging.warning(f"policy table {filename} is out of date, solve it with python -m game.policyTable {edition_name}")
+                            policy = None
+                    PolicyTable._policies[key] = policy
+        return PolicyTable._policies[key]
+
+    @staticmethod
+    def filename(template:EditionTemplate) -> str:
+        """The policy table file of an edition: policyTable_<edition name>.npz in the edition's resource folder
+        """
+        return f'{template.resource_folder}/{template.edition_path}/policyTable_{template.edition_name}.npz'
+
+    @staticmethod
+    def load(filename:str) -> 'PolicyTable':
+        with np.load(filename) as tables:
+            return PolicyTable(str(tables["edition_name"]), [str(name) for name in tables["occupation_names"]], \
+                               tables["best"], tables["alternative"])
+
+    def save(self, filename:str):
+        np.savez_compressed(filename, edition_name=np.array(self._edition_name), occupation_names=np.array(self._occupation_names), \
+                            best=self._best, alternative=self._alternative)
+
+    @property
+    def edition_name(self) -> str:
+        return self._edition_name
+
+    @property
+    def occupation_names(self) -> List[str]:
+        return self._occupation_names
+
+    @property
+    def best(self) -> np.ndarray:
+        return self._best
+
+    @property
+    def alternative(self) -> np.ndarray:
+        return self._alternative
+
+    def choices(self, square_number:int, salary:int, hearts_needed:int, stars_needed:int, money_needed:int) -> Tuple[str|None, str|None]:
+        """The best and second best occupation to head for from a border square, None for going round to Payday.
+            Arguments:
+                square_number - the player's border square number
+                salary - the player's salary
+                hearts_needed, stars_needed, money_needed - the amounts still needed to fulfill the success formula, money in 1000s
+        """
+        index = (square_number, \
+                 np.searchsorted(self._salary_bounds, salary), \
+                 np.searchsorted(self._deficit_bounds, max(hearts_needed, 0)), \
+                 np.searchsorted(self._deficit_bounds, max(stars_needed, 0)), \
+                 np.searchsorted(self._deficit_bounds, max(money_needed, 0)))
+        return self._action_name(self._best[index]), self._action_name(self._alternative[index])
+
+    def choices_for(self, player:Player) -> Tuple[str|None, str|None]:
+        """The best and second best occupation for a Player to head for, see choices()
+        """
+        success_formula = player.success_formula
+        return self.choices(player.board_location.border_square_number, player.salary, success_formula.hearts - player.happiness, \
+                            success_formula.stars - player.fame, success_formula.money - player.cash // 1000)
+
+    def _action_name(self, action:int) -> str|None:
+        return self._occupation_names[action] if action < len(self._occupation_names) else None
+
+    @staticmethod
+    def _occupations(template:EditionTemplate) -> List[str]:
+        """The occupations of an edition that have an entrance square on the board
+        """
+        occupations = {occupation.name : occupation for occupation in template.occupations.values() if occupation is not None}
+        return [name for name in occupations if template.game_board.find_square_number(name) is not None]
+
+    #
+    # value iteration
+    #
+    @staticmethod
+    def _shift(levels:np.ndarray, deltas:np.ndarray, probabilities:np.ndarray) -> np.ndarray:
+        """The (levels, levels) transition matrix of an amount that changes from each level by -deltas with probabilities,
+            clipped to the levels and linearly interpolated between the two nearest levels
+        """
+        n = len(levels)
+        amounts = np.clip(levels[:, None] - deltas[None, :], levels[0], levels[-1])
+        upper = np.clip(np.searchsorted(levels, amounts), 1, n - 1)
+        lower = upper - 1
+        weights = (amounts - levels[lower]) / (levels[upper] - levels[lower])
+        rows = np.broadcast_to(np.arange(n)[:, None], amounts.shape)
+        matrix = np.zeros((n, n))
+        np.add.at(matrix, (rows, lower), probabilities * (1 - weights))
+        np.add.at(matrix, (rows, upper), probabilities * weights)
+        return matrix
+
+    @staticmethod
+    def _distribution_shift(levels:np.ndarray, distribution:Dict[int, float], scale:float, sign:int) -> np.ndarray:
+        values = np.array(list(distribution.keys()), dtype=float) / scale
+        return PolicyTable._shift(levels, sign * values, np.array(list(distribution.values())))
+
+    @staticmethod
+    def _corner_square(game_board:GameBoard, square_type:BorderSquareType, processing_type:SpecialProcessingType) -> int:
+        """The number of the Hospital or Unemployment square. Some layouts give corner squares only their special processing.
+        """
+        square_number = game_board.next_square_number(-1, square_type)
+        if square_number is None:
+            square_number = next((square.number for square in game_board.border_squares \
+                                  if square.special_processing is not None and square.special_processing.processing_type is processing_type), 0)
+        return square_number
+
+    @staticmethod
+    def solve(template:EditionTemplate, tolerance:float=0.01, max_iterations:int=500) -> 'PolicyTable':
+        """Solves the policy of an edition by value iteration.
+            The value of a state is kept only at the squares a decision is made after a trip: Payday, the exit square
+            of each occupation, the Hospital and Unemployment. The policy of every border square is a final backup from these.
+        """
+        edition_name = template.edition_name
+        game_board = template.game_board
+        board_size = game_board.game_board_size
+        analytics = BoardAnalytics.get_analytics(edition_name, template.game_parameters_type, enter_probability=0.0)
+        evaluator = OccupationEvaluator.get_evaluator(edition_name, template.game_parameters_type)
+        names = PolicyTable._occupations(template)
+        occupations = [template.occupations[name] for name in names]
+        deficits = PolicyTable.DEFICIT_LEVELS
+        salaries = PolicyTable.SALARY_LEVELS
+        nactions = len(names) + 1
+        #
+        # the squares a trip ends on, by exit
+        #
+        hospital = PolicyTable._corner_square(game_board, BorderSquareType.HOSPITAL_SQUARE, SpecialProcessingType.HOSPITAL)
+        unemployment = PolicyTable._corner_square(game_board, BorderSquareType.UNEMPLOYMENT_SQUARE, SpecialProcessingType.UNEMPLOYMENT)
+        exit_squares = {"hospital" : hospital, "unemployment" : unemployment}
+        decision_squares = sorted(set([0, hospital, unemployment] + [occupation.exit_square_number for occupation in occupations]))
+        decision_index = {square : i for i,square in enumerate(decision_squares)}
+        #
+        # each action's trip: a list of (exit probability, decision index, salary, hearts, stars, money matrices)
+        # and its expected turns in the occupation
+        #
+        trips = []
+        trip_turns = np.zeros(nactions)
+        identity = np.eye(len(deficits))
+        for a,occupation in enumerate(occupations):
+            payoff:OccupationPayoff = evaluator.payoff(occupation.name)
+            outcomes = []
+            for exit_name in OccupationPayoff.EXITS:
+                probability = payoff.exit_probability(exit_name)
+                if probability < 1e-9:
+                    continue
+                square = exit_squares.get(exit_name, occupation.exit_square_number)
+                cash = payoff.distribution("cash", exit_name)
+                cash = {amount - occupation.entry_fee : p for amount,p in cash.items()}
+                outcomes.append((probability, decision_index[square], \
+                                 PolicyTable._distribution_shift(salaries, payoff.distribution("salary", exit_name), 1, -1), \
+                                 PolicyTable._distribution_shift(deficits, payoff.distribution("hearts", exit_name), 1, 1), \
+                                 PolicyTable._distribution_shift(deficits, payoff.distribution("stars", exit_name), 1, 1), \
+                                 PolicyTable._distribution_shift(deficits, cash, 1000, 1)))
+            trips.append(outcomes)
+            trip_turns[a] = max(payoff.mean("turns"), 1.0)
+        trips.append([(1.0, decision_index[0], np.eye(len(salaries)), identity, identity, identity)])    # round to Payday
+        #
+        # travel from each border square: expected turns and (salary, money, money) matrices of the paydays passed
+        #
+        travel_turns = np.full((board_size, nactions), np.inf)
+        paydays = np.zeros((board_size, nactions))
+        for square in range(board_size):
+            for a,occupation in enumerate(occupations):
+                turns = analytics.expected_turns_to_occupation(occupation.name, square)
+                if np.isfinite(turns):
+                    distance = (game_board.find_square_number(occupation.name) - square) % board_size
+                    travel_turns[square, a] = turns
+                    paydays[square, a] = (square + distance) // board_size + max(0.0, 7 * turns - distance) / board_size
+            travel_turns[square, -1] = max(board_size - square, 7) / 7
+            paydays[square, -1] = 1.0
+        payday_matrices:Dict[float, np.ndarray] = {}
+        def payday_matrix(n:float) -> np.ndarray:
+            matrix = payday_matrices.get(n)
+            if matrix is None:
+                matrix = np.stack([PolicyTable._shift(deficits, np.array([n * salary / 1000]), np.ones(1)) for salary in salaries])
+                payday_matrices[n] = matrix
+            return matrix
+
+        def expected_values(values:np.ndarray) -> np.ndarray:
+            """The expected value after each action's trip, (actions, salary, hearts, stars, money) by the state on entering
+            """
+            expected = np.zeros((nactions,) + values.shape[1:])
+            for a,outcomes in enumerate(trips):
+                for probability, index, salary, hearts, stars, money in outcomes:
+                    expected[a] += probability * np.einsum('si,hj,kt,ml,ijtl->shkm', salary, hearts, stars, money, values[index], optimize=True)
+            return expected
+
+        def action_values(square:int, expected:np.ndarray) -> np.ndarray:
+            q = np.empty(expected.shape)
+            for a in range(nactions):
+                if np.isfinite(travel_turns[square, a]):
+                    q[a] = travel_turns[square, a] + trip_turns[a] * (a < len(occupations)) + \
+                           np.einsum('sml,shkl->shkm', payday_matrix(round(paydays[square, a], 2)), expected[a], optimize=True)
+                else:
+                    q[a] = np.inf
+            return q
+
+        values = np.zeros((len(decision_squares), len(salaries), len(deficits), len(deficits), len(deficits)))
+        for iteration in range(max_iterations):
+            expected = expected_values(values)
+            updated = np.stack([action_values(square, expected).min(axis=0) for square in decision_squares])
+            updated[:, :, 0, 0, 0] = 0.0
+            change = np.abs(updated - values).max()
+            values = updated
+            if change < tolerance:
+                break
+        logging.info(f"{edition_name} policy solved in {iteration + 1} iterations, {values[decision_index[0], 0, -1, -1, -1]:.1f} turns from Payday")
+
+        expected = expected_values(values)
+        best = np.empty((board_size,) + values.shape[1:], dtype=np.uint8)
+        alternative = np.empty_like(best)
+        for square in range(board_size):
+            ranked = np.argsort(action_values(square, expected), axis=0, kind="stable")
+            best[square] = ranked[0]
+            alternative[square] = ranked[min(1, nactions - 1)]
+        return PolicyTable(edition_name, names, best, alternative)
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve and save the policy tables of game editions")
+    parser.add_argument("editions", help="edition names, default is all of them", nargs="*")
+    parser.add_argument("--params", help="game parameters type", type=str, default="prod")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    game_parameters_type = GameParametersType[args.params.upper()]
+    editions = args.editions
+    if len(editions) == 0:
+        editions = EditionTemplate.get_template("Hi-Tech", game_parameters_type).editions
+    for edition_name in editions:
+        try:
+            template = EditionTemplate.get_template(edition_name, game_parameters_type)
+        except Exception as e:
+            print(f'{edition_name}: the edition can\'t be loaded, {e}')
+            continue
+        if len(PolicyTable._occupations(template)) == 0:
+            print(f'{edition_name}: no occupations on the board')
+            continue
+        policy = PolicyTable.solve(template)
+        policy.save(PolicyTable.filename(template))
+        print(f'{PolicyTable.filename(template)}: {len(policy.occupation_names)} occupations')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from typing import Any, Dict, List, Tuple
+
+class SaveTracker(object):
+    """Tracks which fields of a document changed since the document was last saved, so that a save writes only those.
+        A field has changed if its value is not equal to the value last saved. Lists and dicts are saved as copies,
+        so one changed in place is seen as changed. Only the changed fields are copied.
+        An append-only field, a list that's only appended to or replaced like a player's salary history, is pushed rather than set:
+        the items added to the list last saved are appended to the saved list. If it's another list, or got shorter, it's set.
+        A field that was saved and is no longer in the document is unset.
+        Arguments:
+            appended - the names of the append-only list fields
+    """
+
+    def __init__(self, appended:List[str]=None):
+        self._appended = appended or []
+        self._saved:Dict[str, Any] = {}          # field -> a copy of the value last saved
+        self._saved_lists:Dict[str, Tuple[List, int]] = {}     # append-only field -> the list last saved and its length then
+        self._pending:Tuple[Dict, Dict] = None
+
+    @property
+    def is_new(self) -> bool:
+        """True if the document hasn't been saved
+        """
+        return len(self._saved) == 0 and len(self._saved_lists) == 0
+
+    def changes(self, document:Dict, path:str=None) -> Tuple[Dict, Dict, Dict]:
+        """The changes to document since it was last saved.
+            Arguments:
+                document - the document as it is now, for example Player.to_dict()
+                path - the path of the document in the saved document, for example "gameState.players.1", None for the top level
+            Returns: a Tuple of dicts keyed by "{path}.{field}": the fields to set, the items to append and the fields to unset
+                Call saved() once they're written.
+        """
+        set_fields = {}
+        push_fields = {}
+        saved = dict(self._saved)
+        lists = {}
+        for field, value in document.items():
+            key = field if path is None else f'{path}.{field}'
+            if field in self._appended and isinstance(value, list):
+                saved_list, saved_length = self._saved_lists.get(field, (None, 0))
+                lists[field] = (value, len(value))
+                if value is not saved_list or len(value) < saved_length:
+                    set_fields[key] = value
+                elif len(value) > saved_length:
+                    push_fields[key] = value[saved_length:]
+                continue
+            if field not in self._saved or self._saved[field] != value:
+                set_fields[key] = value
+                saved[field] = SaveTracker._copy(value)
+        unset_fields = {}
+        for field in list(self._saved) + list(self._saved_lists):
+            if field not in document:
+                unset_fields[field if path is None else f'{path}.{field}'] = ""
+                saved.pop(field, None)
+        self._pending = (saved, lists)
+        return set_fields, push_fields, unset_fields
+
+    def saved(self):
+        """Records the changes last returned by changes() as saved
+        """
+        if self._pending is not None:
+            self._saved, self._saved_lists = self._pending
+            self._pending = None
+
+    def reset(self):
+        """Forgets what was saved, so the next save writes the whole document
+        """
+        self._saved = {}
+        self._saved_lists = {}
+        self._pending = None
+
+    @staticmethod
+    def _copy(value:Any) -> Any:
+        """A copy of the lists and dicts of a value, that doesn't change with it
+        """
+        if isinstance(value, dict):
+            return {key:SaveTracker._copy(item) for key, item in value.items()}
+        elif isinstance(value, list):
+            return [SaveTracker._copy(item) for item in value]
+        return value
+
+
+class GameSaveTracker(object):
+    """Tracks the changes to a CareersGame since it was last saved in the layout of GameEngineCommands.save_game('json'):
+            gameState - the GameState fields, except the players
+            gameState.players.<n> - each Player, with an append-only salary history and command history
+            opportunity_deck, experience_deck - the deck order
+            random - the random number generator state
+        update() returns only what changed as a MongoDB update with $set, $push and $unset operators.
+        A player who joined since the last save is set as a whole. A player is only compared field by field if it changed:
+        if its version, see Player.version, or its board location or pending actions, which are changed in place, aren't as last saved.
+        Arguments:
+            careers_game - the CareersGame to track
+    """
+    APPENDED = ["salary_history", "commands"]      # the command history is a new list when its oldest commands are dropped, see Player.drop_commands
+
+    def __init__(self, careers_game):
+        self._careers_game = careers_game
+        self._game_state = SaveTracker()
+        self._players:List[SaveTracker] = []
+        self._player_keys:List[Tuple] = []      # the (player, version, board location, pending actions) of each player last saved
+        self._pending_player_keys:List[Tuple] = []
+        self._decks = {"opportunity_deck":SaveTracker(), "experience_deck":SaveTracker()}
+        self._random_state = None           # the state of the game's random number generator last saved
+        self._pending_random_state = None
+
+    @property
+    def careers_game(self):
+        return self._careers_game
+
+    def update(self) -> Dict:
+        """The MongoDB update that saves the changes since the last save, with "$set", "$push" and "$unset" keys if there are any.
+            Call saved() once it's written.
+        """
+        careers_game = self._careers_game
+        game_state = careers_game.game_state
+        set_fields = {}
+        push_fields = {}
+        unset_fields = {}
+        fields, _, unsets = self._game_state.changes(game_state.to_dict(include_players=False), "gameState")
+        set_fields.update(fields)
+        unset_fields.update(unsets)
+
+        while len(self._players) < len(game_state.players):
+            self._players.append(SaveTracker(GameSaveTracker.APPENDED))
+            self._player_keys.append(None)
+        player_keys = []
+        for index, (player, tracker) in enumerate(zip(game_state.players, self._players)):
+            player_key = (player, player.version, player.board_location.to_dict(), player.pending_actions.to_dict())
+            player_keys.append(player_key)
+            if player_key == self._player_keys[index]:
+                continue
+            path = f'gameState.players.{index}'
+            player_dict = player.to_dict()
+            is_new = tracker.is_new
+            fields, pushes, unsets = tracker.changes(player_dict, path)
+            if is_new:
+                set_fields[path] = player_dict
+            else:
+                set_fields.update(fields)
+                push_fields.update({key:{"$each":items} for key, items in pushes.items()})
+                unset_fields.update(unsets)
+
+        decks = {"opportunity_deck":careers_game.opportunities, "experience_deck":careers_game.experience_cards}
+        for name, deck in decks.items():
+            fields, _, _ = self._decks[name].changes({"next_index":deck.next_index, "cards_index":deck.cards_index}, name)
+            set_fields.update(fields)
+        self._pending_player_keys = player_keys
+        random_state = careers_game.random.getstate()
+        if random_state != self._random_state:      # compared as is, it's 625 ints
+            set_fields["random"] = careers_game.random_to_dict()
+        self._pending_random_state = random_state
+
+        if self._game_state.is_new:
+            #
+            # the first save sets the whole game, as the players can only be set by index in a saved gameState
+            #
+            set_fields = {"gameState":game_state.to_dict(), **{key:value for key, value in set_fields.items() if not key.startswith("gameState")}}
+            push_fields = {}
+            unset_fields = {}
+        update = {}
+        if len(set_fields) > 0:
+            update["$set"] = set_fields
+        if len(push_fields) > 0:
+            update["$push"] = push_fields
+        if len(unset_fields) > 0:
+            update["$unset"] = unset_fields
+        return update
+
+    def saved(self):
+        """Records the update last returned by update() as written
+        """
+        for tracker in [self._game_state] + self._players + list(self._decks.values()):
+            tracker.saved()
+        self._player_keys[:len(self._pending_player_keys)] = self._pending_player_keys
+        self._random_state = self._pending_random_state
+
+    def mark_saved(self):
+        """Records the game as it is now as saved, for example when it's just been loaded from the saved game
+        """
+        self.update()
+        self.saved()
+
+    def reset(self):
+        """Forgets what was saved, so the next update saves the whole game
+        """
+        for tracker in [self._game_state] + self._players + list(self._decks.values()):
+            tracker.reset()
+        self._player_keys = [None] * len(self._players)
+        self._random_state = None
@@ -11,7 +11,7 @@ from game.commandResult import CommandResult
 from game.gameParameters import GameParameters
 from game.gameConstants import PendingActionType, SpecialProcessingType
 
-import json
+import json, random
 from typing import Dict, List, Union
 
 
@@ -209,7 +209,7 @@ class SpecialProcessing(CareersObject):
         # amount computed from a roll of the dice
         # and could be negative (cash loss) or positive (cash gain)
         # A cash loss is also insurable
-        roll = sum(GameUtils.roll(self.amount_dice)) if self.amount_dice > 0 else 1
+        roll = sum(GameUtils.roll(self.amount_dice, player.my_game.random)) if self.amount_dice > 0 else 1
         amt = self.amount_dict[str(roll)]
         symbol = self.game_parameters.get_param("currency_symbol")
         if isinstance(amt, str):   # fixed amount
@@ -271,6 +271,7 @@ class SpecialProcessing(CareersObject):
             another player or declaring bankruptcy
         """
         cash_loss = 0
+        rng = player.my_game.random     # dice rolled for the amount use the game's random number generator
         player_salary = player.salary
         player_cash = player.cash
         player_net_worth = player_cash + player.savings - player.get_total_loans()
@@ -283,45 +284,45 @@ class SpecialProcessing(CareersObject):
                     
         elif self.processing_type is SpecialProcessingType.CASH_LOSS:
             if self.of=='net_worth':
-                cash_loss = self._compute_amount(player_net_worth)
+                cash_loss = self._compute_amount(player_net_worth, rng)
             else:    
-                cash_loss = self._compute_amount(player_cash) if self.of=='cash' else self._compute_amount(player_salary)
+                cash_loss = self._compute_amount(player_cash, rng) if self.of=='cash' else self._compute_amount(player_salary, rng)
             player.add_point_loss("cash", cash_loss)    # cash loss is covered by insurance
             
         elif  self.processing_type is SpecialProcessingType.CASH_LOSS_OR_UNEMPLOYMENT.value:
-            cash_loss = self._compute_amount(player_cash) if self.of=='cash' else self._compute_amount(player_salary)
+            cash_loss = self._compute_amount(player_cash, rng) if self.of=='cash' else self._compute_amount(player_salary, rng)
             player.pending_amount = cash_loss
             
         elif self.processing_type is SpecialProcessingType.UNEMPLOYMENT or self.processing_type is SpecialProcessingType.HOSPITAL:
-            cash_loss =  self._compute_amount(player_cash) if self.of=='cash' else self._compute_amount(player_salary)
+            cash_loss =  self._compute_amount(player_cash, rng) if self.of=='cash' else self._compute_amount(player_salary, rng)
         
         else:   # future expansion
             pass
         
         return cash_loss
     
-    def compute_point_loss(self, of_what:str, fame_points:int, happiness_points:int):
+    def compute_point_loss(self, of_what:str, fame_points:int, happiness_points:int, rng:random.Random=None):
         """Computes the loss of fame or happiness points
             Arguments:
                 what - 'happiness' or 'fame'
                 famePoints - player's fame points (Stars)
                 happinessPoints - 
         """
-        point_loss = self._compute_amount(fame_points) if of_what=='fame' else self._compute_amount(happiness_points)
+        point_loss = self._compute_amount(fame_points, rng) if of_what=='fame' else self._compute_amount(happiness_points, rng)
         
         return point_loss
     
-    def _compute_amount(self, original_amount:int) -> int:
+    def _compute_amount(self, original_amount:int, rng:random.Random=None) -> int:
         theAmount = 0
         if self.amount != 0:
             if self.dice > 0:
-                roll = GameUtils.roll(self.dice)
+                roll = GameUtils.roll(self.dice, rng)
                 theAmount = sum(roll) * self.amount
             else:
                 theAmount = self.amount
         elif self.percent != 0.0:
             if self.dice > 0:
-                roll = GameUtils.roll(self.dice)
+                roll = GameUtils.roll(self.dice, rng)
                 theAmount = int(sum(roll) * self.percent * original_amount)
             else:
                 theAmount = int(self.percent * original_amount)
@@ -0,0 +1,218 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from game.editionTemplate import EditionTemplate
+from game.experienceCard import ExperienceType
+from game.gameConstants import GameParametersType, PendingActionType
+from game.gameState import GameState
+from game.opportunityCard import OpportunityType
+
+from operator import attrgetter, itemgetter
+from typing import Dict, List
+import numpy as np
+
+class StateEncoder(object):
+    """Encodes GameStates as fixed-width float32 feature vectors, for training and running a learned (GENIUS) strategy.
+        A game is encoded from the point of view of one player, by default the current player: the first block of
+        features is that player's, followed by the next players in turn order, and the blocks of empty seats are all 0.
+        Each player's block is:
+            square - one-hot border square number
+            occupation - one-hot occupation the player is in, all 0 on the border
+            progress - (occupation square number + 1) / occupation size, 0 on the border
+            SCALARS - money in 10,000s, hearts and stars and what's still needed of the success formula as a fraction of its total points,
+                      the number of degrees and of occupations completed
+            FLAGS - 1 or 0
+            opportunity, experience, pending - the number of Opportunity cards, Experience cards and pending actions of each type
+        Values are read straight from each Player, not through player_info(), with the card counts of each type the Player keeps,
+        so cards aren't iterated. They're gathered into arrays for the whole batch and written into a preallocated buffer
+        with a few fancy indexing assignments, so one encoder encodes one game or thousands at a time.
+        An encoder is not thread safe, use one per thread.
+        Arguments:
+            edition_name - the edition name, for example "Professions-Hi-Tech_v3"
+            game_parameters_type - a GameParametersType
+            max_players - the number of player blocks
+    """
+    SCALARS = ["cash", "salary", "savings", "loans", "hearts", "stars", "hearts_needed", "stars_needed", "money_needed", "degrees", "occupations_completed"]
+    FLAGS = ["present", "current", "insured", "sick", "unemployed", "on_holiday", "can_retire", "lose_turn", "extra_turn"]
+    OPPORTUNITY_TYPES = list(OpportunityType)
+    EXPERIENCE_TYPES = list(ExperienceType)
+    PENDING_ACTION_TYPES = list(PendingActionType)
+    #
+    # the Player attributes encoded are read from its __dict__, and those of its BoardLocation and SuccessFormula, rather than through a property each
+    #
+    _GETTERS = {name : itemgetter(f'_{name}') for name in ["number", "board_location", "success_formula", "happiness", "fame", "cash", "salary", \
+                                                           "savings", "total_loans", "my_degrees", "occupation_record", "is_insured", "is_sick", \
+                                                           "is_unemployed", "on_holiday", "can_retire", "lose_turn", "extra_turn", "pending_actions"]}
+    _GETTERS.update({name : attrgetter(name) for name in ["border_square_number", "occupation_name", "total_points", "hearts", "stars", "money"]})
+    _GETTERS["cards"] = itemgetter('_opportunity_type_counts', '_experience_type_counts')
+
+    def __init__(self, edition_name:str, game_parameters_type:GameParametersType=GameParametersType.PROD, max_players:int=6):
+        template = EditionTemplate.get_template(edition_name, game_parameters_type)
+        self._edition_name = edition_name
+        self._max_players = max_players
+        self._board_size = template.game_board.game_board_size
+        occupations = {occupation.name : occupation for occupation in template.occupations.values() if occupation is not None}
+        self._occupation_names = list(occupations.keys())
+        #
+        # template occupations are also keyed by lower case and alternate names
+        #
+        self._occupation_index:Dict[str, int] = {alias : self._occupation_names.index(occupation.name) \
+                                                 for alias,occupation in template.occupations.items() if occupation is not None}
+        self._occupation_sizes = {alias : occupation.size for alias,occupation in template.occupations.items() if occupation is not None}
+        #
+        # offsets of each group of features in a player's block
+        #
+        sizes = [("square", self._board_size), ("occupation", len(self._occupation_names)), ("progress", 1), \
+                 ("scalars", len(StateEncoder.SCALARS)), ("flags", len(StateEncoder.FLAGS)), \
+                 ("opportunity", len(StateEncoder.OPPORTUNITY_TYPES)), ("experience", len(StateEncoder.EXPERIENCE_TYPES)), \
+                 ("pending", len(StateEncoder.PENDING_ACTION_TYPES))]
+        self._offsets:Dict[str, int] = {}
+        width = 0
+        for name, size in sizes:
+            self._offsets[name] = width
+            width += size
+        self._player_width = width
+        self._pending_index = {action_type : self._offsets["pending"] + i for i,action_type in enumerate(StateEncoder.PENDING_ACTION_TYPES)}
+        #
+        # the scalars, flags and card type counts are next to each other in a player's block, and are written together, scaled
+        #
+        self._values_offset = self._offsets["scalars"]
+        self._scale = np.ones(len(StateEncoder.SCALARS) + len(StateEncoder.FLAGS) + len(StateEncoder.OPPORTUNITY_TYPES) + len(StateEncoder.EXPERIENCE_TYPES), \
+                              dtype=np.float32)
+        self._scale[:4] = 1e-4
+        self._buffer = np.zeros((0, self.width), dtype=np.float32)
+
+    @property
+    def edition_name(self) -> str:
+        return self._edition_name
+
+    @property
+    def max_players(self) -> int:
+        return self._max_players
+
+    @property
+    def board_size(self) -> int:
+        return self._board_size
+
+    @property
+    def offsets(self) -> Dict[str, int]:
+        """The offset of each group of features in a player's block
+        """
+        return dict(self._offsets)
+
+    @property
+    def player_width(self) -> int:
+        """The number of features of each player
+        """
+        return self._player_width
+
+    @property
+    def width(self) -> int:
+        """The number of features of a game
+        """
+        return self._max_players * self._player_width
+
+    @property
+    def feature_names(self) -> List[str]:
+        """The name of each feature, p<block>_<feature>
+        """
+        names = [f"square_{n}" for n in range(self._board_size)] + [f"occupation_{name}" for name in self._occupation_names] + ["progress"] + \
+                StateEncoder.SCALARS + StateEncoder.FLAGS + \
+                [f"opportunity_{card_type.value}" for card_type in StateEncoder.OPPORTUNITY_TYPES] + \
+                [f"experience_{card_type.value}" for card_type in StateEncoder.EXPERIENCE_TYPES] + \
+                [f"pending_{action_type.value}" for action_type in StateEncoder.PENDING_ACTION_TYPES]
+        return [f"p{block}_{name}" for block in range(self._max_players) for name in names]
+
+    def encode(self, game_state:GameState, perspective:int|None=None) -> np.ndarray:
+        """The (width,) features of one game, see encode_batch()
+        """
+        return self.encode_batch([game_state], None if perspective is None else [perspective])[0]
+
+    def encode_batch(self, game_states:List[GameState], perspectives:List[int]|None=None, out:np.ndarray|None=None) -> np.ndarray:
+        """The (len(game_states), width) float32 features of a batch of games.
+            Arguments:
+                game_states - the GameStates to encode
+                perspectives - the player number each game is encoded for, default is each game's current player
+                out - a C-contiguous float32 (len(game_states), width) array to write the features to, for example a slice of a dataset.
+                      If None, the encoder's own buffer is used, which grows as needed: the array returned is then a view of it,
+                      overwritten by the next call.
+        """
+        n = len(game_states)
+        if out is None:
+            if self._buffer.shape[0] < n:
+                self._buffer = np.zeros((max(n, 2 * self._buffer.shape[0]), self.width), dtype=np.float32)
+            out = self._buffer[:n]
+        assert out.shape == (n, self.width) and out.dtype == np.float32 and out.flags.c_contiguous
+        out.fill(0.0)
+        #
+        # the players of the batch in the order of their blocks, and the row of each player's block in blocks
+        #
+        players:List = []
+        rows:List[int] = []
+        currents:List[int] = []
+        for i, game_state in enumerate(game_states):
+            game_players = game_state.players
+            nplayers = len(game_players)
+            current = game_state.current_player_number
+            first = current if perspectives is None else perspectives[i]
+            nblocks = min(nplayers, self._max_players)
+            players += [game_players[(first + block) % nplayers] for block in range(nblocks)]
+            rows += range(i * self._max_players, i * self._max_players + nblocks)
+            currents += [current] * nblocks
+        m = len(players)
+        if m == 0:
+            return out
+        #
+        # then each feature of all the players, a column at a time
+        #
+        states = list(map(vars, players))
+        get = StateEncoder._GETTERS
+        locations = list(map(get["board_location"], states))
+        formulas = list(map(get["success_formula"], states))
+        column = lambda getter, items=states: np.fromiter(map(getter, items), dtype=np.float32, count=m)
+        values = np.empty((m, len(self._scale)), dtype=np.float32)
+        for k, name in enumerate(["cash", "salary", "savings", "total_loans"]):
+            values[:, k] = column(get[name])
+        cash = values[:, 0].copy()
+        points = np.maximum(column(get["total_points"], formulas), 1)
+        values[:, 4] = hearts = np.fromiter([happiness[-1] for happiness in map(get["happiness"], states)], dtype=np.float32, count=m)
+        values[:, 5] = stars = np.fromiter([fame[-1] for fame in map(get["fame"], states)], dtype=np.float32, count=m)
+        values[:, 6] = column(get["hearts"], formulas) - hearts
+        values[:, 7] = column(get["stars"], formulas) - stars
+        values[:, 8] = column(get["money"], formulas) - cash // 1000
+        values[:, 4:9] /= points[:, None]
+        values[:, 9] = np.fromiter([sum(degrees.values()) for degrees in map(get["my_degrees"], states)], dtype=np.float32, count=m)
+        values[:, 10] = np.fromiter([sum(record.values()) for record in map(get["occupation_record"], states)], dtype=np.float32, count=m)
+        flags = len(StateEncoder.SCALARS)
+        values[:, flags] = 1.0
+        values[:, flags + 1] = column(get["number"]) == np.array(currents, dtype=np.float32)
+        for k, name in enumerate(["is_insured", "is_sick", "is_unemployed", "on_holiday", "can_retire", "lose_turn", "extra_turn"]):
+            values[:, flags + 2 + k] = column(get[name])
+        cards = flags + len(StateEncoder.FLAGS)
+        values[:, cards:] = [opportunity + experience for opportunity, experience in map(get["cards"], states)]
+        values *= self._scale
+        blocks = out.reshape(n * self._max_players, self._player_width)
+        rows = np.array(rows, dtype=np.int64)
+        blocks[rows, self._values_offset:self._values_offset + len(self._scale)] = values
+        blocks[rows, np.fromiter(map(get["border_square_number"], locations), dtype=np.int64, count=m)] = 1.0
+        occupied = [k for k, name in enumerate(map(get["occupation_name"], locations)) if name is not None]
+        if len(occupied) > 0:
+            occupation_names = [locations[k].occupation_name for k in occupied]
+            occupied_rows = rows[occupied]
+            blocks[occupied_rows, self._offsets["occupation"] + np.array([self._occupation_index[name] for name in occupation_names])] = 1.0
+            blocks[occupied_rows, self._offsets["progress"]] = [(locations[k].occupation_square_number + 1) / self._occupation_sizes[name] \
+                                                                 for k, name in zip(occupied, occupation_names)]
+        #
+        # a type may be pending more than once, so pending actions are counted
+        #
+        pending:Dict[int, int] = {}
+        for row, pending_actions in zip(rows.tolist(), map(get["pending_actions"], states)):
+            for pending_action in pending_actions.pending_actions:
+                index = row * self._player_width + self._pending_index[pending_action.pending_action_type]
+                pending[index] = pending.get(index, 0) + 1
+        if len(pending) > 0:
+            out.reshape(-1)[list(pending.keys())] = list(pending.values())
+        return out
@@ -60,6 +60,18 @@ class TodoList(CareersObject):
                 if degree["degree_name"]==degree_name:
                     degree["complete"] = 1
     
+    def copy(self) -> 'TodoList':
+        """A copy of the list, which doesn't change when an item of this list is completed
+        """
+        todo_list = TodoList()
+        todo_list._occupations = [dict(occupation) for occupation in self._occupations]
+        todo_list._degrees = [dict(degree) for degree in self._degrees]
+        if "occupations_todo" in self._todos:
+            todo_list._todos["occupations_todo"] = todo_list._occupations
+        if "degrees_todo" in self._todos:
+            todo_list._todos["degrees_todo"] = todo_list._degrees
+        return todo_list
+    
     def is_comlete(self) ->bool:
         """Returns True if all the todo items are complete, False otherwise
         """
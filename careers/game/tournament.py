@@ -0,0 +1,371 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from game.careersGameEngine import CareersGameEngine
+from game.commandResult import CommandResult
+from game.consoleOutput import ConsoleOutput
+from game.editionTemplate import EditionTemplate
+from game.gameConstants import GameParametersType, StrategyLevel
+from game.gameUtils import GameUtils
+import game.plugins
+
+from dataclasses import asdict, dataclass, field
+from itertools import combinations
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Tuple
+import argparse, json, logging, math, os, time
+import numpy as np
+
+@dataclass
+class Entrant():
+    """
+        A strategy playing in a Tournament: a "turn" plug-in class of the game.plugins package and its settings,
+        as in the plugins section of editions.json. The players setting is given by the Tournament.
+
+    """
+    name:str
+    classname:str="Careers_All_Strategy"
+    settings:Dict=field(default_factory=dict)
+
+    @staticmethod
+    def from_level(level:str) -> 'Entrant':
+        """The Careers_All_Strategy at a StrategyLevel, named by the level in lower case
+        """
+        StrategyLevel[level.upper()]      # raises KeyError if not a valid level
+        return Entrant(level.lower(), "Careers_All_Strategy", {"strategy_level":level.lower()})
+
+@dataclass
+class MatchResult():
+    """
+        The outcome of one tournament game. Each pairing of a round is played twice with the same seed,
+        the entrants swapping seats the second time.
+
+    """
+    round:int
+    game_number:int
+    seed:int
+    entrants:List[str]      # the entrant names by seat (player number)
+    winner:int=-1           # the winning seat, -1 if the game was not completed within max_turns
+    turns:int=0
+    elapsed:float=0.0       # seconds
+    error:str|None=None     # the exception message if the game raised an exception
+
+class Tournament(object):
+    """Rates strategy plug-ins against each other in two-player, all-computer games.
+        Each round pairs the entrants, round robin (every pair) or Swiss (entrants of close rating, not the previous round's opponent).
+        Every pairing is played twice with the same seed, so with the same success formulas and the same opening dice,
+        the entrants swapping seats. Games are spread across a pool of worker processes as GameSimulator does,
+        game n of the schedule being seeded with seed + n // 2, and each result is appended to the results file as it completes.
+        A tournament run again with the same results file and settings replays the schedule and plays only the games
+        that are not in the file. The Careers_All_MCTS plug-in searches to a time budget, so its games are not reproducible.
+
+        Ratings are the maximum likelihood Bradley-Terry model of all the results on the Elo scale (centred on 1500),
+        an incomplete game counting as a draw, so they don't depend on the order the games were played in.
+        The confidence interval of a rating, and of the difference of two ratings, comes from the model's covariance.
+        After min_rounds rounds the tournament stops early when the difference of every two entrants adjacent
+        in the standings is separated from zero at the confidence level.
+        Arguments:
+            edition - the game edition name, for example "Professions-Hi-Tech_v3"
+            entrants - a List of Entrant, at least 2
+            pairing - 'round_robin' or 'swiss'
+            total_points - the total points of each player's random success formula
+            game_parameters_type - 'test', 'prod' or 'custom'
+            max_turns - a game not won after this many turns (by all players) is a draw
+            workers - the number of worker processes, default is os.cpu_count(). If 1, games are played in this process.
+            seed - the base random seed
+            results_path - if not None, the JSON lines file results are appended to and resumed from
+            confidence - the confidence level of rating intervals and of the early stop
+    """
+    ELO_SCALE = 400 / math.log(10)      # Elo points per unit of the Bradley-Terry log-strength
+    ELO_BASE = 1500
+    PAIRINGS = ["round_robin", "swiss"]
+
+    def __init__(self, edition:str, entrants:List[Entrant], pairing:str="round_robin", total_points:int=60, game_parameters_type:str="test", \
+                 max_turns:int=600, workers:int|None=None, seed:int=0, results_path:str|None=None, confidence:float=0.95):
+        assert len(entrants) >= 2 and len(set([entrant.name for entrant in entrants])) == len(entrants)
+        assert pairing in Tournament.PAIRINGS
+        for entrant in entrants:
+            getattr(game.plugins, entrant.classname)     # raises AttributeError if there is no such plug-in
+        self._edition = edition
+        self._entrants = entrants
+        self._names = [entrant.name for entrant in entrants]
+        self._pairing = pairing
+        self._total_points = total_points
+        self._game_parameters_type = game_parameters_type
+        self._max_turns = max_turns
+        self._workers = os.cpu_count() if workers is None else workers
+        self._seed = seed
+        self._results_path = results_path
+        self._z = _normal_quantile(0.5 + confidence / 2)
+        self._results:Dict[int, MatchResult] = {}    # by game number
+        self._recorded:Dict[int, MatchResult] = {}   # the results file's results by game number, until they're replayed
+        if results_path is not None and os.path.exists(results_path):
+            with open(results_path, "r") as fp:
+                for line in fp:
+                    if len(line.strip()) > 0:
+                        result = MatchResult(**json.loads(line))
+                        self._recorded[result.game_number] = result
+        self._rounds = 0
+        self._games = 0         # the number of games scheduled so far
+
+    @property
+    def entrants(self) -> List[Entrant]:
+        return self._entrants
+
+    @property
+    def results(self) -> List[MatchResult]:
+        return [self._results[game_number] for game_number in sorted(self._results)]
+
+    @property
+    def rounds(self) -> int:
+        """The number of rounds played
+        """
+        return self._rounds
+
+    def run(self, max_rounds:int, min_rounds:int=2) -> Iterator[MatchResult]:
+        """Plays rounds until max_rounds have been played or, after min_rounds, the standings are separated.
+            Yields each MatchResult as it completes, including the results resumed from the results file.
+        """
+        pool = None
+        try:
+            while self._rounds < max_rounds:
+                jobs = []
+                for pair in self._pairs():
+                    seed = self._seed + self._games // 2
+                    for seats in [pair, pair[::-1]]:
+                        recorded = self._recorded.pop(self._games, None)
+                        if recorded is not None and recorded.entrants == [self._names[i] for i in seats] and recorded.seed == seed:
+                            self._results[recorded.game_number] = recorded
+                            yield recorded
+                        else:
+                            jobs.append(self._job(self._games, seed, seats))
+                        self._games += 1
+                if len(jobs) > 0 and self._workers > 1 and pool is None:
+                    pool = Pool(processes=self._workers, initializer=_init_worker, initargs=(self._edition, self._game_parameters_type))
+                for result in self._play(jobs, pool):
+                    self._add_result(result)
+                    yield result
+                self._rounds += 1
+                if self._rounds >= min_rounds and self.separated():
+                    break
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    def play(self, max_rounds:int, min_rounds:int=2) -> List[Dict]:
+        """Plays the tournament and returns the standings()
+        """
+        for _ in self.run(max_rounds, min_rounds):
+            pass
+        return self.standings()
+
+    def _pairs(self) -> List[Tuple[int, int]]:
+        """The pairings of the next round, as entrant indexes
+        """
+        if self._pairing == "round_robin":
+            return list(combinations(range(len(self._entrants)), 2))
+        #
+        # Swiss: pair down the standings, avoiding the previous round's opponent where possible. With an odd number, the last sits out.
+        #
+        ratings, _ = self.ratings()
+        order = sorted(range(len(self._entrants)), key=lambda i: (-ratings[i], self._names[i]))
+        previous = set([tuple(sorted(self._names.index(name) for name in result.entrants)) for result in self._results.values() \
+                        if result.round == self._rounds - 1])
+        pairs = []
+        while len(order) >= 2:
+            first = order.pop(0)
+            opponent = next((i for i in order if tuple(sorted((first, i))) not in previous), order[0])
+            order.remove(opponent)
+            pairs.append((first, opponent))
+        return pairs
+
+    def _job(self, game_number:int, seed:int, seats:Tuple[int, int]) -> Tuple[Dict, int, int, int, List[Dict]]:
+        settings = {"edition":self._edition, "total_points":self._total_points, "game_parameters_type":self._game_parameters_type, \
+                    "max_turns":self._max_turns}
+        return (settings, self._rounds, game_number, seed, [asdict(self._entrants[i]) for i in seats])
+
+    def _play(self, jobs:List[Tuple], pool) -> Iterator[MatchResult]:
+        if len(jobs) == 0:
+            return
+        if pool is None:
+            _init_worker(self._edition, self._game_parameters_type)
+            for job in jobs:
+                yield _play_game(job)
+        else:
+            yield from pool.imap_unordered(_play_game, jobs)
+
+    def _add_result(self, result:MatchResult):
+        self._results[result.game_number] = result
+        if self._results_path is not None:
+            with open(self._results_path, "a") as fp:
+                fp.write(json.dumps(asdict(result)) + "\n")
+
+    def ratings(self, ridge:float=0.01) -> Tuple[np.ndarray, np.ndarray]:
+        """The Bradley-Terry ratings of the entrants, in Elo points, and their covariance, fitted by Newton's method.
+            Games that raised an exception are left out. A small ridge penalty keeps the ratings finite when an entrant
+            has won or lost every game.
+            Returns: a 2-tuple of the ratings (entrants) and covariance (entrants, entrants) arrays
+        """
+        n = len(self._entrants)
+        scores = np.zeros((n, n))   # scores[i, j] is i's total score against j, 1 for a win and 0.5 for a draw
+        games = np.zeros((n, n))
+        for result in self._results.values():
+            if result.error is not None:
+                continue
+            i, j = [self._names.index(name) for name in result.entrants]
+            games[i, j] += 1
+            games[j, i] += 1
+            score = 0.5 if result.winner < 0 else float(result.winner == 0)
+            scores[i, j] += score
+            scores[j, i] += 1 - score
+        strengths = np.zeros(n)
+        for _ in range(50):
+            p = 1 / (1 + np.exp(strengths[None, :] - strengths[:, None]))       # p[i, j] the probability i beats j
+            gradient = (scores - games * p).sum(axis=1) - ridge * strengths
+            weights = games * p * (1 - p)
+            information = np.diag(weights.sum(axis=1)) - weights + ridge * np.eye(n)
+            step = np.linalg.solve(information, gradient)
+            strengths += step
+            if np.abs(step).max() < 1e-9:
+                break
+        p = 1 / (1 + np.exp(strengths[None, :] - strengths[:, None]))
+        weights = games * p * (1 - p)
+        covariance = np.linalg.inv(np.diag(weights.sum(axis=1)) - weights + ridge * np.eye(n))
+        centring = np.eye(n) - 1 / n       # only differences of strengths are identified, the ratings are centred
+        covariance = centring @ covariance @ centring
+        return Tournament.ELO_BASE + Tournament.ELO_SCALE * (strengths - strengths.mean()), Tournament.ELO_SCALE**2 * covariance
+
+    def standings(self) -> List[Dict]:
+        """The entrants best first, each a Dict of name, rating, interval (the half width of the rating's confidence interval),
+            games, score (wins + draws / 2) and separated (True if the rating is above the next entrant's at the confidence level)
+        """
+        ratings, covariance = self.ratings()
+        order = sorted(range(len(self._entrants)), key=lambda i: (-ratings[i], self._names[i]))
+        standings = []
+        for rank, i in enumerate(order):
+            games = [result for result in self._results.values() if result.error is None and self._names[i] in result.entrants]
+            score = sum([1.0 if result.winner >= 0 and result.entrants[result.winner] == self._names[i] else 0.5 if result.winner < 0 else 0.0 \
+                         for result in games])
+            separated = rank + 1 < len(order) and self._separated(ratings, covariance, i, order[rank + 1])
+            standings.append({"name":self._names[i], "rating":round(float(ratings[i]), 1), \
+                              "interval":round(float(self._z * math.sqrt(covariance[i, i])), 1), \
+                              "games":len(games), "score":score, "separated":separated})
+        return standings
+
+    def separated(self) -> bool:
+        """True if every entrant's rating is above the next entrant's in the standings at the confidence level
+        """
+        ratings, covariance = self.ratings()
+        order = sorted(range(len(self._entrants)), key=lambda i: (-ratings[i], self._names[i]))
+        return all([self._separated(ratings, covariance, i, j) for i,j in zip(order, order[1:])])
+
+    def _separated(self, ratings:np.ndarray, covariance:np.ndarray, i:int, j:int) -> bool:
+        variance = covariance[i, i] + covariance[j, j] - 2 * covariance[i, j]
+        return bool(ratings[i] - ratings[j] > self._z * math.sqrt(max(variance, 0.0)))
+
+def _normal_quantile(p:float) -> float:
+    """The standard normal quantile, by bisection of math.erf
+    """
+    low, high = -10.0, 10.0
+    for _ in range(100):
+        middle = (low + high) / 2
+        if 0.5 * (1 + math.erf(middle / math.sqrt(2))) < p:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+def _init_worker(edition:str, game_parameters_type:str):
+    """Worker process initializer: load the edition once and silence console output.
+    """
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+    EditionTemplate.get_template(edition, GameParametersType[game_parameters_type.upper()])
+
+def _play_game(job:Tuple[Dict, int, int, int, List[Dict]]) -> MatchResult:
+    """Plays a single tournament game to completion or settings["max_turns"], each seat played by its entrant's plug-in
+        Arguments:
+            job - a 5-tuple of (settings dict, round, game number, random seed, the entrants by seat as dicts)
+        Returns: the MatchResult
+    """
+    settings, round_number, game_number, seed, entrants = job
+    result = MatchResult(round=round_number, game_number=game_number, seed=seed, entrants=[entrant["name"] for entrant in entrants])
+    edition = settings["edition"]
+    start = time.perf_counter()
+    engine = CareersGameEngine(loglevel='error', installationId='tournament', edition=edition, headless=True)
+    engine.history_window = None
+    plugins = []
+    try:
+        engine.create(edition, 'tournament', 'points', settings["total_points"], settings["game_parameters_type"], seed=seed)
+        careers_game = engine.careersGame
+        for seat, entrant in enumerate(entrants):
+            plugin = getattr(game.plugins, entrant["classname"])(careers_game)
+            plugin.configure(dict(entrant["settings"], players=[seat]))
+            plugins.append(plugin)
+        careers_game.plugins["turn"] = plugins
+
+        for pn in range(len(entrants)):
+            sf = GameUtils.get_random_formula(settings["total_points"], careers_game.random)
+            name = f"CP_{pn+1}"
+            engine.execute_command(f"add player {name} {name} {name}_{game_number} {name}@tournament {sf.money} {sf.stars} {sf.hearts} computer", None)
+        engine.execute_command("start", None)
+        engine.automatic_run = True
+
+        game_state = engine.game_state
+        while game_state.turns < settings["max_turns"]:
+            player = game_state.current_player
+            cmd_result = engine.execute_command("take_turn", player)
+            if cmd_result.return_code != CommandResult.TERMINATE:
+                cmd_result = engine.execute_command("next", player)
+            if cmd_result.return_code == CommandResult.TERMINATE:
+                break
+        if game_state.game_complete:
+            result.winner = game_state.winning_player.number
+        result.turns = game_state.turns
+    except Exception as ex:
+        result.error = str(ex)
+        logging.error(f"tournament game {game_number} seed {seed}: {str(ex)}")
+    finally:
+        for plugin in plugins:
+            if hasattr(plugin, "close"):
+                plugin.close()
+        engine.discard()
+    result.elapsed = time.perf_counter() - start
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Rate strategy plug-ins in a tournament of two-player computer games")
+    parser.add_argument("entrants", help="strategy levels, for example dumb basic smart", nargs="*", default=["dumb", "basic", "smart"])
+    parser.add_argument("--entrants_file", help="a JSON file of a List of entrants, each with name, classname and settings", type=str, default=None)
+    parser.add_argument("--pairing", help="round_robin or swiss", type=str, choices=Tournament.PAIRINGS, default="round_robin")
+    parser.add_argument("--rounds", help="the maximum number of rounds", type=int, default=100)
+    parser.add_argument("--min_rounds", help="the number of rounds before the tournament can stop early", type=int, default=5)
+    parser.add_argument("--points", help="success formula total points", type=int, default=60)
+    parser.add_argument("--params", help="game parameters type: 'test', 'prod' or 'custom'", type=str, default="test")
+    parser.add_argument("--maxturns", help="a game not won after this many turns is a draw", type=int, default=600)
+    parser.add_argument("--workers", help="the number of worker processes, default is the number of cores", type=int, default=None)
+    parser.add_argument("--seed", help="base random seed", type=int, default=0)
+    parser.add_argument("--results", help="the JSON lines results file to resume from and append to", type=str, default=None)
+    parser.add_argument("--confidence", help="the confidence level of rating intervals and the early stop", type=float, default=0.95)
+    parser.add_argument("--edition", help="game edition", type=str, default="Professions-Hi-Tech_v3")
+    args = parser.parse_args()
+    ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    if args.entrants_file is not None:
+        with open(args.entrants_file, "r") as fp:
+            entrants = [Entrant(**entrant) for entrant in json.load(fp)]
+    else:
+        entrants = [Entrant.from_level(level) for level in args.entrants]
+    tournament = Tournament(args.edition, entrants, pairing=args.pairing, total_points=args.points, game_parameters_type=args.params, \
+                            max_turns=args.maxturns, workers=args.workers, seed=args.seed, results_path=args.results, confidence=args.confidence)
+    start = time.perf_counter()
+    standings = tournament.play(args.rounds, args.min_rounds)
+    for standing in standings:
+        print(f'{standing["name"]:>20} {standing["rating"]:7.1f} +/- {standing["interval"]:5.1f}  score {standing["score"]:6.1f} / {standing["games"]:<5}' + \
+              (' separated' if standing["separated"] else ''))
+    print(f'{tournament.rounds} rounds, {len(tournament.results)} games, {time.perf_counter() - start:.1f} sec')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+'''
+Created on Oct 18, 2026
+
+@author: agent
+'''
+
+from game.turnHistory import TurnHistory
+from typing import Dict, List
+import json, os
+import numpy as np
+
+class TurnDataset(object):
+    """A columnar dataset of turns on disk, for training on more turns than fit in memory,
+        for example every turn of a large batch of simulated games.
+        Each column is a file of int32 values in the dataset folder: the game_number and the TurnHistory.COLUMNS.
+        Turns are appended a game at a time, and arrays() maps the columns into memory read-only, so only the
+        pages that are used are read.
+        Arguments:
+            folder - the dataset folder, created if it doesn't exist. An existing dataset is appended to.
+    """
+    COLUMNS = ["game_number"] + TurnHistory.COLUMNS
+    DTYPE = TurnHistory.DTYPE
+
+    def __init__(self, folder:str):
+        self._folder = folder
+        os.makedirs(folder, exist_ok=True)
+        header = os.path.join(folder, "dataset.json")
+        if not os.path.exists(header):
+            with open(header, "w") as fp:
+                json.dump({"columns":TurnDataset.COLUMNS, "dtype":np.dtype(TurnDataset.DTYPE).name}, fp)
+
+    @property
+    def folder(self) -> str:
+        return self._folder
+
+    def _path(self, column:str) -> str:
+        return os.path.join(self._folder, f"{column}.bin")
+
+    def __len__(self) -> int:
+        """The number of turns. The turns of an interrupted append are not counted past the shortest column.
+        """
+        itemsize = np.dtype(TurnDataset.DTYPE).itemsize
+        return min([os.path.getsize(self._path(column)) // itemsize if os.path.exists(self._path(column)) else 0 \
+                    for column in TurnDataset.COLUMNS])
+
+    def append(self, arrays:Dict[str, np.ndarray], game_number:int=None) -> int:
+        """Appends turns given as arrays by column name, like TurnHistory.to_numpy().
+            Arguments:
+                arrays - an array for each of the TurnHistory.COLUMNS, and optionally "game_number"
+                game_number - the game_number of turns without a "game_number" array
+            Returns: the number of turns appended
+        """
+        count = len(arrays["turn_number"])
+        if "game_number" not in arrays:
+            arrays = {**arrays, "game_number":np.full(count, -1 if game_number is None else game_number, dtype=TurnDataset.DTYPE)}
+        #
+        # columns longer than the others, by an interrupted append, are cut back so the turns appended line up
+        #
+        size = len(self) * np.dtype(TurnDataset.DTYPE).itemsize
+        for column in TurnDataset.COLUMNS:
+            if os.path.exists(self._path(column)) and os.path.getsize(self._path(column)) > size:
+                os.truncate(self._path(column), size)
+        for column in TurnDataset.COLUMNS:
+            with open(self._path(column), "ab") as fp:
+                np.asarray(arrays[column], dtype=TurnDataset.DTYPE).tofile(fp)
+        return count
+
+    def append_history(self, turn_histories:List[TurnHistory], game_number:int) -> int:
+        """Appends the turns in memory of each TurnHistory of a game
+        """
+        return sum([self.append(turn_history.to_numpy(), game_number) for turn_history in turn_histories])
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Each column as a read-only memory-mapped array, by column name
+        """
+        count = len(self)
+        if count == 0:
+            return {column:np.zeros(0, dtype=TurnDataset.DTYPE) for column in TurnDataset.COLUMNS}
+        return {column:np.memmap(self._path(column), dtype=TurnDataset.DTYPE, mode="r", shape=(count,)) for column in TurnDataset.COLUMNS}
+
+    def to_npz(self, filename:str, compressed:bool=True):
+        """Writes the dataset to a NumPy .npz file, for a dataset that fits in memory
+        """
+        arrays = self.arrays()
+        if compressed:
+            np.savez_compressed(filename, **arrays)
+        else:
+            np.savez(filename, **arrays)
@@ -8,8 +8,9 @@ from game.careersObject import CareersObject
 from game.successFormula import SuccessFormula
 from game.gameConstants import GameConstants
 from dataclasses import dataclass, field
-from typing import List, Dict
-import json, logging
+from typing import Dict, Iterator, List, Tuple
+import itertools, json, logging
+import numpy as np
 
 @dataclass
 class Turn():
@@ -77,10 +78,25 @@ class Turn():
 
 class TurnHistory(CareersObject):
     """ History of a player's turn, including command(s), and outcomes.
+        The turns are stored by column: one int32 array per Turn field, the COLUMNS, in a (columns, turns) block
+        that doubles in size as turns are added, with each turn's commands in a separate list.
+        to_numpy() exports the columns as NumPy arrays without copying, and to_npz() writes them to a file.
+        get_turn() and turns build Turn objects from the columns.
+        The history in memory can be a window of the most recent turns: evict() removes the oldest turns,
+        which the engine appends to the game's GameStore, and page() reads them back a page at a time.
+        Turn numbers are unchanged by eviction, offset is the number of turns evicted.
+        A turn once complete is never changed in place, even by evict(), so snapshot() shares the columns and lists
+        with the history and copies only the latest turn's commands and player_info.
     """
     
     BEFORE_KEY = "info_before"
     AFTER_KEY = "info_after"
+    WINDOW = 20         # the default number of turns kept in memory
+    COLUMNS = ["player_number", "turn_number", "outcome", "points", "opportunities", "experiences", "sick", "unemployed", \
+               "degrees", "occupations", "salary", "opportunity_card_value", "experience_card_value", "cash", "stars", "hearts", \
+               "can_retire", "cash_goal", "hearts_goal", "stars_goal"]
+    DTYPE = np.int32
+    CAPACITY = 16       # the initial number of turns the columns have room for
 
     def __init__(self, player_number:int, turn_outcome_parameters:dict, success_formula:SuccessFormula=None):
         """
@@ -89,7 +105,9 @@ class TurnHistory(CareersObject):
         self._player_number = player_number
         self._turn_number = 0       # first turn has turn_number == 0
         self._turn_outcome_parameters = turn_outcome_parameters
-        self._turns:List[Turn] = list()
+        self._values = np.zeros((len(TurnHistory.COLUMNS), TurnHistory.CAPACITY), dtype=TurnHistory.DTYPE)
+        self._size = 0              # the number of turns in memory, the used part of _values
+        self._commands:List[List[str]] = list()     # the commands of each turn in memory
         # player_info is a List[dict] with keys "info_before" and "info_after"
         # info_before is the player's info at the start of the turn
         # info_after is the player's info after the turn is completed
@@ -97,7 +115,41 @@ class TurnHistory(CareersObject):
         # The index of the list is the corresponding turn number.
         self._player_info:List[Dict] = list()
         self._success_formula = success_formula
+        self._offset = 0            # the number of turns (and player_info) evicted
+        self._shared = False        # True if the columns are a snapshot's, copied before a turn is added
+        self._column_index = TurnHistory.column_index()
+        self._weights = TurnHistory.outcome_weights(turn_outcome_parameters, self._column_index)
         
+    @staticmethod
+    def column_index() -> Dict[str, int]:
+        """The index of each column by name, and by the names diff_info() uses for the stars and hearts columns,
+            which depend on the edition's point icons, for example "Muons" for stars.
+        """
+        index = {name:i for i, name in enumerate(TurnHistory.COLUMNS)}
+        for icon, column in [(GameConstants.STAR, "stars"), (GameConstants.HEART, "hearts")]:
+            index.setdefault(f"{icon}s", index[column])
+            index.setdefault(f"{icon}s_goal", index[f"{column}_goal"])
+        return index
+    
+    @staticmethod
+    def outcome_weights(turn_outcome_parameters:Dict, column_index:Dict[str, int]=None) -> np.ndarray:
+        """The turn outcome parameters as a vector of weights over the COLUMNS, 0 for a column without a parameter.
+        """
+        column_index = TurnHistory.column_index() if column_index is None else column_index
+        weights = np.zeros(len(TurnHistory.COLUMNS), dtype=np.float64)
+        for key, weight in turn_outcome_parameters.items():
+            if key in column_index:
+                weights[column_index[key]] = weight
+        return weights
+    
+    @staticmethod
+    def outcome(values:np.ndarray, weights:np.ndarray) -> np.ndarray:
+        """The outcome of turns given their column values, a (columns,) vector or a (columns, turns) block.
+            Each weighted value is truncated to an int before they're summed.
+        """
+        weights = weights if values.ndim == 1 else weights[:, np.newaxis]
+        return np.trunc(weights * values).sum(axis=0).astype(np.int64)
+    
     @property
     def player_number(self) -> int:
         return self._player_number
@@ -119,12 +171,26 @@ class TurnHistory(CareersObject):
     
     @property
     def turns(self) ->List[Turn] :
-        return self._turns
+        """The turns in memory, built from the columns. A Turn's commands are the turn's own list.
+        """
+        return [self.get_turn(index) for index in range(self._size)]
+    
+    @property
+    def command_count(self) -> int:
+        """The number of commands of the turns in memory
+        """
+        return sum(len(commands) for commands in self._commands)
     
     @property
     def player_info(self) ->List[Dict]:
         return self._player_info
     
+    @property
+    def offset(self) -> int:
+        """The number of the oldest turns evicted from memory
+        """
+        return self._offset
+    
     @property
     def success_formula(self) ->SuccessFormula:
         return self._success_formula
@@ -137,7 +203,7 @@ class TurnHistory(CareersObject):
         assert key is not None 
         if key==TurnHistory.BEFORE_KEY or key==TurnHistory.AFTER_KEY:
             i = len(self._player_info) - 1
-            if i==turn_number:
+            if i + self._offset == turn_number:
                 self._player_info[i].update( {key:player_info })
             else:
                 self._player_info.append({key:player_info })
@@ -145,10 +211,9 @@ class TurnHistory(CareersObject):
             return NotImplemented
         
     def create_turn(self, turn_number) ->Turn:
-        """Create and add a new Turn object from the player_info BEFORE and AFTER deltas
-            After creating the Turn, calculate the outcome.
+        """Create and add a new Turn from the player_info BEFORE and AFTER deltas, with its outcome.
         """
-        player_turn_info = self._player_info[turn_number]
+        player_turn_info = self._player_info[turn_number - self._offset]
         before_info = None
         after_info = None
         
@@ -168,35 +233,62 @@ class TurnHistory(CareersObject):
         before_info = after_info if (before_info is None and after_info is not None) else before_info
         after_info = before_info if (after_info is None and before_info is not None) else after_info
         
-        turn = Turn(self._player_number, turn_number)
-        outcome = self._turn_outcome(turn, before_info, after_info)
-        turn.outcome = outcome
-        self.add_turn(turn)
-        return turn
+        index = self._append(self._player_number, turn_number, [])
+        self._turn_outcome(index, before_info, after_info)
+        return self.get_turn(index)
     
     def get_player_info(self, turn_number:int) -> Dict:
-        return self._player_info[turn_number] if turn_number < len(self._player_info) else {}
+        index = turn_number - self._offset
+        return self._player_info[index] if 0 <= index < len(self._player_info) else {}
     
     def add_turn(self, turn:Turn) ->int:
-        self._turns.append(turn)
-        return len(self._turns)
+        index = self._append(turn.player_number, turn.turn_number, turn.commands)
+        self._values[2:, index] = [getattr(turn, name) for name in TurnHistory.COLUMNS[2:]]
+        return self._size
     
     def get_turn(self, index:int=-1) ->Turn :
-        return self._turns[index]
+        index = index + self._size if index < 0 else index
+        if index < 0 or index >= self._size:
+            raise IndexError("turn index out of range")
+        values = self._values[:, index].tolist()
+        return Turn(values[0], values[1], self._commands[index], *values[2:])
+    
+    def add_command(self, command:str):
+        """Adds a command to the latest turn
+        """
+        self._commands[-1].append(command)
+    
+    def _append(self, player_number:int, turn_number:int, commands:List[str]) -> int:
+        """Adds a turn of zeros and returns its index, growing the columns if they're full.
+        """
+        if self._size == self._values.shape[1]:
+            values = np.zeros((self._values.shape[0], 2 * self._size), dtype=TurnHistory.DTYPE)
+            values[:, :self._size] = self._values
+            self._values = values
+            self._shared = False
+        elif self._shared:      # a restored snapshot's columns, another snapshot may have turns past this one
+            self._values = self._values.copy()
+            self._shared = False
+        index = self._size
+        self._values[:, index] = 0
+        self._values[0, index] = player_number
+        self._values[1, index] = turn_number
+        self._commands.append(commands)
+        self._size += 1
+        return index
 
-    def _turn_outcome(self, turn, before_info, after_info) -> int:
+    def _turn_outcome(self, index:int, before_info, after_info) -> int:
         """
-            Compute and save the outcome of a turn
+            Compute and save the changes and outcome of the turn at index
         """
-        outcome = 0
         info_diff = self.diff_info(before_info, after_info)
-        for key in info_diff.keys():
-            diff = info_diff[key]
-            outcome += int(self._turn_outcome_parameters[key] * diff)
-            exec_string = f"turn.{key} = {diff}"
-            #logging.debug(f"exec: {exec_string}")
-            exec(exec_string)
-        
+        values = self._values[:, index]
+        for key, diff in info_diff.items():
+            column = self._column_index.get(key)
+            if column is not None:
+                values[column] = diff
+        outcome = int(TurnHistory.outcome(values, self._weights))
+        values[TurnHistory.COLUMNS.index("outcome")] = outcome
         return outcome
     
     def diff_info(self, before_info:Dict, after_info:Dict) ->Dict:
@@ -301,13 +393,111 @@ class TurnHistory(CareersObject):
         return info_diff
             
     def size(self) ->int:
-        return len(self._turns)
+        """The number of turns, including those evicted
+        """
+        return self._size + self._offset
+    
+    def evict(self, keep:int) -> List[Dict]:
+        """Removes the oldest turns from memory, keeping the most recent keep turns.
+            Only the game's end evicts every turn (keep is 0), as the latest turn gets the commands of the turn in progress.
+            Returns: a record dict of each evicted turn, oldest first, with the "turn" and its "player_info"
+        """
+        count = self._size if keep == 0 else min(self._size, len(self._player_info)) - keep
+        if count <= 0:
+            return []
+        records = [{"turn":turn.to_dict()["turn"], "player_info":info} \
+                   for turn, info in itertools.zip_longest(self.turns[:count], self._player_info[:count], fillvalue={})]
+        #
+        # new columns and lists rather than changing them in place, a snapshot may share them
+        #
+        values = np.zeros_like(self._values)
+        values[:, :self._size - count] = self._values[:, count:self._size]
+        self._values = values
+        self._shared = False
+        self._size -= count
+        self._commands = self._commands[count:]
+        self._player_info = self._player_info[count:]
+        self._offset += count
+        return records
+    
+    def snapshot(self) -> Tuple:
+        """An opaque token of the history as it is now, for restore(). The columns and the lists of the complete turns
+            are shared with the history, only the latest turn's commands and player_info, which can still change, are copied.
+        """
+        last_commands = list(self._commands[-1]) if self._size > 0 else None
+        last_info = dict(self._player_info[-1]) if len(self._player_info) > 0 else None
+        return (self._values, self._size, self._offset, self._turn_number, self._commands, last_commands, \
+                self._player_info, len(self._player_info), last_info, self._success_formula)
+    
+    def restore(self, token:Tuple):
+        """Restores the history to a snapshot(). The turns added since are dropped, and the turns evicted since are back in memory.
+        """
+        self._values, self._size, self._offset, self._turn_number, commands, last_commands, \
+            player_info, ninfo, last_info, self._success_formula = token
+        self._shared = True
+        self._commands = commands[:self._size - 1] + [list(last_commands)] if last_commands is not None else []
+        self._player_info = player_info[:ninfo - 1] + [dict(last_info)] if last_info is not None else []
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_shared', False)      # histories pickled before snapshots
+    
+    def page(self, stored:Iterator[Dict], page:int, page_size:int) -> Dict:
+        """A page of the history, oldest turns first: the evicted turns, then the turns in memory.
+            Arguments:
+                stored - the evicted turn records, oldest first, for example from GameStore.read_turns(). Only what's needed is read.
+                page - the page number, 0 is the oldest turns
+                page_size - the number of turns per page
+            Returns: a dict like to_dict() of the page's turns, with the "page" and "page_size". A page past the end has no turns.
+        """
+        start = page * page_size
+        records = []
+        nstored = 0
+        for record in itertools.islice(stored, start + page_size):
+            if nstored >= start:
+                records.append(record)
+            nstored += 1
+        if len(records) < page_size:
+            memory_start = max(0, start - nstored)
+            for index in range(memory_start, min(self._size, memory_start + page_size - len(records))):
+                records.append({"turn":self.get_turn(index).to_dict()["turn"], "player_info":self.get_player_info(index + self._offset)})
+        hist = {"turns":[{"turn":record["turn"]} for record in records], "player_info":[record["player_info"] for record in records]}
+        hist.update({"page":page, "page_size":page_size})
+        return hist
+    
+    def outcomes(self, turn_outcome_parameters:Dict=None) -> np.ndarray:
+        """The outcome of each turn in memory, computed from its column values in one vector operation.
+            Arguments:
+                turn_outcome_parameters - the weights to use, default is the game's. Others can be used to relabel turns for training.
+        """
+        weights = self._weights if turn_outcome_parameters is None else TurnHistory.outcome_weights(turn_outcome_parameters, self._column_index)
+        return TurnHistory.outcome(self._values[:, :self._size], weights)
+    
+    @property
+    def values(self) -> np.ndarray:
+        """The (columns, turns) block of the turns in memory, a view of the columns.
+        """
+        return self._values[:, :self._size]
+    
+    def to_numpy(self) -> Dict[str, np.ndarray]:
+        """The turns in memory as a dict of NumPy arrays by column name. The arrays are views of the columns, not copies,
+            so they change if a turn is evicted: copy them to keep them.
+        """
+        return {name:self._values[i, :self._size] for i, name in enumerate(TurnHistory.COLUMNS)}
+    
+    def to_npz(self, filename:str, compressed:bool=False):
+        """Writes the turns in memory to a NumPy .npz file with an array for each column.
+        """
+        if compressed:
+            np.savez_compressed(filename, **self.to_numpy())
+        else:
+            np.savez(filename, **self.to_numpy())
     
     def to_dict(self) ->Dict:
         hist = {"turns" : list(), "player_info" : list()}
         if self.size()==0:
             return hist
-        for turn in self._turns:
+        for turn in self.turns:
             hist["turns"].append(turn.to_dict())
         for player_info in self._player_info:
             hist["player_info"].append(player_info)
@@ -317,4 +507,3 @@ class TurnHistory(CareersObject):
         """Returns a JSON formatted string of all the Turns in the history.
         """
         return json.dumps(self.to_dict(), indent=1)
-    
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""Runs the commands for each game one at a time, in arrival order.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from threading import Condition, Lock
+from typing import Any, Callable, Dict
+
+class GameBusyError(Exception):
+    """Raised when a game has too many commands waiting, or a command waited too long for its turn"""
+
+    def __init__(self, gameId: str, message: str):
+        super().__init__(message)
+        self.gameId = gameId
+
+class GameActor(object):
+    """
+        The command queue of one game. A command waits in the queue until the commands ahead of it are done,
+        then runs on the thread that submitted it. Only the head of the queue runs, so a game's commands never overlap.
+    """
+
+    def __init__(self, gameId: str):
+        self.gameId = gameId
+        self.condition = Condition()
+        self.queue: deque = deque()     # a token for each waiting or running command, the running command first
+        self.executed = 0
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+class GameActors(object):
+    """
+        The GameActor of each game with commands in flight, so commands for one game run strictly in order
+        while different games proceed in parallel.
+        Each queue has a bounded depth: a command for a game that already has maxDepth commands waiting or running
+        is refused with GameBusyError, which applies backpressure to the clients of a hot game.
+        An actor is dropped when its queue is empty.
+        Arguments:
+            maxDepth - the most commands that can be waiting or running for a game
+            timeout - the most seconds a command waits for its turn, None to wait indefinitely
+    """
+
+    def __init__(self, maxDepth: int = 16, timeout: float = 30):
+        self.maxDepth = maxDepth
+        self.timeout = timeout
+        self.actors: Dict[str, GameActor] = {}
+        self.lock = Lock()
+        self.executed = 0
+        self.rejected = 0
+        self.timedOut = 0
+        self.maxQueued = 0
+
+    @contextmanager
+    def turn(self, gameId: str):
+        """
+            A context manager that waits for a game's turn and holds it.
+            Enter and exit can be on different threads, as they are for a FastAPI dependency.
+        """
+        token = object()
+        with self.lock:
+            actor = self.actors.get(gameId)
+            if actor is None:
+                actor = GameActor(gameId)
+                self.actors[gameId] = actor
+            with actor.condition:
+                if len(actor.queue) >= self.maxDepth:
+                    self.rejected += 1
+                    raise GameBusyError(gameId, f"Game {gameId} has {len(actor.queue)} commands in flight, try again")
+                actor.queue.append(token)
+                self.maxQueued = max(self.maxQueued, len(actor.queue))
+
+        with actor.condition:
+            ready = actor.condition.wait_for(lambda: actor.queue[0] is token, self.timeout)
+            if not ready:
+                actor.queue.remove(token)
+                actor.condition.notify_all()
+        if not ready:
+            with self.lock:
+                self.timedOut += 1
+            self._release(gameId, actor)    # not holding the actor's condition: the lock is always taken first
+            raise GameBusyError(gameId, f"Timed out waiting for game {gameId}")
+        try:
+            yield actor
+        finally:
+            with actor.condition:
+                actor.queue.popleft()
+                actor.executed += 1
+                actor.condition.notify_all()
+            with self.lock:
+                self.executed += 1
+            self._release(gameId, actor)
+
+    def execute(self, gameId: str, command: Callable, *args, **kwargs) -> Any:
+        """Runs command(*args, **kwargs) in its turn for a game and returns the result"""
+        with self.turn(gameId):
+            return command(*args, **kwargs)
+
+    def _release(self, gameId: str, actor: GameActor):
+        with self.lock:
+            if len(actor.queue) == 0 and self.actors.get(gameId) is actor:
+                del self.actors[gameId]
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"games": len(self.actors), "queued": sum([len(actor) for actor in self.actors.values()]),
+                    "maxDepth": self.maxDepth, "maxQueued": self.maxQueued, "executed": self.executed, "rejected": self.rejected,
+                    "timedOut": self.timedOut}
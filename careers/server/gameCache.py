@@ -0,0 +1,232 @@
+"""A bounded in-memory cache of the game engines a CareersGameManager is serving.
+"""
+
+from collections import OrderedDict
+from threading import Condition, Lock
+from typing import Any, Callable, Dict
+import logging
+import pickle
+import time
+
+from game.careersGameEngine import CareersGameEngine
+
+class CachedGame(object):
+    """A cache entry: the engine plus its bookkeeping"""
+
+    def __init__(self, engine: CareersGameEngine, size: int):
+        self.engine = engine
+        self.size = size
+        self.dirty = False
+        self.pins = 0
+        self.lastAccess = time.monotonic()
+
+class GameCache(object):
+    """
+        Holds the CareersGameEngine of recently used games, least recently used first.
+        A game is loaded on first touch and evicted when the cache has more than maxGames games,
+        when their estimated size exceeds maxBytes, or when it hasn't been used for idleTimeout seconds.
+        An evicted game is hibernated: if it's dirty (changed since it was loaded or last written)
+        it's written back before it's dropped, and it's loaded again on its next touch, after the write-back is done.
+        A game's size is estimated when it's added and when it's written back, not on every change,
+        and never while holding the lock, as pickling a game takes a while.
+        A game is pinned while a command is in flight and a pinned game is never evicted.
+        Arguments:
+            loader - loader(gameId) returns the CareersGameEngine of a game that isn't cached, or None
+            writer - writer(gameId, engine) writes back the state of a dirty game
+            maxGames - the maximum number of cached games
+            maxBytes - the memory budget, the total estimated size of the cached games
+            idleTimeout - seconds after which an unused game is evicted, 0 or None for no timeout
+    """
+
+    def __init__(self, loader: Callable[[str], CareersGameEngine], writer: Callable[[str, CareersGameEngine], None],
+                 maxGames: int = 1000, maxBytes: int = 256 * 1024 * 1024, idleTimeout: float = 3600):
+        self.loader = loader
+        self.writer = writer
+        self.maxGames = maxGames
+        self.maxBytes = maxBytes
+        self.idleTimeout = idleTimeout
+        self.entries: OrderedDict[str, CachedGame] = OrderedDict()
+        self.hibernating: Dict[str, CareersGameEngine] = {}     # evicted games being written back
+        self.lock = Lock()
+        self.writtenBack = Condition(self.lock)     # notified when a hibernating game's write-back is done
+        self.totalBytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writeBacks = 0
+
+    def __contains__(self, gameId: str) -> bool:
+        return gameId in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def estimateSize(engine: CareersGameEngine) -> int:
+        """The size of the pickled game, a fair estimate of its memory use"""
+        try:
+            return len(pickle.dumps(engine.careersGame))
+        except Exception:
+            return 0
+
+    def get(self, gameId: str, pin: bool = False) -> CareersGameEngine | None:
+        """
+            Gets the engine of a game, loading it if it isn't cached.
+            If pin is True the game is pinned, call unpin() when done with it.
+        """
+        with self.lock:
+            #
+            # a game being written back is still being read, and its stored state isn't written yet,
+            # so wait for the write-back before handing it out or loading it
+            #
+            self.writtenBack.wait_for(lambda: gameId not in self.hibernating)
+            entry = self.entries.get(gameId)
+            if entry is not None:
+                self.hits += 1
+                self._touch(gameId, entry, pin)
+                return entry.engine
+            self.misses += 1
+
+        engine = self.loader(gameId)    # not holding the lock, so other games aren't held up by the load
+        if engine is None:
+            return None
+        size = GameCache.estimateSize(engine)
+        with self.lock:
+            entry = self.entries.get(gameId)
+            if entry is None:           # another request may have loaded it meanwhile
+                entry = self._add(gameId, engine, size)
+            self._touch(gameId, entry, pin)
+            evicted = self._evict()
+        self._writeBack(evicted)
+        return entry.engine
+
+    def put(self, gameId: str, engine: CareersGameEngine, dirty: bool = False):
+        """Adds a new game, for example one just created"""
+        size = GameCache.estimateSize(engine)
+        with self.lock:
+            entry = self._add(gameId, engine, size)
+            entry.dirty = dirty
+            entry.lastAccess = time.monotonic()
+            evicted = self._evict()
+        self._writeBack(evicted)
+
+    def pin(self, gameId: str) -> CareersGameEngine | None:
+        """Gets a game and pins it for the duration of a command"""
+        return self.get(gameId, pin=True)
+
+    def unpin(self, gameId: str):
+        with self.lock:
+            entry = self.entries.get(gameId)
+            if entry is not None and entry.pins > 0:
+                entry.pins -= 1
+                self._touch(gameId, entry, False)
+            evicted = self._evict()
+        self._writeBack(evicted)
+
+    def markDirty(self, gameId: str):
+        """Marks a game as changed. Its state is written back when it's evicted or flushed, and its size estimated again then."""
+        with self.lock:
+            entry = self.entries.get(gameId)
+            if entry is not None:
+                entry.dirty = True
+
+    def isDirty(self, gameId: str) -> bool:
+        entry = self.entries.get(gameId)
+        return entry is not None and entry.dirty
+
+    def flush(self, gameId: str = None):
+        """Writes back a dirty game, or all dirty games if gameId is None. The games stay cached."""
+        with self.lock:
+            ids = list(self.entries.keys()) if gameId is None else [gameId]
+            dirty = []
+            for id in ids:
+                entry = self.entries.get(id)
+                if entry is not None and entry.dirty:
+                    entry.dirty = False
+                    dirty.append((id, entry.engine))
+        self._writeBack(dirty)
+
+    def evictIdle(self):
+        """Evicts the games that haven't been used for idleTimeout seconds"""
+        with self.lock:
+            evicted = self._evict()
+        self._writeBack(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        """The cache counters"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"games": len(self.entries), "bytes": self.totalBytes, "maxGames": self.maxGames, "maxBytes": self.maxBytes,
+                    "hits": self.hits, "misses": self.misses, "hitRate": self.hits / lookups if lookups > 0 else 0.0,
+                    "evictions": self.evictions, "writeBacks": self.writeBacks,
+                    "dirty": len([entry for entry in self.entries.values() if entry.dirty]),
+                    "pinned": len([entry for entry in self.entries.values() if entry.pins > 0])}
+
+    def _add(self, gameId: str, engine: CareersGameEngine, size: int) -> CachedGame:
+        """Adds or replaces an entry of the estimated size. The caller holds the lock."""
+        old = self.entries.pop(gameId, None)
+        if old is not None:
+            self.totalBytes -= old.size
+        entry = CachedGame(engine, size)
+        self.entries[gameId] = entry
+        self.totalBytes += entry.size
+        return entry
+
+    def _touch(self, gameId: str, entry: CachedGame, pin: bool):
+        entry.lastAccess = time.monotonic()
+        if pin:
+            entry.pins += 1
+        self.entries.move_to_end(gameId)
+
+    def _evict(self) -> list:
+        """
+            Removes idle games, then least recently used games until the cache is within its limits.
+            The caller holds the lock.
+            Returns: a list of (gameId, engine) of the evicted dirty games, to write back after releasing the lock
+        """
+        now = time.monotonic()
+        count = len(self.entries)
+        totalBytes = self.totalBytes
+        evicted = []
+        for gameId, entry in self.entries.items():
+            over = count > self.maxGames or totalBytes > self.maxBytes
+            idle = self.idleTimeout and now - entry.lastAccess > self.idleTimeout
+            if not over and not idle:
+                break           # entries are in order of last access, so the rest are more recent
+            if entry.pins == 0:
+                evicted.append(gameId)
+                count -= 1
+                totalBytes -= entry.size
+        dirty = []
+        for gameId in evicted:
+            entry = self.entries.pop(gameId)
+            self.totalBytes -= entry.size
+            self.evictions += 1
+            if entry.dirty:
+                dirty.append((gameId, entry.engine))
+                self.hibernating[gameId] = entry.engine
+        return dirty
+
+    def _writeBack(self, games: list):
+        for gameId, engine in games:
+            try:
+                self.writer(gameId, engine)
+                size = GameCache.estimateSize(engine) if gameId not in self.hibernating else 0
+                with self.lock:
+                    self.writeBacks += 1
+                    self.hibernating.pop(gameId, None)
+                    entry = self.entries.get(gameId)
+                    if entry is not None and entry.engine is engine:      # a flushed game stays cached
+                        self.totalBytes += size - entry.size
+                        entry.size = size
+                    self.writtenBack.notify_all()
+            except Exception as ex:
+                logging.error(f"GameCache could not write back game {gameId}: {str(ex)}")
+                size = GameCache.estimateSize(engine)
+                with self.lock:         # keep the game, still dirty, so the write is retried
+                    entry = self.entries.get(gameId)
+                    if entry is None:
+                        entry = self._add(gameId, engine, size)
+                    entry.dirty = True
+                    self.hibernating.pop(gameId, None)
+                    self.writtenBack.notify_all()
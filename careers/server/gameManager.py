@@ -15,13 +15,17 @@ import string
 from datetime import date, datetime
 from uuid import uuid4
 
-import dotenv
+import asyncio
 from pydantic import BaseModel, Field
-from pymongo import MongoClient
-import pymongo
+from careers.server.gameActor import GameActors
+from careers.server.gameCache import GameCache
+from careers.server.policyBatcher import PolicyBatcher
+from careers.server.storage import getAsyncStorage, getConfig, getStorage
 from careers.server.userManager import CareersUserManager, User
 from game.careersGame import CareersGame, restore_game
 from game.careersGameEngine import CareersGameEngine
+from game.commandResult import CommandResult
+from game.gameConstants import PlayerType
 from game.gameParameters import GameParameters
 from game.player import Player
 
@@ -35,19 +39,39 @@ class Game(BaseModel):
     gameState: Any = Field(default=None)
     opportunityDeck: Any = Field(alias="opportunity_deck", default=None)
     experienceDeck: Any = Field(alias="experience_deck", default=None)
+    random: Any = Field(default=None)
     players: Any = Field(default=None)
     updateDate: datetime = Field(...)
     startDate: datetime = Field(default=None)
 
 class CareersGameManager(object):
 
-    def __init__(self):
-        self.games = {}
-        self.config = dotenv.dotenv_values(".env")
-        self.mongo_client = MongoClient(self.config["DB_URL"])
-        self.database = self.mongo_client["careers"]
+    def __init__(self, storage=None, asyncStorage=None):
+        """Uses the shared storage unless given one, for example a MemoryStorage, and the async interface to the same storage"""
+        self.config = getConfig()
+        self.storage = getStorage() if storage is None else storage
+        self.asyncStorage = asyncStorage
+        self.database = self.storage.database
         self.database["games"].create_index('players')
-        self.userManager = CareersUserManager()
+        self.userManager = CareersUserManager(self.storage, asyncStorage)
+
+        """Game engines in use are cached, changes are written back to mongo when a game is evicted"""
+        self.games = GameCache(self.loadGame, self.writeGame,
+            maxGames=int(self.config.get("GAME_CACHE_MAX_GAMES", 1000)),
+            maxBytes=int(self.config.get("GAME_CACHE_MAX_BYTES", 256 * 1024 * 1024)),
+            idleTimeout=float(self.config.get("GAME_CACHE_IDLE_SECONDS", 3600)))
+
+        """Requests for a game run one at a time, requests for different games run in parallel"""
+        self.actors = GameActors(maxDepth=int(self.config.get("GAME_QUEUE_DEPTH", 16)),
+            timeout=float(self.config.get("GAME_QUEUE_TIMEOUT_SECONDS", 30)))
+
+        """
+            When POLICY_BATCH_MS is over 0, computer players' PolicyModel decisions are evaluated in batches across games,
+            the policy_scorer of each engine. By default each game evaluates its own.
+        """
+        batchMs = float(self.config.get("POLICY_BATCH_MS", 0))
+        self.policyBatcher = PolicyBatcher(maxDelay=batchMs / 1000, maxBatch=int(self.config.get("POLICY_BATCH_SIZE", 256))) \
+            if batchMs > 0 else None
 
     def create(self, edition: str, userId: str, points: int):
         """
@@ -55,6 +79,7 @@ class CareersGameManager(object):
             but also stores it in mongo for later lookups
         """
         gameEngine = CareersGameEngine()
+        self.serve(gameEngine)
         newGame = gameEngine.create(edition, userId, 'points', points).message
         gameId = json.loads(newGame)['game_id']
 
@@ -75,9 +100,11 @@ class CareersGameManager(object):
         game.createdBy = userId
         game.experienceDeck = gameDict["experience_deck"]
         game.opportunityDeck = gameDict["opportunity_deck"]
+        game.random = gameDict["random"]
 
         self.database["games"].insert_one(jsonable_encoder(game))
-        self.games[gameId] = gameEngine
+        gameEngine.save_tracker.mark_saved()
+        self.games.put(gameId, gameEngine)
 
         return game
 
@@ -90,13 +117,14 @@ class CareersGameManager(object):
         experience_deck = {"next_index":gameInstance.experience_cards.next_index, "cards_index":gameInstance.experience_cards.cards_index}
         game_dict["opportunity_deck"] = opportunity_deck
         game_dict["experience_deck"] = experience_deck
+        game_dict["random"] = gameInstance.random_to_dict()
         
         return game_dict
     
     def getPlayers(self, gameEngine: CareersGameEngine):
         """Get all the players"""
         #return json.loads(gameEngine.game_state.to_JSON())    
-        game = self.getGameById(gameEngine.game_id)
+        game = self.getGameById(gameEngine.game_id, hasTurn=True)
         return game
     
     def userReady(self, userId: str, ready: bool, gameEngine: CareersGameEngine):
@@ -111,17 +139,72 @@ class CareersGameManager(object):
         """
             Returns a game by join code
         """
-        return self.database["games"].find_one({"joinCode": joinCode})
+        game = self.database["games"].find_one({"joinCode": joinCode})
+        if game is not None and self.flushGame(game["_id"]):
+            game = self.database["games"].find_one({"_id": game["_id"]})
+        return game
 
-    def getGameById(self, gameId: str) -> Game:
-        """Gets a game details by id"""
+    def getGameById(self, gameId: str, hasTurn: bool = False) -> Game:
+        """Gets a game details by id. hasTurn is True if the caller already has the game's turn, for example a request for the game."""
+        if hasTurn:
+            self.games.flush(gameId)    # write back any cached changes first
+        else:
+            self.flushGame(gameId)
         return self.database["games"].find_one({"_id": gameId})
 
+    def flushGame(self, gameId: str) -> bool:
+        """
+            Writes back the cached changes of a game in the game's turn, so the game isn't read while a command is changing it.
+            Returns True if the game had changes.
+        """
+        if not self.games.isDirty(gameId):
+            return False
+        with self.actors.turn(gameId):
+            self.games.flush(gameId)
+        return True
+
+    @property
+    def asyncDatabase(self):
+        """The async interface to the database of the storage, created on first use in the event loop"""
+        if self.asyncStorage is None:
+            self.asyncStorage = getAsyncStorage(self.storage)
+        return self.asyncStorage.database
+
+    async def flushAsync(self, gameIds: List[str]):
+        """Write back any cached changes to games, on a worker thread so the event loop isn't blocked"""
+        dirty = [gameId for gameId in gameIds if self.games.isDirty(gameId)]
+        if len(dirty) > 0:
+            await asyncio.to_thread(lambda: [self.flushGame(gameId) for gameId in dirty])
+        return len(dirty) > 0
+
+    async def getGameByIdAsync(self, gameId: str) -> Game:
+        """Gets a game details by id, without blocking the event loop"""
+        await self.flushAsync([gameId])
+        return await self.asyncDatabase["games"].find_one({"_id": gameId})
+
+    async def getGameByJoinCodeAsync(self, joinCode: str):
+        """Returns a game by join code, without blocking the event loop"""
+        game = await self.asyncDatabase["games"].find_one({"joinCode": joinCode})
+        if game is not None and await self.flushAsync([game["_id"]]):
+            game = await self.asyncDatabase["games"].find_one({"_id": game["_id"]})
+        return game
+
+    async def getGamesAsync(self, installationId: str) -> Any:
+        """Gets all of the games this user participates in, without blocking the event loop"""
+        games = await self.asyncDatabase["games"].find({"players": installationId}).to_list()
+        if await self.flushAsync([game["_id"] for game in games]):
+            games = await self.asyncDatabase["games"].find({"players": installationId}).to_list()
+        return games
+
     def getGames(self, installationId: str) -> Any:         
         """
             Gets all of the games this user participates in
         """
-        return list(self.database["games"].find({"players": installationId}))
+        games = list(self.database["games"].find({"players": installationId}))
+        dirty = [game["_id"] for game in games if self.flushGame(game["_id"])]
+        if len(dirty) > 0:
+            games = list(self.database["games"].find({"players": installationId}))
+        return games
     
     def updatePlayerFormula(self, userId: str, hearts:int, stars: int, money: int, gameEngine: CareersGameEngine):
         """Updates the specified users formula"""
@@ -154,43 +237,106 @@ class CareersGameManager(object):
                                             }})
         
             if (result.modified_count == 1):
-                gameEngine.start()
+                gameEngine.execute_command("start", None)     # logged like any other command
                 self.saveGame(gameEngine.game_id, gameEngine.installationId, gameEngine)
             else:
                 raise Exception("Game modified by another player before starting.")
         
         return game
 
+    def serve(self, gameEngine: CareersGameEngine) -> CareersGameEngine:
+        """Sets up an engine to be served: its computer players' PolicyModel decisions are evaluated by the policyBatcher"""
+        if self.policyBatcher is not None:
+            gameEngine.policy_scorer = self.policyBatcher.scores
+        return gameEngine
+
+    def takeComputerTurn(self, gameId: str) -> CommandResult | None:
+        """
+            Plays a turn of the current player of a game if it's a computer player, in the game's turn like any other request.
+            Returns the CommandResult, or None if there's no such game or the current player isn't a computer player.
+        """
+        with self.actors.turn(gameId):
+            engine = self.games.pin(gameId)
+            try:
+                if engine is None:
+                    return None
+                result = self.playComputerTurn(engine)
+                if result is not None:
+                    self.saveGame(gameId, engine.installationId, engine)
+                return result
+            finally:
+                self.games.unpin(gameId)
+
+    def playComputerTurn(self, gameEngine: CareersGameEngine) -> CommandResult | None:
+        """
+            Plays a turn of the current player of a game if it's a computer player, and ends it if the game is run automatically.
+            The caller has the game's turn.
+        """
+        gameState = gameEngine.game_state
+        player = gameState.current_player
+        if player.player_type is not PlayerType.COMPUTER or gameState.game_complete:
+            return None
+        result = gameEngine.execute_command("take_turn", player)
+        if gameState.automatic_run and result.return_code != CommandResult.TERMINATE:
+            result = gameEngine.execute_command("next", player)
+        return result
+
     def saveGame(self, gameId: str, userId: str, gameEngine: CareersGameEngine) -> None:
-        """Save the state of the game"""
-
-        game = self.getGameDictionary(gameId, userId, "Hi-Tech", gameEngine.careersGame)
-
-        self.database['games'].update_one({"_id": gameEngine.game_id}, 
-            {"$set": 
-                {
-                    'gameState': game["gameState"],
-                    'opportunity_deck': game["opportunity_deck"],
-                    'experience_deck': game['experience_deck'],
-                    'updateDate': str(datetime.now())
-                }
-            })
-
-    def __call__(self, gameId: str = None) -> CareersGameEngine:
-        """Create a new game engine for the user and return the instance"""
-        if(gameId is None):
+        """Save the state of the game. A cached game is written back when it's evicted or flushed."""
+        if gameEngine.game_id in self.games:
+            self.games.markDirty(gameEngine.game_id)
+        else:
+            self.writeGame(gameEngine.game_id, gameEngine)
+
+    def writeGame(self, gameId: str, gameEngine: CareersGameEngine) -> None:
+        """
+            Write the changes to the game since it was last written to mongo:
+            only the changed fields of the game state, players and decks are set, and new commands are pushed
+        """
+        tracker = gameEngine.save_tracker
+        update = tracker.update()
+        update.setdefault("$set", {})['updateDate'] = str(datetime.now())
+
+        self.database['games'].update_one({"_id": gameEngine.game_id}, update)
+        tracker.saved()
+
+    def flush(self) -> None:
+        """Write back all the cached changes, for example when the server shuts down"""
+        self.games.flush()
+
+    def loadGame(self, gameId: str) -> CareersGameEngine:
+        """Restore a game from mongo, or None if there's no such game"""
+        dbGame = self.getGameDocument(gameId)
+        if dbGame is None:
             return None
+        game = restore_game(gameId, json.dumps(dbGame))
 
-        if(gameId in self.games):
-            return self.games[gameId]
-        else: 
-            dbGame = self.getGameById(gameId)
-            game = restore_game(gameId, json.dumps(dbGame))
+        # Create a new GameEngine from this game id
+        engine = CareersGameEngine(game, gameId)
+        engine.game_state = game.game_state
+        self.serve(engine)
+        engine.save_tracker.mark_saved()    # mongo has the game as it is now
 
-            # Create a new GameEngine from this game id
-            engine = CareersGameEngine(game, gameId)
-            engine.game_state = game.game_state
-            self.games[gameId] = engine
+        #engine.execute_command(f"load {gameId}", None)
+        return engine
+
+    def getGameDocument(self, gameId: str):
+        return self.database["games"].find_one({"_id": gameId})
+
+    def __call__(self, gameId: str = None):
+        """
+            Get the game engine of a game, restoring it if it isn't cached.
+            The request waits for its turn on the game, and holds it until the request is done,
+            so requests for the same game never run at the same time.
+            The game is pinned in the cache until the request is done.
+        """
+        if(gameId is None):
+            yield None
+            return
 
-            #self.games[gameId].execute_command(f"load {gameId}", None)
-            return self.games[gameId]
\ No newline at end of file
+        with self.actors.turn(gameId):
+            engine = self.games.pin(gameId)
+            try:
+                yield engine
+            finally:
+                self.games.unpin(gameId)
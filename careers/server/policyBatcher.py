@@ -0,0 +1,116 @@
+"""Evaluates the PolicyModel decisions of computer players in many games at once.
+"""
+
+from threading import Condition, Event
+from typing import Any, Dict, List
+import time
+
+import numpy as np
+from game.gameState import GameState
+from game.policyModel import PolicyModel
+
+class PendingDecision(object):
+    """A decision waiting for its batch: the game as the deciding player sees it, and the model's scores once they're evaluated"""
+
+    def __init__(self, gameState: GameState, perspective: int):
+        self.gameState = gameState
+        self.perspective = perspective
+        self.scores: np.ndarray = None
+        self.error: Exception = None
+        self.done = Event()
+
+class PolicyBatch(object):
+    """The decisions evaluated together by one model"""
+
+    def __init__(self, model: PolicyModel):
+        self.model = model
+        self.decisions: List[PendingDecision] = []
+        self.closed = False
+
+class PolicyBatcher(object):
+    """
+        Micro-batches the PolicyModel evaluations of computer players' decisions across games.
+        A thread that needs a decision adds it to the open batch of its model and waits for the scores.
+        The first decision of a batch waits for up to maxDelay seconds for others to join, or until the batch has maxBatch decisions,
+        then its thread encodes the whole batch and scores it with one matrix multiply, and wakes the others.
+        The games of a batch don't change while it's evaluated: the thread of each decision has its game's turn and is waiting.
+        Arguments:
+            maxDelay - the most seconds a batch waits for more decisions
+            maxBatch - the most decisions in a batch
+    """
+
+    def __init__(self, maxDelay: float = 0.002, maxBatch: int = 256):
+        self.maxDelay = maxDelay
+        self.maxBatch = maxBatch
+        self.condition = Condition()
+        self.batches: Dict[PolicyModel, PolicyBatch] = {}      # the open batch of each model
+        self.decisions = 0
+        self.batchCount = 0
+        self.maxBatchSize = 0
+        self.evaluateSeconds = 0.0
+        self.errors = 0
+
+    def scores(self, model: PolicyModel, gameState: GameState, perspective: int) -> np.ndarray:
+        """
+            The model's scores of a game for a player, evaluated in a batch with the other decisions waiting for the model.
+            Blocks until the batch is evaluated, raises the exception of a batch that fails.
+        """
+        decision = PendingDecision(gameState, perspective)
+        with self.condition:
+            batch = self.batches.get(model)
+            if batch is None:
+                batch = PolicyBatch(model)
+                self.batches[model] = batch
+            batch.decisions.append(decision)
+            leader = len(batch.decisions) == 1
+            if len(batch.decisions) >= self.maxBatch:
+                self._close(batch)
+                self.condition.notify_all()
+            if leader:
+                self.condition.wait_for(lambda: batch.closed, self.maxDelay)
+                self._close(batch)
+        if leader:
+            self._evaluate(batch)
+        else:
+            decision.done.wait()
+        if decision.error is not None:
+            raise decision.error
+        return decision.scores
+
+    def _close(self, batch: PolicyBatch):
+        """No more decisions join a batch once it's closed. The caller holds the condition."""
+        if not batch.closed:
+            batch.closed = True
+            if self.batches.get(batch.model) is batch:
+                del self.batches[batch.model]
+
+    def _evaluate(self, batch: PolicyBatch):
+        decisions = batch.decisions
+        start = time.perf_counter()
+        try:
+            scores = batch.model.evaluate([decision.gameState for decision in decisions], [decision.perspective for decision in decisions])
+            for decision, row in zip(decisions, scores):
+                decision.scores = row
+            failed = False
+        except Exception as ex:
+            for decision in decisions:
+                decision.error = ex
+            failed = True
+        elapsed = time.perf_counter() - start
+        with self.condition:
+            self.decisions += len(decisions)
+            self.batchCount += 1
+            self.maxBatchSize = max(self.maxBatchSize, len(decisions))
+            self.evaluateSeconds += elapsed
+            self.errors += failed
+        for decision in decisions:
+            decision.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """The batch counters, decisionsPerSecond is the rate of the evaluations themselves"""
+        with self.condition:
+            return {"decisions": self.decisions, "batches": self.batchCount,
+                    "meanBatch": self.decisions / self.batchCount if self.batchCount > 0 else 0.0, "maxBatch": self.maxBatchSize,
+                    "maxDelay": self.maxDelay, "evaluateSeconds": self.evaluateSeconds,
+                    "decisionsPerSecond": self.decisions / self.evaluateSeconds if self.evaluateSeconds > 0 else 0.0,
+                    "errors": self.errors}
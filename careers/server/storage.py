@@ -0,0 +1,372 @@
+"""
+    The storage shared by the server's managers: one pooled database client per process, with a sync interface
+    for the threadpool endpoints and an async interface for the async def endpoints.
+    Both interfaces look like pymongo: storage.database["games"].find_one(...)
+    Set DB_URL in .env (or the environment) to a mongodb:// URL, or to memory:// for the in-memory stand-in
+    used by tests and load benchmarks.
+"""
+
+from copy import deepcopy
+from threading import Lock, RLock
+from typing import Any, Dict, List
+from uuid import uuid4
+import asyncio
+import os
+import time
+
+import dotenv
+from pymongo import AsyncMongoClient, MongoClient
+
+_config: Dict[str, str] = None
+_storage = None
+_asyncStorage = None
+_lock = RLock()      # the async memory storage is created from the sync one while holding it
+
+def getConfig() -> Dict[str, str]:
+    """The server configuration: the environment overridden by .env, read once"""
+    global _config
+    if _config is None:
+        with _lock:
+            if _config is None:
+                config = dict(os.environ)
+                config.update({key: value for key, value in dotenv.dotenv_values(".env").items() if value is not None})
+                _config = config
+    return _config
+
+def getStorage() -> 'MongoStorage | MemoryStorage':
+    """The shared sync storage, created on first use"""
+    global _storage
+    if _storage is None:
+        with _lock:
+            if _storage is None:
+                _storage = _createStorage(getConfig(), False)
+    return _storage
+
+def getAsyncStorage(storage: 'MongoStorage | MemoryStorage' = None) -> 'AsyncMongoStorage | AsyncMemoryStorage':
+    """
+        The shared async storage, created on first use, or the async interface to a storage other than the shared one.
+        Call it from the event loop, an async client belongs to the loop it's first used on.
+    """
+    if storage is not None and storage is not _storage:
+        return storage.asyncStorage()
+    global _asyncStorage
+    if _asyncStorage is None:
+        with _lock:
+            if _asyncStorage is None:
+                _asyncStorage = _createStorage(getConfig(), True)
+    return _asyncStorage
+
+def setStorage(storage: 'MongoStorage | MemoryStorage', asyncStorage: 'AsyncMongoStorage | AsyncMemoryStorage' = None):
+    """Replace the shared storage, for example with a MemoryStorage in a test"""
+    global _storage, _asyncStorage
+    with _lock:
+        _storage = storage
+        _asyncStorage = asyncStorage if asyncStorage is not None or not isinstance(storage, MemoryStorage) else storage.asyncStorage()
+
+def _createStorage(config: Dict[str, str], isAsync: bool):
+    url = config["DB_URL"]
+    if url.startswith("memory://"):
+        if isAsync:
+            return getStorage().asyncStorage()      # the same documents as the sync storage
+        return MemoryStorage(latency=float(config.get("DB_MEMORY_LATENCY_MS", 0)) / 1000)
+    poolSize = int(config.get("DB_MAX_POOL_SIZE", 100))
+    return AsyncMongoStorage(url, poolSize) if isAsync else MongoStorage(url, poolSize)
+
+class MongoStorage(object):
+    """A MongoClient with a connection pool, shared by every manager"""
+
+    def __init__(self, url: str, maxPoolSize: int = 100):
+        self.url = url
+        self.maxPoolSize = maxPoolSize
+        self.client = MongoClient(url, maxPoolSize=maxPoolSize)
+        self.database = self.client["careers"]
+        self.asyncMongoStorage: 'AsyncMongoStorage' = None
+
+    def asyncStorage(self) -> 'AsyncMongoStorage':
+        """An async interface to the same database, created on first use. Call it from the event loop, see getAsyncStorage()"""
+        if self.asyncMongoStorage is None:
+            with _lock:
+                if self.asyncMongoStorage is None:
+                    self.asyncMongoStorage = AsyncMongoStorage(self.url, self.maxPoolSize)
+        return self.asyncMongoStorage
+
+    def close(self):
+        self.client.close()
+
+class AsyncMongoStorage(object):
+    """An AsyncMongoClient with a connection pool. Collection methods are awaited, find() cursors have to_list()."""
+
+    def __init__(self, url: str, maxPoolSize: int = 100):
+        self.client = AsyncMongoClient(url, maxPoolSize=maxPoolSize)
+        self.database = self.client["careers"]
+
+    async def close(self):
+        await self.client.close()
+
+class UpdateResult(object):
+    def __init__(self, matched_count: int, modified_count: int, upserted_id: Any = None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+class InsertOneResult(object):
+    def __init__(self, inserted_id: Any):
+        self.inserted_id = inserted_id
+
+class DeleteResult(object):
+    def __init__(self, deleted_count: int):
+        self.deleted_count = deleted_count
+
+class MemoryCollection(object):
+    """
+        A collection of documents in memory with the subset of the pymongo Collection interface the server uses.
+        A filter matches fields by equality, or by membership for an array field.
+        Updates support $set, $unset, $push (with $each), $addToSet and $pull, on a field or a dotted path.
+        Documents are copied in and out.
+    """
+
+    def __init__(self, name: str, storage: 'MemoryStorage'):
+        self.name = name
+        self.storage = storage
+        self.documents: Dict[Any, Dict] = {}
+
+    @staticmethod
+    def _matches(document: Dict, filter: Dict) -> bool:
+        for key, value in filter.items():
+            field = document.get(key)
+            if field != value and not (isinstance(field, list) and value in field):
+                return False
+        return True
+
+    def _find(self, filter: Dict) -> List[Dict]:
+        if "_id" in filter:
+            document = self.documents.get(filter["_id"])
+            return [document] if document is not None and MemoryCollection._matches(document, filter) else []
+        return [document for document in self.documents.values() if MemoryCollection._matches(document, filter)]
+
+    def create_index(self, keys, **kwargs) -> str:
+        return f"{keys}_1"
+
+    def find_one(self, filter: Dict = None, *args, **kwargs) -> Dict | None:
+        self.storage.wait()
+        return self._findOne(filter)
+
+    def find(self, filter: Dict = None, *args, **kwargs) -> List[Dict]:
+        self.storage.wait()
+        return self._findAll(filter)
+
+    def insert_one(self, document: Dict, *args, **kwargs) -> InsertOneResult:
+        self.storage.wait()
+        return self._insertOne(document)
+
+    def update_one(self, filter: Dict, update: Dict, upsert: bool = False, *args, **kwargs) -> UpdateResult:
+        self.storage.wait()
+        return self._updateOne(filter, update, upsert)
+
+    def delete_one(self, filter: Dict, *args, **kwargs) -> DeleteResult:
+        self.storage.wait()
+        return self._deleteOne(filter)
+
+    #
+    # the operations without the latency, shared with AsyncMemoryCollection
+    #
+    def _findOne(self, filter: Dict) -> Dict | None:
+        with self.storage.lock:
+            found = self._find(filter or {})
+            return deepcopy(found[0]) if len(found) > 0 else None
+
+    def _findAll(self, filter: Dict) -> List[Dict]:
+        with self.storage.lock:
+            return deepcopy(self._find(filter or {}))
+
+    def _insertOne(self, document: Dict) -> InsertOneResult:
+        document = deepcopy(document)
+        if "_id" not in document:
+            document["_id"] = str(uuid4())
+        with self.storage.lock:
+            if document["_id"] in self.documents:
+                raise KeyError(f"duplicate key {document['_id']} in {self.name}")
+            self.documents[document["_id"]] = document
+        return InsertOneResult(document["_id"])
+
+    def _updateOne(self, filter: Dict, update: Dict, upsert: bool) -> UpdateResult:
+        with self.storage.lock:
+            found = self._find(filter)
+            upserted_id = None
+            if len(found) == 0:
+                if not upsert:
+                    return UpdateResult(0, 0)
+                document = {key: value for key, value in filter.items()}
+                document.setdefault("_id", str(uuid4()))
+                self.documents[document["_id"]] = document
+                upserted_id = document["_id"]
+            else:
+                document = found[0]
+            before = deepcopy(document)
+            for operator, fields in update.items():
+                for path, value in deepcopy(fields).items():
+                    parent, key = MemoryCollection._parent(document, path, operator != "$unset")
+                    if parent is None:
+                        continue
+                    match operator:
+                        case "$set":
+                            MemoryCollection._setItem(parent, key, value)
+                        case "$unset":
+                            if isinstance(parent, dict):
+                                parent.pop(key, None)
+                            elif key < len(parent):
+                                parent[key] = None
+                        case "$push":
+                            items = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+                            MemoryCollection._getList(parent, key).extend(items)
+                        case "$addToSet":
+                            items = MemoryCollection._getList(parent, key)
+                            if value not in items:
+                                items.append(value)
+                        case "$pull":
+                            MemoryCollection._setItem(parent, key, [item for item in MemoryCollection._getList(parent, key) if item != value])
+                        case _:
+                            raise ValueError(f"unsupported update operator {operator}")
+            modified = 1 if document != before and upserted_id is None else 0
+            return UpdateResult(1 if upserted_id is None else 0, modified, upserted_id)
+
+    @staticmethod
+    def _parent(document: Dict, path: str, create: bool):
+        """
+            The dict or list holding the field at a dotted path like "gameState.players.1.commands", and the field's key,
+            an int for a list index. Missing dicts on the path are created if create is True, otherwise the parent is None.
+        """
+        keys = path.split(".")
+        parent = document
+        for key in keys[:-1]:
+            if isinstance(parent, list):
+                index = int(key)
+                if index >= len(parent):
+                    return None, None
+                parent = parent[index]
+            else:
+                if key not in parent:
+                    if not create:
+                        return None, None
+                    parent[key] = {}
+                parent = parent[key]
+        key = keys[-1]
+        return parent, int(key) if isinstance(parent, list) else key
+
+    @staticmethod
+    def _setItem(parent, key, value):
+        if isinstance(parent, list):
+            parent.extend([None] * (key + 1 - len(parent)))     # as mongo does, an index past the end pads the array
+        parent[key] = value
+
+    @staticmethod
+    def _getList(parent, key) -> List:
+        if isinstance(parent, list):
+            return parent[key]
+        return parent.setdefault(key, [])
+
+    def _deleteOne(self, filter: Dict) -> DeleteResult:
+        with self.storage.lock:
+            found = self._find(filter)
+            if len(found) == 0:
+                return DeleteResult(0)
+            del self.documents[found[0]["_id"]]
+            return DeleteResult(1)
+
+class MemoryStorage(object):
+    """
+        The in-memory stand-in for MongoStorage.
+        Arguments:
+            latency - seconds each operation takes, to stand in for a database round trip in load benchmarks
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.lock = Lock()
+        self.database = MemoryDatabase(self)
+
+    def wait(self):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def asyncStorage(self) -> 'AsyncMemoryStorage':
+        """An async interface to the same documents"""
+        return AsyncMemoryStorage(self)
+
+    def close(self):
+        pass
+
+class MemoryDatabase(object):
+    def __init__(self, storage: MemoryStorage):
+        self.storage = storage
+        self.collections: Dict[str, MemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        with self.storage.lock:
+            if name not in self.collections:
+                self.collections[name] = MemoryCollection(name, self.storage)
+            return self.collections[name]
+
+class AsyncMemoryStorage(object):
+    """The async interface to a MemoryStorage"""
+
+    def __init__(self, storage: MemoryStorage):
+        self.storage = storage
+        self.database = AsyncMemoryDatabase(storage.database)
+
+    async def close(self):
+        pass
+
+class AsyncMemoryDatabase(object):
+    def __init__(self, database: MemoryDatabase):
+        self.database = database
+        self.collections: Dict[str, AsyncMemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> 'AsyncMemoryCollection':
+        collection = self.collections.get(name)
+        if collection is None:
+            collection = AsyncMemoryCollection(self.database[name])
+            self.collections[name] = collection
+        return collection
+
+class AsyncMemoryCursor(object):
+    def __init__(self, collection: 'AsyncMemoryCollection', filter: Dict):
+        self.collection = collection
+        self.filter = filter
+
+    async def to_list(self, length: int = None) -> List[Dict]:
+        await self.collection._wait()
+        documents = self.collection.collection._findAll(self.filter)
+        return documents if length is None else documents[:length]
+
+class AsyncMemoryCollection(object):
+    """The async interface to a MemoryCollection. The latency is awaited, so it doesn't block the event loop."""
+
+    def __init__(self, collection: MemoryCollection):
+        self.collection = collection
+
+    async def _wait(self):
+        if self.collection.storage.latency > 0:
+            await asyncio.sleep(self.collection.storage.latency)
+
+    async def create_index(self, keys, **kwargs) -> str:
+        return self.collection.create_index(keys, **kwargs)
+
+    async def find_one(self, filter: Dict = None, *args, **kwargs) -> Dict | None:
+        await self._wait()
+        return self.collection._findOne(filter)
+
+    def find(self, filter: Dict = None, *args, **kwargs) -> AsyncMemoryCursor:
+        return AsyncMemoryCursor(self, filter)
+
+    async def insert_one(self, document: Dict, *args, **kwargs) -> InsertOneResult:
+        await self._wait()
+        return self.collection._insertOne(document)
+
+    async def update_one(self, filter: Dict, update: Dict, upsert: bool = False, *args, **kwargs) -> UpdateResult:
+        await self._wait()
+        return self.collection._updateOne(filter, update, upsert)
+
+    async def delete_one(self, filter: Dict, *args, **kwargs) -> DeleteResult:
+        await self._wait()
+        return self.collection._deleteOne(filter)
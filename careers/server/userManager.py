@@ -4,9 +4,8 @@ from typing import Any, List
 from datetime import date, datetime
 from uuid import uuid4
 
-import dotenv
 from pydantic import BaseModel, Field
-from pymongo import MongoClient
+from careers.server.storage import getAsyncStorage, getStorage
 
 
 class User(BaseModel):
@@ -19,13 +18,21 @@ class User(BaseModel):
 
 class CareersUserManager(object):
 
-    def __init__(self):
-        self.config = dotenv.dotenv_values(".env")
-        self.mongo_client = MongoClient(self.config["DB_URL"])
-        self.database = self.mongo_client["careers"]
+    def __init__(self, storage=None, asyncStorage=None):
+        """Uses the shared storage unless given one, for example a MemoryStorage, and the async interface to the same storage"""
+        self.storage = getStorage() if storage is None else storage
+        self.asyncStorage = asyncStorage
+        self.database = self.storage.database
         self.database["users"].create_index('name')
         self.collection = self.database["users"]
 
+    @property
+    def asyncDatabase(self):
+        """The async interface to the database of the storage, created on first use in the event loop"""
+        if self.asyncStorage is None:
+            self.asyncStorage = getAsyncStorage(self.storage)
+        return self.asyncStorage.database
+
     def createUser(self, user: User) -> User:
         user.id = uuid4()
         self.collection.insert_one(jsonable_encoder(user))
@@ -34,6 +41,9 @@ class CareersUserManager(object):
     
     def getUserByUserId(self, userId: str) -> User:
         return self.collection.find_one({"_id": userId})
+
+    async def getUserByUserIdAsync(self, userId: str) -> User:
+        return await self.asyncDatabase["users"].find_one({"_id": userId})
     
     def deleteUser(self, userId: str):
         self.collection.delete_one({"_id": userId})
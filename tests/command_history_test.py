@@ -0,0 +1,63 @@
+import unittest
+import json
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+from game.gameStore import GameStore, MemoryGameStore
+
+class CommandHistoryTests(unittest.TestCase):
+    """Paging a player's command history, with the older turns moved to the GameStore"""
+
+    def setUp(self) -> None:
+        ConsoleOutput.set_default(ConsoleOutput.headless())
+        self.saved_store = GameStore._store
+        GameStore.set_store(MemoryGameStore())
+        self.engines = []
+
+    def tearDown(self) -> None:
+        for engine in self.engines:
+            engine.discard()
+        GameStore.set_store(self.saved_store)
+
+    def play(self, history_window:int|None) -> CareersGameEngine:
+        edition = "Professions-Hi-Tech_v3"
+        engine = CareersGameEngine(loglevel='error', installationId='unit-test', edition=edition, headless=True)
+        self.engines.append(engine)
+        engine.history_window = history_window
+        engine.create(edition, 'unit-test', 'points', 100000, 'test', seed=11)
+        for i in range(3):
+            engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 40000 30000 30000 computer", None)
+        engine.execute_command("start", None)
+        engine.automatic_run = True
+        for _ in range(150):
+            player = engine.game_state.current_player
+            engine.execute_command("take_turn", player)
+            engine.execute_command("next", player)
+        return engine
+
+    def pages(self, engine:CareersGameEngine, command:str) -> list:
+        commands = []
+        for page in range(10):
+            result = json.loads(engine.execute_command(f"{command} {page}", None).message)
+            self.assertEqual(result["page"], page)
+            if len(result["commands"]) == 0:
+                return commands
+            commands += result["commands"]
+        self.fail(f"{command} has no last page")
+
+    def test_pages_across_stored_turns(self):
+        """The pages of a player's commands are the complete command history, with most of it in the GameStore"""
+        full = self.play(None)
+        windowed = self.play(5)
+        for i in range(3):
+            player = windowed.get_player(f"CP_{i}")
+            command_history = full.get_player(f"CP_{i}").command_history
+            self.assertGreater(player.commands_stored, 100)     # the second page has stored and in-memory commands
+            self.assertEqual(player.command_history, command_history[player.commands_stored:])
+            self.assertEqual(len(player.command_history), player.turn_history.command_count)
+            self.assertEqual(self.pages(windowed, f"list commands CP_{i}"), command_history)
+            self.assertEqual(self.pages(windowed, f"list commands CP_{i} condensed"), command_history)
+        current = windowed.game_state.current_player
+        self.assertEqual(self.pages(windowed, "list commands"), full.get_player(current.player_initials).command_history)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from game.commandRegistry import CommandRegistry, parse_command
+from game.commandResult import CommandResult
+from game.gameConstants import GameConstants
+from game.gameEngineCommands import GameEngineCommands
+
+def _recorder(name:str):
+    def command(self, *args, **kwargs):
+        return (name, args, kwargs)
+    return command
+
+#
+# an engine whose commands return how they were called, for both the eval() of parse_command_string and dispatch
+#
+Recorder = type("Recorder", (object,), {name:_recorder(name) for name in GameConstants.COMMANDS})
+
+class CommandRegistryTests(unittest.TestCase):
+    """CommandRegistry.dispatch() calls commands with the arguments of the eval() of GameEngineCommands.parse_command_string()"""
+
+    COMMANDS = [
+        # (command, addl_args)
+        ("roll", []),
+        ("next", []),
+        ("where am i", []),
+        ("where is CP_2", []),
+        ("perform roll 2", []),
+        ("use opportunity 3", []),
+        ("use experience 12 4 Hi", []),
+        ("goto 7", []),
+        ("list commands", []),
+        ("resolve buy_hearts", []),
+        ("resolve buy_hearts 2", []),
+        ("resolve Buy_Stars 1 2 3", []),
+        ("resolve * 2", []),
+        ("resolve backstab CP_1", []),
+        ("resolve backstab CP_1 CP_2", []),
+        ("resolve backstab CP_1", ["human"]),
+        ("roll", ["4"]),
+        ("status", ["CP_1", "full"]),
+    ]
+
+    def test_dispatch(self):
+        registry = CommandRegistry(Recorder)
+        engine = Recorder()
+        for txt, addl_args in CommandRegistryTests.COMMANDS:
+            with self.subTest(command=txt, addl_args=addl_args):
+                command_result = GameEngineCommands.parse_command_string(txt, addl_args)
+                self.assertEqual(command_result.return_code, CommandResult.SUCCESS)
+                expected = eval("engine." + command_result.message)
+                self.assertEqual(registry.dispatch(engine, txt, addl_args), expected)
+
+    def test_parse_command(self):
+        for txt, expected in [
+                ("roll", ("roll", (), ())),
+                ("use opportunity 3", ("use", ("opportunity", 3), ())),
+                ("resolve Buy_Hearts 2", ("resolve", ("buy_hearts", "2"), ())),
+                ("resolve backstab CP_1 CP_2", ("resolve", ("backstab", ""), (("player_initials", "CP_1 CP_2"),)))]:
+            with self.subTest(command=txt):
+                self.assertEqual(parse_command(txt), expected)
+
+    def test_addl_args_follow_parsed_args(self):
+        """parse_command_string() can't append additional arguments to parsed ones, dispatch appends them"""
+        registry = CommandRegistry(Recorder)
+        self.assertEqual(registry.dispatch(Recorder(), "use opportunity 3", ["CP_1"]), ("use", ("opportunity", 3, "CP_1"), {}))
+
+    def test_invalid_command(self):
+        registry = CommandRegistry(Recorder)
+        for txt in ["", "  ", "fly away"]:
+            with self.subTest(command=txt):
+                self.assertEqual(registry.dispatch(Recorder(), txt).return_code, CommandResult.ERROR)
+
+if __name__ == '__main__':
+    unittest.main()
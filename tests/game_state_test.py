@@ -0,0 +1,51 @@
+import unittest
+import json
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+
+class GameStateTests(unittest.TestCase):
+    """GameState.to_dict() and its memo"""
+
+    def setUp(self) -> None:
+        ConsoleOutput.set_default(ConsoleOutput.headless())
+
+    def fresh_dict(self, game_state, include_players:bool) -> dict:
+        """to_dict() built from scratch, leaving the memo as it was"""
+        memo = game_state._dict_cache
+        game_state._dict_cache = {}
+        try:
+            return game_state.to_dict(include_players)
+        finally:
+            game_state._dict_cache = memo
+
+    def assert_same_dict(self, memoized:dict, fresh:dict):
+        memoized = dict(memoized)
+        fresh = dict(fresh)
+        memoized.pop("elapsed_time")
+        fresh.pop("elapsed_time")
+        self.assertEqual(json.dumps(memoized, default=str), json.dumps(fresh, default=str))
+
+    def test_memoized_dict(self):
+        """The memoized to_dict() is the same as a fresh one after every command of 3 games"""
+        edition = "Professions-Hi-Tech_v3"
+        for seed, nplayers in [(1, 2), (2, 3), (3, 4)]:
+            with self.subTest(seed=seed):
+                engine = CareersGameEngine(loglevel='error', installationId='unit-test', edition=edition, headless=True)
+                engine.scratch = True
+                try:
+                    engine.create(edition, 'unit-test', 'points', 100000, 'test', seed=seed)
+                    for i in range(nplayers):
+                        engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 40000 30000 30000 computer", None)
+                    engine.execute_command("start", None)
+                    engine.automatic_run = True
+                    game_state = engine.game_state
+                    for n in range(800):
+                        player = game_state.current_player
+                        engine.execute_command("take_turn" if n % 2 == 0 else "next", player)
+                        for include_players in (True, False):
+                            self.assert_same_dict(game_state.to_dict(include_players), self.fresh_dict(game_state, include_players))
+                finally:
+                    engine.discard()
+
+if __name__ == '__main__':
+    unittest.main()
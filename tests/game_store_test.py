@@ -0,0 +1,146 @@
+import unittest
+import json, os, shutil, tempfile
+from unittest import mock
+from game.gameStore import GameStore, MemoryGameStore, FileGameStore, SQLiteGameStore
+
+def game_state(installationId:str, players:list, turns:int=0) -> dict:
+    return {"installationId":installationId, "edition_name":"Professions-Hi-Tech_v3", \
+            "gameState":{"turns":turns, "game_complete":False, \
+                         "players":[{"_id":player_id, "initials":player_id.upper()} for player_id in players]}}
+
+class GameStoreContract(object):
+    """The behavior every GameStore has, run against each backend by the TestCase classes below"""
+
+    def create_store(self) -> GameStore:
+        raise NotImplementedError
+
+    def setUp(self) -> None:
+        self.store = self.create_store()
+
+    def tearDown(self) -> None:
+        self.store.close()
+
+    def test_save_load_list(self):
+        state = game_state("install-1", ["p1", "p2"], turns=3)
+        self.store.save_state("game1", state)
+        self.store.save_state("game2", game_state("install-1", ["p3"]))
+        self.assertEqual(self.store.load_state("game1"), state)
+        self.assertIsNone(self.store.load_state("nope"))
+        self.assertEqual(set([summary["game_id"] for summary in self.store.list_games_for_user("install-1")]), {"game1", "game2"})
+        summaries = self.store.list_games_for_user("p1")
+        self.assertEqual([summary["game_id"] for summary in summaries], ["game1"])
+        self.assertEqual(summaries[0]["turns"], 3)
+        self.assertEqual(summaries[0]["players"], ["P1", "P2"])
+        self.assertEqual(self.store.list_games_for_user("nobody"), [])
+
+    def test_save_replaces_users(self):
+        self.store.save_state("game1", game_state("install-1", ["p1"]))
+        self.store.save_state("game1", game_state("install-1", ["p2"], turns=5))
+        self.assertEqual(self.store.list_games_for_user("p1"), [])
+        self.assertEqual([summary["turns"] for summary in self.store.list_games_for_user("p2")], [5])
+        self.assertEqual(len(self.store.list_games_for_user("install-1")), 1)
+
+    def test_delete_game(self):
+        self.store.save_state("game1", game_state("install-1", ["p1"]))
+        self.store.append_turn("game1", 1, 0, {"commands":["roll"]})
+        self.assertTrue(self.store.delete_game("game1"))
+        self.assertIsNone(self.store.load_state("game1"))
+        self.assertEqual(self.store.list_games_for_user("p1"), [])
+        self.assertEqual(list(self.store.read_turns("game1")), [])
+        self.assertFalse(self.store.delete_game("game1"))
+
+    def test_read_turns(self):
+        for turn_number in range(1, 7):
+            self.store.append_turn("game1", turn_number, turn_number % 2, {"turn":turn_number})
+        self.store.append_turn("game2", 1, 0, {"turn":1})
+        self.assertEqual([row["record"]["turn"] for row in self.store.read_turns("game1")], [1, 2, 3, 4, 5, 6])
+        self.assertEqual([row["turn_number"] for row in self.store.read_turns("game1", player_number=1)], [1, 3, 5])
+        self.assertEqual([row["turn_number"] for row in self.store.read_turns("game1", after_turn=4)], [5, 6])
+        self.assertEqual([row["turn_number"] for row in self.store.read_turns("game1", player_number=0, after_turn=2)], [4, 6])
+        self.assertEqual(list(self.store.read_turns("game3")), [])
+
+class MemoryGameStoreTests(GameStoreContract, unittest.TestCase):
+
+    def create_store(self) -> GameStore:
+        return MemoryGameStore()
+
+class FileGameStoreTests(GameStoreContract, unittest.TestCase):
+
+    def create_store(self) -> GameStore:
+        self.folder = tempfile.mkdtemp()
+        return FileGameStore(self.folder)
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        shutil.rmtree(self.folder)
+
+    def index_lines(self) -> int:
+        with open(os.path.join(self.folder, FileGameStore.INDEX_FILENAME), "r") as fp:
+            return len(fp.readlines())
+
+    def test_reopen(self):
+        self.store.save_state("game1", game_state("install-1", ["p1"]))
+        self.store.save_state("game2", game_state("install-1", ["p2"]))
+        self.store.delete_game("game2")
+        store = FileGameStore(self.folder)
+        self.assertEqual([summary["game_id"] for summary in store.list_games_for_user("install-1")], ["game1"])
+        self.assertEqual(store.load_state("game1"), game_state("install-1", ["p1"]))
+
+    def test_compaction_on_reopen(self):
+        for turns in range(FileGameStore.COMPACT_LINES // 2):
+            self.store.save_state("game1", game_state("install-1", ["p1"], turns))
+        with open(os.path.join(self.folder, FileGameStore.INDEX_FILENAME), "a") as fp:      # another process's saves
+            for turns in range(FileGameStore.COMPACT_LINES):
+                fp.write(json.dumps({"game_id":"game2", "summary":GameStore.summary("game2", game_state("install-1", ["p2"], turns)), \
+                                     "users":["install-1", "p2"]}) + "\n")
+        store = FileGameStore(self.folder)
+        self.assertEqual(self.index_lines(), 2)
+        self.assertEqual(sorted([summary["game_id"] for summary in store.list_games_for_user("install-1")]), ["game1", "game2"])
+        self.assertEqual(store.list_games_for_user("p2")[0]["turns"], FileGameStore.COMPACT_LINES - 1)
+
+    def test_compaction_on_save(self):
+        for turns in range(3 * FileGameStore.COMPACT_LINES):
+            self.store.save_state("game1", game_state("install-1", ["p1"], turns))
+        self.assertLessEqual(self.index_lines(), FileGameStore.COMPACT_LINES + 1)
+        self.assertEqual(FileGameStore(self.folder).list_games_for_user("p1")[0]["turns"], 3 * FileGameStore.COMPACT_LINES - 1)
+
+    def test_incomplete_last_line(self):
+        """A crash while appending leaves an incomplete line, which is skipped"""
+        self.store.save_state("game1", game_state("install-1", ["p1"]))
+        self.store.append_turn("game1", 1, 0, {"turn":1})
+        for filename in [FileGameStore.INDEX_FILENAME, "game1_turns.jsonl"]:
+            with open(os.path.join(self.folder, filename), "a") as fp:
+                fp.write('{"game_id": "game1", "tur')
+        self.assertEqual([row["turn_number"] for row in self.store.read_turns("game1")], [1])
+        store = FileGameStore(self.folder)
+        self.assertEqual([summary["game_id"] for summary in store.list_games_for_user("p1")], ["game1"])
+        store.save_state("game2", game_state("install-1", ["p2"]))        # lines appended after the incomplete one are read
+        store.append_turn("game1", 2, 1, {"turn":2})
+        self.assertEqual([row["turn_number"] for row in FileGameStore(self.folder).read_turns("game1")], [1, 2])
+        self.assertEqual(len(FileGameStore(self.folder).list_games_for_user("install-1")), 2)
+
+    def test_state_file(self):
+        """The state is written by way of a temporary file, so a crash doesn't leave a truncated one"""
+        state = game_state("install-1", ["p1"])
+        with mock.patch("game.gameStore.GameWriter.write_file", side_effect=OSError("disk full")):
+            self.assertRaises(OSError, self.store.save_state, "game1", state)
+        self.assertIsNone(self.store.load_state("game1"))
+        self.store.save_state("game1", state)
+        self.assertEqual(sorted(os.listdir(self.folder)), sorted([FileGameStore.INDEX_FILENAME, "game1_game.json"]))
+
+class SQLiteGameStoreTests(GameStoreContract, unittest.TestCase):
+
+    def create_store(self) -> GameStore:
+        return SQLiteGameStore(":memory:")
+
+    def test_rollback(self):
+        """A save that fails part way leaves the game as it was"""
+        state = game_state("install-1", ["p1"], turns=1)
+        self.store.save_state("game1", state)
+        with mock.patch.object(GameStore, "users", side_effect=RuntimeError("failed")):
+            self.assertRaises(RuntimeError, self.store.save_state, "game1", game_state("install-1", ["p2"], turns=2))
+        self.assertEqual(self.store.load_state("game1"), state)
+        self.assertEqual([summary["game_id"] for summary in self.store.list_games_for_user("p1")], ["game1"])
+        self.assertEqual(self.store.list_games_for_user("p2"), [])
+        self.store.save_state("game2", game_state("install-1", ["p2"]))        # and the connection isn't left in a transaction
+        self.assertEqual(len(self.store.list_games_for_user("install-1")), 2)
@@ -0,0 +1,44 @@
+import unittest
+import json
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+from game.plugins.careers_All_MCTS import Careers_All_MCTS
+
+class RecoveryTests(unittest.TestCase):
+    """Recovering a game from its last checkpoint and CommandLog"""
+
+    def setUp(self) -> None:
+        ConsoleOutput.set_default(ConsoleOutput.headless())
+        self.engines = []
+
+    def tearDown(self) -> None:
+        for engine in self.engines:
+            engine.discard()
+
+    def test_recover_human_and_mcts(self):
+        """The computer's turns are taken by the human's "next", so the commands MCTS chose are logged with it"""
+        edition = "Professions-Hi-Tech_v3"
+        engine = CareersGameEngine(loglevel='error', installationId='unit-test', edition=edition, headless=True)
+        self.engines.append(engine)
+        engine.write_behind = False
+        engine.create(edition, 'unit-test', 'points', 100, 'test', seed=1)
+        mcts = Careers_All_MCTS(engine.careersGame)
+        mcts.configure({"players":[1], "time_budget":0.02, "seed":1})
+        engine.careersGame.plugins["turn"].append(mcts)
+        engine.execute_command("add player Human HU hu hu@example.com 40 30 30 human", None)
+        engine.execute_command("add player Computer CP cp cp@example.com 40 30 30 computer", None)
+        engine.execute_command("start", None)
+        engine.checkpoint_turns = 1000      # recovered from the start of the game
+        game_state = engine.game_state
+        while game_state.turns < 40 and not game_state.game_complete:
+            player = game_state.current_player
+            engine.execute_command("roll", player)
+            engine.execute_command("next", player)
+        engine.flush_saves()
+
+        recovered = CareersGameEngine.recover(engine.game_id, loglevel='error', headless=True)
+        self.engines.append(recovered)
+        self.assertEqual(recovered.game_state.turns, game_state.turns)
+        for player, recovered_player in zip(game_state.players, recovered.game_state.players):
+            self.assertEqual(json.dumps(recovered_player.to_dict(), default=str), json.dumps(player.to_dict(), default=str))
+        self.assertEqual(recovered.careersGame.random.getstate(), engine.careersGame.random.getstate())
@@ -0,0 +1,48 @@
+import unittest
+import json, jsonpickle, os
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+
+class SaveGameTests(unittest.TestCase):
+    """Saving games and loading them back"""
+    maxDiff = None
+
+    def setUp(self) -> None:
+        ConsoleOutput.set_default(ConsoleOutput.headless())
+        self.engine = CareersGameEngine(loglevel='error', installationId='unit-test', edition='Professions-Hi-Tech_v3', headless=True)
+        self.engine.create('Professions-Hi-Tech_v3', 'unit-test', 'points', 100, 'test', seed=3)
+        for i in range(2):
+            self.engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 40 30 30 computer", None)
+        self.engine.execute_command("start", None)
+        self.engine.automatic_run = True
+        for _ in range(10):
+            player = self.engine.game_state.current_player
+            self.engine.execute_command("take_turn", player)
+            self.engine.execute_command("next", player)
+
+    def tearDown(self) -> None:
+        self.engine.discard()
+
+    def test_save_jsonpickle(self):
+        game_state = self.engine.game_state
+        saved = json.loads(json.dumps(game_state.to_dict()))      # a copy before the save command is added to the player's commands
+        result = self.engine.execute_command("save jsonpickle", game_state.current_player)
+        self.assertEqual(result.return_code, 0, result.message)
+        filename = result.message.strip()
+        try:
+            with open(filename, "r") as fp:
+                game = jsonpickle.decode(fp.read())
+        finally:
+            os.remove(filename)
+
+        restored = json.loads(json.dumps(game.game_state.to_dict()))
+        for gs in [restored, saved]:
+            del gs["elapsed_time"]
+        self.assertEqual(restored, saved)
+        for player in game.game_state.players:
+            self.assertIsNotNone(player.progress_listener)     # set again when the GameState is restored
+
+    def test_repr(self):
+        self.assertTrue(len(repr(self.engine.game_state.players[0])) > 0)
+        self.assertTrue(len(repr(self.engine.game_state)) > 0)
+        self.assertTrue(len(self.engine.careersGame.to_JSON()) > 0)
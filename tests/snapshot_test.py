@@ -0,0 +1,107 @@
+import unittest
+import json
+from game.careersGameEngine import CareersGameEngine
+from game.consoleOutput import ConsoleOutput
+
+class SnapshotTests(unittest.TestCase):
+    """snapshot() and restore() of a CareersGame, a Player and its TurnHistory"""
+
+    def setUp(self) -> None:
+        ConsoleOutput.set_default(ConsoleOutput.headless())
+        edition = "Professions-Hi-Tech_v3"
+        self.engine = CareersGameEngine(loglevel='error', installationId='unit-test', edition=edition, headless=True)
+        self.engine.scratch = True
+        self.engine.history_window = 20      # restores bring evicted turns back into memory
+        self.engine.create(edition, 'unit-test', 'points', 100000, 'test', seed=3)
+        for i in range(4):
+            self.engine.execute_command(f"add player ComputerPlayer_{i} CP_{i} cp{i} cp{i}@example.com 40000 30000 30000 computer", None)
+        self.engine.execute_command("start", None)
+        self.engine.automatic_run = True
+        self.game = self.engine.careersGame
+        self.game_state = self.engine.game_state
+        self.play(30)
+
+    def tearDown(self) -> None:
+        self.engine.discard()
+
+    def play(self, turns:int):
+        for _ in range(turns):
+            player = self.game_state.current_player
+            self.engine.execute_command("take_turn", player)
+            self.engine.execute_command("next", player)
+
+    def player_state(self, player) -> str:
+        turn_history = player.turn_history
+        return json.dumps([player.to_dict(), player.info_dict(), player.command_history, player.commands_stored, player.salary_history, \
+                           [pending_action.to_dict() for pending_action in player.pending_actions.get_all()], \
+                           turn_history.to_dict(), turn_history.offset, turn_history.turn_number], default=str)
+
+    def state(self) -> str:
+        game_dict = self.game_state.to_dict()
+        game_dict.pop("elapsed_time", None)
+        return json.dumps([game_dict, [self.player_state(player) for player in self.game_state.players], \
+                           self.game.random.getstate(), self.game.opportunities.next_index, self.game.opportunities.cards_index, \
+                           self.game.experience_cards.next_index, self.game.experience_cards.cards_index], default=str)
+
+    def test_restore_and_replay(self):
+        """Restoring a snapshot and playing the same 50 turns again ends in the same state"""
+        token = self.game.snapshot()
+        before = self.state()
+        self.play(50)
+        after = self.state()
+        self.assertNotEqual(after, before)
+        self.game.restore(token)
+        self.assertEqual(self.state(), before)
+        self.play(50)
+        self.assertEqual(self.state(), after)
+
+    def test_restore_twice(self):
+        """A token can be restored again after playing on from it"""
+        token = self.game.snapshot()
+        before = self.state()
+        self.play(50)
+        after = self.state()
+        self.game.restore(token)
+        self.play(25)
+        self.game.restore(token)
+        self.assertEqual(self.state(), before)
+        self.play(50)
+        self.assertEqual(self.state(), after)
+
+    def test_interleaved_tokens(self):
+        """Two tokens can be restored in any order"""
+        first = self.game.snapshot()
+        first_state = self.state()
+        self.play(25)
+        second = self.game.snapshot()
+        second_state = self.state()
+        self.play(25)
+        end_state = self.state()
+        self.game.restore(first)
+        self.assertEqual(self.state(), first_state)
+        self.game.random.seed(99)       # another branch from the first token
+        self.play(40)
+        self.game.restore(second)
+        self.assertEqual(self.state(), second_state)
+        self.game.restore(first)
+        self.assertEqual(self.state(), first_state)
+        self.game.restore(second)
+        self.play(25)
+        self.assertEqual(self.state(), end_state)
+
+    def test_player_restore(self):
+        """A Player and its TurnHistory restore on their own, in place"""
+        player = self.game_state.players[0]
+        turn_history = player.turn_history
+        token = player.snapshot()
+        before = self.player_state(player)
+        self.play(50)
+        self.assertNotEqual(self.player_state(player), before)
+        player.restore(token)
+        self.assertIs(player.turn_history, turn_history)
+        self.assertEqual(self.player_state(player), before)
+        player.restore(token)
+        self.assertEqual(self.player_state(player), before)
+
+if __name__ == '__main__':
+    unittest.main()